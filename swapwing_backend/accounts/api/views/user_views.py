@@ -2,9 +2,8 @@ import re
 from datetime import timedelta
 
 from django.conf import settings
-from django.contrib.auth import authenticate, get_user_model
+from django.contrib.auth import get_user_model
 from django.contrib.auth.decorators import login_required
-from django.contrib.auth.hashers import check_password
 from django.contrib.auth.password_validation import validate_password
 from django.core.mail import send_mail
 from django.template.loader import get_template
@@ -23,9 +22,9 @@ from accounts.api.serializers import (
     UserRegistrationSerializer,
 )
 from accounts.models import EmailVerificationToken
-from accounts.services import issue_email_verification_token, mark_user_email_verified
+from accounts.services import LoginError, issue_email_verification_token, login_user, mark_user_email_verified
 from accounts.tasks import send_email_verification
-from all_activities.models import AllActivity
+from all_activities.sink import log_activity
 from garage.models import UserDesire, Garage
 
 from mysite.utils import base64_file, generate_random_otp_code
@@ -67,10 +66,6 @@ class UserLogin(APIView):
         password_errors = []
         fcm_token_errors = []
 
-        print(email)
-        print(password)
-        print(fcm_token)
-
         if not email:
             email_errors.append('Email is required.')
         if email_errors:
@@ -97,84 +92,29 @@ class UserLogin(APIView):
             return Response(payload, status=status.HTTP_404_NOT_FOUND)
 
 
-        qs = User.objects.filter(email=email)
-        if qs.exists():
-            not_active = qs.filter(email_verified=False)
-            if not_active:
-                reconfirm_msg = "resend confirmation email."
-                msg1 = "Please check your email to confirm your account or " + reconfirm_msg.lower()
-                email_errors.append(msg1)
-            if email_errors:
-                errors['email'] = email_errors
-                payload['message'] = "Error"
-                payload['errors'] = errors
-                return Response(payload, status=status.HTTP_404_NOT_FOUND)
-
-        if not check_password(email, password):
-            email_errors.append('Invalid Credentials')
-            if email_errors:
-                errors['email'] = email_errors
-                payload['message'] = "Error"
-                payload['errors'] = errors
-                return Response(payload, status=status.HTTP_404_NOT_FOUND)
-
-        user = authenticate(email=email, password=password)
-        if not user:
-            email_errors.append('Invalid Credentials')
-            if email_errors:
-                errors['email'] = email_errors
-                payload['message'] = "Error"
-                payload['errors'] = errors
+        try:
+            login = login_user(email, password, fcm_token)
+        except LoginError as exc:
+            errors['email'] = [exc.message]
+            payload['message'] = "Error"
+            payload['errors'] = errors
             return Response(payload, status=status.HTTP_404_NOT_FOUND)
 
-        else:
-            try:
-                token = Token.objects.get(user=user)
-            except Token.DoesNotExist:
-                token = Token.objects.create(user=user)
-
-            try:
-                user_personal_info = PersonalInfo.objects.get(user=user)
-            except PersonalInfo.DoesNotExist:
-                user_personal_info = PersonalInfo.objects.create(user=user)
-
-            user_personal_info.active = True
-
-            user_personal_info.save()
-
-            user.fcm_token = fcm_token
-            user.save()
-
-            data["user_id"] = user.user_id
-            data["email"] = user.email
-            data["first_name"] = user.first_name
-            data["last_name"] = user.last_name
-            data["token"] = token.key
-
-            payload['message'] = "Successful"
-            payload['data'] = data
+        user = login.user
+        data["user_id"] = user.user_id
+        data["email"] = user.email
+        data["first_name"] = user.first_name
+        data["last_name"] = user.last_name
+        data["token"] = login.token.key
 
-            new_activity = AllActivity.objects.create(
-                user=user,
-                subject="User Login",
-                body=user.email + " Just logged in."
-            )
-            new_activity.save()
+        payload['message'] = "Successful"
+        payload['data'] = data
 
         return Response(payload, status=status.HTTP_200_OK)
 
 
 
 
-def check_password(email, password):
-    try:
-        user = User.objects.get(email=email)
-        return user.check_password(password)
-    except User.DoesNotExist:
-        return False
-
-
-
 @api_view(['POST', ])
 @permission_classes([])
 @authentication_classes([])
@@ -326,11 +266,7 @@ def user_registration_view(request):
     verification_token = issue_email_verification_token(user)
     send_email_verification.delay(verification_token.id)
 
-    AllActivity.objects.create(
-        user=user,
-        subject="User Registration",
-        body=f"{user.email} just created an account.",
-    )
+    log_activity(user, "User Registration", f"{user.email} just created an account.")
 
     payload = {
         "message": "Successful",
@@ -478,12 +414,7 @@ def user_registration_view222(request):
             fail_silently=False
         )
 
-        new_activity = AllActivity.objects.create(
-            user=user,
-            subject="User Registration",
-            body=user.email + " Just created an account."
-        )
-        new_activity.save()
+        log_activity(user, "User Registration", user.email + " Just created an account.")
 
         garage = Garage.objects.create(
             user=user,
@@ -606,11 +537,7 @@ def verify_user_email(request):
         },
     }
 
-    AllActivity.objects.create(
-        user=user,
-        subject="Verify Email",
-        body=f"{user.email} just verified their email",
-    )
+    log_activity(user, "Verify Email", f"{user.email} just verified their email")
 
     return Response(payload, status=status.HTTP_200_OK)
 
@@ -678,12 +605,7 @@ class PasswordResetView(generics.GenericAPIView):
         data["emai"] = user.email
         data["user_id"] = user.user_id
 
-        new_activity = AllActivity.objects.create(
-            user=user,
-            subject="Reset Password",
-            body="OTP sent to " + user.email,
-        )
-        new_activity.save()
+        log_activity(user, "Reset Password", "OTP sent to " + user.email)
 
         payload['message'] = "Successful"
         payload['data'] = data
@@ -866,11 +788,7 @@ def resend_email_verification(request):
 
     send_email_verification.delay(verification_token.id)
 
-    AllActivity.objects.create(
-        user=user,
-        subject="Email verification sent",
-        body=f"Email verification sent to {user.email}",
-    )
+    log_activity(user, "Email verification sent", f"Email verification sent to {user.email}")
 
     return Response(
         {
@@ -1,3 +1,4 @@
+import json
 import random
 from datetime import timedelta
 from decimal import Decimal
@@ -7,6 +8,7 @@ from django.core.management.base import BaseCommand
 from django.db import transaction
 from django.utils import timezone
 
+from benchmarks.dataset import DatasetScale, generate
 from challenges.models import (
     Challenge,
     ChallengeCategory,
@@ -24,6 +26,26 @@ from user_profile.models import AdminInfo, PersonalInfo, SocialMedia, Wallet
 class Command(BaseCommand):
     help = "Seed the staging environment with representative SwapWing data."
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--users",
+            type=int,
+            default=0,
+            help="Also generate this many synthetic traders for load testing (see benchmarks.dataset).",
+        )
+        parser.add_argument("--listings", type=int, default=5, help="Listings per synthetic trader.")
+        parser.add_argument("--journeys", type=float, default=1, help="Journeys per synthetic trader.")
+        parser.add_argument("--steps", type=int, default=4, help="Steps per synthetic journey.")
+        parser.add_argument("--follows", type=int, default=3, help="Journeys followed per synthetic trader.")
+        parser.add_argument(
+            "--participations",
+            type=int,
+            default=50,
+            help="Synthetic traders enrolled in the benchmark challenge.",
+        )
+        parser.add_argument("--seed", type=int, default=0, help="Random seed for the synthetic data.")
+        parser.add_argument("--manifest", help="Write the synthetic dataset manifest (tokens, ids) here.")
+
     def handle(self, *args, **options):
         with transaction.atomic():
             self.stdout.write(self.style.MIGRATE_HEADING("Creating seed users"))
@@ -87,6 +109,27 @@ class Command(BaseCommand):
 
         self.stdout.write(self.style.SUCCESS("Staging data ensured."))
 
+        if options.get("users"):
+            self._generate_scaled(options)
+
+    def _generate_scaled(self, options):
+        scale = DatasetScale(
+            users=options["users"],
+            listings_per_user=options["listings"],
+            journeys_per_user=options["journeys"],
+            steps_per_journey=options["steps"],
+            follows_per_user=options["follows"],
+            participations=options["participations"],
+        )
+        self.stdout.write(self.style.MIGRATE_HEADING("Generating synthetic load-test data"))
+        manifest = generate(scale, seed=options["seed"])
+        counts = ", ".join(f"{count} {name}" for name, count in manifest["counts"].items())
+        self.stdout.write(f"Generated {counts}.")
+        if options.get("manifest"):
+            with open(options["manifest"], "w", encoding="utf-8") as handle:
+                json.dump(manifest, handle, indent=2)
+            self.stdout.write(f"Manifest written to {options['manifest']}.")
+
     # --- helpers -----------------------------------------------------------------
     def _ensure_admin_user(self):
         User = get_user_model()
@@ -0,0 +1,25 @@
+# Generated by Django 4.2 on 2026-10-17 05:26
+
+from django.db import migrations, models
+import mysite.ids
+
+
+def backfill_user_ids(apps, schema_editor):
+    # Legacy random IDs stay valid; only rows the old generator left empty get a ULID.
+    mysite.ids.backfill_missing_ids(apps.get_model("accounts", "User"), "user_id")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_user_unread_notification_count'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='user',
+            name='user_id',
+            field=models.CharField(blank=True, default=mysite.ids.new_ulid, max_length=255, null=True, unique=True),
+        ),
+        migrations.RunPython(backfill_user_ids, migrations.RunPython.noop),
+    ]
@@ -12,7 +12,7 @@ from django.utils import timezone
 
 from rest_framework.authtoken.models import Token
 
-from mysite.utils import unique_user_id_generator
+from mysite.ids import new_ulid
 from user_profile.models import PersonalInfo
 
 DEFAULT_ACTIVATION_DAYS = getattr(settings, 'DEFAULT_ACTIVATION_DAYS', 7)
@@ -71,7 +71,7 @@ class UserManager(BaseUserManager):
 
 
 class User(AbstractBaseUser):
-    user_id = models.CharField(max_length=255, blank=True, null=True, unique=True)
+    user_id = models.CharField(max_length=255, blank=True, null=True, unique=True, default=new_ulid)
     email = models.EmailField(max_length=255, unique=True)
     first_name = models.CharField(max_length=255, blank=True, null=True)
     last_name = models.CharField(max_length=255, blank=True, null=True)
@@ -85,6 +85,9 @@ class User(AbstractBaseUser):
     admin = models.BooleanField(default=False)
     timestamp = models.DateTimeField(auto_now_add=True)
 
+    # Maintained by notifications.models receivers and Notification.objects.mark_read
+    unread_notification_count = models.PositiveIntegerField(default=0)
+
     USERNAME_FIELD = 'email'
 
     REQUIRED_FIELDS = ['first_name', 'last_name']
@@ -125,7 +128,7 @@ def create_auth_token(sender, instance=None, created=False, **kwargs):
 # Generate unique User_id
 def pre_save_user_id_receiver(sender, instance, *args, **kwargs):
     if not instance.user_id:
-        instance.user_id = unique_user_id_generator(instance)
+        instance.user_id = new_ulid()
 
 pre_save.connect(pre_save_user_id_receiver, sender=User)
 
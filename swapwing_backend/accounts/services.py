@@ -2,13 +2,18 @@
 
 import secrets
 import string
+from dataclasses import dataclass
 from datetime import timedelta
 
 from django.conf import settings
+from django.contrib.auth import get_user_model
 from django.db import transaction
 from django.utils import timezone
+from rest_framework.authtoken.models import Token
 
 from accounts.models import EmailVerificationToken
+from all_activities.sink import log_activity
+from user_profile.models import PersonalInfo
 
 
 def _generate_unique_code():
@@ -57,3 +62,62 @@ def mark_user_email_verified(user, *, save=True):
     if save:
         user.save(update_fields=["email_verified", "is_active", "email_token"])
     return user
+
+
+UNVERIFIED_LOGIN_MESSAGE = "Please check your email to confirm your account or resend confirmation email."
+INVALID_CREDENTIALS_MESSAGE = "Invalid Credentials"
+
+
+class LoginError(Exception):
+    """A rejected login; ``message`` is reported under the ``email`` field."""
+
+    def __init__(self, message):
+        super().__init__(message)
+        self.message = message
+
+
+@dataclass
+class LoginResult:
+    user: object
+    token: Token
+
+
+def login_user(email, password, fcm_token) -> LoginResult:
+    """Check credentials and mark the trader signed in on ``fcm_token``.
+
+    One query loads the user with its token and profile, the password is
+    hashed once, and only changed columns are written. The activity row is
+    buffered and inserted later by ``all_activities.tasks.flush_activity_log``.
+    """
+
+    User = get_user_model()
+    user = User.objects.select_related("auth_token", "user_personal_info").filter(email=email).first()
+    if user is None:
+        # Hash anyway so unknown emails cost the same as wrong passwords.
+        User().set_password(password)
+        raise LoginError(INVALID_CREDENTIALS_MESSAGE)
+    if not user.email_verified:
+        raise LoginError(UNVERIFIED_LOGIN_MESSAGE)
+    if not user.check_password(password) or not user.is_active:
+        raise LoginError(INVALID_CREDENTIALS_MESSAGE)
+
+    try:
+        token = user.auth_token
+    except Token.DoesNotExist:
+        token = Token.objects.create(user=user)
+
+    try:
+        personal_info = user.user_personal_info
+    except PersonalInfo.DoesNotExist:
+        PersonalInfo.objects.create(user=user, active=True)
+    else:
+        if not personal_info.active:
+            personal_info.active = True
+            personal_info.save(update_fields=["active", "updated_at"])
+
+    if user.fcm_token != fcm_token:
+        user.fcm_token = fcm_token
+        user.save(update_fields=["fcm_token"])
+
+    log_activity(user, "User Login", f"{user.email} Just logged in.")
+    return LoginResult(user=user, token=token)
@@ -1,6 +1,8 @@
 from datetime import timedelta
+from unittest import mock
 
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import check_password
 from django.core import mail
 from django.test import override_settings
 from django.urls import reverse
@@ -9,6 +11,9 @@ from rest_framework import status
 from rest_framework.test import APITestCase
 
 from accounts.models import EmailVerificationToken
+from all_activities.models import AllActivity
+from all_activities.tasks import flush_activity_log
+from user_profile.models import PersonalInfo
 from accounts.services import issue_email_verification_token
 
 User = get_user_model()
@@ -111,3 +116,46 @@ class EmailVerificationFlowTests(APITestCase):
         user_tokens = EmailVerificationToken.objects.filter(user=user)
         self.assertEqual(user_tokens.filter(consumed_at__isnull=True).count(), 1)
         self.assertEqual(len(mail.outbox), 1)
+
+
+class UserLoginTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="login@example.com", password="SwapWing!123", first_name="Log")
+        User.objects.filter(pk=self.user.pk).update(email_verified=True)
+        self.url = reverse("accounts_api:login_user")
+        self.payload = {"email": "login@example.com", "password": "SwapWing!123", "fcm_token": "device-1"}
+
+    def test_login_hashes_once_and_writes_only_changed_columns(self):
+        PersonalInfo.objects.filter(user=self.user).update(active=False)
+        with mock.patch(
+            "django.contrib.auth.base_user.check_password", side_effect=check_password
+        ) as hasher, self.captureOnCommitCallbacks() as callbacks:
+            # One select (user + token + profile), then the profile and fcm_token updates.
+            with self.assertNumQueries(3):
+                response = self.client.post(self.url, self.payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        self.assertEqual(response.data["data"]["token"], self.user.auth_token.key)
+        self.assertEqual(hasher.call_count, 1)
+        self.assertFalse(AllActivity.objects.filter(user=self.user).exists())
+
+        for callback in callbacks:
+            callback()
+        flush_activity_log.delay()
+        self.assertEqual(AllActivity.objects.get(user=self.user).subject, "User Login")
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.fcm_token, "device-1")
+        self.assertTrue(self.user.user_personal_info.active)
+
+        with self.assertNumQueries(1):
+            self.client.post(self.url, self.payload, format="json")
+
+    def test_login_rejects_bad_credentials_and_unverified_users(self):
+        response = self.client.post(self.url, {**self.payload, "password": "wrong"}, format="json")
+        self.assertEqual(response.data["errors"]["email"], ["Invalid Credentials"])
+        response = self.client.post(self.url, {**self.payload, "email": "nobody@example.com"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        User.objects.filter(pk=self.user.pk).update(email_verified=False)
+        response = self.client.post(self.url, self.payload, format="json")
+        self.assertIn("confirm your account", response.data["errors"]["email"][0])
@@ -0,0 +1,27 @@
+# Generated by Django 4.2 on 2026-10-17 05:23
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('all_activities', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='allactivity',
+            name='timestamp',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddIndex(
+            model_name='allactivity',
+            index=models.Index(fields=['user', '-timestamp'], name='activity_user_ts_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='allactivity',
+            index=models.Index(fields=['timestamp'], name='activity_ts_idx'),
+        ),
+    ]
@@ -1,5 +1,6 @@
 from django.conf import settings
 from django.db import models
+from django.utils import timezone
 
 User = settings.AUTH_USER_MODEL
 
@@ -8,4 +9,11 @@ class AllActivity(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='all_user_activities')
     subject = models.CharField(max_length=500, unique=False, blank=True, null=True)
     body = models.CharField(max_length=700, unique=False, blank=True, null=True)
-    timestamp = models.DateTimeField(auto_now_add=True)
+    # Set when the event is logged; rows are inserted later by all_activities.sink.flush_activities.
+    timestamp = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "-timestamp"], name="activity_user_ts_idx"),
+            models.Index(fields=["timestamp"], name="activity_ts_idx"),
+        ]
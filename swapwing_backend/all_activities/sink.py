@@ -0,0 +1,185 @@
+"""Buffered activity log.
+
+Auth flows record an activity row per request. Instead of inserting it in
+the request, ``log_activity`` appends the event to a sink once the request's
+transaction commits, and ``flush_activities`` (run by beat) moves what has
+accumulated into ``AllActivity`` with batched ``bulk_create`` calls. Two
+interchangeable sinks are provided:
+
+* ``redis`` (default) – a Redis stream read through a consumer group, shared
+  by web and Celery workers. Entries are acknowledged and deleted only after
+  their rows are inserted, and entries a crashed flusher left pending are
+  reclaimed after ``ACTIVITY_CLAIM_IDLE_SECONDS``.
+* ``memory`` – a list in the recording process, for the test suite (see
+  ``mysite.backends``); the Celery flusher never sees it.
+
+The event timestamp is taken when it is logged, not when it is flushed.
+Events whose user was deleted before the flush are dropped (and acknowledged)
+rather than failing the batch, which would otherwise be retried forever.
+``prune_activities`` deletes rows older than ``ACTIVITY_RETENTION_DAYS`` in
+primary-key chunks so retention never holds a long lock on the table.
+"""
+
+from __future__ import annotations
+
+import os
+import socket
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+
+from all_activities.models import AllActivity
+from mysite.backends import MEMORY, REDIS, BackendRegistry
+
+# Rows per bulk_create / DELETE statement.
+FLUSH_BATCH_SIZE = 500
+PRUNE_BATCH_SIZE = 1000
+
+Event = Dict[str, str]
+
+
+class MemoryActivitySink:
+    """Events held in process, in arrival order."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._events: List[Event] = []
+
+    def append(self, event: Event) -> None:
+        with self._lock:
+            self._events.append(event)
+
+    def read(self, count: int) -> Tuple[List[str], List[Event]]:
+        with self._lock:
+            batch = self._events[:count]
+        return [str(index) for index in range(len(batch))], batch
+
+    def ack(self, ids: List[str]) -> None:
+        with self._lock:
+            del self._events[: len(ids)]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._events.clear()
+
+
+class RedisActivitySink:
+    """``XADD`` to a stream; flushers read it through a consumer group."""
+
+    group = "flush"
+
+    def __init__(self, url: Optional[str] = None, client=None):
+        if client is None:
+            import redis
+
+            client = redis.Redis.from_url(url or settings.REDIS_URL, decode_responses=True)
+        self.client = client
+        self.consumer = f"{socket.gethostname()}:{os.getpid()}"
+        self._group_ready = False
+
+    @property
+    def key(self) -> str:
+        return getattr(settings, "ACTIVITY_STREAM_KEY", "swapwing:activity")
+
+    def _ensure_group(self) -> None:
+        if self._group_ready:
+            return
+        import redis
+
+        try:
+            self.client.xgroup_create(self.key, self.group, id="0", mkstream=True)
+        except redis.ResponseError as exc:
+            if "BUSYGROUP" not in str(exc):
+                raise
+        self._group_ready = True
+
+    def append(self, event: Event) -> None:
+        self.client.xadd(self.key, event)
+
+    def read(self, count: int) -> Tuple[List[str], List[Event]]:
+        self._ensure_group()
+        idle_ms = int(getattr(settings, "ACTIVITY_CLAIM_IDLE_SECONDS", 300) * 1000)
+        entries = self.client.xautoclaim(self.key, self.group, self.consumer, idle_ms, count=count)[1]
+        if len(entries) < count:
+            replies = self.client.xreadgroup(self.group, self.consumer, {self.key: ">"}, count=count - len(entries))
+            for _, stream_entries in replies or ():
+                entries.extend(stream_entries)
+        entries = [(entry_id, fields) for entry_id, fields in entries if fields]
+        return [entry_id for entry_id, _ in entries], [fields for _, fields in entries]
+
+    def ack(self, ids: List[str]) -> None:
+        if not ids:
+            return
+        pipe = self.client.pipeline(transaction=True)
+        pipe.xack(self.key, self.group, *ids)
+        pipe.xdel(self.key, *ids)
+        pipe.execute()
+
+    def clear(self) -> None:
+        self.client.delete(self.key)
+        self._group_ready = False
+
+
+_sinks = BackendRegistry(
+    "ACTIVITY_SINK", {MEMORY: MemoryActivitySink, REDIS: RedisActivitySink}, label="activity sink"
+)
+get_activity_sink = _sinks.get
+reset_activity_sink = _sinks.reset
+
+
+def log_activity(user, subject: str, body: str) -> None:
+    """Record an activity for ``user`` once the current transaction commits."""
+
+    event = {"user_id": str(user.pk), "subject": subject, "body": body, "timestamp": timezone.now().isoformat()}
+    transaction.on_commit(lambda: get_activity_sink().append(event))
+
+
+def _to_row(event: Event) -> AllActivity:
+    return AllActivity(
+        user_id=event["user_id"],
+        subject=event.get("subject"),
+        body=event.get("body"),
+        timestamp=datetime.fromisoformat(event["timestamp"]),
+    )
+
+
+def _existing_user_ids(events: List[Event]) -> set:
+    user_ids = {event["user_id"] for event in events}
+    return {str(pk) for pk in get_user_model().objects.filter(pk__in=user_ids).values_list("pk", flat=True)}
+
+
+def flush_activities(max_batches: Optional[int] = None) -> int:
+    """Insert buffered events in batches; returns the rows written."""
+
+    sink = get_activity_sink()
+    written = batches = 0
+    while max_batches is None or batches < max_batches:
+        ids, events = sink.read(FLUSH_BATCH_SIZE)
+        if not ids:
+            break
+        existing = _existing_user_ids(events)
+        rows = [_to_row(event) for event in events if event["user_id"] in existing]
+        AllActivity.objects.bulk_create(rows, batch_size=FLUSH_BATCH_SIZE)
+        sink.ack(ids)
+        written += len(rows)
+        batches += 1
+    return written
+
+
+def prune_activities(now: Optional[datetime] = None) -> int:
+    """Delete rows older than ``ACTIVITY_RETENTION_DAYS`` in chunks; returns rows deleted."""
+
+    days = getattr(settings, "ACTIVITY_RETENTION_DAYS", 180)
+    cutoff = (now or timezone.now()) - timedelta(days=days)
+    stale = AllActivity.objects.filter(timestamp__lt=cutoff).order_by("pk")
+    deleted = 0
+    while True:
+        ids = list(stale.values_list("pk", flat=True)[:PRUNE_BATCH_SIZE])
+        if not ids:
+            return deleted
+        deleted += AllActivity.objects.filter(pk__in=ids).delete()[0]
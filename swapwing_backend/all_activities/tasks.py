@@ -0,0 +1,19 @@
+"""Celery tasks for the activity log."""
+
+from celery import shared_task
+
+from all_activities import sink
+
+
+@shared_task
+def flush_activity_log():
+    """Insert buffered activity events; returns the rows written."""
+
+    return sink.flush_activities()
+
+
+@shared_task
+def prune_activity_log():
+    """Delete activity rows past ``ACTIVITY_RETENTION_DAYS``; returns rows deleted."""
+
+    return sink.prune_activities()
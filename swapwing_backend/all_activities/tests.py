@@ -1,3 +1,117 @@
-from django.test import TestCase
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from all_activities import sink
+from all_activities.models import AllActivity
+from all_activities.tasks import flush_activity_log, prune_activity_log
+
+User = get_user_model()
+
+
+class ActivitySinkTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="active@example.com", password="Password123")
+
+    def test_logged_events_are_bulk_inserted_in_batches(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            for index in range(5):
+                sink.log_activity(self.user, "User Login", f"login {index}")
+            self.assertFalse(AllActivity.objects.exists())
+        logged_at = timezone.now()
+
+        with mock.patch.object(sink, "FLUSH_BATCH_SIZE", 2), CaptureQueriesContext(connection) as queries:
+            self.assertEqual(flush_activity_log.delay().get(), 5)
+        inserts = [query for query in queries if query["sql"].startswith('INSERT INTO "all_activities_allactivity"')]
+        self.assertEqual(len(inserts), 3)
+        rows = list(AllActivity.objects.filter(user=self.user).order_by("timestamp"))
+        self.assertEqual([row.body for row in rows], [f"login {index}" for index in range(5)])
+        self.assertLessEqual(rows[-1].timestamp, logged_at)
+        self.assertEqual(flush_activity_log.delay().get(), 0)
+
+    def test_events_from_rolled_back_transactions_are_dropped(self):
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            sink.log_activity(self.user, "User Login", "never committed")
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(sink.flush_activities(), 0)
+
+    def test_events_of_deleted_users_do_not_block_the_flush(self):
+        gone = User.objects.create_user(email="gone@example.com", password="Password123")
+        with self.captureOnCommitCallbacks(execute=True):
+            sink.log_activity(gone, "User Login", "deleted later")
+            sink.log_activity(self.user, "User Login", "kept")
+        gone.delete()
+
+        self.assertEqual(sink.flush_activities(), 1)
+        self.assertEqual(list(AllActivity.objects.values_list("body", flat=True)), ["kept"])
+        self.assertEqual(sink.get_activity_sink().read(10), ([], []))
+
+    @override_settings(ACTIVITY_RETENTION_DAYS=30)
+    def test_prune_deletes_old_rows_in_chunks(self):
+        now = timezone.now()
+        AllActivity.objects.bulk_create(
+            [AllActivity(user=self.user, subject="old", timestamp=now - timedelta(days=40)) for _ in range(5)]
+            + [AllActivity(user=self.user, subject="recent", timestamp=now - timedelta(days=5))]
+        )
+        with mock.patch.object(sink, "PRUNE_BATCH_SIZE", 2), CaptureQueriesContext(connection) as queries:
+            self.assertEqual(prune_activity_log.delay().get(), 5)
+        deletes = [query for query in queries if query["sql"].startswith('DELETE FROM "all_activities_allactivity"')]
+        self.assertEqual(len(deletes), 3)
+        self.assertEqual(list(AllActivity.objects.values_list("subject", flat=True)), ["recent"])
+
+    def test_redis_sink_reclaims_unacknowledged_entries(self):
+        class FakePipeline:
+            def __init__(self, client):
+                self.client, self.calls = client, []
+
+            def xack(self, key, group, *ids):
+                self.calls.append(lambda: [self.client.pending.pop(entry_id, None) for entry_id in ids])
+
+            def xdel(self, key, *ids):
+                self.calls.append(lambda: self.client.entries.update({entry_id: None for entry_id in ids}))
+
+            def execute(self):
+                return [call() for call in self.calls]
+
+        class FakeRedis:
+            def __init__(self):
+                self.entries, self.pending, self.delivered = {}, {}, 0
+
+            def xgroup_create(self, key, group, id="0", mkstream=False):
+                pass
+
+            def xadd(self, key, fields):
+                entry_id = f"{len(self.entries) + 1}-0"
+                self.entries[entry_id] = fields
+                return entry_id
+
+            def xautoclaim(self, key, group, consumer, min_idle_time, count=None):
+                claimed = list(self.pending)[:count]
+                return ["0-0", [(entry_id, self.entries[entry_id]) for entry_id in claimed], []]
+
+            def xreadgroup(self, group, consumer, streams, count=None):
+                fresh = list(self.entries)[self.delivered : self.delivered + count]
+                self.delivered += len(fresh)
+                for entry_id in fresh:
+                    self.pending[entry_id] = consumer
+                return [["stream", [(entry_id, self.entries[entry_id]) for entry_id in fresh]]] if fresh else []
+
+            def pipeline(self, transaction=True):
+                return FakePipeline(self)
+
+        redis_sink = sink.RedisActivitySink(client=FakeRedis())
+        for index in range(3):
+            redis_sink.append({"user_id": str(self.user.pk), "subject": "s", "body": str(index), "timestamp": "t"})
+
+        ids, events = redis_sink.read(2)
+        self.assertEqual([event["body"] for event in events], ["0", "1"])
+        # The flusher died before acknowledging; the next read reclaims its entries first.
+        ids, events = redis_sink.read(5)
+        self.assertEqual([event["body"] for event in events], ["0", "1", "2"])
+        redis_sink.ack(ids)
+        self.assertEqual(redis_sink.read(5), ([], []))
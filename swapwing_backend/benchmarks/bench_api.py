@@ -0,0 +1,63 @@
+"""Micro-benchmarks for the hot read/write paths, one view call per round."""
+
+from decimal import Decimal
+
+import pytest
+from rest_framework.authtoken.models import Token
+from rest_framework.test import force_authenticate
+
+from accounts.api.views.user_views import UserLogin
+from challenges.api.views import ChallengeViewSet
+from journeys.api.views import JourneyViewSet
+from listings.api.view import ListingViewSet
+
+pytestmark = pytest.mark.django_db
+
+
+def _call(view, request, token, **kwargs):
+    force_authenticate(request, user=token.user, token=token)
+    response = view(request, **kwargs)
+    assert response.status_code < 300, response.data
+    return response
+
+
+@pytest.fixture
+def token(bench_dataset):
+    return Token.objects.select_related("user").get(key=bench_dataset["participants"][0]["token"])
+
+
+def test_listing_browse(measure, api_rf, token):
+    view = ListingViewSet.as_view({"get": "list"})
+    measure(lambda: _call(view, api_rf.get("/api/listings/"), token))
+
+
+def test_journey_discovery(measure, api_rf, token):
+    view = JourneyViewSet.as_view({"get": "list"})
+    measure(lambda: _call(view, api_rf.get("/api/journeys/"), token))
+
+
+def test_challenge_detail(measure, api_rf, token, bench_dataset):
+    view = ChallengeViewSet.as_view({"get": "retrieve"})
+    pk = bench_dataset["challenge_id"]
+    measure(lambda: _call(view, api_rf.get(f"/api/challenges/{pk}/"), token, pk=pk))
+
+
+def test_progress_submit(measure, api_rf, token, bench_dataset):
+    view = ChallengeViewSet.as_view({"post": "progress"})
+    pk = bench_dataset["challenge_id"]
+    payload = {"trade_delta_value": str(Decimal("1.50"))}
+    measure(
+        lambda: _call(view, api_rf.post(f"/api/challenges/{pk}/progress/", payload, format="json"), token, pk=pk)
+    )
+
+
+def test_login(measure, api_rf, bench_dataset):
+    view = UserLogin.as_view()
+    participant = bench_dataset["participants"][0]
+    payload = {"email": participant["email"], "password": bench_dataset["password"], "fcm_token": "bench-device"}
+
+    def login():
+        response = view(api_rf.post("/api/accounts/login-user", payload, format="json"))
+        assert response.status_code == 200, response.data
+
+    measure(login)
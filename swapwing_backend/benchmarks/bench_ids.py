@@ -0,0 +1,40 @@
+"""ID generation and bulk-creation throughput for the ULID-keyed garage models."""
+
+import pytest
+
+from garage.models import Garage, GarageItem
+from mysite.ids import new_ulid
+
+pytestmark = pytest.mark.django_db
+
+BULK_ROWS = 1000
+
+
+@pytest.fixture
+def garage(bench_dataset):
+    return Garage.objects.select_related("user").first()
+
+
+def _items(garage, count):
+    return [GarageItem(garage=garage, item_owner=garage.user, item_name=f"Bulk item {index}") for index in range(count)]
+
+
+def test_new_ulid(benchmark):
+    benchmark(new_ulid)
+
+
+def test_garage_item_create(measure, garage):
+    # One INSERT per item; the old generators added an exists() query each.
+    measure(lambda: GarageItem.objects.create(garage=garage, item_owner=garage.user, item_name="Single item"))
+
+
+def test_garage_item_bulk_create(benchmark, garage):
+    def clear():
+        GarageItem.objects.filter(item_name__startswith="Bulk item").delete()
+
+    benchmark.extra_info["rows"] = BULK_ROWS
+    benchmark.pedantic(
+        lambda: GarageItem.objects.bulk_create(_items(garage, BULK_ROWS), batch_size=500),
+        setup=clear,
+        rounds=5,
+    )
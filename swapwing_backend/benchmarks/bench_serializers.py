@@ -0,0 +1,74 @@
+"""Serializer and queryset micro-benchmarks, isolating each half of a list view.
+
+Queryset benchmarks evaluate one page of the viewset's queryset; serializer
+benchmarks render an already-fetched page, so they should report 0 queries.
+"""
+
+import pytest
+from django.conf import settings
+from rest_framework.authtoken.models import Token
+from rest_framework.request import Request
+
+from challenges.api.serializers import ChallengeDetailSerializer, leaderboard_entries
+from challenges.leaderboard import leaderboard_for
+from challenges.models import Challenge
+from journeys.api.views import JourneyViewSet
+from listings.api.view import ListingViewSet
+
+pytestmark = pytest.mark.django_db
+
+
+def _viewset(viewset_class, api_rf, path, user, action="list"):
+    request = Request(api_rf.get(path))
+    request.user = user
+    viewset = viewset_class(action=action, request=request, format_kwarg=None, kwargs={})
+    return viewset
+
+
+def _page(viewset):
+    return list(viewset.get_queryset()[: getattr(settings, "API_DEFAULT_PAGE_SIZE", 20)])
+
+
+@pytest.fixture
+def trader(bench_dataset):
+    return Token.objects.select_related("user").get(key=bench_dataset["participants"][0]["token"]).user
+
+
+def test_listing_page_queryset(measure, api_rf, trader):
+    viewset = _viewset(ListingViewSet, api_rf, "/api/listings/", trader)
+    measure(_page, viewset)
+
+
+def test_listing_page_serializer(measure, api_rf, trader):
+    viewset = _viewset(ListingViewSet, api_rf, "/api/listings/", trader)
+    page = _page(viewset)
+    measure(lambda: viewset.get_serializer(page, many=True).data)
+
+
+def test_journey_page_queryset(measure, api_rf, trader):
+    viewset = _viewset(JourneyViewSet, api_rf, "/api/journeys/", trader)
+    measure(_page, viewset)
+
+
+def test_journey_page_serializer(measure, api_rf, trader):
+    viewset = _viewset(JourneyViewSet, api_rf, "/api/journeys/", trader)
+    page = _page(viewset)
+    context = viewset.get_serializer_context()
+    context["following_journey_ids"] = {str(pk) for pk in viewset.following_queryset(page) or []}
+    measure(lambda: viewset.get_serializer(page, many=True, context=context).data)
+
+
+def test_leaderboard_top(measure, bench_dataset):
+    leaderboard = leaderboard_for(bench_dataset["challenge_id"])
+    measure(lambda: leaderboard_entries(leaderboard.top()))
+
+
+def test_challenge_detail_serializer(measure, api_rf, trader, bench_dataset):
+    challenge = Challenge.objects.prefetch_related("milestones", "prizes").get(pk=bench_dataset["challenge_id"])
+    request = Request(api_rf.get("/"))
+    request.user = trader
+    context = {
+        "request": request,
+        "leaderboard_entries": leaderboard_entries(leaderboard_for(challenge).top()),
+    }
+    measure(lambda: ChallengeDetailSerializer(challenge, context=context).data)
@@ -0,0 +1,49 @@
+"""Fixtures for the micro-benchmarks in ``bench_*.py``.
+
+These files are not collected by the regular test run. Run them with
+pytest-benchmark, writing JSON that ``--benchmark-compare`` (or any later
+run) can be diffed against::
+
+    python -m pytest benchmarks -o python_files="bench_*.py" --no-cov \\
+        --benchmark-json=.benchmarks/micro.json
+
+``BENCH_USERS`` scales the generated dataset (default 50 traders).
+"""
+
+import os
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory
+
+from benchmarks.dataset import DatasetScale, generate
+
+
+@pytest.fixture(autouse=True)
+def _measure_views_not_cache(settings):
+    settings.RESPONSE_CACHE_ENABLED = False
+
+
+@pytest.fixture
+def bench_dataset(db):
+    users = int(os.getenv("BENCH_USERS", "50"))
+    return generate(DatasetScale(users=users, participations=max(users // 2, 1)))
+
+
+@pytest.fixture
+def api_rf():
+    return APIRequestFactory()
+
+
+@pytest.fixture
+def measure(benchmark):
+    """Benchmark ``func`` and record the queries one call issues in ``extra_info``."""
+
+    def run(func, *args, **kwargs):
+        with CaptureQueriesContext(connection) as queries:
+            func(*args, **kwargs)
+        benchmark.extra_info["queries"] = len(queries)
+        return benchmark(func, *args, **kwargs)
+
+    return run
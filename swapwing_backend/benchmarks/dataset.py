@@ -0,0 +1,470 @@
+"""Scalable synthetic dataset for benchmarks and load tests.
+
+``generate`` writes N traders with their listings, public journeys, journey
+steps, follow links, enrollments in one benchmark challenge, garages
+(items with images, categories, comments and reactions, plus services),
+notifications and trade-up episodes. Rows are
+inserted with ``bulk_create``, so the model signals that normally maintain
+tokens, profiles, counter columns, leaderboards, search documents and the
+response cache are replayed explicitly at the end.
+
+The data is owned by users under ``BENCH_EMAIL_DOMAIN`` and a challenge
+titled ``BENCH_CHALLENGE_TITLE``; both are deleted before generating, so a
+rerun with the same seed reproduces the same shape. ``seed_staging`` exposes
+this through its ``--users``/``--listings``/... options.
+"""
+
+from __future__ import annotations
+
+import random
+from dataclasses import asdict, dataclass
+from datetime import timedelta
+from decimal import Decimal
+from typing import Dict, List
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from challenges.leaderboard import leaderboard_for
+from challenges.models import (
+    Challenge,
+    ChallengeCategory,
+    ChallengeParticipation,
+    ChallengeStatus,
+)
+from garage.models import (
+    Garage,
+    GarageItem,
+    GarageItemCategory,
+    GarageItemComment,
+    GarageItemImages,
+    GarageService,
+    GarageServiceImages,
+)
+from journeys.models import (
+    Journey,
+    JourneyFollower,
+    JourneyStatus,
+    JourneyStep,
+    JourneyStepStatus,
+    JourneyVisibility,
+)
+from listings.models import Listing, ListingCategory, ListingMedia
+from mysite.counters import reconcile_counter
+from mysite.response_cache import NAMESPACES, invalidate
+from notifications.models import UNREAD_COUNTER, Notification
+from search.services import rebuild_index
+from tags.models import Tag
+from trade_up_league.models import EPISODE_COUNTERS, Episode
+from user_profile.models import PersonalInfo, get_default_profile_image
+
+BENCH_EMAIL_DOMAIN = "bench.swapwing.test"
+BENCH_CHALLENGE_TITLE = "Benchmark Trade-Up Sprint"
+BENCH_PASSWORD = "tradeup123"
+BENCH_TAG_PREFIX = "bench-"
+BATCH_SIZE = 500
+
+TAG_POOL = ["vintage", "tools", "bikes", "camping", "audio", "crafts", "solar", "gaming"]
+LOCATIONS = ["Accra", "Lagos", "Nairobi", "Lisbon", "Austin", "Osaka"]
+
+
+@dataclass(frozen=True)
+class DatasetScale:
+    """How many rows to generate; per-owner counts are averages."""
+
+    users: int = 100
+    listings_per_user: int = 5
+    journeys_per_user: float = 1
+    steps_per_journey: int = 4
+    follows_per_user: int = 3
+    participations: int = 50
+    media_per_listing: int = 1
+    garage_items_per_user: int = 2
+    garage_services_per_user: int = 1
+    comments_per_item: int = 2
+    reactions_per_item: int = 2
+    notifications_per_user: int = 3
+    episodes_per_user: float = 0.2
+
+    @classmethod
+    def small(cls) -> "DatasetScale":
+        return cls(users=20, listings_per_user=3, journeys_per_user=1, steps_per_journey=3, participations=10)
+
+
+def bench_email(index: int) -> str:
+    return f"trader{index:06d}@{BENCH_EMAIL_DOMAIN}"
+
+
+def clear() -> None:
+    """Delete a previously generated dataset."""
+
+    User = get_user_model()
+    Challenge.objects.filter(title=BENCH_CHALLENGE_TITLE).delete()
+    User.objects.filter(email__endswith=f"@{BENCH_EMAIL_DOMAIN}").delete()
+    Tag.objects.filter(name__startswith=BENCH_TAG_PREFIX).delete()
+
+
+def _create_users(count: int, rng: random.Random) -> list:
+    User = get_user_model()
+    password = make_password(BENCH_PASSWORD)
+    User.objects.bulk_create(
+        [
+            User(
+                email=bench_email(index),
+                first_name=f"Trader{index}",
+                last_name=rng.choice(["Okoro", "Sato", "Mensah", "Silva", "Kim"]),
+                password=password,
+                email_verified=True,
+                is_active=True,
+            )
+            for index in range(count)
+        ],
+        batch_size=BATCH_SIZE,
+    )
+    users = list(User.objects.filter(email__endswith=f"@{BENCH_EMAIL_DOMAIN}").order_by("email"))
+    Token.objects.bulk_create([Token(user=user, key=Token.generate_key()) for user in users], batch_size=BATCH_SIZE)
+    PersonalInfo.objects.bulk_create(
+        [
+            PersonalInfo(
+                user=user,
+                active=True,
+                verified=True,
+                profile_complete=True,
+                about_me="Synthetic trader generated for benchmarks.",
+                photo=get_default_profile_image(),
+            )
+            for user in users
+        ],
+        batch_size=BATCH_SIZE,
+    )
+    return users
+
+
+def _create_listings(users: list, scale: DatasetScale, rng: random.Random, now) -> Dict[int, List[Listing]]:
+    categories = [choice for choice, _ in ListingCategory.choices]
+    by_owner: Dict[int, List[Listing]] = {}
+    rows = []
+    for user in users:
+        for offset in range(scale.listings_per_user):
+            listing = Listing(
+                owner=user,
+                title=f"{rng.choice(TAG_POOL).title()} bundle #{offset + 1}",
+                description="Synthetic listing generated for benchmarks.",
+                category=rng.choice(categories),
+                tags=rng.sample(TAG_POOL, 2),
+                estimated_value=Decimal(rng.randint(5, 2500)),
+                is_trade_up_eligible=rng.random() < 0.6,
+                location=rng.choice(LOCATIONS),
+            )
+            rows.append(listing)
+            by_owner.setdefault(user.pk, []).append(listing)
+    Listing.objects.bulk_create(rows, batch_size=BATCH_SIZE)
+    # auto_now_add stamps every row with the same instant; spread them out so
+    # cursor pagination and ordering behave as on real data.
+    for index, listing in enumerate(rows):
+        listing.created_at = now - timedelta(minutes=index)
+    Listing.objects.bulk_update(rows, ["created_at"], batch_size=BATCH_SIZE)
+    if scale.media_per_listing:
+        ListingMedia.objects.bulk_create(
+            [
+                ListingMedia(
+                    listing=listing,
+                    external_url=f"https://cdn.swapwing.test/bench/{listing.pk}/{order}.jpg",
+                    order=order,
+                )
+                for listing in rows
+                for order in range(scale.media_per_listing)
+            ],
+            batch_size=BATCH_SIZE,
+        )
+    return by_owner
+
+
+def _create_journeys(users: list, listings: Dict[int, List[Listing]], scale: DatasetScale, rng: random.Random, now):
+    journeys = []
+    total = round(len(users) * scale.journeys_per_user)
+    for index in range(total):
+        owner = users[index % len(users)]
+        owned = listings.get(owner.pk) or [None]
+        start = owned[0]
+        starting_value = start.estimated_value if start else Decimal(rng.randint(5, 100))
+        journeys.append(
+            Journey(
+                owner=owner,
+                title=f"Trade-up journey {index + 1}",
+                description="Synthetic journey generated for benchmarks.",
+                starting_listing=start,
+                starting_value=starting_value,
+                target_value=starting_value * 10,
+                tags=rng.sample(TAG_POOL, 2),
+                visibility=JourneyVisibility.PUBLIC,
+                status=JourneyStatus.ACTIVE,
+                published_at=now - timedelta(hours=index),
+            )
+        )
+    Journey.objects.bulk_create(journeys, batch_size=BATCH_SIZE)
+    for index, journey in enumerate(journeys):
+        journey.created_at = now - timedelta(hours=index)
+    Journey.objects.bulk_update(journeys, ["created_at"], batch_size=BATCH_SIZE)
+
+    steps = []
+    for journey in journeys:
+        value = journey.starting_value
+        for sequence in range(1, scale.steps_per_journey + 1):
+            gained = (value * Decimal(rng.randint(10, 60)) / 100).quantize(Decimal("0.01"))
+            steps.append(
+                JourneyStep(
+                    journey=journey,
+                    sequence=sequence,
+                    from_value=value,
+                    to_value=value + gained,
+                    notes=f"Step {sequence}",
+                    status=JourneyStepStatus.PUBLISHED,
+                    completed_at=now - timedelta(hours=scale.steps_per_journey - sequence),
+                )
+            )
+            value += gained
+    JourneyStep.objects.bulk_create(steps, batch_size=BATCH_SIZE)
+
+    follows = []
+    if journeys:
+        for user in users:
+            for journey in rng.sample(journeys, min(scale.follows_per_user, len(journeys))):
+                if journey.owner_id != user.pk:
+                    follows.append(JourneyFollower(journey=journey, user=user))
+    JourneyFollower.objects.bulk_create(follows, batch_size=BATCH_SIZE, ignore_conflicts=True)
+    return journeys, steps
+
+
+def _create_challenge(journeys: list, steps: list, scale: DatasetScale, rng: random.Random, now):
+    challenge = Challenge.objects.create(
+        title=BENCH_CHALLENGE_TITLE,
+        description="Synthetic challenge generated for benchmarks.",
+        status=ChallengeStatus.ACTIVE,
+        category=ChallengeCategory.SUSTAINABILITY,
+        start_at=now - timedelta(days=3),
+        end_at=now + timedelta(days=11),
+    )
+    last_step = {}
+    for step in steps:
+        last_step[step.journey_id] = step
+
+    # One enrollment per journey owner, linked to their first journey.
+    enrolled = {}
+    for journey in journeys:
+        enrolled.setdefault(journey.owner_id, journey)
+    owners = list(enrolled.items())[: scale.participations]
+    participations = [
+        ChallengeParticipation(
+            challenge=challenge,
+            user_id=owner_id,
+            journey=journey,
+            total_trade_delta=Decimal(rng.randint(0, 50000)) / 100,
+            trades_completed=rng.randint(0, scale.steps_per_journey),
+            last_progress_at=now - timedelta(minutes=rng.randint(0, 600)),
+            last_step=last_step.get(journey.pk),
+        )
+        for owner_id, journey in owners
+    ]
+    ChallengeParticipation.objects.bulk_create(participations, batch_size=BATCH_SIZE)
+    return challenge, participations
+
+
+def _others(users: list, user, count: int, rng: random.Random) -> list:
+    pool = [other for other in users if other.pk != user.pk]
+    return rng.sample(pool, min(count, len(pool)))
+
+
+def _create_garages(users: list, scale: DatasetScale, rng: random.Random) -> None:
+    Garage.objects.bulk_create(
+        [
+            Garage(
+                user=user,
+                location_name=rng.choice(LOCATIONS),
+            )
+            for user in users
+        ],
+        batch_size=BATCH_SIZE,
+    )
+    garages = list(Garage.objects.filter(user__in=users).select_related("user"))
+
+    items, services = [], []
+    for garage in garages:
+        for index in range(scale.garage_items_per_user):
+            items.append(
+                GarageItem(
+                    garage=garage,
+                    item_owner=garage.user,
+                    item_name=f"{rng.choice(TAG_POOL).title()} item #{index + 1}",
+                    description="Synthetic garage item generated for benchmarks.",
+                    quality="Good",
+                    bid_starts=Decimal(rng.randint(5, 500)),
+                    is_listed=True,
+                    active=True,
+                )
+            )
+        for index in range(scale.garage_services_per_user):
+            services.append(
+                GarageService(
+                    garage=garage,
+                    service_name=f"{rng.choice(TAG_POOL).title()} repair #{index + 1}",
+                    service_type="Repair",
+                    available=True,
+                    active=True,
+                )
+            )
+    GarageItem.objects.bulk_create(items, batch_size=BATCH_SIZE)
+    GarageService.objects.bulk_create(services, batch_size=BATCH_SIZE)
+    items = list(GarageItem.objects.filter(garage__in=garages).select_related("item_owner"))
+    services = list(GarageService.objects.filter(garage__in=garages))
+
+    GarageItemImages.objects.bulk_create(
+        [GarageItemImages(garage_item=item, image=f"bench/items/{item.item_id}.jpg", active=True) for item in items],
+        batch_size=BATCH_SIZE,
+    )
+    GarageServiceImages.objects.bulk_create(
+        [
+            GarageServiceImages(garage_service=service, image=f"bench/services/{service.service_id}.jpg", active=True)
+            for service in services
+        ],
+        batch_size=BATCH_SIZE,
+    )
+    GarageItemCategory.objects.bulk_create(
+        [GarageItemCategory(item=item, category_name=rng.choice(TAG_POOL)) for item in items],
+        batch_size=BATCH_SIZE,
+    )
+    GarageItemComment.objects.bulk_create(
+        [
+            GarageItemComment(garage_item=item, user=commenter, comment="Would you swap for this?", active=True)
+            for item in items
+            for commenter in _others(users, item.item_owner, scale.comments_per_item, rng)
+        ],
+        batch_size=BATCH_SIZE,
+    )
+    Reaction = GarageItem.reactions.through
+    Reaction.objects.bulk_create(
+        [
+            Reaction(garageitem_id=item.pk, user_id=reactor.pk)
+            for item in items
+            for reactor in _others(users, item.item_owner, scale.reactions_per_item, rng)
+        ],
+        batch_size=BATCH_SIZE,
+    )
+
+
+def _create_notifications(users: list, scale: DatasetScale) -> None:
+    Notification.objects.bulk_create(
+        [
+            Notification(
+                user=user,
+                subject=f"Trade update #{index + 1}",
+                body="Synthetic notification generated for benchmarks.",
+                read=index % 2 == 0,
+                active=True,
+            )
+            for user in users
+            for index in range(scale.notifications_per_user)
+        ],
+        batch_size=BATCH_SIZE,
+    )
+
+
+def _create_episodes(users: list, scale: DatasetScale, rng: random.Random, now) -> None:
+    total = round(len(users) * scale.episodes_per_user)
+    if not total:
+        return
+    Tag.objects.bulk_create([Tag(name=f"{BENCH_TAG_PREFIX}{name}") for name in TAG_POOL])
+    tags = list(Tag.objects.filter(name__startswith=BENCH_TAG_PREFIX))
+    Episode.objects.bulk_create(
+        [
+            Episode(
+                user=users[index % len(users)],
+                title=f"Trade-up episode {index + 1}",
+                caption="Synthetic episode generated for benchmarks.",
+                date_published=now - timedelta(days=index),
+                views=rng.randint(0, 5000),
+                trending_no=index + 1,
+                active=True,
+            )
+            for index in range(total)
+        ],
+        batch_size=BATCH_SIZE,
+    )
+    episodes = list(Episode.objects.filter(user__in=users))
+    EpisodeTag = Episode.tags.through
+    EpisodeTag.objects.bulk_create(
+        [EpisodeTag(episode_id=episode.pk, tag_id=tag.pk) for episode in episodes for tag in rng.sample(tags, 2)],
+        batch_size=BATCH_SIZE,
+    )
+    EpisodeLike = Episode.likes.through
+    EpisodeLike.objects.bulk_create(
+        [
+            EpisodeLike(episode_id=episode.pk, user_id=fan.pk)
+            for episode in episodes
+            for fan in _others(users, episode.user, 3, rng)
+        ],
+        batch_size=BATCH_SIZE,
+    )
+
+
+@transaction.atomic
+def generate(scale: DatasetScale, seed: int = 0) -> dict:
+    """Replace the benchmark dataset and return a manifest describing it.
+
+    The manifest carries the benchmark challenge id, row counts and one
+    ``{email, user_id, token, participant_id, journey_id}`` entry per enrolled
+    trader, which is what the HTTP load scenarios need to authenticate and
+    submit progress.
+    """
+
+    rng = random.Random(seed)
+    now = timezone.now()
+    clear()
+
+    users = _create_users(scale.users, rng)
+    listings = _create_listings(users, scale, rng, now)
+    journeys, steps = _create_journeys(users, listings, scale, rng, now)
+    challenge, participations = _create_challenge(journeys, steps, scale, rng, now)
+    _create_garages(users, scale, rng)
+    _create_notifications(users, scale)
+    _create_episodes(users, scale, rng, now)
+
+    reconcile_counter(Journey, "followers_count", JourneyFollower, "journey")
+    reconcile_counter(Challenge, "participant_count", ChallengeParticipation, "challenge")
+    reconcile_counter(get_user_model(), UNREAD_COUNTER, Notification, "user", {"read": False})
+    for through, field in EPISODE_COUNTERS.items():
+        reconcile_counter(Episode, field, through, "episode")
+    leaderboard_for(challenge).rebuild()
+    rebuild_index()
+    invalidate(*NAMESPACES)
+
+    tokens = dict(Token.objects.filter(user__in=users).values_list("user_id", "key"))
+    emails = {user.pk: user.email for user in users}
+    user_ids = {user.pk: user.user_id for user in users}
+    return {
+        "seed": seed,
+        "scale": asdict(scale),
+        "challenge_id": str(challenge.pk),
+        "counts": {
+            "users": len(users),
+            "listings": sum(len(owned) for owned in listings.values()),
+            "journeys": len(journeys),
+            "steps": len(steps),
+            "participations": len(participations),
+        },
+        "participants": [
+            {
+                "email": emails[participation.user_id],
+                "user_id": user_ids[participation.user_id],
+                "token": tokens[participation.user_id],
+                "participant_id": str(participation.pk),
+                "journey_id": str(participation.journey_id),
+            }
+            for participation in participations
+        ],
+        "password": BENCH_PASSWORD,
+    }
+
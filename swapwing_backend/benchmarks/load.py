@@ -0,0 +1,339 @@
+"""HTTP load scenarios for the API hot paths.
+
+Generate data and a manifest first, then point the scenarios at a running
+server (``runserver`` for a quick look, Gunicorn for real numbers)::
+
+    python manage.py seed_staging --users 1000 --manifest /tmp/bench.json
+    python -m benchmarks.load run --manifest /tmp/bench.json --label main --output main.json
+    python -m benchmarks.load compare main.json branch.json
+
+Scenarios:
+
+* ``listing_browse``   - ``GET /api/listings/``, following the cursor five pages deep
+* ``journey_discovery`` - ``GET /api/journeys/`` as an authenticated trader
+* ``challenge_detail`` - ``GET /api/challenges/<id>/`` with leaderboard
+* ``progress_submit``  - ``POST /api/challenges/<id>/progress/``, one
+  enrolled trader per client thread
+* ``login``            - ``POST /api/accounts/login-user`` with the manifest
+  password, cycling through the enrolled traders
+
+Each scenario runs for ``--duration`` seconds at every ``--concurrency``
+level. Results are JSON (requests, errors, req/s and latency percentiles per
+scenario and level) tagged with the git commit, so ``compare`` can flag
+regressions between two runs. Set ``RESPONSE_CACHE_ENABLED=False`` on the
+server to measure the views rather than the response cache.
+``--slow-client-ms`` holds each connection open after the response headers
+arrive, which is where the ASGI serving mode pulls ahead of sync workers.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+import requests
+
+OK_STATUSES = {200, 201, 202}
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(int(round(fraction * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+
+def latency_summary(samples: List[float]) -> Dict[str, float]:
+    return {
+        "mean": round(statistics.fmean(samples), 2) if samples else 0.0,
+        "p50": round(percentile(samples, 0.50), 2),
+        "p95": round(percentile(samples, 0.95), 2),
+        "p99": round(percentile(samples, 0.99), 2),
+    }
+
+
+# -- scenarios -------------------------------------------------------------------
+class Scenario:
+    """One kind of request; ``request(session, client_index)`` sends it."""
+
+    method = "get"
+
+    def __init__(self, base_url: str, manifest: dict):
+        self.base_url = base_url.rstrip("/")
+        self.manifest = manifest
+        self.participants = manifest.get("participants") or []
+
+    def token_for(self, client_index: int) -> Optional[str]:
+        if not self.participants:
+            return None
+        return self.participants[client_index % len(self.participants)]["token"]
+
+    def session_for(self, client_index: int) -> requests.Session:
+        session = requests.Session()
+        token = self.token_for(client_index)
+        if token:
+            session.headers["Authorization"] = f"Token {token}"
+        return session
+
+    def url(self) -> str:
+        raise NotImplementedError
+
+    def request(self, session: requests.Session, client_index: int, **kwargs) -> requests.Response:
+        return session.request(self.method, self.url(), timeout=30, **kwargs)
+
+
+class ListingBrowse(Scenario):
+    """Marketplace browsing: page through the feed, then start over."""
+
+    name = "listing_browse"
+    pages = 5
+
+    def __init__(self, base_url, manifest):
+        super().__init__(base_url, manifest)
+        self.cursors: Dict[int, tuple] = {}
+
+    def url(self) -> str:
+        return f"{self.base_url}/api/listings/"
+
+    def request(self, session, client_index, **kwargs):
+        kwargs.pop("stream", None)
+        url, depth = self.cursors.get(client_index) or (self.url(), 1)
+        response = session.get(url, timeout=30, **kwargs)
+        following = response.json().get("next") if response.ok else None
+        if following and depth < self.pages:
+            self.cursors[client_index] = (following, depth + 1)
+        else:
+            self.cursors.pop(client_index, None)
+        return response
+
+
+class JourneyDiscovery(Scenario):
+    name = "journey_discovery"
+
+    def url(self) -> str:
+        return f"{self.base_url}/api/journeys/"
+
+
+class ChallengeDetail(Scenario):
+    name = "challenge_detail"
+
+    def url(self) -> str:
+        return f"{self.base_url}/api/challenges/{self.manifest['challenge_id']}/"
+
+
+class ProgressSubmit(Scenario):
+    name = "progress_submit"
+    method = "post"
+
+    def url(self) -> str:
+        return f"{self.base_url}/api/challenges/{self.manifest['challenge_id']}/progress/"
+
+    def request(self, session, client_index, **kwargs):
+        kwargs.setdefault("json", {"trade_delta_value": f"{random.randint(1, 2500) / 100:.2f}"})
+        return super().request(session, client_index, **kwargs)
+
+
+class Login(Scenario):
+    """Morning-peak sign-ins, cycling through the manifest's traders."""
+
+    name = "login"
+    method = "post"
+
+    def session_for(self, client_index: int) -> requests.Session:
+        return requests.Session()
+
+    def url(self) -> str:
+        return f"{self.base_url}/api/accounts/login-user"
+
+    def request(self, session, client_index, **kwargs):
+        participant = self.participants[client_index % len(self.participants)]
+        kwargs.setdefault(
+            "json",
+            {"email": participant["email"], "password": self.manifest["password"], "fcm_token": f"bench-{client_index}"},
+        )
+        return super().request(session, client_index, **kwargs)
+
+
+SCENARIOS = {
+    scenario.name: scenario for scenario in (ListingBrowse, JourneyDiscovery, ChallengeDetail, ProgressSubmit, Login)
+}
+
+
+# -- driver ----------------------------------------------------------------------
+def hammer(scenario: Scenario, concurrency: int, duration: float, slow_client_ms: int = 0) -> dict:
+    """Run ``scenario`` from ``concurrency`` threads for ``duration`` seconds."""
+
+    deadline = time.monotonic() + duration
+    lock = threading.Lock()
+    latencies: List[float] = []
+    errors = 0
+
+    def client(client_index: int):
+        nonlocal errors
+        session = scenario.session_for(client_index)
+        while time.monotonic() < deadline:
+            started = time.perf_counter()
+            try:
+                with scenario.request(session, client_index, stream=True) as response:
+                    if slow_client_ms:
+                        time.sleep(slow_client_ms / 1000)
+                    response.content  # noqa: B018 - drain the body
+                    ok = response.status_code in OK_STATUSES
+            except requests.RequestException:
+                ok = False
+            elapsed = (time.perf_counter() - started) * 1000
+            with lock:
+                if ok:
+                    latencies.append(elapsed)
+                else:
+                    errors += 1
+
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for client_index in range(concurrency):
+            pool.submit(client, client_index)
+    wall = time.monotonic() - started
+    return {
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / wall, 2) if wall else 0.0,
+        "latency_ms": latency_summary(latencies),
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(
+    base_url: str,
+    manifest: dict,
+    scenarios: List[str],
+    concurrency: List[int],
+    duration: float,
+    label: str = "run",
+    slow_client_ms: int = 0,
+    log: Callable[[str], None] = print,
+) -> dict:
+    results = []
+    for name in scenarios:
+        scenario = SCENARIOS[name](base_url, manifest)
+        warmup = scenario.session_for(0)
+        scenario.request(warmup, 0)
+        for level in concurrency:
+            outcome = hammer(scenario, level, duration, slow_client_ms)
+            results.append({"scenario": name, **outcome})
+            log(
+                f"{label:>8} {name:<18} c={level:<4} {outcome['rps']:>9.1f} req/s  "
+                f"p95={outcome['latency_ms']['p95']:.1f}ms errors={outcome['errors']}"
+            )
+    return {
+        "label": label,
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "base_url": base_url,
+        "duration": duration,
+        "slow_client_ms": slow_client_ms,
+        "dataset": manifest.get("counts", {}),
+        "results": results,
+    }
+
+
+def compare(baseline: dict, candidate: dict, threshold: float = 0.1) -> List[dict]:
+    """Pair up matching scenario/concurrency rows.
+
+    A row is a regression when throughput drops, or p95 latency grows, by
+    more than ``threshold`` (a fraction).
+    """
+
+    base_rows = {(row["scenario"], row["concurrency"]): row for row in baseline["results"]}
+    rows = []
+    for row in candidate["results"]:
+        base = base_rows.get((row["scenario"], row["concurrency"]))
+        if base is None:
+            continue
+        speedup = round(row["rps"] / base["rps"], 2) if base["rps"] else None
+        base_p95, p95 = base["latency_ms"]["p95"], row["latency_ms"]["p95"]
+        p95_ratio = round(p95 / base_p95, 2) if base_p95 else None
+        rows.append(
+            {
+                "scenario": row["scenario"],
+                "concurrency": row["concurrency"],
+                "baseline_rps": base["rps"],
+                "candidate_rps": row["rps"],
+                "baseline_p95_ms": base_p95,
+                "candidate_p95_ms": p95,
+                "speedup": speedup,
+                "p95_ratio": p95_ratio,
+                "regression": bool(
+                    (speedup is not None and speedup < 1 - threshold)
+                    or (p95_ratio is not None and p95_ratio > 1 + threshold)
+                ),
+            }
+        )
+    return rows
+
+
+def _load_json(path: str) -> dict:
+    with open(path, encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Load a running server.")
+    run_parser.add_argument("--base-url", default="http://localhost:8000")
+    run_parser.add_argument("--manifest", required=True, help="Written by seed_staging --manifest.")
+    run_parser.add_argument("--label", default="run")
+    run_parser.add_argument("--scenarios", nargs="+", choices=sorted(SCENARIOS), default=list(SCENARIOS))
+    run_parser.add_argument("--concurrency", nargs="+", type=int, default=[1, 16, 64])
+    run_parser.add_argument("--duration", type=float, default=15.0, help="Seconds per level.")
+    run_parser.add_argument("--slow-client-ms", type=int, default=0)
+    run_parser.add_argument("--output", help="Write the JSON results here.")
+
+    compare_parser = commands.add_parser("compare", help="Compare two result files.")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("candidate")
+    compare_parser.add_argument("--threshold", type=float, default=0.1)
+
+    args = parser.parse_args(argv)
+    if args.command == "run":
+        report = run(
+            args.base_url,
+            _load_json(args.manifest),
+            args.scenarios,
+            args.concurrency,
+            args.duration,
+            label=args.label,
+            slow_client_ms=args.slow_client_ms,
+        )
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as handle:
+                json.dump(report, handle, indent=2)
+        return 0
+
+    rows = compare(_load_json(args.baseline), _load_json(args.candidate), args.threshold)
+    print(json.dumps(rows, indent=2))
+    return 1 if any(row["regression"] for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
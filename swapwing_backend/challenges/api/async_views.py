@@ -0,0 +1,46 @@
+"""Async variants of the challenge read endpoints (see ``mysite.async_api``)."""
+
+from asgiref.sync import sync_to_async
+from rest_framework.response import Response
+
+from challenges.api.serializers import ChallengeLeaderboardEntrySerializer, aleaderboard_entries
+from challenges.api.views import ChallengeViewSet
+from challenges.leaderboard import DEFAULT_TOP_SIZE, leaderboard_for
+from challenges.models import ChallengeParticipation
+from mysite import response_cache
+from mysite.async_api import async_read_view, get_object
+from mysite.response_cache import cached_response
+
+
+@async_read_view(ChallengeViewSet, "retrieve", {"get": "retrieve"})
+@cached_response(response_cache.CHALLENGES, vary_on_user=True)
+async def challenge_detail(view, request, *args, **kwargs):
+    challenge = await get_object(view)
+    leaderboard = leaderboard_for(challenge)
+    # The leaderboard backend client is synchronous, so its calls go to a thread.
+    standings = await sync_to_async(leaderboard.top)(DEFAULT_TOP_SIZE)
+    entries = await aleaderboard_entries(standings)
+
+    enrolled_ids, current = set(), None
+    if request.user.is_authenticated:
+        participation = await ChallengeParticipation.objects.filter(
+            challenge=challenge, user=request.user
+        ).afirst()
+        if participation:
+            enrolled_ids = {str(challenge.id)}
+            current = {
+                "participant_id": participation.id,
+                "rank": await sync_to_async(leaderboard.rank_of)(participation),
+                "total_trade_delta": participation.total_trade_delta,
+            }
+
+    serializer = view.get_serializer(
+        challenge,
+        context={
+            **view.get_serializer_context(),
+            "enrolled_challenge_ids": enrolled_ids,
+            "leaderboard_entries": ChallengeLeaderboardEntrySerializer(entries, many=True).data,
+            "current_participation": current,
+        },
+    )
+    return Response(serializer.data)
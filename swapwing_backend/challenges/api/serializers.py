@@ -8,6 +8,7 @@ from django.contrib.auth import get_user_model
 from django.utils import timezone
 from rest_framework import serializers
 
+from challenges.leaderboard import LeaderboardStanding, ahydrate_standings, hydrate_standings
 from challenges.models import (
     Challenge,
     ChallengeStatus,
@@ -16,6 +17,7 @@ from challenges.models import (
     ChallengePrize,
     ChallengeProgress,
 )
+from challenges.services import record_progress_batch
 from journeys.models import Journey, JourneyStep
 
 User = get_user_model()
@@ -64,6 +66,44 @@ class ChallengeLeaderboardEntrySerializer(serializers.Serializer):
     last_progress_at = serializers.DateTimeField(allow_null=True)
 
 
+def _entry_participations():
+    return ChallengeParticipation.objects.select_related(
+        "user", "user__user_personal_info", "journey"
+    )
+
+
+def _leaderboard_entry(standing: LeaderboardStanding, participation: ChallengeParticipation) -> dict:
+    return {
+        "participant_id": participation.id,
+        "user_id": participation.user_id,
+        "display_name": _display_name_for(participation.user),
+        "avatar_url": _avatar_url_for(participation.user),
+        "total_trade_delta": participation.total_trade_delta,
+        "rank": standing.rank,
+        "journey_id": participation.journey_id,
+        "trades_completed": participation.trades_completed,
+        "last_progress_at": participation.last_progress_at,
+    }
+
+
+def leaderboard_entries(standings: Sequence[LeaderboardStanding]) -> List[dict]:
+    """Hydrate sorted-set standings into leaderboard entry dicts with one query."""
+
+    return [
+        _leaderboard_entry(standing, participation)
+        for standing, participation in hydrate_standings(standings, _entry_participations())
+    ]
+
+
+async def aleaderboard_entries(standings: Sequence[LeaderboardStanding]) -> List[dict]:
+    """``leaderboard_entries`` using the async ORM."""
+
+    return [
+        _leaderboard_entry(standing, participation)
+        for standing, participation in await ahydrate_standings(standings, _entry_participations())
+    ]
+
+
 class ChallengeSummarySerializer(serializers.ModelSerializer):
     participant_count = serializers.IntegerField(read_only=True)
     is_enrolled = serializers.SerializerMethodField()
@@ -285,3 +325,84 @@ class ChallengeProgressSerializer(serializers.Serializer):
         ])
 
         return progress
+
+
+MAX_PROGRESS_BATCH_SIZE = 100
+
+
+class ChallengeProgressEntrySerializer(ChallengeProgressSerializer):
+    """One entry of a progress batch; relations are checked by the batch."""
+
+    challenge_id = serializers.UUIDField()
+
+    def validate(self, attrs):
+        return attrs
+
+
+class ChallengeProgressBatchSerializer(serializers.Serializer):
+    entries = ChallengeProgressEntrySerializer(
+        many=True, allow_empty=False, max_length=MAX_PROGRESS_BATCH_SIZE
+    )
+
+    def validate_entries(self, entries):
+        """Apply the single-entry rules to the whole batch with one query per table."""
+
+        user: User = self.context["request"].user
+        participations = {
+            participation.challenge_id: participation
+            for participation in ChallengeParticipation.objects.filter(
+                user=user,
+                challenge_id__in={entry["challenge_id"] for entry in entries},
+            )
+        }
+        journey_ids = {entry["journey_id"] for entry in entries if entry.get("journey_id")}
+        journeys = Journey.objects.only("id", "owner_id").in_bulk(journey_ids) if journey_ids else {}
+        step_ids = {entry["step_id"] for entry in entries if entry.get("step_id")}
+        steps = (
+            JourneyStep.objects.select_related("journey")
+            .only("id", "journey_id", "journey__owner_id")
+            .in_bulk(step_ids)
+            if step_ids
+            else {}
+        )
+
+        errors = []
+        for entry in entries:
+            errors.append(self._entry_errors(entry, user, participations, journeys, steps))
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        return entries
+
+    @staticmethod
+    def _entry_errors(entry, user, participations, journeys, steps) -> dict:
+        participation = participations.get(entry["challenge_id"])
+        if participation is None:
+            return {"challenge_id": ["You must enroll before submitting progress."]}
+
+        journey_id = participation.journey_id
+        if entry.get("journey_id"):
+            requested_journey = journeys.get(entry["journey_id"])
+            if requested_journey is None:
+                return {"journey_id": ["Journey not found."]}
+            if requested_journey.owner_id != user.id:
+                return {"journey_id": ["Journey does not belong to you."]}
+            if journey_id and requested_journey.id != journey_id:
+                return {"journey_id": ["Enrollment is linked to a different journey."]}
+            journey_id = requested_journey.id
+
+        journey_step = None
+        if entry.get("step_id"):
+            journey_step = steps.get(entry["step_id"])
+            if journey_step is None:
+                return {"step_id": ["Journey step not found."]}
+            if journey_id and journey_step.journey_id != journey_id:
+                return {"step_id": ["Step does not belong to the linked journey."]}
+            if journey_step.journey.owner_id != user.id:
+                return {"step_id": ["You can only submit your own journey steps."]}
+
+        entry["participation"] = participation
+        entry["journey_step"] = journey_step
+        return {}
+
+    def save(self):
+        return record_progress_batch(self.validated_data["entries"])
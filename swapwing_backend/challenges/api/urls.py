@@ -1,6 +1,8 @@
+from django.conf import settings
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
+from challenges.api.async_views import challenge_detail
 from challenges.api.views import ChallengeViewSet
 
 app_name = "challenges"
@@ -11,3 +13,6 @@ router.register(r"", ChallengeViewSet, basename="challenge")
 urlpatterns = [
     path("", include(router.urls)),
 ]
+
+if settings.API_ASYNC_READ_VIEWS:
+    urlpatterns = [path("<uuid:pk>/", challenge_detail)] + urlpatterns
@@ -2,11 +2,9 @@
 
 from __future__ import annotations
 
-from typing import List, Sequence
+from typing import Sequence
 
-from asgiref.sync import async_to_sync
-from channels.layers import get_channel_layer
-from django.db.models import Count, QuerySet
+from django.db.models import QuerySet
 from drf_spectacular.utils import (
     OpenApiParameter,
     OpenApiResponse,
@@ -18,7 +16,7 @@ from drf_spectacular.utils import (
 from rest_framework import mixins, serializers, status, viewsets
 from rest_framework.authentication import TokenAuthentication
 from rest_framework.decorators import action
-from rest_framework.exceptions import ValidationError
+from rest_framework.exceptions import NotAuthenticated, ValidationError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
@@ -27,12 +25,21 @@ from challenges.api.serializers import (
     ChallengeEnrollRequestSerializer,
     ChallengeLeaderboardEntrySerializer,
     ChallengeParticipationSerializer,
+    ChallengeProgressBatchSerializer,
     ChallengeProgressSerializer,
     ChallengeSummarySerializer,
-    _avatar_url_for,
-    _display_name_for,
+    leaderboard_entries,
+)
+from challenges.leaderboard import (
+    DEFAULT_NEIGHBOR_RADIUS,
+    DEFAULT_TOP_SIZE,
+    leaderboard_for,
 )
 from challenges.models import Challenge, ChallengeParticipation, ChallengeStatus
+from mysite import response_cache
+from mysite.response_cache import cached_response
+
+MAX_LEADERBOARD_PAGE_SIZE = 100
 
 
 @extend_schema_view(
@@ -69,11 +76,12 @@ class ChallengeViewSet(mixins.ListModelMixin, mixins.RetrieveModelMixin, viewset
     serializer_class = ChallengeSummarySerializer
     queryset = Challenge.objects.all()
     authentication_classes = [TokenAuthentication]
+    cursor_ordering_fields = {"start_at": ("start_at", "-title", "-id")}
+    cursor_default_ordering = "-start_at"
 
     def get_queryset(self) -> QuerySet:
         base = (
             Challenge.objects.all()
-            .annotate(participant_count=Count("participations", distinct=True))
             .prefetch_related("milestones", "prizes")
             .order_by("-start_at", "title")
         )
@@ -120,51 +128,24 @@ class ChallengeViewSet(mixins.ListModelMixin, mixins.RetrieveModelMixin, viewset
         context["enrolled_challenge_ids"] = {str(value) for value in enrolled_ids}
         return context
 
-    def _all_participations(self, challenge: Challenge) -> List[ChallengeParticipation]:
-        return list(
-            challenge.participations.select_related("user", "journey")
-            .order_by("-total_trade_delta", "joined_at")
-        )
-
     def _leaderboard_for(self, challenge: Challenge):
-        participations = self._all_participations(challenge)
-        leaderboard = []
+        leaderboard = leaderboard_for(challenge)
+        entries = leaderboard_entries(leaderboard.top(DEFAULT_TOP_SIZE))
+
         current_participation = None
-        for idx, participation in enumerate(participations, start=1):
-            if idx <= 20:
-                leaderboard.append(
-                    {
-                        "participant_id": participation.id,
-                        "user_id": participation.user_id,
-                        "display_name": _display_name_for(participation.user),
-                        "avatar_url": _avatar_url_for(participation.user),
-                        "total_trade_delta": participation.total_trade_delta,
-                        "rank": idx,
-                        "journey_id": participation.journey_id,
-                        "trades_completed": participation.trades_completed,
-                        "last_progress_at": participation.last_progress_at,
-                    }
-                )
-            if (
-                self.request.user.is_authenticated
-                and participation.user_id == self.request.user.id
-            ):
+        if self.request.user.is_authenticated:
+            participation = ChallengeParticipation.objects.filter(
+                challenge=challenge, user=self.request.user
+            ).first()
+            if participation:
                 current_participation = {
                     "participant_id": participation.id,
-                    "rank": idx,
+                    "rank": leaderboard.rank_of(participation),
                     "total_trade_delta": participation.total_trade_delta,
                 }
-        return leaderboard, current_participation
-
-    def _broadcast_leaderboard(self, challenge: Challenge, payload: dict):
-        channel_layer = get_channel_layer()
-        if not channel_layer:
-            return
-        async_to_sync(channel_layer.group_send)(
-            f"challenge_{challenge.id}",
-            {"type": "leaderboard.update", "payload": payload},
-        )
+        return entries, current_participation
 
+    @cached_response(response_cache.CHALLENGES, vary_on_user=True)
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
 
@@ -178,6 +159,7 @@ class ChallengeViewSet(mixins.ListModelMixin, mixins.RetrieveModelMixin, viewset
         serializer = self.get_serializer(queryset, many=True, context=context)
         return Response(serializer.data)
 
+    @cached_response(response_cache.CHALLENGES, vary_on_user=True)
     def retrieve(self, request, *args, **kwargs):
         challenge = self.get_object()
         leaderboard, current = self._leaderboard_for(challenge)
@@ -193,13 +175,8 @@ class ChallengeViewSet(mixins.ListModelMixin, mixins.RetrieveModelMixin, viewset
         )
         return Response(serializer.data)
 
-    def _rank_for_participation(
-        self, challenge: Challenge, participation: ChallengeParticipation
-    ) -> int:
-        for idx, record in enumerate(self._all_participations(challenge), start=1):
-            if record.id == participation.id:
-                return idx
-        return 0
+    def _rank_for_participation(self, challenge, participation: ChallengeParticipation) -> int:
+        return leaderboard_for(challenge).rank_of(participation)
 
     @extend_schema(
         summary="Enroll in a challenge",
@@ -289,17 +266,6 @@ class ChallengeViewSet(mixins.ListModelMixin, mixins.RetrieveModelMixin, viewset
         participation = progress.participation
         rank = self._rank_for_participation(challenge, participation)
 
-        payload = {
-            "challenge_id": str(challenge.id),
-            "participant_id": str(participation.id),
-            "rank": rank,
-            "total_trade_delta": str(participation.total_trade_delta),
-            "updated_at": participation.last_progress_at.isoformat()
-            if participation.last_progress_at
-            else None,
-        }
-        self._broadcast_leaderboard(challenge, payload)
-
         return Response(
             {
                 "progress_id": str(progress.id),
@@ -308,3 +274,145 @@ class ChallengeViewSet(mixins.ListModelMixin, mixins.RetrieveModelMixin, viewset
             },
             status=status.HTTP_202_ACCEPTED,
         )
+
+    @extend_schema(
+        summary="Submit a batch of challenge progress",
+        description="Accept up to 100 progress entries across the trader's challenges in one "
+        "request, e.g. trades synced after being offline. The batch is validated and stored "
+        "atomically: if any entry is invalid nothing is saved and `entries` holds one error "
+        "object per entry.",
+        request=ChallengeProgressBatchSerializer,
+        responses={
+            status.HTTP_202_ACCEPTED: inline_serializer(
+                name="ChallengeProgressBatchResponse",
+                fields={
+                    "accepted": serializers.IntegerField(),
+                    "results": inline_serializer(
+                        name="ChallengeProgressBatchResult",
+                        fields={
+                            "challenge_id": serializers.UUIDField(),
+                            "participant_id": serializers.UUIDField(),
+                            "progress_ids": serializers.ListField(child=serializers.UUIDField()),
+                            "rank": serializers.IntegerField(),
+                            "total_trade_delta": serializers.CharField(),
+                        },
+                        many=True,
+                    ),
+                },
+            )
+        },
+        tags=["Challenges"],
+    )
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="progress/batch",
+        url_name="progress-batch",
+        permission_classes=[IsAuthenticated],
+    )
+    def progress_batch(self, request, *args, **kwargs):
+        serializer = ChallengeProgressBatchSerializer(
+            data=request.data, context={"request": request}
+        )
+        serializer.is_valid(raise_exception=True)
+        recorded = serializer.save()
+
+        results = []
+        for participation, progress in recorded.items():
+            challenge_id = participation.challenge_id
+            rank = self._rank_for_participation(challenge_id, participation)
+            results.append(
+                {
+                    "challenge_id": str(challenge_id),
+                    "participant_id": str(participation.id),
+                    "progress_ids": [str(row.id) for row in progress],
+                    "rank": rank,
+                    "total_trade_delta": str(participation.total_trade_delta),
+                }
+            )
+
+        return Response(
+            {"accepted": sum(len(progress) for progress in recorded.values()), "results": results},
+            status=status.HTTP_202_ACCEPTED,
+        )
+
+    @extend_schema(
+        summary="Page through a challenge leaderboard",
+        description="Return a page of standings, or the window of traders ranked around the "
+        "authenticated trader when `around=me` is supplied.",
+        parameters=[
+            OpenApiParameter(
+                name="offset",
+                type=OpenApiTypes.INT,
+                location=OpenApiParameter.QUERY,
+                description="Zero-based rank offset for the page (defaults to 0).",
+            ),
+            OpenApiParameter(
+                name="limit",
+                type=OpenApiTypes.INT,
+                location=OpenApiParameter.QUERY,
+                description=f"Number of standings to return (defaults to {DEFAULT_TOP_SIZE}, "
+                f"max {MAX_LEADERBOARD_PAGE_SIZE}).",
+            ),
+            OpenApiParameter(
+                name="around",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                description="Use `me` to return the neighbors around the authenticated trader.",
+            ),
+            OpenApiParameter(
+                name="radius",
+                type=OpenApiTypes.INT,
+                location=OpenApiParameter.QUERY,
+                description=f"Neighbors on each side when `around=me` (defaults to {DEFAULT_NEIGHBOR_RADIUS}).",
+            ),
+        ],
+        responses={
+            status.HTTP_200_OK: inline_serializer(
+                name="ChallengeLeaderboardPage",
+                fields={
+                    "count": serializers.IntegerField(),
+                    "results": ChallengeLeaderboardEntrySerializer(many=True),
+                },
+            )
+        },
+        tags=["Challenges"],
+    )
+    @action(detail=True, methods=["get"])
+    def leaderboard(self, request, *args, **kwargs):
+        challenge = self.get_object()
+        leaderboard = leaderboard_for(challenge)
+        params = request.query_params
+
+        def _int_param(name: str, default: int, maximum: int) -> int:
+            try:
+                value = int(params.get(name, default))
+            except (TypeError, ValueError) as exc:
+                raise ValidationError({name: "Enter a valid integer."}) from exc
+            return min(max(value, 0), maximum)
+
+        if params.get("around") == "me":
+            if not request.user.is_authenticated:
+                raise NotAuthenticated()
+            participation = ChallengeParticipation.objects.filter(
+                challenge=challenge, user=request.user
+            ).first()
+            if not participation:
+                return Response(
+                    {"detail": "You are not enrolled in this challenge."},
+                    status=status.HTTP_404_NOT_FOUND,
+                )
+            radius = _int_param("radius", DEFAULT_NEIGHBOR_RADIUS, MAX_LEADERBOARD_PAGE_SIZE // 2)
+            standings = leaderboard.around(participation, radius=radius)
+        else:
+            offset = _int_param("offset", 0, leaderboard.count())
+            limit = _int_param("limit", DEFAULT_TOP_SIZE, MAX_LEADERBOARD_PAGE_SIZE)
+            standings = leaderboard.top(limit, offset=offset)
+
+        entries = leaderboard_entries(standings)
+        return Response(
+            {
+                "count": leaderboard.count(),
+                "results": ChallengeLeaderboardEntrySerializer(entries, many=True).data,
+            }
+        )
@@ -0,0 +1,217 @@
+"""Coalescing, rate-limited leaderboard broadcasts.
+
+Progress writes no longer talk to the channel layer. They call
+``schedule_leaderboard_broadcast`` which, at most once per
+``CHALLENGE_BROADCAST_INTERVAL_MS`` per challenge, enqueues the
+``flush_leaderboard_broadcast`` Celery task with that delay. Every change
+made while the flush is pending is folded into the same frame.
+
+The flush compares the current top-K with the last published top-K (kept in
+the default cache alongside a sequence number; the cache must be shared, see
+``CACHE_BACKEND``, because the flush runs in Celery while snapshots are
+served by the web process) and sends one ``leaderboard.delta``
+frame holding only the entries that moved, entered, or left. Sequence numbers
+increase by one per frame, so a client that sees a gap knows it missed a
+frame and should ask for a fresh snapshot.
+
+When a frame puts a different participant in first place, everyone enrolled
+in the challenge is notified through the ``challenge_participants``
+notification fan-out; the interval above bounds how often that can happen.
+
+Snapshots for newly connected clients are served from that same cached
+top-K, so a reconnect storm costs one cache read per client plus a single
+indexed lookup for the caller's own rank.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, Optional
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from challenges.api.serializers import ChallengeLeaderboardEntrySerializer, leaderboard_entries
+from challenges.leaderboard import leaderboard_for
+from challenges.models import ChallengeParticipation
+
+
+def group_name_for(challenge_id) -> str:
+    return f"challenge_{challenge_id}"
+
+
+def broadcast_interval() -> float:
+    """Minimum seconds between two frames for the same challenge."""
+
+    return getattr(settings, "CHALLENGE_BROADCAST_INTERVAL_MS", 500) / 1000
+
+
+def broadcast_top_size() -> int:
+    return getattr(settings, "CHALLENGE_BROADCAST_TOP_SIZE", 20)
+
+
+def _scheduled_key(challenge_id) -> str:
+    return f"lb:broadcast:scheduled:{challenge_id}"
+
+
+def _lock_key(challenge_id) -> str:
+    return f"lb:broadcast:lock:{challenge_id}"
+
+
+def _snapshot_key(challenge_id) -> str:
+    return f"lb:broadcast:snapshot:{challenge_id}"
+
+
+def published_snapshot(challenge_id) -> Optional[dict]:
+    """Return the last published ``{"seq", "entries"}`` top-K, if any."""
+
+    return cache.get(_snapshot_key(challenge_id))
+
+
+def forget_challenge(challenge_id) -> None:
+    cache.delete_many([_snapshot_key(challenge_id), _scheduled_key(challenge_id)])
+
+
+def schedule_leaderboard_broadcast(challenge_id) -> None:
+    """Queue a delta frame for the challenge once the current transaction commits."""
+
+    transaction.on_commit(lambda: _enqueue(challenge_id))
+
+
+def _enqueue(challenge_id) -> None:
+    from challenges.tasks import flush_leaderboard_broadcast
+
+    interval = broadcast_interval()
+    # A pending flush already covers this change; the key expires as a
+    # safety net in case the worker running it dies.
+    if not cache.add(_scheduled_key(challenge_id), 1, timeout=max(int(interval * 10), 10)):
+        return
+    flush_leaderboard_broadcast.apply_async(args=[str(challenge_id)], countdown=interval)
+
+
+def _entry_state(entry: dict) -> tuple:
+    return entry["rank"], entry["total_trade_delta"], entry["trades_completed"]
+
+
+def diff_top(previous: List[dict], current: List[dict]) -> Dict[str, list]:
+    """Compare two serialized top-K lists keyed by participant."""
+
+    before = {entry["participant_id"]: entry for entry in previous}
+    after = {entry["participant_id"]: entry for entry in current}
+    changed = [
+        entry
+        for participant_id, entry in after.items()
+        if participant_id not in before or _entry_state(before[participant_id]) != _entry_state(entry)
+    ]
+    removed = [participant_id for participant_id in before if participant_id not in after]
+    return {"changed": changed, "removed": removed}
+
+
+def current_top(challenge_id) -> List[dict]:
+    standings = leaderboard_for(challenge_id).top(broadcast_top_size())
+    return [
+        dict(entry)
+        for entry in ChallengeLeaderboardEntrySerializer(leaderboard_entries(standings), many=True).data
+    ]
+
+
+def notify_leader_change(challenge_id, leader: dict) -> None:
+    from notifications.fanout import queue_fan_out
+
+    queue_fan_out(
+        "challenge_participants",
+        challenge_id,
+        subject="The challenge has a new leader",
+        body=f"{leader['display_name']} moved into first place.",
+        data={"challenge_id": str(challenge_id), "participant_id": str(leader["participant_id"])},
+    )
+
+
+def flush_challenge(challenge_id) -> Optional[dict]:
+    """Publish one merged delta frame for the challenge.
+
+    Returns the frame sent, or ``None`` when the top-K did not change or
+    another worker is flushing the same challenge.
+    """
+
+    challenge_id = str(challenge_id)
+    # Clear the schedule marker first so changes made during this flush
+    # queue the next frame instead of being dropped.
+    cache.delete(_scheduled_key(challenge_id))
+    if not cache.add(_lock_key(challenge_id), 1, timeout=30):
+        _enqueue(challenge_id)
+        return None
+    try:
+        snapshot = published_snapshot(challenge_id) or {"seq": 0, "entries": []}
+        entries = current_top(challenge_id)
+        diff = diff_top(snapshot["entries"], entries)
+        if not diff["changed"] and not diff["removed"]:
+            return None
+
+        seq = snapshot["seq"] + 1
+        cache.set(_snapshot_key(challenge_id), {"seq": seq, "entries": entries}, timeout=None)
+        if snapshot["entries"] and entries and entries[0]["participant_id"] != snapshot["entries"][0]["participant_id"]:
+            notify_leader_change(challenge_id, entries[0])
+        frame = {
+            "type": "delta",
+            "challenge_id": challenge_id,
+            "seq": seq,
+            "changed": diff["changed"],
+            "removed": diff["removed"],
+        }
+        channel_layer = get_channel_layer()
+        if channel_layer:
+            async_to_sync(channel_layer.group_send)(
+                group_name_for(challenge_id),
+                {"type": "leaderboard.delta", "payload": frame},
+            )
+        return frame
+    finally:
+        cache.delete(_lock_key(challenge_id))
+
+
+def leaderboard_snapshot(challenge_id) -> dict:
+    """Return the published top-K, publishing one at sequence 0 if none exists."""
+
+    snapshot = published_snapshot(challenge_id)
+    if snapshot is None:
+        # add() rather than set(): a flush that published meanwhile wins.
+        cache.add(
+            _snapshot_key(challenge_id),
+            {"seq": 0, "entries": current_top(challenge_id)},
+            timeout=None,
+        )
+        snapshot = published_snapshot(challenge_id)
+    return snapshot
+
+
+def own_standing(challenge_id, user) -> Optional[dict]:
+    if user is None or not user.is_authenticated:
+        return None
+    participation = (
+        ChallengeParticipation.objects.filter(challenge_id=challenge_id, user=user)
+        .only("id", "joined_at", "total_trade_delta")
+        .first()
+    )
+    if participation is None:
+        return None
+    return {
+        "participant_id": str(participation.id),
+        "rank": leaderboard_for(challenge_id).rank_of(participation),
+        "total_trade_delta": str(participation.total_trade_delta),
+    }
+
+
+def snapshot_frame(challenge_id, user=None) -> dict:
+    """Build the ``snapshot`` frame sent on connect and on ``resync``."""
+
+    snapshot = leaderboard_snapshot(challenge_id)
+    return {
+        "type": "snapshot",
+        "challenge_id": str(challenge_id),
+        "seq": snapshot["seq"],
+        "entries": snapshot["entries"],
+        "me": own_standing(challenge_id, user),
+    }
@@ -2,28 +2,51 @@
 
 from __future__ import annotations
 
-from asgiref.sync import sync_to_async
+from channels.db import database_sync_to_async
 from channels.generic.websocket import AsyncJsonWebsocketConsumer
 
+from challenges.broadcaster import group_name_for, snapshot_frame
 from challenges.models import Challenge
 
 
 class ChallengeLeaderboardConsumer(AsyncJsonWebsocketConsumer):
+    """Send a leaderboard snapshot on connect, then sequenced delta frames.
+
+    The snapshot carries the top-K, the caller's own standing (``me``) and the
+    sequence number it reflects. Clients drop deltas with ``seq`` at or below
+    the snapshot's and send ``{"type": "resync"}`` for a fresh snapshot when
+    they spot a gap.
+    """
+
     group_name: str
+    challenge_id: str
 
     async def connect(self):
         challenge_id = self.scope["url_route"]["kwargs"].get("challenge_id")
-        exists = await sync_to_async(Challenge.objects.filter(id=challenge_id).exists)()
+        exists = await database_sync_to_async(Challenge.objects.filter(id=challenge_id).exists)()
         if not exists:
             await self.close(code=4404)
             return
-        self.group_name = f"challenge_{challenge_id}"
+        self.challenge_id = str(challenge_id)
+        self.group_name = group_name_for(challenge_id)
+        # Join before reading the snapshot so no delta can fall in between.
         await self.channel_layer.group_add(self.group_name, self.channel_name)
         await self.accept()
+        await self.send_snapshot()
 
     async def disconnect(self, code):
         if hasattr(self, "group_name"):
             await self.channel_layer.group_discard(self.group_name, self.channel_name)
 
-    async def leaderboard_update(self, event):
+    async def receive_json(self, content, **kwargs):
+        if isinstance(content, dict) and content.get("type") == "resync":
+            await self.send_snapshot()
+            return
+        await self.send_json({"type": "error", "detail": "Unsupported message type."})
+
+    async def send_snapshot(self):
+        frame = await database_sync_to_async(snapshot_frame)(self.challenge_id, self.scope.get("user"))
+        await self.send_json(frame)
+
+    async def leaderboard_delta(self, event):
         await self.send_json(event.get("payload", {}))
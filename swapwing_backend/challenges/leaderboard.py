@@ -0,0 +1,353 @@
+"""Sorted-set leaderboard engine for challenge standings.
+
+Standings are kept in a per-challenge sorted set so rank lookups, top-K pages
+and "neighbors around me" windows no longer require loading every
+``ChallengeParticipation`` row. Two interchangeable backends are provided:
+
+* ``redis`` (default) – a Redis ZSET per challenge, shared by every worker.
+* ``memory`` – in-process sorted sets for the test suite (see
+  ``mysite.backends``).
+
+Ordering mirrors ``ChallengeParticipation.Meta.ordering``: highest
+``total_trade_delta`` first, ties broken by the earliest ``joined_at``. The
+score stores the negated total in cents so ascending set order equals
+leaderboard order, and the member string is prefixed with the zero-padded
+join timestamp so equal scores fall back to join order lexicographically.
+"""
+
+from __future__ import annotations
+
+import threading
+from bisect import bisect_left, insort
+from dataclasses import dataclass
+from datetime import datetime, timezone as dt_timezone
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from django.conf import settings
+
+from mysite.backends import MEMORY, REDIS, BackendRegistry
+
+DEFAULT_TOP_SIZE = 20
+DEFAULT_NEIGHBOR_RADIUS = 2
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+
+@dataclass(frozen=True)
+class LeaderboardStanding:
+    """A participation's position on a challenge leaderboard."""
+
+    participant_id: str
+    rank: int
+    total_trade_delta: Decimal
+
+
+def member_for(participant_id, joined_at: Optional[datetime]) -> str:
+    """Encode a participation as a sorted-set member with join-order tiebreak."""
+
+    if joined_at is None:
+        micros = 0
+    else:
+        delta = joined_at - _EPOCH
+        micros = (delta.days * 86_400 + delta.seconds) * 1_000_000 + delta.microseconds
+    return f"{micros:017d}:{participant_id}"
+
+
+def participant_id_from_member(member: str) -> str:
+    return member.split(":", 1)[1]
+
+
+def score_for(total_trade_delta) -> float:
+    """Convert a decimal total into an ascending sorted-set score."""
+
+    cents = int((Decimal(total_trade_delta or 0) * 100).to_integral_value())
+    return float(-cents)
+
+
+def total_from_score(score: float) -> Decimal:
+    return (Decimal(int(-score)) / 100).quantize(Decimal("0.01"))
+
+
+class MemoryLeaderboardBackend:
+    """In-process sorted sets used when Redis is not configured.
+
+    Each challenge keeps a list of ``(score, member)`` tuples in sorted order,
+    so rank lookups are a binary search. State is local to the process, which
+    is fine for development and tests but not for multi-worker deployments.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[str, List[Tuple[float, str]]] = {}
+        self._scores: Dict[str, Dict[str, float]] = {}
+
+    def is_loaded(self, key: str) -> bool:
+        return key in self._entries
+
+    def load(self, key: str, members: Iterable[Tuple[str, float]]) -> None:
+        scores = {member: score for member, score in members}
+        entries = sorted((score, member) for member, score in scores.items())
+        with self._lock:
+            self._entries[key] = entries
+            self._scores[key] = scores
+
+    def upsert(self, key: str, member: str, score: float) -> None:
+        with self._lock:
+            if key not in self._entries:
+                return
+            entries = self._entries[key]
+            scores = self._scores[key]
+            previous = scores.get(member)
+            if previous is not None:
+                del entries[bisect_left(entries, (previous, member))]
+            insort(entries, (score, member))
+            scores[member] = score
+
+    def remove(self, key: str, member: str) -> None:
+        with self._lock:
+            scores = self._scores.get(key)
+            if scores is None or member not in scores:
+                return
+            entries = self._entries[key]
+            del entries[bisect_left(entries, (scores.pop(member), member))]
+
+    def rank(self, key: str, member: str) -> Optional[int]:
+        with self._lock:
+            scores = self._scores.get(key, {})
+            score = scores.get(member)
+            if score is None:
+                return None
+            return bisect_left(self._entries[key], (score, member))
+
+    def range(self, key: str, start: int, stop: int) -> List[Tuple[str, float]]:
+        with self._lock:
+            entries = self._entries.get(key, [])
+            if stop < 0:
+                stop += len(entries)
+            window = entries[start : stop + 1]
+        return [(member, score) for score, member in window]
+
+    def count(self, key: str) -> int:
+        return len(self._entries.get(key, []))
+
+    def clear(self, key: Optional[str] = None) -> None:
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+                self._scores.clear()
+            else:
+                self._entries.pop(key, None)
+                self._scores.pop(key, None)
+
+
+class RedisLeaderboardBackend:
+    """Sorted sets stored as Redis ZSETs shared across web workers.
+
+    A companion ``:loaded`` key marks challenges that have been hydrated from
+    the database so an empty leaderboard is not reloaded on every request.
+    """
+
+    # Checking ``:loaded`` and adding in one script keeps an upsert from
+    # interleaving with a concurrent ``load``.
+    UPSERT_IF_LOADED = """
+    if redis.call('EXISTS', KEYS[2]) == 1 then
+        return redis.call('ZADD', KEYS[1], ARGV[1], ARGV[2])
+    end
+    return 0
+    """
+
+    def __init__(self, url: Optional[str] = None, client=None):
+        if client is None:
+            import redis
+
+            client = redis.Redis.from_url(url or settings.REDIS_URL, decode_responses=True)
+        self.client = client
+        self._upsert_if_loaded = client.register_script(self.UPSERT_IF_LOADED)
+
+    @staticmethod
+    def _loaded_key(key: str) -> str:
+        return f"{key}:loaded"
+
+    def is_loaded(self, key: str) -> bool:
+        return bool(self.client.exists(self._loaded_key(key)))
+
+    def load(self, key: str, members: Iterable[Tuple[str, float]]) -> None:
+        mapping = {member: score for member, score in members}
+        pipe = self.client.pipeline(transaction=True)
+        pipe.delete(key)
+        if mapping:
+            pipe.zadd(key, mapping)
+        pipe.set(self._loaded_key(key), 1)
+        pipe.execute()
+
+    def upsert(self, key: str, member: str, score: float) -> None:
+        self._upsert_if_loaded(keys=[key, self._loaded_key(key)], args=[score, member])
+
+    def remove(self, key: str, member: str) -> None:
+        self.client.zrem(key, member)
+
+    def rank(self, key: str, member: str) -> Optional[int]:
+        return self.client.zrank(key, member)
+
+    def range(self, key: str, start: int, stop: int) -> List[Tuple[str, float]]:
+        return [
+            (member, float(score))
+            for member, score in self.client.zrange(key, start, stop, withscores=True)
+        ]
+
+    def count(self, key: str) -> int:
+        return self.client.zcard(key)
+
+    def clear(self, key: Optional[str] = None) -> None:
+        if key is None:
+            prefix = getattr(settings, "CHALLENGE_LEADERBOARD_KEY_PREFIX", "swapwing:leaderboard")
+            keys = list(self.client.scan_iter(match=f"{prefix}:*"))
+            if keys:
+                self.client.delete(*keys)
+            return
+        self.client.delete(key, self._loaded_key(key))
+
+
+_backends = BackendRegistry(
+    "CHALLENGE_LEADERBOARD_BACKEND",
+    {MEMORY: MemoryLeaderboardBackend, REDIS: RedisLeaderboardBackend},
+    label="challenge leaderboard backend",
+)
+get_leaderboard_backend = _backends.get
+reset_leaderboard_backend = _backends.reset
+
+
+class ChallengeLeaderboard:
+    """Leaderboard queries and updates for a single challenge.
+
+    The sorted set is hydrated from the database the first time a challenge is
+    read; after that it is maintained incrementally by the participation
+    ``post_save``/``post_delete`` receivers in ``challenges.models``.
+    """
+
+    def __init__(self, challenge_id, backend=None):
+        self.challenge_id = str(challenge_id)
+        self.backend = backend or get_leaderboard_backend()
+        prefix = getattr(settings, "CHALLENGE_LEADERBOARD_KEY_PREFIX", "swapwing:leaderboard")
+        self.key = f"{prefix}:{self.challenge_id}"
+
+    # -- maintenance -------------------------------------------------------------
+    def _database_members(self) -> List[Tuple[str, float]]:
+        from challenges.models import ChallengeParticipation
+
+        rows = ChallengeParticipation.objects.filter(
+            challenge_id=self.challenge_id
+        ).values_list("id", "joined_at", "total_trade_delta")
+        return [
+            (member_for(participant_id, joined_at), score_for(total))
+            for participant_id, joined_at, total in rows.iterator()
+        ]
+
+    def ensure_loaded(self) -> None:
+        if not self.backend.is_loaded(self.key):
+            self.backend.load(self.key, self._database_members())
+
+    def rebuild(self) -> int:
+        """Replace the sorted set with the current database state.
+
+        Returns the number of members whose presence or score differed from the
+        database before the rebuild.
+        """
+
+        expected = dict(self._database_members())
+        drift = 0
+        if self.backend.is_loaded(self.key):
+            current = dict(self.backend.range(self.key, 0, -1))
+            drift = sum(
+                1
+                for member in expected.keys() | current.keys()
+                if expected.get(member) != current.get(member)
+            )
+        self.backend.load(self.key, expected.items())
+        return drift
+
+    def record(self, participation) -> None:
+        self.backend.upsert(
+            self.key,
+            member_for(participation.id, participation.joined_at),
+            score_for(participation.total_trade_delta),
+        )
+
+    def discard(self, participation) -> None:
+        self.backend.remove(self.key, member_for(participation.id, participation.joined_at))
+
+    def clear(self) -> None:
+        self.backend.clear(self.key)
+
+    # -- queries -----------------------------------------------------------------
+    def count(self) -> int:
+        self.ensure_loaded()
+        return self.backend.count(self.key)
+
+    def rank_of(self, participation) -> int:
+        """Return the 1-based rank for a participation, or 0 when absent."""
+
+        self.ensure_loaded()
+        index = self.backend.rank(
+            self.key, member_for(participation.id, participation.joined_at)
+        )
+        return 0 if index is None else index + 1
+
+    def _standings(self, start: int, stop: int) -> List[LeaderboardStanding]:
+        if stop < start:
+            return []
+        return [
+            LeaderboardStanding(
+                participant_id=participant_id_from_member(member),
+                rank=start + offset + 1,
+                total_trade_delta=total_from_score(score),
+            )
+            for offset, (member, score) in enumerate(
+                self.backend.range(self.key, start, stop)
+            )
+        ]
+
+    def top(self, limit: int = DEFAULT_TOP_SIZE, offset: int = 0) -> List[LeaderboardStanding]:
+        self.ensure_loaded()
+        return self._standings(max(offset, 0), max(offset, 0) + limit - 1)
+
+    def around(
+        self, participation, radius: int = DEFAULT_NEIGHBOR_RADIUS
+    ) -> List[LeaderboardStanding]:
+        """Return the window of standings centred on a participation."""
+
+        rank = self.rank_of(participation)
+        if not rank:
+            return []
+        index = rank - 1
+        return self._standings(max(index - radius, 0), index + radius)
+
+
+def leaderboard_for(challenge) -> ChallengeLeaderboard:
+    challenge_id = getattr(challenge, "pk", challenge)
+    return ChallengeLeaderboard(challenge_id)
+
+
+def _pair_standings(standings: Sequence[LeaderboardStanding], rows: Dict[str, object]) -> List[tuple]:
+    return [
+        (standing, rows[standing.participant_id])
+        for standing in standings
+        if standing.participant_id in rows
+    ]
+
+
+def hydrate_standings(standings: Sequence[LeaderboardStanding], queryset) -> List[tuple]:
+    """Pair standings with participation rows fetched in a single query."""
+
+    ids = [standing.participant_id for standing in standings]
+    rows = {str(row.id): row for row in queryset.filter(id__in=ids)}
+    return _pair_standings(standings, rows)
+
+
+async def ahydrate_standings(standings: Sequence[LeaderboardStanding], queryset) -> List[tuple]:
+    """``hydrate_standings`` using the async ORM."""
+
+    ids = [standing.participant_id for standing in standings]
+    rows = {str(row.id): row async for row in queryset.filter(id__in=ids)}
+    return _pair_standings(standings, rows)
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from challenges.leaderboard import leaderboard_for
+from challenges.models import Challenge
+
+
+class Command(BaseCommand):
+    help = "Reconcile challenge leaderboards against ChallengeParticipation rows."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--challenge",
+            action="append",
+            dest="challenge_ids",
+            help="Only rebuild the given challenge id (repeatable).",
+        )
+
+    def handle(self, *args, **options):
+        challenges = Challenge.objects.order_by("start_at", "title")
+        challenge_ids = options.get("challenge_ids")
+        if challenge_ids:
+            challenges = challenges.filter(id__in=challenge_ids)
+            if not challenges.exists():
+                raise CommandError("No challenges matched the given ids.")
+
+        total_drift = 0
+        for challenge in challenges.iterator():
+            leaderboard = leaderboard_for(challenge)
+            drift = leaderboard.rebuild()
+            total_drift += drift
+            self.stdout.write(
+                f"{challenge.title}: {leaderboard.count()} participants, {drift} corrected"
+            )
+
+        self.stdout.write(self.style.SUCCESS(f"Leaderboards rebuilt ({total_drift} entries corrected)."))
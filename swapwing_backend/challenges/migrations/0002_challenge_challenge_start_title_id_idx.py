@@ -0,0 +1,17 @@
+# Generated by Django 4.2 on 2026-10-17 03:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('challenges', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='challenge',
+            index=models.Index(fields=['-start_at', 'title', 'id'], name='challenge_start_title_id_idx'),
+        ),
+    ]
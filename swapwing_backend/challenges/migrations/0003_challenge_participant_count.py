@@ -0,0 +1,30 @@
+# Generated by Django 4.2 on 2026-10-17 04:08
+
+from django.db import migrations, models
+
+from mysite.counters import reconcile_counter
+
+
+def backfill_participant_count(apps, schema_editor):
+    reconcile_counter(
+        apps.get_model("challenges", "Challenge"),
+        "participant_count",
+        apps.get_model("challenges", "ChallengeParticipation"),
+        "challenge",
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('challenges', '0002_challenge_challenge_start_title_id_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='challenge',
+            name='participant_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_participant_count, migrations.RunPython.noop),
+    ]
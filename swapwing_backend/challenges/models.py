@@ -2,15 +2,19 @@
 
 from __future__ import annotations
 
+import copy
 import uuid
 from decimal import Decimal
 
 from django.conf import settings
 from django.core.validators import MinValueValidator
-from django.db import models
+from django.db import models, transaction
 from django.db.models import Q
+from django.db.models.signals import post_delete, post_save
 
 from journeys.models import Journey, JourneyStep
+from mysite.counters import adjust_counter
+from mysite.response_cache import CHALLENGES, invalidate_on_change
 
 
 class ChallengeStatus(models.TextChoices):
@@ -48,6 +52,7 @@ class Challenge(models.Model):
     )
     start_at = models.DateTimeField(null=True, blank=True)
     end_at = models.DateTimeField(null=True, blank=True)
+    participant_count = models.PositiveIntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -57,6 +62,10 @@ class Challenge(models.Model):
             models.Index(fields=["status"]),
             models.Index(fields=["category"]),
             models.Index(fields=["start_at"]),
+            models.Index(
+                fields=["-start_at", "title", "id"],
+                name="challenge_start_title_id_idx",
+            ),
         ]
 
     def __str__(self) -> str:  # pragma: no cover - debug helper
@@ -196,3 +205,58 @@ class ChallengeProgress(models.Model):
 
     def __str__(self) -> str:  # pragma: no cover - debug helper
         return f"Progress {self.trade_delta_value} for {self.participation_id}"
+
+
+# Keep the sorted-set leaderboard in step with participation writes. The
+# sorted set lives outside the database, so it is only touched once the
+# write commits; a rolled-back enrollment or delete leaves it alone. The
+# callbacks get a copy because delete() clears the instance's pk afterwards.
+def post_save_participation_leaderboard_receiver(sender, instance, *args, **kwargs):
+    from challenges.broadcaster import schedule_leaderboard_broadcast
+    from challenges.leaderboard import leaderboard_for
+
+    leaderboard = leaderboard_for(instance.challenge_id)
+    participation = copy.copy(instance)
+    transaction.on_commit(lambda: leaderboard.record(participation))
+    schedule_leaderboard_broadcast(instance.challenge_id)
+
+
+def post_delete_participation_leaderboard_receiver(sender, instance, *args, **kwargs):
+    from challenges.broadcaster import schedule_leaderboard_broadcast
+    from challenges.leaderboard import leaderboard_for
+
+    leaderboard = leaderboard_for(instance.challenge_id)
+    participation = copy.copy(instance)
+    transaction.on_commit(lambda: leaderboard.discard(participation))
+    schedule_leaderboard_broadcast(instance.challenge_id)
+
+
+def post_delete_challenge_leaderboard_receiver(sender, instance, *args, **kwargs):
+    from challenges.broadcaster import forget_challenge
+    from challenges.leaderboard import leaderboard_for
+
+    leaderboard_for(instance.pk).clear()
+    forget_challenge(instance.pk)
+
+
+# Keep Challenge.participant_count in step with enrollments
+def post_save_participant_count_receiver(sender, instance, created, *args, **kwargs):
+    if created:
+        adjust_counter(Challenge, instance.challenge_id, "participant_count", 1)
+
+
+def post_delete_participant_count_receiver(sender, instance, *args, **kwargs):
+    adjust_counter(Challenge, instance.challenge_id, "participant_count", -1)
+
+
+post_save.connect(post_save_participation_leaderboard_receiver, sender=ChallengeParticipation)
+post_delete.connect(post_delete_participation_leaderboard_receiver, sender=ChallengeParticipation)
+post_delete.connect(post_delete_challenge_leaderboard_receiver, sender=Challenge)
+post_save.connect(post_save_participant_count_receiver, sender=ChallengeParticipation)
+post_delete.connect(post_delete_participant_count_receiver, sender=ChallengeParticipation)
+
+
+# Orphan cached discovery responses whenever their source rows change
+invalidate_on_change(
+    CHALLENGES, Challenge, ChallengeMilestone, ChallengePrize, ChallengeParticipation
+)
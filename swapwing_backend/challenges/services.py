@@ -0,0 +1,98 @@
+"""Write services for challenge progress."""
+
+from __future__ import annotations
+
+from typing import Dict, List, Sequence
+
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from challenges.leaderboard import leaderboard_for
+from challenges.models import ChallengeParticipation, ChallengeProgress
+from mysite.response_cache import CHALLENGES, invalidate
+
+PARTICIPATION_PROGRESS_FIELDS = [
+    "total_trade_delta",
+    "trades_completed",
+    "last_progress_at",
+    "last_step",
+    "updated_at",
+]
+
+
+@transaction.atomic
+def record_progress_batch(entries: Sequence[dict]) -> Dict[ChallengeParticipation, List[ChallengeProgress]]:
+    """Store validated progress entries and fold them into their participations.
+
+    ``entries`` are dicts carrying ``participation``, ``journey_step``,
+    ``trade_delta_value`` and ``notes`` (as produced by
+    ``ChallengeProgressBatchSerializer``). Every participation touched is
+    locked once, in primary-key order, so concurrent batches cannot lose each
+    other's deltas or deadlock. The progress rows are written with one
+    ``bulk_create`` and the aggregated totals with one ``bulk_update``.
+
+    Returns the refreshed participations mapped to their new progress rows,
+    in the order each participation first appears in ``entries``. Raises
+    ``ValidationError``, shaped like the serializer's per-entry errors, when a
+    participation was deleted after the batch was validated.
+    """
+
+    from challenges.broadcaster import schedule_leaderboard_broadcast
+
+    participation_ids = list(dict.fromkeys(entry["participation"].pk for entry in entries))
+    locked = {
+        participation.pk: participation
+        for participation in ChallengeParticipation.objects.select_for_update()
+        .filter(pk__in=participation_ids)
+        .order_by("pk")
+    }
+    missing = set(participation_ids) - set(locked)
+    if missing:
+        raise ValidationError(
+            {
+                "entries": [
+                    {"challenge_id": ["You must enroll before submitting progress."]}
+                    if entry["participation"].pk in missing
+                    else {}
+                    for entry in entries
+                ]
+            }
+        )
+
+    progress = ChallengeProgress.objects.bulk_create(
+        [
+            ChallengeProgress(
+                participation=locked[entry["participation"].pk],
+                journey_step=entry.get("journey_step"),
+                trade_delta_value=entry["trade_delta_value"],
+                notes=entry.get("notes", ""),
+            )
+            for entry in entries
+        ]
+    )
+
+    now = timezone.now()
+    results: Dict[ChallengeParticipation, List[ChallengeProgress]] = {
+        locked[pk]: [] for pk in participation_ids
+    }
+    for entry, row in zip(entries, progress):
+        participation = locked[entry["participation"].pk]
+        participation.total_trade_delta += row.trade_delta_value
+        if row.journey_step is not None:
+            participation.trades_completed += 1
+            participation.last_step = row.journey_step
+        participation.last_progress_at = now
+        participation.updated_at = now
+        results[participation].append(row)
+
+    ChallengeParticipation.objects.bulk_update(list(results), PARTICIPATION_PROGRESS_FIELDS)
+
+    # bulk_update skips post_save, so mirror the participation receivers here:
+    # the sorted sets are only touched once the batch commits.
+    for participation in results:
+        record = leaderboard_for(participation.challenge_id).record
+        transaction.on_commit(lambda record=record, participation=participation: record(participation))
+        schedule_leaderboard_broadcast(participation.challenge_id)
+    invalidate(CHALLENGES)
+    return results
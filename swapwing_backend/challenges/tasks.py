@@ -0,0 +1,21 @@
+"""Celery tasks for challenge bookkeeping."""
+
+from celery import shared_task
+
+from challenges.broadcaster import flush_challenge
+from challenges.models import Challenge, ChallengeParticipation
+from mysite.counters import reconcile_counter
+
+
+@shared_task
+def reconcile_participant_counts():
+    """Repair ``Challenge.participant_count`` drift; returns rows corrected."""
+
+    return reconcile_counter(Challenge, "participant_count", ChallengeParticipation, "challenge")
+
+
+@shared_task(ignore_result=True)
+def flush_leaderboard_broadcast(challenge_id):
+    """Send the merged leaderboard delta frame queued for a challenge."""
+
+    flush_challenge(challenge_id)
@@ -1,15 +1,26 @@
+import json
 from datetime import timedelta
 from decimal import Decimal
+from io import StringIO
 from types import SimpleNamespace
 from unittest.mock import patch
 
+from asgiref.sync import async_to_sync
+from asgiref.testing import ApplicationCommunicator
 from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core.management import call_command
+from django.db import transaction
 from django.urls import reverse
 from django.utils import timezone
 from rest_framework import status
 from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import ValidationError
 from rest_framework.test import APITestCase
 
+from challenges.broadcaster import flush_challenge, published_snapshot
+from challenges.consumers import ChallengeLeaderboardConsumer
+from challenges.leaderboard import leaderboard_for
 from challenges.models import (
     Challenge,
     ChallengeCategory,
@@ -19,7 +30,10 @@ from challenges.models import (
     ChallengeProgress,
     ChallengeStatus,
 )
+from challenges.services import record_progress_batch
+from challenges.tasks import reconcile_participant_counts
 from journeys.models import Journey, JourneyStep, JourneyVisibility
+from notifications.models import Notification
 
 User = get_user_model()
 
@@ -77,8 +91,8 @@ class ChallengeAPITests(APITestCase):
 
         list_response = self.client.get(self.list_url)
         self.assertEqual(list_response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(list_response.data), 1)
-        summary = list_response.data[0]
+        self.assertEqual(len(list_response.data["results"]), 1)
+        summary = list_response.data["results"][0]
         self.assertEqual(summary["id"], str(self.challenge.id))
         self.assertTrue(summary["is_enrolled"])
         self.assertEqual(summary["participant_count"], 1)
@@ -145,7 +159,8 @@ class ChallengeAPITests(APITestCase):
         async def fake_group_send(*args, **kwargs):
             calls.append((args, kwargs))
 
-        with patch("challenges.api.views.get_channel_layer") as mock_layer:
+        with patch("challenges.broadcaster.get_channel_layer") as mock_layer, \
+                self.captureOnCommitCallbacks(execute=True):
             mock_layer.return_value = SimpleNamespace(group_send=fake_group_send)
             response = self.client.post(
                 self.progress_url,
@@ -166,14 +181,338 @@ class ChallengeAPITests(APITestCase):
         self.assertEqual(len(calls), 1)
         (group_name, message), _ = calls[0]
         self.assertEqual(group_name, f"challenge_{self.challenge.id}")
-        self.assertEqual(message["payload"]["rank"], 1)
+        self.assertEqual(message["type"], "leaderboard.delta")
+        self.assertEqual(message["payload"]["seq"], 1)
+        self.assertEqual(message["payload"]["changed"][0]["participant_id"], str(participation.id))
+        self.assertEqual(message["payload"]["changed"][0]["total_trade_delta"], "45.50")
         self.assertEqual(ChallengeProgress.objects.count(), 1)
 
+    def test_progress_batch_aggregates_entries_per_challenge(self):
+        journey = Journey.objects.create(owner=self.user, title="Offline Trades")
+        participation = ChallengeParticipation.objects.create(
+            challenge=self.challenge, user=self.user, journey=journey
+        )
+        steps = [
+            JourneyStep.objects.create(journey=journey, sequence=idx, notes=f"Trade {idx}")
+            for idx in (1, 2)
+        ]
+        sprint = Challenge.objects.create(title="Weekend Swap Sprint", status=ChallengeStatus.ACTIVE)
+        sprint_participation = ChallengeParticipation.objects.create(challenge=sprint, user=self.user)
+        rival = User.objects.create_user(email="rival@example.com", password="Password123")
+        ChallengeParticipation.objects.create(
+            challenge=self.challenge, user=rival, total_trade_delta=Decimal("50.00")
+        )
+        entries = [
+            {"challenge_id": str(self.challenge.id), "step_id": str(steps[0].id), "trade_delta_value": "20.00"},
+            {"challenge_id": str(sprint.id), "trade_delta_value": "5.00"},
+            {"challenge_id": str(self.challenge.id), "step_id": str(steps[1].id), "trade_delta_value": "40.00"},
+        ]
+
+        calls = []
+
+        async def fake_group_send(*args, **kwargs):
+            calls.append(args)
+
+        url = reverse("challenges:challenge-progress-batch")
+        with patch("challenges.broadcaster.get_channel_layer") as mock_layer, \
+                self.captureOnCommitCallbacks(execute=True):
+            mock_layer.return_value = SimpleNamespace(group_send=fake_group_send)
+            with self.assertNumQueries(10):
+                response = self.client.post(url, {"entries": entries}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED, response.data)
+        self.assertEqual(response.data["accepted"], 3)
+        first = response.data["results"][0]
+        self.assertEqual(first["challenge_id"], str(self.challenge.id))
+        self.assertEqual((first["rank"], first["total_trade_delta"]), (1, "60.00"))
+        self.assertEqual(len(first["progress_ids"]), 2)
+
+        participation.refresh_from_db()
+        self.assertEqual(participation.total_trade_delta, Decimal("60.00"))
+        self.assertEqual(participation.trades_completed, 2)
+        self.assertEqual(participation.last_step, steps[1])
+        sprint_participation.refresh_from_db()
+        self.assertEqual(sprint_participation.total_trade_delta, Decimal("5.00"))
+        self.assertEqual(ChallengeProgress.objects.count(), 3)
+        self.assertEqual(
+            sorted(group for group, _ in calls),
+            sorted([f"challenge_{self.challenge.id}", f"challenge_{sprint.id}"]),
+        )
+
+    def test_rolled_back_progress_batch_leaves_the_leaderboard_alone(self):
+        participation = ChallengeParticipation.objects.create(challenge=self.challenge, user=self.user)
+        rival = User.objects.create_user(email="rival@example.com", password="Password123")
+        ChallengeParticipation.objects.create(
+            challenge=self.challenge, user=rival, total_trade_delta=Decimal("50.00")
+        )
+        leaderboard = leaderboard_for(self.challenge)
+        self.assertEqual(leaderboard.rank_of(participation), 2)
+
+        entries = [{"participation": participation, "trade_delta_value": Decimal("90.00")}]
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertRaises(RuntimeError), transaction.atomic():
+                record_progress_batch(entries)
+                raise RuntimeError("rolled back")
+        self.assertEqual(leaderboard.rank_of(participation), 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            record_progress_batch(entries)
+        self.assertEqual(leaderboard.rank_of(participation), 1)
+
+    def test_progress_batch_rejects_participation_deleted_after_validation(self):
+        participation = ChallengeParticipation.objects.create(challenge=self.challenge, user=self.user)
+        rival = User.objects.create_user(email="rival@example.com", password="Password123")
+        stale = ChallengeParticipation.objects.create(challenge=self.challenge, user=rival)
+        ChallengeParticipation.objects.get(pk=stale.pk).delete()
+
+        entries = [
+            {"participation": participation, "trade_delta_value": Decimal("10.00")},
+            {"participation": stale, "trade_delta_value": Decimal("10.00")},
+        ]
+        with self.assertRaises(ValidationError) as raised:
+            record_progress_batch(entries)
+        self.assertEqual(raised.exception.detail["entries"][0], {})
+        self.assertIn("challenge_id", raised.exception.detail["entries"][1])
+        self.assertEqual(ChallengeProgress.objects.count(), 0)
+
+    def test_progress_batch_rejects_whole_batch_on_invalid_entry(self):
+        ChallengeParticipation.objects.create(challenge=self.challenge, user=self.user)
+        other = Challenge.objects.create(title="Not Joined", status=ChallengeStatus.ACTIVE)
+        entries = [
+            {"challenge_id": str(self.challenge.id), "trade_delta_value": "10.00"},
+            {"challenge_id": str(other.id), "trade_delta_value": "10.00"},
+            {"challenge_id": str(self.challenge.id), "trade_delta_value": "-1"},
+        ]
+
+        response = self.client.post(
+            reverse("challenges:challenge-progress-batch"), {"entries": entries}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("trade_delta_value", response.data["entries"][2])
+
+        entries.pop()
+        response = self.client.post(
+            reverse("challenges:challenge-progress-batch"), {"entries": entries}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["entries"][0], {})
+        self.assertIn("challenge_id", response.data["entries"][1])
+        self.assertEqual(ChallengeProgress.objects.count(), 0)
+
     def test_leave_challenge_removes_enrollment(self):
         participation = ChallengeParticipation.objects.create(
             challenge=self.challenge,
             user=self.user,
         )
+        self.challenge.refresh_from_db()
+        self.assertEqual(self.challenge.participant_count, 1)
+
         response = self.client.delete(self.enroll_url)
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
         self.assertFalse(ChallengeParticipation.objects.filter(id=participation.id).exists())
+        self.challenge.refresh_from_db()
+        self.assertEqual(self.challenge.participant_count, 0)
+
+    def test_reconcile_task_repairs_participant_count_drift(self):
+        ChallengeParticipation.objects.create(challenge=self.challenge, user=self.user)
+        Challenge.objects.filter(pk=self.challenge.pk).update(participant_count=0)
+
+        self.assertEqual(reconcile_participant_counts(), 1)
+        self.challenge.refresh_from_db()
+        self.assertEqual(self.challenge.participant_count, 1)
+
+    def test_leaderboard_endpoint_pages_and_neighbors(self):
+        traders = [self.user] + [
+            User.objects.create_user(email=f"trader{idx}@example.com", password="Password123")
+            for idx in range(5)
+        ]
+        for idx, trader in enumerate(traders):
+            ChallengeParticipation.objects.create(
+                challenge=self.challenge,
+                user=trader,
+                total_trade_delta=Decimal(10 * (idx + 1)),
+            )
+        url = reverse("challenges:challenge-leaderboard", kwargs={"pk": self.challenge.id})
+
+        page = self.client.get(url, {"offset": 1, "limit": 2})
+        self.assertEqual(page.status_code, status.HTTP_200_OK)
+        self.assertEqual(page.data["count"], 6)
+        self.assertEqual([entry["rank"] for entry in page.data["results"]], [2, 3])
+        self.assertEqual(page.data["results"][0]["total_trade_delta"], "50.00")
+
+        around = self.client.get(url, {"around": "me", "radius": 1})
+        self.assertEqual(around.status_code, status.HTTP_200_OK)
+        self.assertEqual([entry["rank"] for entry in around.data["results"]], [5, 6])
+        self.assertEqual(around.data["results"][-1]["user_id"], str(self.user.id))
+
+
+class ChallengeLeaderboardEngineTests(APITestCase):
+    def setUp(self):
+        self.challenge = Challenge.objects.create(title="Leaderboard Sprint", status=ChallengeStatus.ACTIVE)
+        self.users = [
+            User.objects.create_user(email=f"racer{idx}@example.com", password="Password123")
+            for idx in range(4)
+        ]
+
+    def _enroll(self, user, total):
+        return ChallengeParticipation.objects.create(
+            challenge=self.challenge, user=user, total_trade_delta=Decimal(total)
+        )
+
+    def test_ties_rank_by_join_order_and_updates_reorder(self):
+        first = self._enroll(self.users[0], "50.00")
+        second = self._enroll(self.users[1], "50.00")
+        third = self._enroll(self.users[2], "75.25")
+
+        leaderboard = leaderboard_for(self.challenge)
+        self.assertEqual(
+            [standing.participant_id for standing in leaderboard.top()],
+            [str(third.id), str(first.id), str(second.id)],
+        )
+        self.assertEqual(leaderboard.top()[0].total_trade_delta, Decimal("75.25"))
+
+        second.total_trade_delta = Decimal("80.00")
+        with self.captureOnCommitCallbacks(execute=True):
+            second.save(update_fields=["total_trade_delta", "updated_at"])
+        self.assertEqual(leaderboard.rank_of(second), 1)
+        self.assertEqual(leaderboard.rank_of(first), 3)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first.delete()
+        self.assertEqual(leaderboard.count(), 2)
+        self.assertEqual(leaderboard.rank_of(first), 0)
+
+    def test_rolled_back_writes_leave_the_leaderboard_alone(self):
+        participation = self._enroll(self.users[0], "10.00")
+        leaderboard = leaderboard_for(self.challenge)
+        self.assertEqual(leaderboard.count(), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertRaises(RuntimeError), transaction.atomic():
+                self._enroll(self.users[1], "99.00")
+                ChallengeParticipation.objects.get(pk=participation.pk).delete()
+                raise RuntimeError("rolled back")
+        self.assertEqual(leaderboard.count(), 1)
+        self.assertEqual(leaderboard.rank_of(participation), 1)
+
+    def test_rebuild_reconciles_drift(self):
+        participation = self._enroll(self.users[0], "10.00")
+        self._enroll(self.users[1], "20.00")
+        leaderboard = leaderboard_for(self.challenge)
+        self.assertEqual(leaderboard.rank_of(participation), 2)
+
+        ChallengeParticipation.objects.filter(id=participation.id).update(
+            total_trade_delta=Decimal("99.00")
+        )
+        self.assertEqual(leaderboard.rank_of(participation), 2)
+
+        out = StringIO()
+        call_command("rebuild_leaderboards", challenge_ids=[str(self.challenge.id)], stdout=out)
+        self.assertIn("1 corrected", out.getvalue())
+        self.assertEqual(leaderboard.rank_of(participation), 1)
+
+    def test_new_leader_notifies_every_participant(self):
+        self._enroll(self.users[0], "30.00")
+        second = self._enroll(self.users[1], "20.00")
+        self._enroll(self.users[2], "10.00")
+        flush_challenge(self.challenge.id)
+        self.assertFalse(Notification.objects.exists())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            second.total_trade_delta = Decimal("25.00")
+            second.save()
+            flush_challenge(self.challenge.id)
+        self.assertFalse(Notification.objects.exists())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            second.total_trade_delta = Decimal("40.00")
+            second.save()
+            flush_challenge(self.challenge.id)
+        notifications = Notification.objects.filter(subject="The challenge has a new leader")
+        self.assertEqual(
+            sorted(notifications.values_list("user_id", flat=True)), sorted(user.id for user in self.users[:3])
+        )
+        self.assertEqual(notifications.first().body, f"{second.user.email} moved into first place.")
+
+    def test_broadcasts_are_coalesced_into_sequenced_deltas(self):
+        first = self._enroll(self.users[0], "10.00")
+        second = self._enroll(self.users[1], "20.00")
+
+        with patch("challenges.tasks.flush_leaderboard_broadcast.apply_async") as enqueue, \
+                self.captureOnCommitCallbacks(execute=True):
+            first.total_trade_delta = Decimal("30.00")
+            first.save()
+            second.total_trade_delta = Decimal("25.00")
+            second.save()
+        enqueue.assert_called_once_with(args=[str(self.challenge.id)], countdown=0.5)
+
+        frame = flush_challenge(self.challenge.id)
+        self.assertEqual(frame["seq"], 1)
+        self.assertEqual(
+            [(entry["participant_id"], entry["rank"]) for entry in frame["changed"]],
+            [(str(first.id), 1), (str(second.id), 2)],
+        )
+        self.assertIsNone(flush_challenge(self.challenge.id))
+
+        second_id = str(second.id)
+        second.delete()
+        frame = flush_challenge(self.challenge.id)
+        self.assertEqual((frame["seq"], frame["changed"], frame["removed"]), (2, [], [second_id]))
+        self.assertEqual(published_snapshot(self.challenge.id)["seq"], 2)
+
+    def _converse(self, challenge_id, user, messages=()):
+        """Connect to the leaderboard socket, send ``messages`` and collect the frames."""
+
+        scope = {
+            "type": "websocket",
+            "path": f"/ws/challenges/{challenge_id}/leaderboard/",
+            "url_route": {"kwargs": {"challenge_id": str(challenge_id)}},
+            "user": user,
+            "headers": [],
+            "query_string": b"",
+            "subprotocols": [],
+        }
+
+        async def conversation():
+            communicator = ApplicationCommunicator(ChallengeLeaderboardConsumer.as_asgi(), scope)
+            await communicator.send_input({"type": "websocket.connect"})
+            outputs = [await communicator.receive_output(timeout=5)]
+            if outputs[0]["type"] == "websocket.accept":
+                outputs.append(await communicator.receive_output(timeout=5))
+                for message in messages:
+                    await communicator.send_input({"type": "websocket.receive", "text": json.dumps(message)})
+                    outputs.append(await communicator.receive_output(timeout=5))
+            await communicator.send_input({"type": "websocket.disconnect", "code": 1000})
+            await communicator.wait(timeout=5)
+            return outputs
+
+        outputs = async_to_sync(conversation)()
+        return outputs[0], [json.loads(output["text"]) for output in outputs[1:]]
+
+    def test_socket_sends_cached_snapshot_then_resyncs(self):
+        mine = self._enroll(self.users[0], "10.00")
+        self._enroll(self.users[1], "40.00")
+        self._enroll(self.users[2], "25.00")
+        flush_challenge(self.challenge.id)
+
+        handshake, frames = self._converse(self.challenge.id, self.users[0], [{"type": "resync"}, {"type": "ping"}])
+        self.assertEqual(handshake["type"], "websocket.accept")
+        snapshot, resync, error = frames
+        self.assertEqual((snapshot["type"], snapshot["seq"]), ("snapshot", 1))
+        self.assertEqual([entry["total_trade_delta"] for entry in snapshot["entries"]], ["40.00", "25.00", "10.00"])
+        self.assertEqual(snapshot["me"], {"participant_id": str(mine.id), "rank": 3, "total_trade_delta": "10.00"})
+        self.assertEqual(resync, snapshot)
+        self.assertEqual(error["type"], "error")
+
+    def test_socket_snapshot_is_published_once_and_read_from_cache(self):
+        self._enroll(self.users[0], "10.00")
+        _, (snapshot,) = self._converse(self.challenge.id, AnonymousUser())
+        self.assertEqual((snapshot["seq"], len(snapshot["entries"]), snapshot["me"]), (0, 1, None))
+
+        with self.assertNumQueries(1):  # challenge existence check only
+            _, (again,) = self._converse(self.challenge.id, AnonymousUser())
+        self.assertEqual(again, snapshot)
+
+    def test_socket_rejects_unknown_challenge(self):
+        handshake, frames = self._converse("00000000-0000-0000-0000-000000000000", AnonymousUser())
+        self.assertEqual((handshake["type"], handshake["code"], frames), ("websocket.close", 4404, []))
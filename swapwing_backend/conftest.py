@@ -5,12 +5,33 @@ import pytest
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "mysite.settings")
 
+pytest_plugins = ["mysite.query_budget"]
+
 
 @pytest.fixture(autouse=True)
 def _configure_test_environment(settings):
+    from django.core.cache import cache
+
+    from all_activities.sink import reset_activity_sink
+    from challenges.leaderboard import reset_leaderboard_backend
+    from notifications.push import reset_push_transport
+    from trade_up_league.trending import reset_event_buffer
+
     settings.EMAIL_BACKEND = "django.core.mail.backends.locmem.EmailBackend"
     settings.CELERY_TASK_ALWAYS_EAGER = True
     settings.CELERY_TASK_EAGER_PROPAGATES = True
     settings.CHANNEL_LAYERS = {
         "default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}
     }
+    settings.CHALLENGE_LEADERBOARD_BACKEND = "memory"
+    reset_leaderboard_backend()
+    settings.NOTIFICATION_PUSH_TRANSPORT = "memory"
+    reset_push_transport()
+    settings.EPISODE_EVENT_BUFFER = "memory"
+    reset_event_buffer()
+    settings.ACTIVITY_SINK = "memory"
+    reset_activity_sink()
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    }
+    cache.clear()
@@ -1,10 +1,12 @@
 
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.utils.datetime_safe import date
 from rest_framework import serializers
 
 from garage.models import Garage, GarageItem, GarageService, GarageItemImages, GarageServiceImages, GarageItemVideos, \
     GarageServiceVideos, GarageItemComment, GarageItemCategory, CanCounterWith
+from garage.loaders import COVER_IMAGES_ATTR
 from user_profile.models import PersonalInfo
 
 User = get_user_model()
@@ -95,12 +97,12 @@ class GarageServiceDetailSerializer(serializers.ModelSerializer):
 ###########
 
 class GarageItemDetailSerializer(serializers.ModelSerializer):
+    # Comments and reactions are paginated; garage.loaders adds one page of
+    # each to the payload.
     garage_item_images = GarageItemImagesSerializer(many=True)
     garage_item_videos = GarageItemVideosSerializer(many=True)
-    garage_item_comments = GarageItemCommentsSerializer(many=True)
     item_category = GarageItemCategoriesSerializer(many=True)
     can_counter_item = GarageItemCanCounterWithSerializer(many=True)
-    reactions = ReactionSerializer(many=True)
 
     class Meta:
         model = GarageItem
@@ -123,8 +125,6 @@ class GarageItemDetailSerializer(serializers.ModelSerializer):
                   'duration',
                   'auto_relist',
 
-                  'reactions',
-
                   'with_anything',
                   'can_counter_item',
 
@@ -140,8 +140,6 @@ class GarageItemDetailSerializer(serializers.ModelSerializer):
                   'garage_item_images',
                   'garage_item_videos',
 
-                  'garage_item_comments',
-
                   ]
 
 
@@ -154,6 +152,14 @@ class GarageItemDetailSerializer(serializers.ModelSerializer):
 ###########
 
 
+def _cover_image(obj, related_name):
+    # Prefer the cover prefetched by garage.loaders over a per-row query.
+    covers = getattr(obj, COVER_IMAGES_ATTR, None)
+    if covers is not None:
+        return covers[0] if covers else None
+    return getattr(obj, related_name).first()
+
+
 class GarageServiceSerializer(serializers.ModelSerializer):
     garage_service_images = serializers.SerializerMethodField()
 
@@ -162,7 +168,7 @@ class GarageServiceSerializer(serializers.ModelSerializer):
         fields = ['id', 'service_id', 'garage', 'service_name', 'is_listed', 'hidden', 'reactions', 'garage_service_images']
 
     def get_garage_service_images(self, obj):
-        first_image = obj.garage_service_images.first()
+        first_image = _cover_image(obj, "garage_service_images")
         if first_image:
             return GarageServiceImagesSerializer(first_image).data
         return None
@@ -178,7 +184,7 @@ class GarageItemSerializer(serializers.ModelSerializer):
         fields = ['id', 'item_id', 'garage', 'item_name', 'is_listed', 'hidden', 'reactions', 'garage_item_images']
 
     def get_garage_item_images(self, obj):
-        first_image = obj.garage_item_images.first()
+        first_image = _cover_image(obj, "garage_item_images")
         if first_image:
             return GarageItemImagesSerializer(first_image).data
         return None
@@ -197,3 +203,64 @@ class GarageSerializer(serializers.ModelSerializer):
         ]
 
 
+
+
+
+################
+
+# ITEM WRITES
+
+###########
+
+
+class CommaSeparatedListField(serializers.ListField):
+    """A list of names sent as a JSON list, repeated form keys or ``"a,b,c"``."""
+
+    child = serializers.CharField(max_length=255)
+
+    def to_internal_value(self, data):
+        if isinstance(data, str):
+            data = [data]
+        names = [name.strip() for value in data for name in str(value).split(",")]
+        return super().to_internal_value([name for name in names if name])
+
+
+class GarageItemWriteSerializer(serializers.ModelSerializer):
+    category = CommaSeparatedListField(source="categories", required=False, default=list)
+    counter_withs = CommaSeparatedListField(required=False, default=list)
+    list_item = serializers.BooleanField(source="is_listed", required=False, default=False)
+    item_images = serializers.ListField(child=serializers.FileField(), required=False, default=list)
+    item_videos = serializers.ListField(child=serializers.FileField(), required=False, default=list)
+
+    class Meta:
+        model = GarageItem
+        fields = [
+            'item_name',
+            'description',
+            'reason',
+            'quality',
+            'category',
+            'meet_up_loc',
+            'meet_up_lat',
+            'meet_up_lng',
+            'add_generic_loc',
+            'bid_starts',
+            'duration',
+            'list_item',
+            'auto_relist',
+            'counter_withs',
+            'with_anything',
+            'item_images',
+            'item_videos',
+        ]
+        extra_kwargs = {'item_name': {'required': True, 'allow_null': False, 'allow_blank': False}}
+
+
+class GarageItemImportSerializer(serializers.Serializer):
+    items = GarageItemWriteSerializer(many=True, allow_empty=False)
+
+    def validate_items(self, items):
+        limit = getattr(settings, "GARAGE_IMPORT_MAX_ITEMS", 100)
+        if len(items) > limit:
+            raise serializers.ValidationError(f"Import at most {limit} items per request.")
+        return items
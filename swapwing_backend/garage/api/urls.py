@@ -2,7 +2,7 @@ from django.urls import path
 
 from garage.api.views import get_user_garage, get_garage_item_detail, get_garage_service_detail, add_garage_item, \
     add_garage_service, delete_garage_item, set_garage_item_premium, list_garage_item, \
-    hide_show_garage_item, edit_garage_item, list_item_reactions
+    hide_show_garage_item, edit_garage_item, list_item_reactions, import_garage_items
 
 app_name = 'garage'
 
@@ -13,6 +13,7 @@ urlpatterns = [
     path('garage-service-detail', get_garage_service_detail, name="get_garage_service_detail"),
 
     path('add-garage-item', add_garage_item, name="add_garage_item"),
+    path('import-garage-items', import_garage_items, name="import_garage_items"),
     path('edit-garage-item', edit_garage_item, name="edit_garage_item"),
     path('list-garage-item', list_garage_item, name="list_garage_item"),
     path('hide-show-garage-item', hide_show_garage_item, name="hide_show_garage_item"),
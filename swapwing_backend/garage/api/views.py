@@ -6,9 +6,10 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
 from garage.api.serializers import GarageSerializer, GarageItemSerializer, GarageServiceSerializer, \
-    GarageItemDetailSerializer, GarageServiceDetailSerializer
-from garage.models import Garage, GarageItem, GarageService, CanCounterWith, GarageItemImages, GarageItemVideos, \
-    GarageServiceImages, GarageServiceVideos, GarageItemCategory
+    GarageServiceDetailSerializer, GarageItemImportSerializer, GarageItemWriteSerializer
+from garage.loaders import load_garage_item_detail, load_user_garage, page_meta
+from garage.services import create_garage_items
+from garage.models import Garage, GarageItem, GarageService, GarageServiceImages, GarageServiceVideos
 from mysite.utils import base64_file
 
 User = get_user_model()
@@ -29,28 +30,22 @@ def get_user_garage(request):
             payload['response'] = "Error"
             errors.append("User ID Required.")
         else:
-            user = User.objects.get(user_id=user_id)
             try:
-                user_garage = Garage.objects.get(user=user)
-                user_garage_serializer = GarageSerializer(user_garage, many=False)
-                if user_garage_serializer:
-                    _data = user_garage_serializer.data
-                    data = _data
+                garage = load_user_garage(
+                    user_id,
+                    items_page=request.query_params.get('items_page', 1),
+                    services_page=request.query_params.get('services_page', 1),
+                    page_size=request.query_params.get('page_size'),
+                )
+                data = GarageSerializer(garage.garage, many=False).data
 
                 # GAGRAGE ITEMS
-                garage_item = GarageItem.objects.all().filter(garage=user_garage)
-                garage_item_serializer = GarageItemSerializer(garage_item, many=True)
-                if garage_item_serializer:
-                    _data = garage_item_serializer.data
-                    data['garage_items'] = _data
+                data['garage_items'] = GarageItemSerializer(garage.items.object_list, many=True).data
+                data['garage_items_page'] = page_meta(garage.items)
 
                 # GAGRAGE SERVICES
-                garage_service = GarageService.objects.all().filter(garage=user_garage)
-                garage_service_serializer = GarageServiceSerializer(garage_service, many=True)
-                if garage_service_serializer:
-                    _data = garage_service_serializer.data
-                    data['garage_services'] = _data
-
+                data['garage_services'] = GarageServiceSerializer(garage.services.object_list, many=True).data
+                data['garage_services_page'] = page_meta(garage.services)
 
             except Garage.DoesNotExist:
                 payload['response'] = "Error"
@@ -74,161 +69,68 @@ def get_user_garage(request):
 @authentication_classes([TokenAuthentication, ])
 def add_garage_item(request):
     payload = {}
-    user_data = {}
     data = {}
     errors = []
 
     if request.method == 'POST':
         user_id = request.data.get('user_id', '0')
 
-        item_name = request.data.get('item_name', '0')
-        quality = request.data.get('quality', '0')
-        description = request.data.get('description', '0')
-        reason = request.data.get('reason', '0')
-
-
-        category = request.data.get('category', '0').split(",")
-        #categories = []
-        #for cat in category:
-        #    categories.append(cat)
-
-
-        meet_up_loc = request.data.get('meet_up_loc', '0')
-        meet_up_lat = request.data.get('meet_up_lat', '0')
-        meet_up_lng = request.data.get('meet_up_lng', '0')
-
-        add_generic_loc = request.data.get('add_generic_loc', '0')
-        if add_generic_loc == "true":
-            add_generic_loc = True
-        elif add_generic_loc == "false":
-            add_generic_loc = False
-
-
-        bid_starts = request.data.get('bid_starts', '0')
-        duration = request.data.get('duration', '0')
-
-        list_item = request.data.get('list_item', '0')
-        if list_item == "true":
-            list_item = True
-        elif list_item == "false":
-            list_item = False
-
-        auto_relist = request.data.get('auto_relist', '0')
-        if auto_relist == "true":
-            auto_relist = True
-        elif auto_relist == "false":
-            auto_relist = False
-
-        counter_withs = request.data.get('counter_withs', '0').split(",")
-        with_anything = request.data.get('with_anything', '0')
-        if with_anything == "true":
-            with_anything = True
-        elif with_anything == "false":
-            with_anything = False
-
-
-
-
-        item_images = request.FILES.getlist('item_images')
-        item_videos = request.data.get('item_videos', '0')
-
-
-
-
         if not user_id:
             payload['response'] = "Error"
             errors.append("User ID Required.")
         else:
+            garage = _own_garage(request, user_id)
+            if garage is None:
+                payload['response'] = "Error"
+                errors.append("User garage not available.")
+            else:
+                serializer = GarageItemWriteSerializer(data=request.data)
+                if not serializer.is_valid():
+                    payload['response'] = "Error"
+                    payload['errors'] = serializer.errors
+                    return Response(payload, status=status.HTTP_400_BAD_REQUEST)
 
-            print("#########################")
-            print(user_id)
-
-            print(item_name)
-            print(description)
-            print(reason)
-            print(quality)
-
-            print(category)
-
-            print(meet_up_loc)
-            print(meet_up_lat)
-            print(meet_up_lng)
-            print(add_generic_loc)
-
-            print(bid_starts)
-            print(duration)
-            print(list_item)
-            print(auto_relist)
-
-            print(counter_withs)
-            print(with_anything)
-
-            print(item_images)
-            print(item_videos)
-#
-
-
-            user = User.objects.get(user_id=user_id)
-            garage = Garage.objects.get(user=user)
-#
-#
-#
-#
-#
-#
-            new_item = GarageItem.objects.create(
-                garage=garage,
-                item_name=item_name,
-                description=description,
-                reason=reason,
-                quality=quality,
-
-
-                meet_up_loc=meet_up_loc,
-                meet_up_lat=meet_up_lat,
-                meet_up_lng=meet_up_lng,
-                add_generic_loc=add_generic_loc,
-
-                bid_starts=bid_starts,
-                duration=duration,
-                is_listed=list_item,
-                auto_relist=auto_relist,
-
-                with_anything=with_anything,
-
-                item_owner=user
+                new_item, = create_garage_items(garage, request.user, [serializer.validated_data])
+                data['item_id'] = new_item.item_id
 
-            )
+        if errors:
+            payload['errors'] = errors
+            return Response(payload, status=status.HTTP_404_NOT_FOUND)
 
-            for item in counter_withs:
-                can_counter = CanCounterWith.objects.create(
-                    item=new_item,
-                   item_name=item,
-                )
+        payload['response'] = "Successful"
+        payload['data'] = data
 
-            for item_cat in category:
-                category = GarageItemCategory.objects.create(
-                    item=new_item,
-                   category_name=item_cat,
-                )
+        return Response(payload, status=status.HTTP_200_OK)
 
-            data['item_id'] = new_item.item_id
 
+@api_view(['POST', ])
+@permission_classes([IsAuthenticated, ])
+@authentication_classes([TokenAuthentication, ])
+def import_garage_items(request):
+    payload = {}
+    data = {}
+    errors = []
 
-            for image in item_images:
-                item_image = GarageItemImages.objects.create(
-                    garage_item=new_item,
-                    image=image
-                )
-                #print(image)
+    if request.method == 'POST':
+        user_id = request.data.get('user_id', '0')
 
-            for video in item_videos:
-                item_video = GarageItemVideos.objects.create(
-                    garage_item=new_item,
-                    video=video
-                )
-                #print(video)
+        if not user_id:
+            payload['response'] = "Error"
+            errors.append("User ID Required.")
+        else:
+            garage = _own_garage(request, user_id)
+            if garage is None:
+                payload['response'] = "Error"
+                errors.append("User garage not available.")
+            else:
+                serializer = GarageItemImportSerializer(data=request.data)
+                if not serializer.is_valid():
+                    payload['response'] = "Error"
+                    payload['errors'] = serializer.errors
+                    return Response(payload, status=status.HTTP_400_BAD_REQUEST)
 
+                items = create_garage_items(garage, request.user, serializer.validated_data['items'])
+                data['item_ids'] = [item.item_id for item in items]
 
         if errors:
             payload['errors'] = errors
@@ -239,6 +141,14 @@ def add_garage_item(request):
 
         return Response(payload, status=status.HTTP_200_OK)
 
+
+def _own_garage(request, user_id):
+    # Items are only ever added to the caller's own garage.
+    if user_id != request.user.user_id:
+        return None
+    return Garage.objects.filter(user=request.user).first()
+
+
 @api_view(['GET', ])
 @permission_classes([IsAuthenticated, ])
 @authentication_classes([TokenAuthentication, ])
@@ -261,14 +171,13 @@ def get_garage_item_detail(request):
             errors.append("Item ID Required.")
 
         else:
-            user = User.objects.get(user_id=user_id)
             try:
-                garage_item = GarageItem.objects.get(item_id=item_id)
-                garage_item_detail_serializer = GarageItemDetailSerializer(garage_item, many=False)
-                if garage_item_detail_serializer:
-                    _data = garage_item_detail_serializer.data
-                    data['garage_item_detail'] = _data
-
+                data['garage_item_detail'] = load_garage_item_detail(
+                    item_id,
+                    comments_page=request.query_params.get('comments_page', 1),
+                    reactions_page=request.query_params.get('reactions_page', 1),
+                    page_size=request.query_params.get('page_size'),
+                )
 
             except GarageItem.DoesNotExist:
                 payload['response'] = "Error"
@@ -0,0 +1,209 @@
+"""Read-model loaders for garage pages.
+
+``load_user_garage`` fetches a garage together with one page of items and one
+page of services. Cover images and reaction IDs for every row on the page are
+loaded with one prefetch query each, so the number of queries stays the same
+however many items or services a garage holds.
+
+``load_garage_item_detail`` builds the item detail payload: the item, its
+images, videos, categories and counter-with items in one query each, plus one
+page of comments and one page of reactions with their authors' users and
+profiles joined in. The payload is cached per item and page under a version
+that the ``garage.models`` receivers bump on every write to the item or its
+children; edits to a commenter's name or photo show up once the entry times
+out (``GARAGE_ITEM_DETAIL_CACHE_SECONDS``).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.paginator import Page, Paginator
+from django.db.models import Prefetch, prefetch_related_objects
+
+from garage.models import (
+    CanCounterWith,
+    Garage,
+    GarageItem,
+    GarageItemCategory,
+    GarageItemComment,
+    GarageItemImages,
+    GarageItemVideos,
+    GarageService,
+    GarageServiceImages,
+    item_cache_namespace,
+)
+from mysite import response_cache
+
+User = get_user_model()
+
+COVER_IMAGES_ATTR = "cover_images"
+
+
+def cover_image_prefetch(lookup: str, model) -> Prefetch:
+    """Prefetch only the first image (lowest id) of each parent row.
+
+    Django compiles the sliced prefetch into a ``ROW_NUMBER()`` window
+    partitioned by the parent foreign key, so a page of N rows costs one
+    query instead of N ``.first()`` calls.
+    """
+
+    return Prefetch(lookup, queryset=model.objects.order_by("id")[:1], to_attr=COVER_IMAGES_ATTR)
+
+
+def reaction_ids_prefetch() -> Prefetch:
+    return Prefetch("reactions", queryset=User.objects.only("id"))
+
+
+def garage_items_queryset(garage):
+    return (
+        GarageItem.objects.filter(garage=garage)
+        .order_by("id")
+        .prefetch_related(
+            cover_image_prefetch("garage_item_images", GarageItemImages),
+            reaction_ids_prefetch(),
+        )
+    )
+
+
+def garage_services_queryset(garage):
+    return (
+        GarageService.objects.filter(garage=garage)
+        .order_by("id")
+        .prefetch_related(
+            cover_image_prefetch("garage_service_images", GarageServiceImages),
+            reaction_ids_prefetch(),
+        )
+    )
+
+
+@dataclass
+class GarageReadModel:
+    garage: Garage
+    items: Page
+    services: Page
+
+
+def page_size_from(value) -> int:
+    default = getattr(settings, "API_DEFAULT_PAGE_SIZE", 20)
+    maximum = getattr(settings, "API_MAX_PAGE_SIZE", 100)
+    try:
+        size = int(value)
+    except (TypeError, ValueError):
+        return default
+    return min(max(size, 1), maximum)
+
+
+def load_user_garage(user_id, items_page=1, services_page=1, page_size=None) -> GarageReadModel:
+    """Load a trader's garage with paginated item and service sections.
+
+    Raises ``Garage.DoesNotExist`` when the trader or their garage is missing.
+    Out-of-range or malformed page numbers fall back to the nearest valid page.
+    """
+
+    garage = Garage.objects.get(user__user_id=user_id)
+    size = page_size_from(page_size)
+    return GarageReadModel(
+        garage=garage,
+        items=Paginator(garage_items_queryset(garage), size).get_page(items_page),
+        services=Paginator(garage_services_queryset(garage), size).get_page(services_page),
+    )
+
+
+def page_meta(page: Page) -> dict:
+    return {
+        "page": page.number,
+        "page_size": page.paginator.per_page,
+        "count": page.paginator.count,
+        "has_next": page.has_next(),
+    }
+
+
+# -- item detail -------------------------------------------------------------------
+def item_detail_prefetches():
+    return (
+        Prefetch("garage_item_images", queryset=GarageItemImages.objects.order_by("id")),
+        Prefetch("garage_item_videos", queryset=GarageItemVideos.objects.order_by("id")),
+        Prefetch("item_category", queryset=GarageItemCategory.objects.order_by("id")),
+        Prefetch("can_counter_item", queryset=CanCounterWith.objects.order_by("id")),
+    )
+
+
+def item_comments_queryset(item):
+    return (
+        GarageItemComment.objects.filter(garage_item=item)
+        .select_related("user__user_personal_info")
+        .order_by("-created_at", "-id")
+    )
+
+
+def item_reactions_queryset(item):
+    return item.reactions.select_related("user_personal_info").order_by("id")
+
+
+def _page_number(value) -> int:
+    try:
+        return max(int(value), 1)
+    except (TypeError, ValueError):
+        return 1
+
+
+def _item_pk_key(item_id) -> str:
+    return f"garage:item-pk:{item_id}"
+
+
+def _detail_key(item_pk, comments_page, reactions_page, size) -> str:
+    version = response_cache.current_version(item_cache_namespace(item_pk))
+    return f"garage:item-detail:{item_pk}:v{version}:c{comments_page}:r{reactions_page}:s{size}"
+
+
+def build_garage_item_detail(item, comments_page=1, reactions_page=1, page_size=None) -> dict:
+    # The serializers import COVER_IMAGES_ATTR from this module.
+    from garage.api.serializers import GarageItemCommentsSerializer, GarageItemDetailSerializer, ReactionSerializer
+
+    size = page_size_from(page_size)
+    prefetch_related_objects([item], *item_detail_prefetches())
+    comments = Paginator(item_comments_queryset(item), size).get_page(comments_page)
+    reactions = Paginator(item_reactions_queryset(item), size).get_page(reactions_page)
+
+    detail = GarageItemDetailSerializer(item, many=False).data
+    detail["garage_item_comments"] = GarageItemCommentsSerializer(comments.object_list, many=True).data
+    detail["garage_item_comments_page"] = page_meta(comments)
+    detail["reactions"] = ReactionSerializer(reactions.object_list, many=True).data
+    detail["reactions_page"] = page_meta(reactions)
+    return detail
+
+
+def load_garage_item_detail(item_id, comments_page=1, reactions_page=1, page_size=None) -> dict:
+    """The detail payload of an item with one page of comments and reactions.
+
+    Served from the cache while the item and its children are unchanged.
+    Raises ``GarageItem.DoesNotExist`` when the item is missing.
+    """
+
+    comments_page, reactions_page = _page_number(comments_page), _page_number(reactions_page)
+    size = page_size_from(page_size)
+    if not response_cache.is_enabled():
+        return build_garage_item_detail(GarageItem.objects.get(item_id=item_id), comments_page, reactions_page, size)
+
+    # item_id -> pk never changes, so it is kept without a timeout and a warm
+    # lookup does not touch the database at all.
+    item_pk = cache.get(_item_pk_key(item_id))
+    if item_pk is not None:
+        detail = cache.get(_detail_key(item_pk, comments_page, reactions_page, size))
+        if detail is not None:
+            response_cache.record_event(response_cache.GARAGE_ITEMS, response_cache.HIT)
+            return detail
+    response_cache.record_event(response_cache.GARAGE_ITEMS, response_cache.MISS)
+
+    item = GarageItem.objects.get(item_id=item_id)
+    cache.set(_item_pk_key(item_id), item.pk, None)
+    # The key (and so the version) is taken before the children are read: a
+    # write that lands meanwhile bumps the version and orphans this entry.
+    key = _detail_key(item.pk, comments_page, reactions_page, size)
+    detail = build_garage_item_detail(item, comments_page, reactions_page, size)
+    cache.set(key, detail, getattr(settings, "GARAGE_ITEM_DETAIL_CACHE_SECONDS", 300))
+    return detail
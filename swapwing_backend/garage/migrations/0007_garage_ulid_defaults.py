@@ -0,0 +1,38 @@
+# Generated by Django 4.2 on 2026-10-17 05:26
+
+from django.db import migrations, models
+import mysite.ids
+
+ID_FIELDS = (("Garage", "garage_id"), ("GarageItem", "item_id"), ("GarageService", "service_id"))
+
+
+def backfill_garage_ids(apps, schema_editor):
+    # Legacy random IDs stay valid; only rows the old generators left empty get a ULID.
+    for model_name, field in ID_FIELDS:
+        mysite.ids.backfill_missing_ids(apps.get_model("garage", model_name), field)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('garage', '0006_garageitem_ends_in'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='garage',
+            name='garage_id',
+            field=models.CharField(blank=True, default=mysite.ids.new_ulid, max_length=120, null=True, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='garageitem',
+            name='item_id',
+            field=models.CharField(blank=True, default=mysite.ids.new_ulid, max_length=120, null=True, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='garageservice',
+            name='service_id',
+            field=models.CharField(blank=True, default=mysite.ids.new_ulid, max_length=120, null=True, unique=True),
+        ),
+        migrations.RunPython(backfill_garage_ids, migrations.RunPython.noop),
+    ]
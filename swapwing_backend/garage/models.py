@@ -4,9 +4,10 @@ import random
 from django.conf import settings
 from django.db import models
 from django.db.models import Q
-from django.db.models.signals import pre_save
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
 
-from mysite.utils import unique_garage_id_generator, unique_item_id_generator, unique_service_id_generator
+from mysite.ids import new_ulid
+from mysite.response_cache import GARAGE_ITEMS, invalidate
 
 User = settings.AUTH_USER_MODEL
 
@@ -103,7 +104,7 @@ class UserDesire(models.Model):
 
 
 class Garage(models.Model):
-    garage_id = models.CharField(max_length=120, unique=True, blank=True, null=True)
+    garage_id = models.CharField(max_length=120, unique=True, blank=True, null=True, default=new_ulid)
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name="user_garage")
     open = models.BooleanField(default=True)
     location_name = models.CharField(max_length=200, null=True, blank=True)
@@ -116,7 +117,7 @@ class Garage(models.Model):
 
 def pre_save_garage_id_receiver(sender, instance, *args, **kwargs):
     if not instance.garage_id:
-        instance.garage_id = unique_garage_id_generator(instance)
+        instance.garage_id = new_ulid()
 
 pre_save.connect(pre_save_garage_id_receiver, sender=Garage)
 
@@ -152,7 +153,7 @@ class GarageItemCategory(models.Model):
 
 
 class GarageItem(models.Model):
-    item_id = models.CharField(max_length=120, unique=True, blank=True, null=True)
+    item_id = models.CharField(max_length=120, unique=True, blank=True, null=True, default=new_ulid)
     garage = models.ForeignKey(Garage, on_delete=models.CASCADE, related_name="garage_items")
 
     item_name = models.CharField(max_length=255, null=True, blank=True)
@@ -191,7 +192,7 @@ class GarageItem(models.Model):
 
 def pre_save_item_id_receiver(sender, instance, *args, **kwargs):
     if not instance.item_id:
-        instance.item_id = unique_item_id_generator(instance)
+        instance.item_id = new_ulid()
 
 pre_save.connect(pre_save_item_id_receiver, sender=GarageItem)
 
@@ -226,7 +227,7 @@ class GarageItemComment(models.Model):
 
 
 class GarageService(models.Model):
-    service_id = models.CharField(max_length=120, unique=True, blank=True, null=True)
+    service_id = models.CharField(max_length=120, unique=True, blank=True, null=True, default=new_ulid)
     garage = models.ForeignKey(Garage, on_delete=models.CASCADE, related_name="garage_service")
     service_name = models.CharField(max_length=255, null=True, blank=True)
     service_type = models.CharField(max_length=255, null=True, blank=True)
@@ -251,7 +252,7 @@ class GarageService(models.Model):
 
 def pre_save_service_id_receiver(sender, instance, *args, **kwargs):
     if not instance.service_id:
-        instance.service_id = unique_service_id_generator(instance)
+        instance.service_id = new_ulid()
 
 pre_save.connect(pre_save_service_id_receiver, sender=GarageService)
 
@@ -285,3 +286,39 @@ class GarageServiceComment(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+
+# Garage item details are cached per item (see garage.loaders); any write to
+# the item or a row shown on its detail page orphans that item's entries.
+def item_cache_namespace(item_pk):
+    return f"{GARAGE_ITEMS}:{item_pk}"
+
+
+def invalidate_item_detail_receiver(sender, instance, *args, **kwargs):
+    item_pk = instance.pk if sender is GarageItem else getattr(instance, ITEM_DETAIL_CHILDREN[sender])
+    if item_pk is not None:
+        invalidate(item_cache_namespace(item_pk))
+
+
+def invalidate_item_reactions_receiver(sender, instance, action, reverse, pk_set, *args, **kwargs):
+    if not reverse:
+        if action in ("post_add", "post_remove", "post_clear"):
+            invalidate(item_cache_namespace(instance.pk))
+    elif action in ("post_add", "post_remove"):
+        invalidate(*(item_cache_namespace(pk) for pk in pk_set))
+    elif action == "pre_clear":
+        # A user's reactions are being cleared; pk_set is not filled in for clears.
+        invalidate(*(item_cache_namespace(pk) for pk in instance.item_reactions.values_list("pk", flat=True)))
+
+
+ITEM_DETAIL_CHILDREN = {
+    GarageItemImages: "garage_item_id",
+    GarageItemVideos: "garage_item_id",
+    GarageItemComment: "garage_item_id",
+    GarageItemCategory: "item_id",
+    CanCounterWith: "item_id",
+}
+
+for _model in (GarageItem, *ITEM_DETAIL_CHILDREN):
+    post_save.connect(invalidate_item_detail_receiver, sender=_model)
+    post_delete.connect(invalidate_item_detail_receiver, sender=_model)
+m2m_changed.connect(invalidate_item_reactions_receiver, sender=GarageItem.reactions.through)
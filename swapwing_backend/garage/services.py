@@ -0,0 +1,47 @@
+"""Write paths for garage items.
+
+``create_garage_items`` inserts any number of validated items, with their
+categories, counter-with entries, images and videos, in one transaction:
+one ``bulk_create`` per table however many items or children there are, and
+nothing is left half-written if any insert fails. Items get their ULID
+``item_id`` from the field default, so children can point at them straight
+after the bulk insert.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable, List
+
+from django.db import transaction
+
+from garage.models import CanCounterWith, GarageItem, GarageItemCategory, GarageItemImages, GarageItemVideos
+
+# Keys of a validated item that become child rows rather than item columns.
+CHILD_KEYS = ("categories", "counter_withs", "item_images", "item_videos")
+
+
+def create_garage_items(garage, owner, items: Iterable[dict]) -> List[GarageItem]:
+    """Create ``items`` (``GarageItemWriteSerializer.validated_data``) in ``garage``."""
+
+    items = list(items)
+    rows = [
+        GarageItem(garage=garage, item_owner=owner, **{key: value for key, value in item.items() if key not in CHILD_KEYS})
+        for item in items
+    ]
+    with transaction.atomic():
+        GarageItem.objects.bulk_create(rows)
+        categories, counters, images, videos = [], [], [], []
+        for row, item in zip(rows, items):
+            categories += [GarageItemCategory(item=row, category_name=name) for name in item.get("categories", ())]
+            counters += [CanCounterWith(item=row, item_name=name) for name in item.get("counter_withs", ())]
+            images += [GarageItemImages(garage_item=row, image=upload) for upload in item.get("item_images", ())]
+            videos += [GarageItemVideos(garage_item=row, video=upload) for upload in item.get("item_videos", ())]
+        for model, children in (
+            (GarageItemCategory, categories),
+            (CanCounterWith, counters),
+            (GarageItemImages, images),
+            (GarageItemVideos, videos),
+        ):
+            if children:
+                model.objects.bulk_create(children)
+    return rows
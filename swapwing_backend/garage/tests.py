@@ -1,3 +1,241 @@
-from django.test import TestCase
+import shutil
+import tempfile
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from garage.models import (
+    CanCounterWith,
+    Garage,
+    GarageItem,
+    GarageItemCategory,
+    GarageItemComment,
+    GarageItemImages,
+    GarageService,
+    GarageServiceImages,
+)
+
+User = get_user_model()
+
+
+class UserGarageTests(APITestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(email="garage@example.com", password="Password123")
+        self.fans = [
+            User.objects.create_user(email=f"fan{idx}@example.com", password="Password123")
+            for idx in range(3)
+        ]
+        token = Token.objects.get(user=self.owner)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+        self.garage = Garage.objects.create(user=self.owner)
+        self.url = reverse("garage:user_garage")
+
+    def _stock(self, count):
+        for _ in range(count):
+            item = GarageItem.objects.create(garage=self.garage, item_name="Item", item_owner=self.owner)
+            for name in ("cover.png", "second.png"):
+                GarageItemImages.objects.create(garage_item=item, image=f"item_images/{name}")
+            item.reactions.add(*self.fans)
+
+            service = GarageService.objects.create(garage=self.garage, service_name="Service")
+            GarageServiceImages.objects.create(garage_service=service, image="service_images/cover.png")
+            service.reactions.add(self.fans[0])
+
+    def _query_count(self, params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        return len(queries), response
+
+    def test_query_count_does_not_grow_with_garage_size(self):
+        params = {"user_id": self.owner.user_id, "page_size": 100}
+        self._stock(2)
+        small, _ = self._query_count(params)
+
+        self._stock(20)
+        large, response = self._query_count(params)
+
+        self.assertEqual(small, large)
+        self.assertLessEqual(large, 10)
+        self.assertEqual(len(response.data["data"]["garage_items"]), 22)
+        self.assertEqual(len(response.data["data"]["garage_services"]), 22)
+
+    def test_items_expose_cover_image_and_reaction_ids(self):
+        self._stock(1)
+        _, response = self._query_count({"user_id": self.owner.user_id})
+
+        item = response.data["data"]["garage_items"][0]
+        self.assertTrue(item["garage_item_images"]["image"].endswith("item_images/cover.png"))
+        self.assertEqual(sorted(item["reactions"]), sorted(fan.id for fan in self.fans))
+        service = response.data["data"]["garage_services"][0]
+        self.assertEqual(service["reactions"], [self.fans[0].id])
+
+    def test_sections_are_paginated_independently(self):
+        self._stock(3)
+        _, response = self._query_count(
+            {"user_id": self.owner.user_id, "page_size": 2, "items_page": 2}
+        )
+
+        data = response.data["data"]
+        self.assertEqual(len(data["garage_items"]), 1)
+        self.assertEqual(data["garage_items_page"], {"page": 2, "page_size": 2, "count": 3, "has_next": False})
+        self.assertEqual(len(data["garage_services"]), 2)
+        self.assertTrue(data["garage_services_page"]["has_next"])
+
+    def test_unknown_user_returns_not_found(self):
+        response = self.client.get(self.url, {"user_id": "missing"})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class GarageItemDetailTests(APITestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(email="detail@example.com", password="Password123")
+        token = Token.objects.get(user=self.owner)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+        garage = Garage.objects.create(user=self.owner)
+        self.item = GarageItem.objects.create(garage=garage, item_name="Lamp", item_owner=self.owner)
+        GarageItemImages.objects.create(garage_item=self.item, image="item_images/lamp.png")
+        GarageItemCategory.objects.create(item=self.item, category_name="home")
+        CanCounterWith.objects.create(item=self.item, item_name="rug")
+        self.url = reverse("garage:get_garage_item_detail")
+        self.params = {"user_id": self.owner.user_id, "item_id": self.item.item_id}
+
+    def _engage(self, count):
+        for _ in range(count):
+            fan = User.objects.create_user(email=f"fan-{User.objects.count()}@example.com", password="Password123")
+            GarageItemComment.objects.create(garage_item=self.item, user=fan, comment="Swap?")
+            self.item.reactions.add(fan)
+
+    def _get(self, **params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, {**self.params, **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        return len(queries), response.data["data"]["garage_item_detail"]
+
+    @override_settings(RESPONSE_CACHE_ENABLED=False)
+    def test_query_count_does_not_grow_with_comments_and_reactions(self):
+        self._engage(2)
+        small, _ = self._get(page_size=100)
+        self._engage(10)
+        large, detail = self._get(page_size=100)
+
+        self.assertEqual(small, large)
+        self.assertEqual(len(detail["garage_item_comments"]), 12)
+        self.assertEqual(len(detail["reactions"]), 12)
+        self.assertIn("photo", detail["garage_item_comments"][0]["user"]["user_personal_info"])
+        self.assertEqual(detail["item_category"][0]["category_name"], "home")
+        self.assertEqual(detail["can_counter_item"][0]["item_name"], "rug")
+
+    @override_settings(RESPONSE_CACHE_ENABLED=False)
+    def test_comments_and_reactions_are_paginated(self):
+        self._engage(3)
+        _, detail = self._get(page_size=2, comments_page=2)
+
+        self.assertEqual(len(detail["garage_item_comments"]), 1)
+        self.assertEqual(detail["garage_item_comments_page"], {"page": 2, "page_size": 2, "count": 3, "has_next": False})
+        self.assertEqual(len(detail["reactions"]), 2)
+        self.assertTrue(detail["reactions_page"]["has_next"])
+
+    def test_cached_detail_is_rebuilt_after_a_child_changes(self):
+        self._engage(1)
+        _, first = self._get()
+        cached_queries, cached = self._get()
+        self.assertEqual(cached, first)
+        # Only the token lookup remains on a warm request.
+        self.assertEqual(cached_queries, 1)
+
+        self._engage(1)
+        _, detail = self._get()
+        self.assertEqual(detail["garage_item_comments_page"]["count"], 2)
+        self.assertEqual(detail["reactions_page"]["count"], 2)
+
+        self.item.reactions.clear()
+        _, detail = self._get()
+        self.assertEqual(detail["reactions"], [])
+
+    def test_unknown_item_returns_not_found(self):
+        response = self.client.get(self.url, {**self.params, "item_id": "missing"})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp(prefix="garage-tests-"))
+class GarageItemWriteTests(APITestCase):
+    @classmethod
+    def tearDownClass(cls):  # pragma: no cover - cleanup helper
+        super().tearDownClass()
+        shutil.rmtree(cls._overridden_settings["MEDIA_ROOT"], ignore_errors=True)
+
+    def setUp(self):
+        self.owner = User.objects.create_user(email="seller@example.com", password="Password123")
+        token = Token.objects.get(user=self.owner)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+        self.garage = Garage.objects.create(user=self.owner)
+
+    def test_add_item_bulk_creates_children_in_one_transaction(self):
+        images = [SimpleUploadedFile(f"photo{index}.png", b"png", content_type="image/png") for index in range(8)]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(
+                reverse("garage:add_garage_item"),
+                {
+                    "user_id": self.owner.user_id,
+                    "item_name": "Bike",
+                    "category": "sports,outdoor,bikes,vintage,city",
+                    "counter_withs": "skateboard,scooter",
+                    "list_item": "true",
+                    "bid_starts": "25.5",
+                    "item_images": images,
+                },
+                format="multipart",
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        item = GarageItem.objects.get(item_id=response.data["data"]["item_id"])
+        self.assertTrue(item.is_listed)
+        self.assertEqual(item.item_owner, self.owner)
+        self.assertEqual(item.item_category.count(), 5)
+        self.assertEqual(sorted(item.can_counter_item.values_list("item_name", flat=True)), ["scooter", "skateboard"])
+        self.assertEqual(item.garage_item_images.count(), 8)
+        self.assertFalse(item.garage_item_videos.exists())
+        inserts = [query for query in queries if query["sql"].startswith("INSERT")]
+        self.assertEqual(len(inserts), 4)
+
+    def test_invalid_or_foreign_requests_write_nothing(self):
+        url = reverse("garage:add_garage_item")
+        response = self.client.post(url, {"user_id": self.owner.user_id, "bid_starts": "lots"}, format="multipart")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(set(response.data["errors"]), {"item_name", "bid_starts"})
+
+        response = self.client.post(url, {"user_id": "someone-else", "item_name": "Bike"}, format="multipart")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertFalse(GarageItem.objects.exists())
+
+    def test_import_creates_every_item_or_none(self):
+        url = reverse("garage:import_garage_items")
+        items = [
+            {"item_name": f"Record {index}", "category": ["music", "vinyl"], "counter_withs": ["cd"]}
+            for index in range(3)
+        ]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(url, {"user_id": self.owner.user_id, "items": items}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        self.assertEqual(len(response.data["data"]["item_ids"]), 3)
+        self.assertEqual(GarageItemCategory.objects.filter(item__garage=self.garage).count(), 6)
+        self.assertEqual(CanCounterWith.objects.filter(item__garage=self.garage).count(), 3)
+        self.assertEqual(len([query for query in queries if query["sql"].startswith("INSERT")]), 3)
+
+        with mock.patch.object(CanCounterWith.objects, "bulk_create", side_effect=RuntimeError("disk full")):
+            with self.assertRaises(RuntimeError):
+                self.client.post(url, {"user_id": self.owner.user_id, "items": items}, format="json")
+        self.assertEqual(GarageItem.objects.filter(garage=self.garage).count(), 3)
+
+        with self.settings(GARAGE_IMPORT_MAX_ITEMS=2):
+            response = self.client.post(url, {"user_id": self.owner.user_id, "items": items}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
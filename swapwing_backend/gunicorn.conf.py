@@ -0,0 +1,36 @@
+"""Gunicorn settings for the web container.
+
+``SERVER_MODE`` picks the serving path:
+
+* ``wsgi`` (default) – sync workers running ``mysite.wsgi``, as before.
+  ``GUNICORN_WORKER_CLASS=gthread`` with ``GUNICORN_THREADS`` adds threads.
+* ``asgi`` – uvicorn workers running ``mysite.asgi``, which also serves the
+  Channels websockets. Set ``API_ASYNC_READ_VIEWS=True`` alongside it so the
+  hot read endpoints use their async-ORM variants instead of borrowing a
+  thread per request.
+
+Everything else is tunable through environment variables so the two modes
+can be benchmarked with the same worker count (see ``benchmarks/load.py``).
+"""
+
+import multiprocessing
+import os
+
+SERVER_MODE = os.getenv("SERVER_MODE", "wsgi").lower()
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 30))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", 30))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", 5))
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", 2000))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", 200))
+accesslog = os.getenv("GUNICORN_ACCESS_LOG", "-") or None
+
+if SERVER_MODE == "asgi":
+    wsgi_app = "mysite.asgi:application"
+    worker_class = "uvicorn.workers.UvicornWorker"
+else:
+    wsgi_app = "mysite.wsgi:application"
+    worker_class = os.getenv("GUNICORN_WORKER_CLASS", "sync")
+    threads = int(os.getenv("GUNICORN_THREADS", 1))
@@ -1,4 +1,3 @@
-from django.contrib.auth import get_user_model
 from rest_framework import status
 from rest_framework.authentication import TokenAuthentication
 from rest_framework.decorators import permission_classes, api_view, authentication_classes
@@ -6,14 +5,9 @@ from rest_framework.generics import get_object_or_404
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
-from notifications.api.serializers import NotificationSerializer
-from notifications.models import Notification
-from trade_up_league.api.serializers import ListAllEpisodesSerializer
-from trade_up_league.models import Episode
+from home_page.feed import episode_page, trending_episodes, user_block
 from user_profile.models import PersonalInfo
 
-User = get_user_model()
-
 
 
 @api_view(['GET', ])
@@ -21,7 +15,6 @@ User = get_user_model()
 @authentication_classes([TokenAuthentication, ])
 def user_home_view(request):
     payload = {}
-    user_data = {}
     data = {}
     errors = []
 
@@ -33,35 +26,17 @@ def user_home_view(request):
             errors.append("User ID Required.")
         else:
 
-            has_notification = False
-
-            user = get_object_or_404(User, user_id=user_id)
-            personal_info = get_object_or_404(PersonalInfo, user=user)
-
-            user_data['first_name'] = user.first_name
-            user_data['last_name'] = user.last_name
-            user_data['profile_photo'] = personal_info.photo.url
-
-            notifications = Notification.objects.all().filter(user=user)
-            notifications_serializer = NotificationSerializer(notifications, many=True)
-            if notifications_serializer:
-                notifications = notifications_serializer.data
-
-            for notification in notifications:
-                if notification['read'] == False:
-                    has_notification = True
+            personal_info = get_object_or_404(
+                PersonalInfo.objects.select_related('user'), user__user_id=user_id
+            )
+            data.update(user_block(personal_info.user, personal_info))
 
-            data['user_data'] = user_data
-            data['has_notification'] = has_notification
-
-
-            all_episodes = Episode.objects.all().order_by("trending_no")
-            all_episodes_serializer = ListAllEpisodesSerializer(all_episodes, many=True)
-            if all_episodes_serializer:
-                all_episodes = all_episodes_serializer.data
+            data['trending_episodes'] = trending_episodes()
 
+            all_episodes, paginator = episode_page(request)
             data['all_episodes'] = all_episodes
-
+            data['next'] = paginator.get_next_link()
+            data['previous'] = paginator.get_previous_link()
 
 
         payload['response'] = "Successful"
@@ -72,4 +47,3 @@ def user_home_view(request):
             return Response(payload, status=status.HTTP_404_NOT_FOUND)
 
         return Response(payload, status=status.HTTP_200_OK)
-
@@ -0,0 +1,86 @@
+"""Home feed assembly.
+
+The home payload has two parts:
+
+* a shared block, the ``HOME_TRENDING_EPISODES`` top-ranked episodes, built
+  once and cached for every user under the ``episodes`` response-cache
+  version, so saving an episode rebuilds it on the next request;
+* a per-user block read from the user row and its profile in one query,
+  with the unread total taken from the ``unread_notification_count``
+  counter rather than the notifications table.
+
+The full episode list is served in keyset pages in the same ranked order.
+Episodes are summarized (``EpisodeSummarySerializer``): likes and shares are
+counter columns and tags are ids, so no M2M membership list is serialized.
+"""
+
+from __future__ import annotations
+
+from typing import List
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models import Prefetch
+
+from mysite import response_cache
+from mysite.pagination import KeysetCursorPagination
+from tags.models import Tag
+from trade_up_league.api.serializers import EpisodeSummarySerializer
+from trade_up_league.models import Episode
+
+User = get_user_model()
+
+FEED_ORDERING_FIELDS = {"trending": ("trending_no", "id")}
+
+
+class FeedOrdering:
+    """Keyset ordering for ``KeysetCursorPagination``: rank 1 first."""
+
+    cursor_ordering_fields = FEED_ORDERING_FIELDS
+    cursor_default_ordering = "trending"
+
+
+def feed_episodes():
+    return Episode.objects.filter(active=True).prefetch_related(
+        Prefetch("tags", queryset=Tag.objects.only("id"))
+    )
+
+
+def _trending_key() -> str:
+    return f"home:trending:v{response_cache.current_version(response_cache.EPISODES)}"
+
+
+def trending_episodes() -> List[dict]:
+    """The shared trending block, from the cache when it is current."""
+
+    key = _trending_key()
+    block = cache.get(key)
+    if block is not None:
+        response_cache.record_event(response_cache.EPISODES, response_cache.HIT)
+        return block
+    response_cache.record_event(response_cache.EPISODES, response_cache.MISS)
+    episodes = feed_episodes().order_by(*FEED_ORDERING_FIELDS["trending"])[: settings.HOME_TRENDING_EPISODES]
+    block = EpisodeSummarySerializer(episodes, many=True).data
+    cache.set(key, block, settings.HOME_TRENDING_CACHE_SECONDS)
+    return block
+
+
+def user_block(user, personal_info) -> dict:
+    return {
+        "user_data": {
+            "first_name": user.first_name,
+            "last_name": user.last_name,
+            "profile_photo": personal_info.photo.url if personal_info.photo else None,
+        },
+        "has_notification": user.unread_notification_count > 0,
+        "unread_notification_count": user.unread_notification_count,
+    }
+
+
+def episode_page(request):
+    """One keyset page of the ranked episode list and its paginator."""
+
+    paginator = KeysetCursorPagination()
+    episodes = paginator.paginate_queryset(feed_episodes(), request, view=FeedOrdering)
+    return EpisodeSummarySerializer(episodes, many=True).data, paginator
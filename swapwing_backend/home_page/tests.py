@@ -1,3 +1,87 @@
-from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
 
-# Create your tests here.
+from tags.models import Tag
+from trade_up_league.models import Episode
+from trade_up_league.tasks import flush_episode_events, reconcile_episode_counts
+from user_profile.models import PersonalInfo
+
+User = get_user_model()
+
+
+class HomeFeedTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="home@example.com", password="Password123", first_name="Ama")
+        PersonalInfo.objects.get_or_create(user=self.user)
+        token = Token.objects.get(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+        self.url = reverse("home_page:user_home")
+        self.fans = [User.objects.create_user(email=f"fan{index}@example.com", password="Password123") for index in range(3)]
+        self.tag = Tag.objects.create(name="barter", user=self.user)
+        self.episodes = []
+        for rank in range(1, 6):
+            episode = Episode.objects.create(user=self.user, title=f"Episode {rank}", trending_no=rank, active=True)
+            episode.tags.add(self.tag)
+            episode.likes.add(*self.fans[:rank % 4])
+            self.episodes.append(episode)
+        Episode.objects.create(user=self.user, title="Draft", trending_no=0, active=False)
+        flush_episode_events.delay()
+
+    def test_home_returns_summaries_in_rank_order(self):
+        response = self.client.get(self.url, {"user_id": self.user.user_id, "page_size": 3})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.data["data"]
+        self.assertEqual(data["user_data"]["first_name"], "Ama")
+        self.assertEqual([episode["title"] for episode in data["all_episodes"]], ["Episode 1", "Episode 2", "Episode 3"])
+        first = data["all_episodes"][0]
+        self.assertEqual((first["like_count"], first["share_count"], first["tag_ids"]), (1, 0, [self.tag.pk]))
+        self.assertNotIn("likes", first)
+
+        following = self.client.get(data["next"])
+        self.assertEqual([episode["title"] for episode in following.data["data"]["all_episodes"]], ["Episode 4", "Episode 5"])
+        self.assertEqual(len(data["trending_episodes"]), 5)
+
+    def test_trending_block_is_shared_and_rebuilt_on_change(self):
+        self.client.get(self.url, {"user_id": self.user.user_id})
+
+        other = self.fans[0]
+        PersonalInfo.objects.get_or_create(user=other)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {Token.objects.get(user=other).key}")
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, {"user_id": other.user_id})
+        self.assertEqual(response.data["data"]["trending_episodes"][0]["title"], "Episode 1")
+        # Token, profile and user, one page of episodes and its tags; no trending query.
+        self.assertEqual(len(queries), 4)
+
+        Episode.objects.filter(pk=self.episodes[0].pk).update(trending_no=9)
+        self.episodes[4].title = "Renamed"
+        self.episodes[4].save()
+        response = self.client.get(self.url, {"user_id": other.user_id})
+        self.assertEqual(response.data["data"]["trending_episodes"][0]["title"], "Episode 2")
+
+    def test_like_and_share_counters_follow_links(self):
+        episode = self.episodes[0]
+        episode.shared_episodes.add(*self.fans)
+        self.fans[1].episode_likes.add(episode)
+        episode.refresh_from_db()
+        self.assertEqual((episode.like_count, episode.share_count), (1, 0))
+
+        self.assertEqual(flush_episode_events.delay().get(), 1)
+        episode.refresh_from_db()
+        self.assertEqual((episode.like_count, episode.share_count), (2, 3))
+
+        episode.shared_episodes.remove(self.fans[0])
+        self.fans[0].episode_likes.clear()
+        flush_episode_events.delay()
+        episode.refresh_from_db()
+        self.assertEqual((episode.like_count, episode.share_count), (1, 2))
+
+        Episode.objects.filter(pk=episode.pk).update(like_count=40)
+        self.assertEqual(reconcile_episode_counts.delay().get(), 1)
+        episode.refresh_from_db()
+        self.assertEqual(episode.like_count, 1)
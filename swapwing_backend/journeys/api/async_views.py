@@ -0,0 +1,20 @@
+"""Async variants of the journey read endpoints (see ``mysite.async_api``)."""
+
+from journeys.api.views import JourneyViewSet
+from mysite import response_cache
+from mysite.async_api import async_read_view
+from mysite.response_cache import cached_response
+
+
+@async_read_view(JourneyViewSet, "list", {"get": "list", "post": "create"})
+@cached_response(response_cache.JOURNEYS, vary_on_user=True)
+async def list_journeys(view, request):
+    queryset = view.filter_queryset(view.get_queryset())
+    page = await view.paginator.apaginate_queryset(queryset, request, view=view)
+    following = view.following_queryset(page)
+    context = view.get_serializer_context()
+    context["following_journey_ids"] = (
+        {str(journey_id) async for journey_id in following} if following is not None else set()
+    )
+    serializer = view.get_serializer(page, many=True, context=context)
+    return view.get_paginated_response(serializer.data)
@@ -14,9 +14,14 @@ from journeys.models import (
     JourneyStepStatus,
 )
 from listings.models import Listing
+from uploads.derivatives import variant_urls
+from uploads.media import bulk_create_media
 
 User = get_user_model()
 
+SAMPLE_FOLLOWERS_SIZE = 10
+SAMPLE_FOLLOWERS_ATTR = "sample_follower_list"
+
 
 class JourneyOwnerSerializer(serializers.ModelSerializer):
     class Meta:
@@ -35,10 +40,11 @@ class JourneyFollowerSerializer(serializers.ModelSerializer):
 class JourneyStepMediaSerializer(serializers.ModelSerializer):
     url = serializers.SerializerMethodField()
     source = serializers.SerializerMethodField()
+    variants = serializers.SerializerMethodField()
 
     class Meta:
         model = JourneyStepMedia
-        fields = ("id", "media_type", "url", "source", "order")
+        fields = ("id", "media_type", "url", "source", "order", "processing_status", "variants")
         read_only_fields = fields
 
     def get_url(self, obj: JourneyStepMedia) -> str | None:
@@ -55,6 +61,9 @@ class JourneyStepMediaSerializer(serializers.ModelSerializer):
     def get_source(self, obj: JourneyStepMedia) -> str:
         return "external" if obj.external_url else "upload"
 
+    def get_variants(self, obj: JourneyStepMedia) -> dict:
+        return variant_urls(obj.variants, obj.file.storage, self.context.get("request"))
+
 
 class JourneyStepSerializer(serializers.ModelSerializer):
     journey_id = serializers.UUIDField(source="journey.id", read_only=True)
@@ -190,19 +199,7 @@ class JourneyStepSerializer(serializers.ModelSerializer):
         return instance
 
     def _create_media(self, step: JourneyStep, media_files, media_urls):
-        order_start = step.media.count()
-        for index, file_obj in enumerate(media_files or [], start=1):
-            media = JourneyStepMedia(step=step, file=file_obj, order=order_start + index)
-            media.full_clean()
-            media.save()
-        for index, url in enumerate(media_urls or [], start=1):
-            media = JourneyStepMedia(
-                step=step,
-                external_url=url,
-                order=order_start + len(media_files or []) + index,
-            )
-            media.full_clean()
-            media.save()
+        bulk_create_media(JourneyStepMedia, "step", step, media_files, media_urls)
 
     def to_representation(self, instance):
         data = super().to_representation(instance)
@@ -222,7 +219,6 @@ class JourneySerializer(serializers.ModelSerializer):
         required=False,
         allow_null=True,
     )
-    followers_count = serializers.SerializerMethodField()
     is_following = serializers.SerializerMethodField()
     sample_followers = serializers.SerializerMethodField()
     next_steps_hint = serializers.SerializerMethodField()
@@ -305,9 +301,6 @@ class JourneySerializer(serializers.ModelSerializer):
             instance.save(update_fields=["published_at", "updated_at"])
         return instance
 
-    def get_followers_count(self, obj: Journey) -> int:
-        return obj.followers.count()
-
     def get_is_following(self, obj: Journey) -> bool:
         request = self.context.get("request")
         user = getattr(request, "user", None)
@@ -315,10 +308,15 @@ class JourneySerializer(serializers.ModelSerializer):
             return False
         if obj.owner_id == user.id:
             return True
-        return obj.followers.filter(id=user.id).exists()
+        following_ids = self.context.get("following_journey_ids")
+        if following_ids is not None:
+            return str(obj.id) in following_ids
+        return obj.follower_links.filter(user=user).exists()
 
     def get_sample_followers(self, obj: Journey):
-        followers = obj.followers.all()[:10]
+        followers = getattr(obj, SAMPLE_FOLLOWERS_ATTR, None)
+        if followers is None:
+            followers = obj.followers.order_by("id")[:SAMPLE_FOLLOWERS_SIZE]
         serializer = JourneyFollowerSerializer(followers, many=True, context=self.context)
         return serializer.data
 
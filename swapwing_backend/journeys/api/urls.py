@@ -1,6 +1,8 @@
+from django.conf import settings
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
+from journeys.api.async_views import list_journeys
 from journeys.api.views import JourneyStepViewSet, JourneyViewSet
 
 app_name = "journeys"
@@ -18,3 +20,7 @@ urlpatterns = [
     path("<uuid:journey_pk>/steps/", step_list, name="journey-step-list"),
     path("<uuid:journey_pk>/steps/<uuid:pk>/", step_detail, name="journey-step-detail"),
 ]
+
+if settings.API_ASYNC_READ_VIEWS:
+    # The list is served by the async variant; other methods fall through to the viewset.
+    urlpatterns = [path("", list_journeys)] + urlpatterns
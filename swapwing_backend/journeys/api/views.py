@@ -1,3 +1,6 @@
+from typing import Set
+
+from django.contrib.auth import get_user_model
 from django.db.models import Prefetch, Q
 from django.shortcuts import get_object_or_404
 from drf_spectacular.utils import (
@@ -14,7 +17,12 @@ from rest_framework.decorators import action
 from rest_framework.exceptions import PermissionDenied
 from rest_framework.response import Response
 
-from journeys.api.serializers import JourneySerializer, JourneyStepSerializer
+from journeys.api.serializers import (
+    SAMPLE_FOLLOWERS_ATTR,
+    SAMPLE_FOLLOWERS_SIZE,
+    JourneySerializer,
+    JourneyStepSerializer,
+)
 from journeys.models import (
     Journey,
     JourneyFollower,
@@ -23,6 +31,14 @@ from journeys.models import (
     JourneyStepStatus,
     JourneyVisibility,
 )
+from mysite import response_cache
+from mysite.response_cache import cached_response
+from notifications.fanout import queue_fan_out
+from search.models import SearchDocumentKind
+from search.services import matching_object_ids
+from uploads.streaming import StreamingUploadMixin
+
+User = get_user_model()
 
 
 class IsJourneyOwnerOrReadOnly(permissions.BasePermission):
@@ -61,13 +77,15 @@ class IsJourneyOwnerOrReadOnly(permissions.BasePermission):
                 name="search",
                 type=OpenApiTypes.STR,
                 location=OpenApiParameter.QUERY,
-                description="Keyword search across the journey title, description, and tags.",
+                description="Full-text search across the journey title, tags, and description. "
+                "Every word is matched as a prefix.",
             ),
             OpenApiParameter(
                 name="ordering",
                 type=OpenApiTypes.STR,
                 location=OpenApiParameter.QUERY,
-                description="Comma separated ordering fields (defaults to `-created_at`).",
+                description="Sort key for cursor pagination: `created_at` or `-created_at` "
+                "(defaults to `-created_at`).",
             ),
             OpenApiParameter(
                 name="include_steps",
@@ -88,6 +106,12 @@ class JourneyViewSet(viewsets.ModelViewSet):
     serializer_class = JourneySerializer
     authentication_classes = [TokenAuthentication]
     permission_classes = [permissions.IsAuthenticated, IsJourneyOwnerOrReadOnly]
+    cursor_ordering_fields = {"created_at": ("created_at", "id")}
+    cursor_default_ordering = "-created_at"
+
+    @cached_response(response_cache.JOURNEYS, vary_on_user=True)
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
 
     def get_permissions(self):
         if self.action in {"list", "retrieve", "follow"}:
@@ -102,7 +126,12 @@ class JourneyViewSet(viewsets.ModelViewSet):
             Journey.objects.select_related("owner", "starting_listing")
             .prefetch_related(
                 Prefetch("steps", queryset=JourneyStep.objects.prefetch_related("media")),
-                "followers",
+                # Sliced prefetches run as one windowed query for the whole page.
+                Prefetch(
+                    "followers",
+                    queryset=User.objects.order_by("id")[:SAMPLE_FOLLOWERS_SIZE],
+                    to_attr=SAMPLE_FOLLOWERS_ATTR,
+                ),
             )
         )
 
@@ -135,19 +164,36 @@ class JourneyViewSet(viewsets.ModelViewSet):
         search = params.get("search")
         if search:
             queryset = queryset.filter(
-                Q(title__icontains=search)
-                | Q(description__icontains=search)
-                | Q(tags__icontains=search)
+                id__in=matching_object_ids(SearchDocumentKind.JOURNEY, search)
             )
 
-        ordering = params.get("ordering")
-        if ordering:
-            queryset = queryset.order_by(*[term.strip() for term in ordering.split(",") if term.strip()])
-        else:
-            queryset = queryset.order_by("-created_at")
-
         return queryset.distinct()
 
+    def get_serializer(self, *args, **kwargs):
+        if args and self.action in {"list", "retrieve"}:
+            context = kwargs.setdefault("context", self.get_serializer_context())
+            if "following_journey_ids" not in context:
+                context["following_journey_ids"] = self._following_journey_ids(args[0])
+        return super().get_serializer(*args, **kwargs)
+
+    def following_queryset(self, data):
+        """IDs of the journeys in ``data`` the trader follows, or ``None`` if none can be."""
+
+        user = self.request.user
+        journeys = data if isinstance(data, (list, tuple)) else [data]
+        journey_ids = [journey.id for journey in journeys]
+        if not user.is_authenticated or not journey_ids:
+            return None
+        return JourneyFollower.objects.filter(
+            user=user, journey_id__in=journey_ids
+        ).values_list("journey_id", flat=True)
+
+    def _following_journey_ids(self, data) -> Set[str]:
+        following = self.following_queryset(data)
+        if following is None:
+            return set()
+        return {str(journey_id) for journey_id in following}
+
     def get_serializer_context(self):
         context = super().get_serializer_context()
         include_steps = self.action == "retrieve" or self.request.query_params.get("include_steps") in {
@@ -182,9 +228,19 @@ class JourneyViewSet(viewsets.ModelViewSet):
         if journey.owner_id != request.user.id:
             raise PermissionDenied("You cannot publish someone else's journey.")
 
+        was_draft = journey.status == JourneyStatus.DRAFT
         updated_steps = journey.steps.filter(status=JourneyStepStatus.DRAFT)
         count = updated_steps.update(status=JourneyStepStatus.PUBLISHED)
         journey.mark_published()
+        if was_draft or count:
+            body = f"{count} new step{'' if count == 1 else 's'} published." if count else "The journey is now live."
+            queue_fan_out(
+                "journey_followers",
+                str(journey.id),
+                subject=f"{journey.title[:160]} has new trades",
+                body=body,
+                data={"journey_id": str(journey.id)},
+            )
         return Response({"published": True, "steps_updated": count})
 
     @extend_schema(
@@ -218,6 +274,7 @@ class JourneyViewSet(viewsets.ModelViewSet):
     destroy=extend_schema(summary="Delete a journey step", tags=["Journey Steps"]),
 )
 class JourneyStepViewSet(
+    StreamingUploadMixin,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
     mixins.RetrieveModelMixin,
@@ -228,6 +285,8 @@ class JourneyStepViewSet(
     serializer_class = JourneyStepSerializer
     authentication_classes = [TokenAuthentication]
     permission_classes = [permissions.IsAuthenticated]
+    cursor_ordering_fields = {"sequence": ("sequence", "id")}
+    cursor_default_ordering = "sequence"
 
     def get_queryset(self):
         journey = self.get_journey()
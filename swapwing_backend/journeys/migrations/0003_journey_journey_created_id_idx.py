@@ -0,0 +1,17 @@
+# Generated by Django 4.2 on 2026-10-17 03:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('journeys', '0002_alter_journeystepmedia_file'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='journey',
+            index=models.Index(fields=['created_at', 'id'], name='journey_created_id_idx'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 4.2 on 2026-10-17 04:08
+
+from django.db import migrations, models
+
+from mysite.counters import reconcile_counter
+
+
+def backfill_followers_count(apps, schema_editor):
+    reconcile_counter(
+        apps.get_model("journeys", "Journey"),
+        "followers_count",
+        apps.get_model("journeys", "JourneyFollower"),
+        "journey",
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('journeys', '0003_journey_journey_created_id_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='journey',
+            name='followers_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_followers_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2 on 2026-10-17 05:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('journeys', '0004_journey_followers_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='journeystepmedia',
+            name='content_type',
+            field=models.CharField(blank=True, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='journeystepmedia',
+            name='processing_status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('ready', 'Ready'), ('failed', 'Failed')], default='ready', max_length=16),
+        ),
+        migrations.AddField(
+            model_name='journeystepmedia',
+            name='size_bytes',
+            field=models.PositiveBigIntegerField(blank=True, null=True),
+        ),
+    ]
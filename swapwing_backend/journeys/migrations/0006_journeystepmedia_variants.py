@@ -0,0 +1,18 @@
+# Generated by Django 4.2 on 2026-10-17 05:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('journeys', '0005_journeystepmedia_processing'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='journeystepmedia',
+            name='variants',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
@@ -11,9 +11,12 @@ from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator
 from django.db import models
+from django.db.models.signals import post_delete, post_save
 from django.utils import timezone
 
 from listings.models import Listing
+from mysite.counters import adjust_counter
+from mysite.response_cache import JOURNEYS, invalidate_on_change
 
 
 class JourneyVisibility(models.TextChoices):
@@ -78,6 +81,7 @@ class Journey(models.Model):
         related_name="followed_journeys",
         blank=True,
     )
+    followers_count = models.PositiveIntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -87,6 +91,7 @@ class Journey(models.Model):
             models.Index(fields=["status"]),
             models.Index(fields=["visibility"]),
             models.Index(fields=["owner"]),
+            models.Index(fields=["created_at", "id"], name="journey_created_id_idx"),
         ]
 
     def __str__(self) -> str:  # pragma: no cover - debug helper
@@ -207,6 +212,11 @@ class JourneyStepMedia(models.Model):
         IMAGE = "image", "Image"
         VIDEO = "video", "Video"
 
+    class ProcessingStatus(models.TextChoices):
+        PENDING = "pending", "Pending"
+        READY = "ready", "Ready"
+        FAILED = "failed", "Failed"
+
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     step = models.ForeignKey(
         JourneyStep,
@@ -225,6 +235,16 @@ class JourneyStepMedia(models.Model):
     )
     external_url = models.URLField(blank=True)
     order = models.PositiveIntegerField(default=0)
+    # Filled in by uploads.tasks.process_media once the stored file is inspected.
+    content_type = models.CharField(max_length=100, blank=True)
+    size_bytes = models.PositiveBigIntegerField(null=True, blank=True)
+    processing_status = models.CharField(
+        max_length=16,
+        choices=ProcessingStatus.choices,
+        default=ProcessingStatus.READY,
+    )
+    # Resized copies written by uploads.derivatives: {variant: {name, width, height, format, bytes}}.
+    variants = models.JSONField(default=dict, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
@@ -239,3 +259,21 @@ class JourneyStepMedia(models.Model):
 
     def __str__(self) -> str:  # pragma: no cover - debug helper
         return f"Media {self.id} for step {self.step_id}"
+
+
+# Keep Journey.followers_count in step with follow links
+def post_save_follower_count_receiver(sender, instance, created, *args, **kwargs):
+    if created:
+        adjust_counter(Journey, instance.journey_id, "followers_count", 1)
+
+
+def post_delete_follower_count_receiver(sender, instance, *args, **kwargs):
+    adjust_counter(Journey, instance.journey_id, "followers_count", -1)
+
+
+post_save.connect(post_save_follower_count_receiver, sender=JourneyFollower)
+post_delete.connect(post_delete_follower_count_receiver, sender=JourneyFollower)
+
+
+# Orphan cached discovery responses whenever their source rows change
+invalidate_on_change(JOURNEYS, Journey, JourneyFollower, JourneyStep, JourneyStepMedia)
@@ -0,0 +1,13 @@
+"""Celery tasks for journey bookkeeping."""
+
+from celery import shared_task
+
+from journeys.models import Journey, JourneyFollower
+from mysite.counters import reconcile_counter
+
+
+@shared_task
+def reconcile_follower_counts():
+    """Repair ``Journey.followers_count`` drift; returns rows corrected."""
+
+    return reconcile_counter(Journey, "followers_count", JourneyFollower, "journey")
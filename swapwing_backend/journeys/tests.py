@@ -5,7 +5,9 @@ from io import BytesIO
 
 from django.contrib.auth import get_user_model
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
 from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from PIL import Image
 from rest_framework import status
@@ -20,6 +22,7 @@ from journeys.models import (
     JourneyStepStatus,
     JourneyVisibility,
 )
+from journeys.tasks import reconcile_follower_counts
 from listings.models import Listing, ListingCategory
 
 User = get_user_model()
@@ -134,15 +137,15 @@ class JourneyAPITests(APITestCase):
 
         response = self.client.get(self.list_url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        returned_titles = {item["title"] for item in response.data}
+        returned_titles = {item["title"] for item in response.data["results"]}
         self.assertIn(public_journey.title, returned_titles)
         self.assertIn(followers_only.title, returned_titles)
         self.assertNotIn("Private Journey", returned_titles)
 
         following_response = self.client.get(self.list_url, {"following": "true"})
         self.assertEqual(following_response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(following_response.data), 1)
-        self.assertEqual(following_response.data[0]["title"], followers_only.title)
+        self.assertEqual(len(following_response.data["results"]), 1)
+        self.assertEqual(following_response.data["results"][0]["title"], followers_only.title)
 
     def test_publish_endpoint_marks_steps_active(self):
         journey = Journey.objects.create(
@@ -175,9 +178,53 @@ class JourneyAPITests(APITestCase):
         self.assertEqual(follow_response.status_code, status.HTTP_200_OK)
         self.assertTrue(JourneyFollower.objects.filter(journey=journey, user=self.owner).exists())
 
+        journey.refresh_from_db()
+        self.assertEqual(journey.followers_count, 1)
+
+        self.client.post(url)
+        journey.refresh_from_db()
+        self.assertEqual(journey.followers_count, 1)
+
         unfollow_response = self.client.delete(url)
         self.assertEqual(unfollow_response.status_code, status.HTTP_204_NO_CONTENT)
         self.assertFalse(JourneyFollower.objects.filter(journey=journey, user=self.owner).exists())
+        journey.refresh_from_db()
+        self.assertEqual(journey.followers_count, 0)
+
+    def test_list_reads_follow_state_without_per_row_queries(self):
+        def _create_followed(count):
+            for index in range(count):
+                journey = Journey.objects.create(owner=self.other, title=f"Build {index}")
+                JourneyFollower.objects.create(journey=journey, user=self.owner)
+                JourneyFollower.objects.create(journey=journey, user=self.viewer)
+
+        def _list_queries():
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(self.list_url, {"page_size": 50})
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            return len(queries), response.data["results"]
+
+        _create_followed(2)
+        small, _ = _list_queries()
+        _create_followed(8)
+        large, results = _list_queries()
+
+        self.assertEqual(small, large)
+        self.assertEqual(len(results), 10)
+        for item in results:
+            self.assertEqual(item["followers_count"], 2)
+            self.assertTrue(item["is_following"])
+            self.assertEqual(len(item["sample_followers"]), 2)
+
+    def test_reconcile_task_repairs_follower_count_drift(self):
+        journey = Journey.objects.create(owner=self.other, title="Drifting")
+        JourneyFollower.objects.create(journey=journey, user=self.owner)
+        Journey.objects.filter(pk=journey.pk).update(followers_count=7)
+
+        self.assertEqual(reconcile_follower_counts(), 1)
+        journey.refresh_from_db()
+        self.assertEqual(journey.followers_count, 1)
+        self.assertEqual(reconcile_follower_counts(), 0)
 
     def test_follower_cannot_modify_steps(self):
         journey = Journey.objects.create(
@@ -201,4 +248,4 @@ class JourneyAPITests(APITestCase):
 
         list_response = self.client.get(step_list_url)
         self.assertEqual(list_response.status_code, status.HTTP_200_OK)
-        self.assertEqual(list_response.data, [])
+        self.assertEqual(list_response.data["results"], [])
@@ -0,0 +1,12 @@
+"""Async variants of the listing read endpoints (see ``mysite.async_api``)."""
+
+from listings.api.view import ListingViewSet, varies_by_owner
+from mysite import response_cache
+from mysite.async_api import async_read_view, list_page
+from mysite.response_cache import cached_response
+
+
+@async_read_view(ListingViewSet, "list", {"get": "list", "post": "create"})
+@cached_response(response_cache.LISTINGS, vary_on_user=varies_by_owner)
+async def browse_listings(view, request):
+    return await list_page(view, request)
@@ -7,6 +7,8 @@ from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
 
 from listings.models import Listing, ListingMedia
+from uploads.derivatives import variant_urls
+from uploads.media import bulk_create_media
 
 User = get_user_model()
 
@@ -21,10 +23,11 @@ class ListingOwnerSerializer(serializers.ModelSerializer):
 class ListingMediaSerializer(serializers.ModelSerializer):
     url = serializers.SerializerMethodField()
     source = serializers.SerializerMethodField()
+    variants = serializers.SerializerMethodField()
 
     class Meta:
         model = ListingMedia
-        fields = ("id", "media_type", "url", "source", "order")
+        fields = ("id", "media_type", "url", "source", "order", "processing_status", "variants")
         read_only_fields = fields
 
     def get_url(self, obj: ListingMedia) -> str | None:
@@ -41,6 +44,9 @@ class ListingMediaSerializer(serializers.ModelSerializer):
     def get_source(self, obj: ListingMedia) -> str:
         return "external" if obj.external_url else "upload"
 
+    def get_variants(self, obj: ListingMedia) -> dict:
+        return variant_urls(obj.variants, obj.file.storage, self.context.get("request"))
+
 
 class ListingSerializer(serializers.ModelSerializer):
     owner = ListingOwnerSerializer(read_only=True)
@@ -181,19 +187,7 @@ class ListingSerializer(serializers.ModelSerializer):
         return instance
 
     def _create_media(self, listing: Listing, media_files, media_urls):
-        order_start = listing.media.count()
-        for index, file_obj in enumerate(media_files or [], start=1):
-            media = ListingMedia(listing=listing, file=file_obj, order=order_start + index)
-            media.full_clean()
-            media.save()
-        for index, url in enumerate(media_urls or [], start=1):
-            media = ListingMedia(
-                listing=listing,
-                external_url=url,
-                order=order_start + len(media_files or []) + index,
-            )
-            media.full_clean()
-            media.save()
+        bulk_create_media(ListingMedia, "listing", listing, media_files, media_urls)
 
     def to_representation(self, instance):
         data = super().to_representation(instance)
@@ -1,5 +1,8 @@
+from django.conf import settings
+from django.urls import path
 from rest_framework.routers import DefaultRouter
 
+from listings.api.async_views import browse_listings
 from listings.api.view import ListingViewSet
 
 app_name = "listings"
@@ -8,3 +11,7 @@ router = DefaultRouter()
 router.register(r"", ListingViewSet, basename="listing")
 
 urlpatterns = router.urls
+
+if settings.API_ASYNC_READ_VIEWS:
+    # Browse is served by the async variant; other methods fall through to the viewset.
+    urlpatterns = [path("", browse_listings)] + urlpatterns
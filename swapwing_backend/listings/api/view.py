@@ -1,6 +1,5 @@
 from decimal import Decimal, InvalidOperation
 
-from django.db.models import Q
 from drf_spectacular.utils import (
     OpenApiParameter,
     OpenApiTypes,
@@ -13,6 +12,17 @@ from rest_framework.exceptions import ValidationError
 
 from listings.api.serializers import ListingSerializer
 from listings.models import Listing, ListingStatus
+from mysite import response_cache
+from mysite.response_cache import cached_response
+from search.models import SearchDocumentKind
+from search.services import matching_object_ids
+from uploads.streaming import StreamingUploadMixin
+
+
+def varies_by_owner(request) -> bool:
+    """Only ``owner=me`` browse pages differ between traders."""
+
+    return request.query_params.get("owner") == "me"
 
 
 class IsOwnerOrReadOnly(permissions.BasePermission):
@@ -32,7 +42,8 @@ class IsOwnerOrReadOnly(permissions.BasePermission):
                 name="search",
                 type=OpenApiTypes.STR,
                 location=OpenApiParameter.QUERY,
-                description="Keyword search across title, description, tags, and location.",
+                description="Full-text search across title, tags, description, and location. "
+                "Every word is matched as a prefix.",
             ),
             OpenApiParameter(
                 name="category",
@@ -76,7 +87,8 @@ class IsOwnerOrReadOnly(permissions.BasePermission):
                 name="ordering",
                 type=OpenApiTypes.STR,
                 location=OpenApiParameter.QUERY,
-                description="Comma separated list of fields to order by (e.g. `-created_at`).",
+                description="Sort key for cursor pagination: `created_at` or `estimated_value`, "
+                "prefixed with `-` for descending (defaults to `-created_at`).",
             ),
         ],
         tags=["Listings"],
@@ -91,10 +103,19 @@ class IsOwnerOrReadOnly(permissions.BasePermission):
         tags=["Listings"],
     ),
 )
-class ListingViewSet(viewsets.ModelViewSet):
+class ListingViewSet(StreamingUploadMixin, viewsets.ModelViewSet):
     serializer_class = ListingSerializer
     authentication_classes = [TokenAuthentication]
     permission_classes = [permissions.IsAuthenticated, IsOwnerOrReadOnly]
+    cursor_ordering_fields = {
+        "created_at": ("created_at", "id"),
+        "estimated_value": ("estimated_value", "id"),
+    }
+    cursor_default_ordering = "-created_at"
+
+    @cached_response(response_cache.LISTINGS, vary_on_user=varies_by_owner)
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
 
     def get_queryset(self):
         queryset = Listing.objects.select_related("owner").prefetch_related("media")
@@ -111,10 +132,7 @@ class ListingViewSet(viewsets.ModelViewSet):
         search = params.get("search")
         if search:
             queryset = queryset.filter(
-                Q(title__icontains=search)
-                | Q(description__icontains=search)
-                | Q(tags__icontains=search)
-                | Q(location__icontains=search)
+                id__in=matching_object_ids(SearchDocumentKind.LISTING, search)
             )
 
         categories = params.getlist("category") or []
@@ -157,10 +175,6 @@ class ListingViewSet(viewsets.ModelViewSet):
         if errors:
             raise ValidationError(errors)
 
-        ordering = params.get("ordering")
-        if ordering:
-            queryset = queryset.order_by(*[term.strip() for term in ordering.split(",") if term.strip()])
-
         return queryset
 
     def perform_create(self, serializer):
@@ -0,0 +1,18 @@
+# Generated by Django 4.2 on 2026-10-17 05:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('listings', '0003_listingmedia_processing'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='listingmedia',
+            name='variants',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
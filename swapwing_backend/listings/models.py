@@ -8,6 +8,8 @@ from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator
 from django.db import models
 
+from mysite.response_cache import LISTINGS, invalidate_on_change
+
 
 class ListingCategory(models.TextChoices):
     GOODS = "goods", "Goods"
@@ -66,6 +68,8 @@ class Listing(models.Model):
             models.Index(fields=["status"]),
             models.Index(fields=["category"]),
             models.Index(fields=["is_trade_up_eligible"]),
+            models.Index(fields=["created_at", "id"], name="listing_created_id_idx"),
+            models.Index(fields=["estimated_value", "id"], name="listing_value_id_idx"),
         ]
 
     def clean(self):
@@ -94,6 +98,11 @@ class ListingMedia(models.Model):
         IMAGE = "image", "Image"
         VIDEO = "video", "Video"
 
+    class ProcessingStatus(models.TextChoices):
+        PENDING = "pending", "Pending"
+        READY = "ready", "Ready"
+        FAILED = "failed", "Failed"
+
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     listing = models.ForeignKey(
         Listing,
@@ -108,6 +117,16 @@ class ListingMedia(models.Model):
     file = models.FileField(upload_to=listing_media_upload_to, blank=True)
     external_url = models.URLField(blank=True)
     order = models.PositiveIntegerField(default=0)
+    # Filled in by uploads.tasks.process_media once the stored file is inspected.
+    content_type = models.CharField(max_length=100, blank=True)
+    size_bytes = models.PositiveBigIntegerField(null=True, blank=True)
+    processing_status = models.CharField(
+        max_length=16,
+        choices=ProcessingStatus.choices,
+        default=ProcessingStatus.READY,
+    )
+    # Resized copies written by uploads.derivatives: {variant: {name, width, height, format, bytes}}.
+    variants = models.JSONField(default=dict, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
@@ -122,3 +141,7 @@ class ListingMedia(models.Model):
 
     def __str__(self) -> str:
         return f"Media {self.id} for listing {self.listing_id}"
+
+
+# Orphan cached discovery responses whenever their source rows change
+invalidate_on_change(LISTINGS, Listing, ListingMedia)
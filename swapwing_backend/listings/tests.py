@@ -106,8 +106,8 @@ class ListingAPITests(APITestCase):
             {"category": ListingCategory.ELECTRONICS, "search": "vintage"},
         )
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]["title"], "Vintage Camera")
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(response.data["results"][0]["title"], "Vintage Camera")
 
     def test_only_owner_can_update_listing(self):
         listing = Listing.objects.create(
@@ -5,17 +5,19 @@ from channels.routing import ProtocolTypeRouter, URLRouter
 from channels.security.websocket import AllowedHostsOriginValidator
 from django.core.asgi import get_asgi_application
 
-from mysite import routing
-
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "mysite.settings")
 
 django_asgi_app = get_asgi_application()
 
+# Routing pulls in models, so it is imported once the app registry is ready.
+from mysite import routing  # noqa: E402
+from mysite.channels_auth import TokenAuthMiddleware  # noqa: E402
+
 application = ProtocolTypeRouter(
     {
         "http": django_asgi_app,
         "websocket": AllowedHostsOriginValidator(
-            AuthMiddlewareStack(URLRouter(routing.websocket_urlpatterns))
+            AuthMiddlewareStack(TokenAuthMiddleware(URLRouter(routing.websocket_urlpatterns)))
         )
     }
-)
\ No newline at end of file
+)
@@ -0,0 +1,124 @@
+"""Async-native variants of hot DRF read endpoints for the ASGI serving mode.
+
+DRF 3.14 views are synchronous, so under ASGI every request to them is handed
+to a worker thread. ``async_read_view`` wraps a coroutine handler in an
+``async def`` Django view that reuses the viewset's queryset building,
+filtering, permissions, serializers and exception handling, but performs
+token authentication and its database reads with Django's async ORM.
+Serializers must therefore only see prefetched data; a lazy query raises
+``SynchronousOnlyOperation`` instead of silently blocking the event loop.
+
+Requests with any method other than the handled one are passed to the
+regular synchronous viewset view, so the async route can sit in front of
+the router's route for the same URL.
+"""
+
+from __future__ import annotations
+
+from functools import wraps
+from typing import Awaitable, Callable, Dict
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import AnonymousUser
+from django.core.exceptions import ObjectDoesNotExist
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.http import Http404
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import get_authorization_header
+from rest_framework.authtoken.models import Token
+
+
+async def authenticate_token(request):
+    """Async counterpart of ``TokenAuthentication.authenticate``.
+
+    Returns ``(user, token)``; anonymous requests get ``(AnonymousUser(), None)``.
+    """
+
+    auth = get_authorization_header(request).split()
+    if not auth or auth[0].lower() != b"token":
+        return AnonymousUser(), None
+    if len(auth) == 1:
+        raise exceptions.AuthenticationFailed(_("Invalid token header. No credentials provided."))
+    if len(auth) > 2:
+        raise exceptions.AuthenticationFailed(
+            _("Invalid token header. Token string should not contain spaces.")
+        )
+    try:
+        key = auth[1].decode()
+    except UnicodeError as exc:
+        raise exceptions.AuthenticationFailed(
+            _("Invalid token header. Token string should not contain invalid characters.")
+        ) from exc
+
+    try:
+        token = await Token.objects.select_related("user").aget(key=key)
+    except Token.DoesNotExist as exc:
+        raise exceptions.AuthenticationFailed(_("Invalid token.")) from exc
+    if not token.user.is_active:
+        raise exceptions.AuthenticationFailed(_("User inactive or deleted."))
+    return token.user, token
+
+
+def async_read_view(
+    viewset_class,
+    action: str,
+    actions: Dict[str, str],
+    method: str = "get",
+) -> Callable[..., Awaitable]:
+    """Decorate ``handler(view, request, *args, **kwargs)`` as an async Django view.
+
+    ``action`` is the viewset action the handler replaces (so ``get_queryset``,
+    ``get_permissions`` and friends behave as for the sync view) and
+    ``actions`` is the router's method map for the URL, used to build the
+    synchronous fallback for other methods.
+    """
+
+    fallback = sync_to_async(viewset_class.as_view(actions))
+
+    def decorator(handler):
+        @wraps(handler)
+        async def view(request, *args, **kwargs):
+            if request.method.lower() != method:
+                return await fallback(request, *args, **kwargs)
+
+            viewset = viewset_class(action_map={method: action})
+            viewset.args, viewset.kwargs, viewset.format_kwarg = args, kwargs, None
+            viewset.headers = viewset.default_response_headers
+            drf_request = viewset.initialize_request(request, *args, **kwargs)
+            viewset.request = drf_request
+            try:
+                drf_request.user, drf_request.auth = await authenticate_token(request)
+                viewset.initial(drf_request, *args, **kwargs)
+                response = await handler(viewset, drf_request, *args, **kwargs)
+            except Exception as exc:
+                response = viewset.handle_exception(exc)
+            response = viewset.finalize_response(drf_request, response, *args, **kwargs)
+            return response.render()
+
+        view.csrf_exempt = True
+        return view
+
+    return decorator
+
+
+async def get_object(view):
+    """``GenericAPIView.get_object`` using the async ORM."""
+
+    queryset = view.filter_queryset(view.get_queryset())
+    lookup_url_kwarg = view.lookup_url_kwarg or view.lookup_field
+    try:
+        obj = await queryset.aget(**{view.lookup_field: view.kwargs[lookup_url_kwarg]})
+    except (ObjectDoesNotExist, DjangoValidationError, TypeError, ValueError) as exc:
+        raise Http404 from exc
+    view.check_object_permissions(view.request, obj)
+    return obj
+
+
+async def list_page(view, request):
+    """``ListModelMixin.list`` with the page fetched through the async ORM."""
+
+    queryset = view.filter_queryset(view.get_queryset())
+    page = await view.paginator.apaginate_queryset(queryset, request, view=view)
+    serializer = view.get_serializer(page, many=True)
+    return view.get_paginated_response(serializer.data)
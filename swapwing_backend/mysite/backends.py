@@ -0,0 +1,52 @@
+"""Pluggable storage backends selected by a setting.
+
+Leaderboards, the episode event buffer, the activity sink and push delivery
+each ship a shared implementation (Redis, FCM) and an in-process ``memory``
+one. A ``BackendRegistry`` maps the setting's value to a class, builds the
+instance on first use and reuses it for the life of the process.
+
+``memory`` state is private to the process that holds it, while writers run
+in web workers and readers or flushers in other workers and in Celery, so
+the registries default to ``redis``. Tests select ``memory`` and call
+``reset`` between cases. Push delivery shares no state and passes its own
+default.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Optional
+
+from django.conf import settings
+
+MEMORY = "memory"
+REDIS = "redis"
+
+
+class BackendRegistry:
+    def __init__(self, setting: str, backends: Dict[str, type], label: str, default: Optional[str] = REDIS):
+        self.setting = setting
+        self.backends = backends
+        self.label = label
+        self.default = default
+        self._instances: Dict[str, object] = {}
+
+    def name(self) -> str:
+        return getattr(settings, self.setting, self.default)
+
+    def get(self):
+        """Return the configured backend, instantiating it once per process."""
+
+        name = self.name()
+        if name not in self.backends:
+            raise ValueError(f"Unknown {self.label}: {name}")
+        if name not in self._instances:
+            self._instances[name] = self.backends[name]()
+        return self._instances[name]
+
+    def reset(self) -> None:
+        """Drop cached instances, clearing in-process state first."""
+
+        memory = self._instances.get(MEMORY)
+        if memory is not None:
+            memory.clear()
+        self._instances.clear()
@@ -0,0 +1,41 @@
+"""Token authentication for websocket connections.
+
+Mobile clients authenticate REST calls with DRF tokens and carry no session
+cookie, so the websocket handshake accepts the same key either as an
+``Authorization: Token <key>`` header or a ``?token=<key>`` query parameter.
+Connections without a token keep the session user set by
+``AuthMiddlewareStack``.
+"""
+
+from urllib.parse import parse_qs
+
+from channels.db import database_sync_to_async
+from channels.middleware import BaseMiddleware
+from django.contrib.auth.models import AnonymousUser
+from rest_framework.authtoken.models import Token
+
+
+def token_key_from_scope(scope):
+    for name, value in scope.get("headers", []):
+        if name == b"authorization":
+            keyword, _, key = value.decode("latin1").partition(" ")
+            if keyword.lower() == "token" and key:
+                return key.strip()
+    params = parse_qs(scope.get("query_string", b"").decode("latin1"))
+    return params.get("token", [None])[0]
+
+
+@database_sync_to_async
+def user_for_token(key):
+    token = Token.objects.select_related("user").filter(key=key).first()
+    if token is None or not token.user.is_active:
+        return AnonymousUser()
+    return token.user
+
+
+class TokenAuthMiddleware(BaseMiddleware):
+    async def __call__(self, scope, receive, send):
+        key = token_key_from_scope(scope)
+        if key:
+            scope = dict(scope, user=await user_for_token(key))
+        return await super().__call__(scope, receive, send)
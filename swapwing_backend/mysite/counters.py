@@ -0,0 +1,60 @@
+"""Denormalized counter columns kept in step with child rows.
+
+Counters are bumped with single ``UPDATE ... SET n = n + 1`` statements from
+``post_save``/``post_delete`` receivers, so concurrent writers never lose an
+increment. Writes that bypass model signals (``bulk_create``, raw SQL,
+``QuerySet.update`` on the foreign key) can still drift; ``reconcile_counter``
+is run periodically by Celery beat to repair them in one statement.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable, Optional
+
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def adjust_counter(model, pk, field: str, delta: int) -> None:
+    """Atomically add ``delta`` to ``field`` on one row, never going below zero."""
+
+    queryset = model._default_manager.filter(pk=pk)
+    if delta < 0:
+        queryset = queryset.filter(**{f"{field}__gte": -delta})
+    queryset.update(**{field: F(field) + delta})
+
+
+def reconcile_counter(
+    model,
+    field: str,
+    child_model,
+    fk_name: str,
+    child_filter: Optional[dict] = None,
+    pks: Optional[Iterable] = None,
+) -> int:
+    """Reset ``field`` to the live child row count where they disagree.
+
+    ``child_filter`` narrows the children counted (``{"read": False}`` for an
+    unread counter) and ``pks`` the parent rows checked. Returns the number of
+    parent rows corrected.
+    """
+
+    actual = Coalesce(
+        Subquery(
+            child_model._default_manager.filter(**{fk_name: OuterRef("pk")}, **(child_filter or {}))
+            .order_by()
+            .values(fk_name)
+            .annotate(total=Count("pk"))
+            .values("total"),
+            output_field=IntegerField(),
+        ),
+        Value(0),
+    )
+    parents = model._default_manager.all()
+    if pks is not None:
+        parents = parents.filter(pk__in=list(pks))
+    return (
+        parents.annotate(actual_count=actual)
+        .exclude(**{field: F("actual_count")})
+        .update(**{field: actual})
+    )
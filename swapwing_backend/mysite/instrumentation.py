@@ -0,0 +1,401 @@
+"""Per-request query, timing and cache instrumentation.
+
+``InstrumentationMiddleware`` samples a configurable fraction of requests
+(``INSTRUMENTATION_SAMPLE_RATE``). For a sampled request it tracks:
+
+* SQL queries and time spent in the database, via an execute wrapper that
+  every database connection carries (it is a no-op outside sampled requests);
+* time spent producing ``serializer.data`` and the queries issued while
+  doing so, which is where N+1 lookups from ``SerializerMethodField`` and
+  lazy relations show up;
+* response cache hits and misses (see ``mysite.response_cache``).
+
+The numbers are returned in a ``Server-Timing`` header, logged as one JSON
+line on the ``swapwing.requests`` logger, and folded into per-view counters.
+Counters accumulate in-process and are flushed to the cache every
+``INSTRUMENTATION_FLUSH_SECONDS`` so they aggregate across workers;
+``prometheus_text`` renders them for the ``/metrics`` endpoint. Counters
+cover sampled requests only; ``swapwing_instrumentation_sample_rate`` lets
+dashboards scale them back up.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import random
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, Iterable, Optional, Tuple
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections
+from django.db.backends.signals import connection_created
+from rest_framework.serializers import BaseSerializer
+
+logger = logging.getLogger("swapwing.requests")
+
+DURATION_BUCKETS = (0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+UNRESOLVED_VIEW = "<unresolved>"
+
+# Counter name -> (metric name, help, scale applied when rendering).
+COUNTERS = {
+    "requests": ("swapwing_http_requests_total", "Sampled requests.", 1),
+    "errors": ("swapwing_http_server_errors_total", "Sampled requests that returned 5xx.", 1),
+    "queries": ("swapwing_db_queries_total", "SQL queries issued by sampled requests.", 1),
+    "serializer_queries": (
+        "swapwing_serializer_queries_total",
+        "SQL queries issued while serializing responses.",
+        1,
+    ),
+    "db_us": ("swapwing_db_seconds_total", "Time spent in the database.", 1e-6),
+    "serializer_us": ("swapwing_serializer_seconds_total", "Time spent building serializer data.", 1e-6),
+    "cache_hits": ("swapwing_response_cache_hits_total", "Responses served from the response cache.", 1),
+    "cache_misses": ("swapwing_response_cache_misses_total", "Response cache misses.", 1),
+}
+
+_current: ContextVar[Optional["RequestMetrics"]] = ContextVar("swapwing_request_metrics", default=None)
+
+
+def _setting(name: str, default):
+    return getattr(settings, name, default)
+
+
+def is_enabled() -> bool:
+    return bool(_setting("INSTRUMENTATION_ENABLED", True))
+
+
+def sample_rate() -> float:
+    return float(_setting("INSTRUMENTATION_SAMPLE_RATE", 1.0))
+
+
+def should_sample() -> bool:
+    rate = sample_rate()
+    return rate >= 1 or (rate > 0 and random.random() < rate)
+
+
+class RequestMetrics:
+    """Mutable tallies for one sampled request."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.serializer_queries = 0
+        self.serializer_seconds = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.serializing = False
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+
+def current_metrics() -> Optional[RequestMetrics]:
+    return _current.get()
+
+
+# -- database --------------------------------------------------------------------
+def record_query(execute, sql, params, many, context):
+    """Database execute wrapper counting queries and time for sampled requests."""
+
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.queries += 1
+        metrics.db_seconds += time.perf_counter() - started
+        if metrics.serializing:
+            metrics.serializer_queries += 1
+
+
+def install_query_wrapper(connection) -> None:
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def _connection_created_receiver(sender, connection, **kwargs):
+    install_query_wrapper(connection)
+
+
+connection_created.connect(_connection_created_receiver, dispatch_uid="mysite.instrumentation")
+
+
+# -- serializers -----------------------------------------------------------------
+def instrument_serializers() -> None:
+    """Time the outermost ``serializer.data`` access of each sampled request.
+
+    ``Serializer.data`` and ``ListSerializer.data`` both defer to
+    ``BaseSerializer.data``, so wrapping that one property covers every
+    serializer. Nested accesses (serializers built inside method fields) are
+    attributed to the outer call.
+    """
+
+    original = BaseSerializer.data
+    if getattr(original.fget, "instrumented", False):
+        return
+
+    def data(self):
+        metrics = _current.get()
+        if metrics is None or metrics.serializing:
+            return original.fget(self)
+        metrics.serializing = True
+        started = time.perf_counter()
+        try:
+            return original.fget(self)
+        finally:
+            metrics.serializing = False
+            metrics.serializer_seconds += time.perf_counter() - started
+
+    data.instrumented = True
+    BaseSerializer.data = property(data)
+
+
+# -- cache -----------------------------------------------------------------------
+def note_cache_event(namespace: str, event: str) -> None:
+    """Called by the response cache for every lookup it resolves."""
+
+    metrics = _current.get()
+    if metrics is None:
+        return
+    if event == "miss":
+        metrics.cache_misses += 1
+    else:
+        metrics.cache_hits += 1
+
+
+# -- aggregation -----------------------------------------------------------------
+def _cache():
+    return caches[_setting("INSTRUMENTATION_CACHE_ALIAS", "default")]
+
+
+def _counter_key(view: str, counter: str) -> str:
+    return f"im:{counter}:{view}"
+
+
+def _bucket_key(view: str, bound) -> str:
+    return f"im:bucket:{bound}:{view}"
+
+
+VIEWS_KEY = "im:views"
+
+
+class CounterBuffer:
+    """Process-local counter deltas, periodically added to the shared cache."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.deltas: Dict[str, int] = {}
+        self.views: set = set()
+        self.flushed_at = time.monotonic()
+
+    def add(self, view: str, values: Dict[str, int], duration: float) -> None:
+        with self.lock:
+            self.views.add(view)
+            for counter, value in values.items():
+                if value:
+                    key = _counter_key(view, counter)
+                    self.deltas[key] = self.deltas.get(key, 0) + value
+            for bound in DURATION_BUCKETS:
+                if duration <= bound:
+                    key = _bucket_key(view, bound)
+                    self.deltas[key] = self.deltas.get(key, 0) + 1
+            key = _counter_key(view, "duration_us")
+            self.deltas[key] = self.deltas.get(key, 0) + int(duration * 1e6)
+            due = time.monotonic() - self.flushed_at >= _setting("INSTRUMENTATION_FLUSH_SECONDS", 10)
+        if due:
+            self.flush()
+
+    def flush(self) -> None:
+        with self.lock:
+            deltas, views = self.deltas, self.views
+            self.deltas, self.views = {}, set()
+            self.flushed_at = time.monotonic()
+        if not deltas:
+            return
+        cache = _cache()
+        for key, delta in deltas.items():
+            try:
+                cache.incr(key, delta)
+            except ValueError:
+                if not cache.add(key, delta, timeout=None):
+                    cache.incr(key, delta)
+        known = set(cache.get(VIEWS_KEY) or ())
+        if not views <= known:
+            cache.set(VIEWS_KEY, sorted(known | views), timeout=None)
+
+
+counters = CounterBuffer()
+
+
+def reset_metrics() -> None:
+    counters.flush()
+    cache = _cache()
+    views = cache.get(VIEWS_KEY) or []
+    keys = [VIEWS_KEY]
+    for view in views:
+        keys += [_counter_key(view, counter) for counter in [*COUNTERS, "duration_us"]]
+        keys += [_bucket_key(view, bound) for bound in DURATION_BUCKETS]
+    cache.delete_many(keys)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def prometheus_text(extra: Iterable[Tuple[str, str, str, dict]] = ()) -> str:
+    """Render the shared counters in the Prometheus text exposition format.
+
+    ``extra`` takes additional ``(name, type, help, samples)`` families to
+    append, where ``samples`` maps label tuples like ``(("namespace", "x"),)``
+    to values.
+    """
+
+    counters.flush()
+    cache = _cache()
+    views = cache.get(VIEWS_KEY) or []
+    keys = []
+    for view in views:
+        keys += [_counter_key(view, counter) for counter in [*COUNTERS, "duration_us"]]
+        keys += [_bucket_key(view, bound) for bound in DURATION_BUCKETS]
+    values = cache.get_many(keys) if keys else {}
+
+    lines = [
+        "# HELP swapwing_instrumentation_sample_rate Fraction of requests instrumented.",
+        "# TYPE swapwing_instrumentation_sample_rate gauge",
+        f"swapwing_instrumentation_sample_rate {sample_rate()}",
+    ]
+    for counter, (name, help_text, scale) in COUNTERS.items():
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+        for view in views:
+            value = values.get(_counter_key(view, counter), 0) * scale
+            lines.append(f'{name}{{view="{_escape(view)}"}} {value:g}')
+
+    name = "swapwing_http_request_duration_seconds"
+    lines += [f"# HELP {name} Sampled request latency.", f"# TYPE {name} histogram"]
+    for view in views:
+        label = f'view="{_escape(view)}"'
+        for bound in DURATION_BUCKETS:
+            lines.append(f'{name}_bucket{{{label},le="{bound}"}} {values.get(_bucket_key(view, bound), 0)}')
+        total = values.get(_counter_key(view, "requests"), 0)
+        lines.append(f'{name}_bucket{{{label},le="+Inf"}} {total}')
+        lines.append(f"{name}_sum{{{label}}} {values.get(_counter_key(view, 'duration_us'), 0) * 1e-6:g}")
+        lines.append(f"{name}_count{{{label}}} {total}")
+
+    for name, metric_type, help_text, samples in extra:
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {metric_type}"]
+        for labels, value in samples.items():
+            rendered = ",".join(f'{key}="{_escape(str(val))}"' for key, val in labels)
+            lines.append(f"{name}{{{rendered}}} {value:g}")
+    return "\n".join(lines) + "\n"
+
+
+# -- middleware ------------------------------------------------------------------
+def _view_name(request) -> str:
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return UNRESOLVED_VIEW
+    return match.view_name or match.route or UNRESOLVED_VIEW
+
+
+def server_timing(metrics: RequestMetrics, total: float) -> str:
+    parts = [
+        f'db;dur={metrics.db_seconds * 1000:.1f};desc="{metrics.queries} queries"',
+        f'ser;dur={metrics.serializer_seconds * 1000:.1f};desc="{metrics.serializer_queries} queries"',
+    ]
+    if metrics.cache_hits or metrics.cache_misses:
+        parts.append(f'cache;desc="{"hit" if metrics.cache_hits else "miss"}"')
+    parts.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(parts)
+
+
+def finish_request(request, response, metrics: RequestMetrics):
+    total = metrics.elapsed()
+    view = _view_name(request)
+    timing = server_timing(metrics, total)
+    existing = response.get("Server-Timing")
+    response["Server-Timing"] = f"{existing}, {timing}" if existing else timing
+
+    logger.info(
+        json.dumps(
+            {
+                "event": "request",
+                "method": request.method,
+                "path": request.path,
+                "view": view,
+                "status": response.status_code,
+                "duration_ms": round(total * 1000, 2),
+                "queries": metrics.queries,
+                "db_ms": round(metrics.db_seconds * 1000, 2),
+                "serializer_ms": round(metrics.serializer_seconds * 1000, 2),
+                "serializer_queries": metrics.serializer_queries,
+                "cache_hits": metrics.cache_hits,
+                "cache_misses": metrics.cache_misses,
+            },
+            separators=(",", ":"),
+        )
+    )
+    counters.add(
+        view,
+        {
+            "requests": 1,
+            "errors": int(response.status_code >= 500),
+            "queries": metrics.queries,
+            "serializer_queries": metrics.serializer_queries,
+            "db_us": int(metrics.db_seconds * 1e6),
+            "serializer_us": int(metrics.serializer_seconds * 1e6),
+            "cache_hits": metrics.cache_hits,
+            "cache_misses": metrics.cache_misses,
+        },
+        total,
+    )
+    return response
+
+
+class InstrumentationMiddleware:
+    """Sample requests and record their query, serializer and cache costs."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        instrument_serializers()
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not is_enabled() or not should_sample():
+            return self.get_response(request)
+        # Connections opened before this module was imported missed the
+        # connection_created hook.
+        for connection in connections.all(initialized_only=True):
+            install_query_wrapper(connection)
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return finish_request(request, response, metrics)
+
+    async def __acall__(self, request):
+        if not is_enabled() or not should_sample():
+            return await self.get_response(request)
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        # Flushing counters talks to the cache; keep it off the event loop.
+        return await sync_to_async(finish_request)(request, response, metrics)
@@ -0,0 +1,249 @@
+"""Keyset (cursor) pagination shared by the list endpoints.
+
+Pages are addressed by the sort-key values of the last row served rather than
+an offset, so fetching page 500 costs the same index range scan as page 1.
+Each view declares the sort keys it supports through ``cursor_ordering_fields``;
+every key maps to a full, unique ordering tuple (ending in the primary key)
+that is backed by a composite index on the model.
+"""
+
+from __future__ import annotations
+
+import json
+from base64 import b64decode, b64encode
+from binascii import Error as BinasciiError
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import connections
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import CursorPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+DEFAULT_CURSOR_ORDERING_FIELDS = {"created_at": ("created_at", "id")}
+
+
+def _flip(term: str) -> str:
+    return term[1:] if term.startswith("-") else f"-{term}"
+
+
+class KeysetCursorPagination(CursorPagination):
+    """Cursor pagination over a multi-column keyset.
+
+    Views may set ``cursor_ordering_fields`` (a mapping of ``ordering`` query
+    values to ascending keysets) and ``cursor_default_ordering``. A leading
+    ``-`` on the requested key flips every column in its keyset.
+    """
+
+    page_size_query_param = "page_size"
+    ordering_query_param = "ordering"
+    cursor_query_description = (
+        "Opaque cursor taken from the `next` or `previous` link of a prior page. "
+        "Cursors encode the sort-key values of the boundary row, so they stay "
+        "valid while new rows are inserted."
+    )
+    invalid_cursor_message = "Invalid cursor"
+
+    def get_page_size(self, request):
+        self.page_size = getattr(settings, "API_DEFAULT_PAGE_SIZE", 20)
+        self.max_page_size = getattr(settings, "API_MAX_PAGE_SIZE", 100)
+        return super().get_page_size(request)
+
+    # -- ordering ----------------------------------------------------------------
+    def _ordering_fields(self, view) -> Dict[str, Tuple[str, ...]]:
+        return getattr(view, "cursor_ordering_fields", DEFAULT_CURSOR_ORDERING_FIELDS)
+
+    def get_ordering(self, request, queryset, view) -> Tuple[str, ...]:
+        fields = self._ordering_fields(view)
+        requested = request.query_params.get(self.ordering_query_param)
+        if not requested:
+            requested = getattr(view, "cursor_default_ordering", f"-{next(iter(fields))}")
+        requested = requested.strip()
+        key = requested.lstrip("-")
+        if "," in requested or key not in fields:
+            allowed = ", ".join(sorted(f"{name}, -{name}" for name in fields))
+            raise ValidationError(
+                {self.ordering_query_param: f"Unsupported ordering. Choose one of: {allowed}."}
+            )
+        keyset = tuple(fields[key])
+        if requested.startswith("-"):
+            keyset = tuple(_flip(term) for term in keyset)
+        return keyset
+
+    def _order_expressions(self, ordering: Sequence[str], reverse: bool):
+        return [
+            F(term.lstrip("-")).desc() if term.startswith("-") != reverse else F(term.lstrip("-")).asc()
+            for term in ordering
+        ]
+
+    # -- keyset filtering --------------------------------------------------------
+    def _keyset_filter(self, queryset, ordering: Sequence[str], position: List, reverse: bool) -> Q:
+        """Build ``(a, b, c) > (x, y, z)`` for the ordering in traversal direction.
+
+        ``NULL`` values keep the database's native placement (largest on
+        PostgreSQL, smallest on SQLite) so the plain B-tree indexes still serve
+        the ``ORDER BY``.
+        """
+
+        model = queryset.model
+        nulls_largest = connections[queryset.db].features.nulls_order_largest
+        clause = Q(pk__in=[])
+        equal = Q()
+        for term, value in zip(ordering, position):
+            name = term.lstrip("-")
+            descending = term.startswith("-") != reverse
+            nulls_trail = descending != nulls_largest
+            if value is None:
+                beyond = Q(pk__in=[]) if nulls_trail else Q(**{f"{name}__isnull": False})
+                same = Q(**{f"{name}__isnull": True})
+            else:
+                beyond = Q(**{f"{name}__{'lt' if descending else 'gt'}": value})
+                if nulls_trail and model._meta.get_field(name).null:
+                    beyond |= Q(**{f"{name}__isnull": True})
+                same = Q(**{name: value})
+            clause |= equal & beyond
+            equal &= same
+        return clause
+
+    def _position_from_instance(self, instance, ordering: Sequence[str]) -> List:
+        position = []
+        for term in ordering:
+            field = instance._meta.get_field(term.lstrip("-"))
+            value = field.value_from_object(instance)
+            position.append(None if value is None else field.value_to_string(instance))
+        return position
+
+    def _position_to_python(self, model, ordering: Sequence[str], position: List) -> List:
+        if not isinstance(position, list) or len(position) != len(ordering):
+            raise NotFound(self.invalid_cursor_message)
+        values = []
+        for term, raw in zip(ordering, position):
+            field = model._meta.get_field(term.lstrip("-"))
+            try:
+                values.append(None if raw is None else field.to_python(raw))
+            except DjangoValidationError as exc:
+                raise NotFound(self.invalid_cursor_message) from exc
+        return values
+
+    # -- cursors -----------------------------------------------------------------
+    def decode_cursor(self, request) -> Optional[dict]:
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            payload = json.loads(b64decode(encoded.encode("ascii")).decode("utf-8"))
+            return {"position": payload["p"], "reverse": bool(payload.get("r", 0))}
+        except (BinasciiError, KeyError, TypeError, UnicodeError, ValueError) as exc:
+            raise NotFound(self.invalid_cursor_message) from exc
+
+    def encode_cursor(self, position: List, reverse: bool) -> str:
+        payload = {"p": position}
+        if reverse:
+            payload["r"] = 1
+        encoded = b64encode(json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded.decode("ascii"))
+
+    # -- pagination --------------------------------------------------------------
+    def paginate_queryset(self, queryset, request, view=None):
+        window = self._page_window(queryset, request, view)
+        if window is None:
+            return None
+        return self._set_page(list(window))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """``paginate_queryset`` for async views, fetching the page with the async ORM."""
+
+        window = self._page_window(queryset, request, view)
+        if window is None:
+            return None
+        return self._set_page([row async for row in window])
+
+    def _page_window(self, queryset, request, view):
+        """Return the ``page_size + 1`` row slice to fetch, or ``None`` when unpaginated."""
+
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        cursor = self.decode_cursor(request)
+        self._has_cursor = cursor is not None
+        self._reverse = bool(cursor and cursor["reverse"])
+        model = queryset.model
+
+        queryset = queryset.order_by(*self._order_expressions(self.ordering, self._reverse))
+        if cursor is not None:
+            position = self._position_to_python(model, self.ordering, cursor["position"])
+            queryset = queryset.filter(
+                self._keyset_filter(queryset, self.ordering, position, self._reverse)
+            )
+        return queryset[: self.page_size + 1]
+
+    def _set_page(self, results: List):
+        has_more = len(results) > self.page_size
+        self.page = results[: self.page_size]
+        if self._reverse:
+            self.page.reverse()
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self._has_cursor
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self._position_from_instance(self.page[-1], self.ordering), False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self._position_from_instance(self.page[0], self.ordering), True)
+
+    def get_paginated_response(self, data):
+        return Response(
+            OrderedDict(
+                [
+                    ("next", self.get_next_link()),
+                    ("previous", self.get_previous_link()),
+                    ("results", data),
+                ]
+            )
+        )
+
+    def get_paginated_response_schema(self, schema):
+        link = {
+            "type": "string",
+            "nullable": True,
+            "format": "uri",
+            "description": "Absolute URL carrying a stable `cursor` for the adjacent page.",
+        }
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {**link, "example": "http://api.example.org/accounts/?cursor=eyJwIjpbXX0="},
+                "previous": {**link, "example": None},
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        parameters = super().get_schema_operation_parameters(view)
+        max_page_size = getattr(settings, "API_MAX_PAGE_SIZE", 100)
+        for parameter in parameters:
+            if parameter["name"] == self.page_size_query_param:
+                parameter["description"] = f"Number of results to return per page (max {max_page_size})."
+                parameter["schema"]["maximum"] = max_page_size
+        return parameters
@@ -0,0 +1,297 @@
+"""Per-endpoint database query budgets.
+
+Every GET-capable API endpoint registered in ``mysite/urls.py`` is requested
+against the benchmark dataset (``benchmarks.dataset.generate``) at two sizes.
+An endpoint passes when
+
+* it answers with a non-error status,
+* it issues the same number of queries at both sizes, so the count does not
+  grow with the data (the usual N+1 symptom), and
+* that count stays within its budget in ``mysite/query_budgets.json``.
+
+The manifest is keyed by URL name. Each entry carries the ``budget`` and,
+where the URL needs them, ``kwargs`` (path arguments) and ``query`` (query
+string) whose ``{placeholders}`` are filled from the generated data; see
+``World``. ``auth`` is ``user`` (default), ``staff`` or ``anonymous``. An
+entry may instead carry ``skip`` (the endpoint is not measured) or ``xfail``
+(a known, strict failure that should disappear when the endpoint is fixed),
+each with a reason.
+
+This module is registered as a pytest plugin by the root ``conftest.py``;
+the tests themselves live in ``mysite/tests/test_query_budgets.py``. Run
+them with ``--query-budget-report`` to print the measured counts.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import pytest
+
+MANIFEST_PATH = Path(__file__).with_name("query_budgets.json")
+
+# Both sizes keep every list under the default page size, so a paginated
+# N+1 still shows up as extra queries at the larger size.
+SCALES = {
+    "small": dict(
+        users=4,
+        listings_per_user=1,
+        journeys_per_user=1,
+        steps_per_journey=2,
+        follows_per_user=1,
+        participations=2,
+        media_per_listing=1,
+        garage_items_per_user=1,
+        garage_services_per_user=1,
+        comments_per_item=1,
+        reactions_per_item=1,
+        notifications_per_user=1,
+        episodes_per_user=0.5,
+    ),
+    "large": dict(
+        users=9,
+        listings_per_user=2,
+        journeys_per_user=2,
+        steps_per_journey=4,
+        follows_per_user=3,
+        participations=6,
+        media_per_listing=3,
+        garage_items_per_user=3,
+        garage_services_per_user=2,
+        comments_per_item=4,
+        reactions_per_item=4,
+        notifications_per_user=4,
+        episodes_per_user=1,
+    ),
+}
+
+EXCLUDED_NAMESPACES = {"admin"}
+
+
+@dataclass(frozen=True)
+class Endpoint:
+    name: str
+    route: str
+    methods: Tuple[str, ...]
+
+
+@dataclass
+class Budget:
+    name: str
+    budget: Optional[int] = None
+    kwargs: Dict[str, str] = field(default_factory=dict)
+    query: Dict[str, str] = field(default_factory=dict)
+    auth: str = "user"
+    skip: Optional[str] = None
+    xfail: Optional[str] = None
+
+
+@dataclass
+class Measurement:
+    status: int
+    queries: int
+
+
+# -- discovery -------------------------------------------------------------------
+def _view_methods(callback) -> Tuple[str, ...]:
+    actions = getattr(callback, "actions", None)
+    if actions:
+        return tuple(sorted(actions))
+    view_class = getattr(callback, "cls", None) or getattr(callback, "view_class", None)
+    if view_class is None:
+        return ()
+    return tuple(
+        method
+        for method in view_class.http_method_names
+        if method not in {"head", "options"} and hasattr(view_class, method)
+    )
+
+
+def _walk(patterns, namespace: Optional[str], prefix: str):
+    from django.urls import URLResolver
+
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            inner = namespace
+            if pattern.namespace:
+                inner = f"{namespace}:{pattern.namespace}" if namespace else pattern.namespace
+            yield from _walk(pattern.url_patterns, inner, prefix + str(pattern.pattern))
+        else:
+            yield pattern, namespace, prefix + str(pattern.pattern)
+
+
+def discover_endpoints(urlconf: Optional[str] = None) -> List[Endpoint]:
+    """GET-capable API views in the URLconf, one per URL name.
+
+    Only DRF views are considered (the admin and static file routes are not
+    API surface), and the router's ``.json``-style format suffix routes
+    collapse into the plain route of the same name.
+    """
+
+    from django.urls import get_resolver
+    from rest_framework.views import APIView
+
+    endpoints: Dict[str, Endpoint] = {}
+    for pattern, namespace, route in _walk(get_resolver(urlconf).url_patterns, None, ""):
+        if not pattern.name or (namespace or "").split(":")[0] in EXCLUDED_NAMESPACES:
+            continue
+        view_class = getattr(pattern.callback, "cls", None)
+        if not (isinstance(view_class, type) and issubclass(view_class, APIView)):
+            continue
+        methods = _view_methods(pattern.callback)
+        if "get" not in methods:
+            continue
+        name = f"{namespace}:{pattern.name}" if namespace else pattern.name
+        endpoints.setdefault(name, Endpoint(name=name, route=route, methods=methods))
+    return sorted(endpoints.values(), key=lambda endpoint: endpoint.name)
+
+
+# -- manifest --------------------------------------------------------------------
+def load_budgets(path: Path = MANIFEST_PATH) -> Dict[str, Budget]:
+    with open(path, encoding="utf-8") as handle:
+        raw = json.load(handle)
+    return {name: Budget(name=name, **entry) for name, entry in sorted(raw["endpoints"].items())}
+
+
+# -- measurement -----------------------------------------------------------------
+class World:
+    """The generated dataset, as the values manifest placeholders refer to.
+
+    ``user_id``, ``journey`` and ``step`` belong to the requesting trader (an
+    enrolled participant); ``listing``, ``item_id``, ``service_id`` and
+    ``owner_id`` (the garage owner's ``user_id``) belong to other traders so
+    that detail views serialize foreign data.
+    """
+
+    def __init__(self, manifest: dict):
+        from django.contrib.auth import get_user_model
+        from rest_framework.authtoken.models import Token
+
+        from garage.models import GarageItem, GarageService
+        from journeys.models import JourneyStep
+        from listings.models import Listing
+
+        User = get_user_model()
+        participant = manifest["participants"][0]
+        self.user = User.objects.get(user_id=participant["user_id"])
+        self.token = participant["token"]
+        other = GarageItem.objects.exclude(item_owner=self.user).order_by("pk").first()
+        self.values = {
+            "user_id": self.user.user_id,
+            "challenge": manifest["challenge_id"],
+            "journey": participant["journey_id"],
+            "step": str(
+                JourneyStep.objects.filter(journey_id=participant["journey_id"]).values_list("pk", flat=True).first()
+            ),
+            "listing": str(Listing.objects.exclude(owner=self.user).values_list("pk", flat=True).first()),
+            "item_id": other.item_id,
+            "service_id": GarageService.objects.filter(garage=other.garage).values_list("service_id", flat=True).first(),
+            "owner_id": other.item_owner.user_id,
+        }
+        staff = User.objects.create_staffuser(email="query-budget-staff@example.com", password="budget-staff")
+        self.staff_token = Token.objects.get_or_create(user=staff)[0].key
+
+    def fill(self, template: Dict[str, str]) -> Dict[str, str]:
+        return {key: value.format(**self.values) for key, value in template.items()}
+
+    def client(self, auth: str):
+        from rest_framework.test import APIClient
+
+        client = APIClient()
+        if auth == "user":
+            client.credentials(HTTP_AUTHORIZATION=f"Token {self.token}")
+        elif auth == "staff":
+            client.credentials(HTTP_AUTHORIZATION=f"Token {self.staff_token}")
+        return client
+
+
+def measure(world: World, budget: Budget) -> Measurement:
+    """Issue one GET for ``budget``'s endpoint and count its queries."""
+
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from django.urls import reverse
+
+    url = reverse(budget.name, kwargs=world.fill(budget.kwargs) or None)
+    client = world.client(budget.auth)
+    with CaptureQueriesContext(connection) as captured:
+        response = client.get(url, world.fill(budget.query))
+    return Measurement(status=response.status_code, queries=len(captured))
+
+
+def measure_all(budgets: Dict[str, Budget]) -> Dict[str, Dict[str, Measurement]]:
+    """Measure every non-skipped endpoint at each of ``SCALES``.
+
+    Each dataset is generated inside a transaction that is rolled back, so
+    nothing outlives the call.
+    """
+
+    from django.core.cache import cache
+    from django.db import transaction
+    from django.test.utils import override_settings
+
+    from benchmarks.dataset import DatasetScale, generate
+    from challenges.leaderboard import reset_leaderboard_backend
+
+    results: Dict[str, Dict[str, Measurement]] = {name: {} for name in budgets}
+    with override_settings(RESPONSE_CACHE_ENABLED=False):
+        for label, scale in SCALES.items():
+            cache.clear()
+            reset_leaderboard_backend()
+            with transaction.atomic():
+                world = World(generate(DatasetScale(**scale)))
+                for name, budget in budgets.items():
+                    if budget.skip is None:
+                        results[name][label] = measure(world, budget)
+                transaction.set_rollback(True)
+    return results
+
+
+# -- pytest plugin ---------------------------------------------------------------
+_RESULTS = pytest.StashKey[Dict[str, Dict[str, Measurement]]]()
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--query-budget-report",
+        action="store_true",
+        default=False,
+        help="Print the measured query count of every API endpoint.",
+    )
+
+
+def pytest_generate_tests(metafunc):
+    if "query_budget" not in metafunc.fixturenames:
+        return
+    params = []
+    for name, budget in load_budgets().items():
+        marks = []
+        if budget.skip:
+            marks.append(pytest.mark.skip(reason=budget.skip))
+        elif budget.xfail:
+            marks.append(pytest.mark.xfail(reason=budget.xfail, strict=True))
+        params.append(pytest.param(budget, id=name, marks=marks))
+    metafunc.parametrize("query_budget", params)
+
+
+@pytest.fixture
+def query_budget_measurements(request, db) -> Dict[str, Dict[str, Measurement]]:
+    """Measurements for every manifest entry, taken once per session."""
+
+    stash = request.config.stash
+    if _RESULTS not in stash:
+        stash[_RESULTS] = measure_all(load_budgets())
+    return stash[_RESULTS]
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    if not config.getoption("--query-budget-report") or _RESULTS not in config.stash:
+        return
+    budgets = load_budgets()
+    terminalreporter.section("query budgets")
+    for name, sizes in config.stash[_RESULTS].items():
+        counts = " ".join(f"{label}={sizes[label].queries}" for label in SCALES if label in sizes)
+        terminalreporter.write_line(f"{name:<48} {counts or 'skipped':<20} budget={budgets[name].budget}")
@@ -0,0 +1,295 @@
+"""Versioned response cache for the read-heavy discovery endpoints.
+
+Cached payloads live under keys that embed a per-namespace version number
+(``listings``, ``journeys``, ``challenges``, ``episodes``). Model signals bump the version
+whenever a row that feeds the namespace changes, which orphans every cached
+page at once without scanning keys; orphans simply age out. Garage item
+details (``garage_items``) are versioned per item instead, see
+``garage.loaders``.
+
+Stampede protection works in two layers. Entries carry a soft expiry ahead of
+the real cache timeout: once it passes, a single request takes a short lock
+and recomputes while everyone else keeps serving the stale copy. On a cold
+miss, requests that lose the lock race wait briefly for the winner's result
+instead of all hitting the database.
+
+Every lookup is counted per namespace (hit, stale, miss) in the cache itself
+so the numbers aggregate across workers; see ``cache_metrics``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import inspect
+import time
+from functools import wraps
+from typing import Callable, Dict, Iterable, Union
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from rest_framework import status
+from rest_framework.response import Response
+
+from mysite.instrumentation import note_cache_event
+
+LISTINGS = "listings"
+JOURNEYS = "journeys"
+CHALLENGES = "challenges"
+EPISODES = "episodes"
+GARAGE_ITEMS = "garage_items"
+NAMESPACES = (LISTINGS, JOURNEYS, CHALLENGES, EPISODES, GARAGE_ITEMS)
+
+HIT = "hit"
+STALE = "stale"
+MISS = "miss"
+EVENTS = (HIT, STALE, MISS)
+
+LOCK_WAIT_INTERVAL = 0.05
+
+
+def _cache():
+    return caches[getattr(settings, "RESPONSE_CACHE_ALIAS", "default")]
+
+
+def _setting(name: str, default):
+    return getattr(settings, name, default)
+
+
+def is_enabled() -> bool:
+    return bool(_setting("RESPONSE_CACHE_ENABLED", True))
+
+
+# -- versions --------------------------------------------------------------------
+def _version_key(namespace: str) -> str:
+    return f"rc:version:{namespace}"
+
+
+def _seed_version() -> int:
+    # Seeding from the clock keeps a version that was evicted from the cache
+    # from ever restarting below numbers that may still key live entries.
+    return time.time_ns() // 1000
+
+
+def current_version(namespace: str) -> int:
+    cache = _cache()
+    key = _version_key(namespace)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _seed_version(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_version(namespace: str) -> None:
+    cache = _cache()
+    key = _version_key(namespace)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, _seed_version(), timeout=None)
+
+
+def invalidate(*namespaces: str) -> None:
+    """Orphan cached responses for the namespaces.
+
+    Versions are bumped immediately and again once the surrounding
+    transaction commits, so a read that re-caches the old rows between the
+    write and the commit is orphaned as well.
+    """
+
+    for namespace in namespaces:
+        bump_version(namespace)
+        transaction.on_commit(lambda namespace=namespace: bump_version(namespace))
+
+
+def invalidate_on_change(namespaces: Union[str, Iterable[str]], *models) -> None:
+    """Connect ``post_save``/``post_delete`` receivers that invalidate namespaces."""
+
+    if isinstance(namespaces, str):
+        namespaces = (namespaces,)
+    namespaces = tuple(namespaces)
+
+    def receiver(sender, instance, *args, **kwargs):
+        invalidate(*namespaces)
+
+    for model in models:
+        uid = f"response_cache:{model._meta.label}:{','.join(namespaces)}"
+        post_save.connect(receiver, sender=model, weak=False, dispatch_uid=uid)
+        post_delete.connect(receiver, sender=model, weak=False, dispatch_uid=uid)
+
+
+# -- metrics ---------------------------------------------------------------------
+def _metric_key(namespace: str, event: str) -> str:
+    return f"rc:metrics:{namespace}:{event}"
+
+
+def record_event(namespace: str, event: str) -> None:
+    note_cache_event(namespace, event)
+    cache = _cache()
+    key = _metric_key(namespace, event)
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
+
+
+def cache_metrics(namespaces: Iterable[str] = NAMESPACES) -> Dict[str, Dict[str, float]]:
+    """Return hit/stale/miss counts and the hit ratio for each namespace."""
+
+    namespaces = list(namespaces)
+    keys = {_metric_key(namespace, event): (namespace, event) for namespace in namespaces for event in EVENTS}
+    values = _cache().get_many(list(keys))
+    metrics: Dict[str, Dict[str, float]] = {namespace: {event: 0 for event in EVENTS} for namespace in namespaces}
+    for key, value in values.items():
+        namespace, event = keys[key]
+        metrics[namespace][event] = int(value)
+    for counts in metrics.values():
+        lookups = counts[HIT] + counts[STALE] + counts[MISS]
+        counts["hit_ratio"] = round((counts[HIT] + counts[STALE]) / lookups, 4) if lookups else 0.0
+    return metrics
+
+
+def reset_cache_metrics(namespaces: Iterable[str] = NAMESPACES) -> None:
+    _cache().delete_many([_metric_key(namespace, event) for namespace in namespaces for event in EVENTS])
+
+
+# -- responses -------------------------------------------------------------------
+def response_cache_key(namespace: str, request, per_user: bool) -> str:
+    params = sorted((name, sorted(values)) for name, values in request.query_params.lists())
+    fingerprint = hashlib.md5(
+        repr((request.get_host(), request.path, params)).encode("utf-8")
+    ).hexdigest()
+    user = getattr(request, "user", None)
+    variant = f"u{user.pk}" if per_user and user is not None and user.is_authenticated else "shared"
+    return f"rc:{namespace}:v{current_version(namespace)}:{variant}:{fingerprint}"
+
+
+def _respond(data, state: str) -> Response:
+    return Response(data, headers={"X-Cache": state.upper()})
+
+
+class _CachedCall:
+    """Cache bookkeeping for one request, shared by the sync and async wrappers."""
+
+    def __init__(self, namespace: str, request, vary_on_user, timeout):
+        self.namespace = namespace
+        self.cache = _cache()
+        per_user = vary_on_user(request) if callable(vary_on_user) else vary_on_user
+        self.key = response_cache_key(namespace, request, per_user)
+        self.lock_key = f"{self.key}:lock"
+        self.ttl = timeout or _setting("RESPONSE_CACHE_TIMEOUT", 60)
+        self.grace = _setting("RESPONSE_CACHE_STALE_SECONDS", 30)
+        self.lock_timeout = _setting("RESPONSE_CACHE_LOCK_SECONDS", 10)
+        self.locked = False
+        self.cold = False
+
+    def lookup(self):
+        """Return a cached response, or ``None`` when the caller should compute one."""
+
+        entry = self.cache.get(self.key)
+        if entry is not None:
+            fresh_until, data = entry
+            if fresh_until > time.time():
+                record_event(self.namespace, HIT)
+                return _respond(data, HIT)
+            self.locked = self.cache.add(self.lock_key, 1, self.lock_timeout)
+            if not self.locked:
+                # Someone else is refreshing; keep serving the stale copy.
+                record_event(self.namespace, STALE)
+                return _respond(data, STALE)
+            return None
+        self.locked = self.cache.add(self.lock_key, 1, self.lock_timeout)
+        self.cold = not self.locked
+        return None
+
+    def wait_deadline(self) -> float:
+        return time.monotonic() + _setting("RESPONSE_CACHE_LOCK_WAIT_SECONDS", 2)
+
+    def poll(self):
+        entry = self.cache.get(self.key)
+        if entry is None:
+            return None
+        record_event(self.namespace, HIT)
+        return _respond(entry[1], HIT)
+
+    def store(self, response):
+        record_event(self.namespace, MISS)
+        if response.status_code == status.HTTP_200_OK:
+            self.cache.set(self.key, (time.time() + self.ttl, response.data), self.ttl + self.grace)
+            response["X-Cache"] = "MISS"
+        return response
+
+    def release(self):
+        if self.locked:
+            self.cache.delete(self.lock_key)
+
+
+def cached_response(
+    namespace: str,
+    vary_on_user: Union[bool, Callable] = False,
+    timeout: int = None,
+):
+    """Cache a DRF view method's successful responses under ``namespace``.
+
+    ``vary_on_user`` stores a separate copy per authenticated user; pass a
+    callable ``(request) -> bool`` when only some requests are personalized.
+    Only ``200 OK`` responses are stored. Coroutine view methods are
+    supported; their cache round trips run in the thread pool.
+    """
+
+    def decorator(view_method):
+        if inspect.iscoroutinefunction(view_method):
+
+            @wraps(view_method)
+            async def async_wrapper(self, request, *args, **kwargs):
+                if not is_enabled():
+                    return await view_method(self, request, *args, **kwargs)
+
+                call = await sync_to_async(_CachedCall)(namespace, request, vary_on_user, timeout)
+                cached = await sync_to_async(call.lookup)()
+                if cached is not None:
+                    return cached
+                if call.cold:
+                    deadline = call.wait_deadline()
+                    while time.monotonic() < deadline:
+                        await asyncio.sleep(LOCK_WAIT_INTERVAL)
+                        cached = await sync_to_async(call.poll)()
+                        if cached is not None:
+                            return cached
+                try:
+                    response = await view_method(self, request, *args, **kwargs)
+                    return await sync_to_async(call.store)(response)
+                finally:
+                    await sync_to_async(call.release)()
+
+            return async_wrapper
+
+        @wraps(view_method)
+        def wrapper(self, request, *args, **kwargs):
+            if not is_enabled():
+                return view_method(self, request, *args, **kwargs)
+
+            call = _CachedCall(namespace, request, vary_on_user, timeout)
+            cached = call.lookup()
+            if cached is not None:
+                return cached
+            if call.cold:
+                deadline = call.wait_deadline()
+                while time.monotonic() < deadline:
+                    time.sleep(LOCK_WAIT_INTERVAL)
+                    cached = call.poll()
+                    if cached is not None:
+                        return cached
+            try:
+                return call.store(view_method(self, request, *args, **kwargs))
+            finally:
+                call.release()
+
+        return wrapper
+
+    return decorator
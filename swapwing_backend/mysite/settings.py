@@ -103,13 +103,18 @@ INSTALLED_APPS = [
     "all_activities",
 
     "trade_up_league",
-    "tags"
+    "tags",
+    "uploads",
 ]
 
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    "DEFAULT_PAGINATION_CLASS": "mysite.pagination.KeysetCursorPagination",
 }
 
+API_DEFAULT_PAGE_SIZE = int(os.getenv("API_DEFAULT_PAGE_SIZE", "20"))
+API_MAX_PAGE_SIZE = int(os.getenv("API_MAX_PAGE_SIZE", "100"))
+
 SPECTACULAR_SETTINGS = {
     "TITLE": "SwapWing API",
     "DESCRIPTION": (
@@ -125,6 +130,7 @@ SPECTACULAR_SETTINGS = {
 }
 
 MIDDLEWARE = [
+    "mysite.instrumentation.InstrumentationMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -149,6 +155,99 @@ CHANNEL_LAYERS = {
     },
 }
 
+# The default cache is shared by every web and Celery worker: it holds the
+# response-cache versions that Celery tasks bump and the published leaderboard
+# snapshots and sequence numbers. "locmem" is only correct in a single process
+# (the test suite).
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "redis")
+if CACHE_BACKEND == "redis":
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.getenv("CACHE_URL", REDIS_URL),
+            "KEY_PREFIX": "swapwing",
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "swapwing",
+        }
+    }
+
+# ASGI serving mode (SERVER_MODE=asgi, see gunicorn.conf.py) routes GET requests
+# for challenge detail, journey list and listing browse to async-ORM variants.
+API_ASYNC_READ_VIEWS = _env_bool(os.getenv("API_ASYNC_READ_VIEWS"), False)
+
+# Discovery endpoint response cache (see mysite.response_cache).
+RESPONSE_CACHE_ENABLED = _env_bool(os.getenv("RESPONSE_CACHE_ENABLED"), True)
+RESPONSE_CACHE_TIMEOUT = int(os.getenv("RESPONSE_CACHE_TIMEOUT", 60))
+RESPONSE_CACHE_STALE_SECONDS = int(os.getenv("RESPONSE_CACHE_STALE_SECONDS", 30))
+
+# Home feed (see home_page.feed): the trending-episodes block is cached once for
+# every user and rebuilt when an episode changes or the timeout passes.
+HOME_TRENDING_EPISODES = int(os.getenv("HOME_TRENDING_EPISODES", 10))
+HOME_TRENDING_CACHE_SECONDS = int(os.getenv("HOME_TRENDING_CACHE_SECONDS", 300))
+
+# Episode view/like/share events are counted in Redis (see
+# trade_up_league.trending), shared with the Celery worker that flushes them.
+# Beat flushes the buffer and re-ranks episodes by time-decayed engagement.
+EPISODE_EVENT_BUFFER = os.getenv("EPISODE_EVENT_BUFFER", "redis")
+EPISODE_EVENT_KEY_PREFIX = os.getenv("EPISODE_EVENT_KEY_PREFIX", "swapwing:episode-events")
+EPISODE_EVENT_FLUSH_SECONDS = float(os.getenv("EPISODE_EVENT_FLUSH_SECONDS", 30))
+TRENDING_INTERVAL_SECONDS = float(os.getenv("TRENDING_INTERVAL_SECONDS", 5 * 60))
+TRENDING_GRAVITY = float(os.getenv("TRENDING_GRAVITY", 1.5))
+
+# Activity log events are appended to a Redis stream (see all_activities.sink)
+# that the Celery worker drains with bulk inserts. Beat flushes the sink and
+# prunes rows past the retention window.
+ACTIVITY_SINK = os.getenv("ACTIVITY_SINK", "redis")
+ACTIVITY_STREAM_KEY = os.getenv("ACTIVITY_STREAM_KEY", "swapwing:activity")
+ACTIVITY_CLAIM_IDLE_SECONDS = float(os.getenv("ACTIVITY_CLAIM_IDLE_SECONDS", 5 * 60))
+ACTIVITY_FLUSH_SECONDS = float(os.getenv("ACTIVITY_FLUSH_SECONDS", 15))
+ACTIVITY_RETENTION_DAYS = int(os.getenv("ACTIVITY_RETENTION_DAYS", 180))
+ACTIVITY_PRUNE_INTERVAL_SECONDS = float(os.getenv("ACTIVITY_PRUNE_INTERVAL_SECONDS", 24 * 60 * 60))
+
+# Per-request query/serializer/cache instrumentation (see mysite.instrumentation).
+# Sampled requests get a Server-Timing header and a JSON log line and feed the
+# Prometheus counters at /metrics, which require METRICS_TOKEN as a bearer
+# token when it is set (and are only open without one in DEBUG).
+INSTRUMENTATION_ENABLED = _env_bool(os.getenv("INSTRUMENTATION_ENABLED"), True)
+INSTRUMENTATION_SAMPLE_RATE = float(
+    os.getenv("INSTRUMENTATION_SAMPLE_RATE", "1.0" if DEBUG else "0.05")
+)
+INSTRUMENTATION_FLUSH_SECONDS = int(os.getenv("INSTRUMENTATION_FLUSH_SECONDS", 10))
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {"console": {"class": "logging.StreamHandler"}},
+    "loggers": {
+        "swapwing.requests": {
+            "handlers": ["console"],
+            "level": os.getenv("REQUEST_LOG_LEVEL", "INFO"),
+            "propagate": False,
+        },
+    },
+}
+
+# Sorted-set leaderboard storage shared by every web and Celery worker
+# (see mysite.backends; "memory" is for the test suite).
+CHALLENGE_LEADERBOARD_BACKEND = os.getenv("CHALLENGE_LEADERBOARD_BACKEND", "redis")
+CHALLENGE_LEADERBOARD_KEY_PREFIX = os.getenv(
+    "CHALLENGE_LEADERBOARD_KEY_PREFIX", "swapwing:leaderboard"
+)
+# Websocket leaderboard frames are coalesced per challenge and sent at most
+# once per interval, carrying the changes within the top N standings.
+CHALLENGE_BROADCAST_INTERVAL_MS = int(os.getenv("CHALLENGE_BROADCAST_INTERVAL_MS", 500))
+CHALLENGE_BROADCAST_TOP_SIZE = int(os.getenv("CHALLENGE_BROADCAST_TOP_SIZE", 20))
+
+# PostgreSQL text search configuration used to build the search index.
+# "simple" skips stemming so prefix matching behaves the same in every language.
+SEARCH_TEXT_CONFIG = os.getenv("SEARCH_TEXT_CONFIG", "simple")
+
 
 TEMPLATES = [
     {
@@ -205,6 +304,49 @@ CELERY_TASK_EAGER_PROPAGATES = _env_bool(
     os.getenv("CELERY_TASK_EAGER_PROPAGATES"), False
 )
 
+# Counter columns are maintained on write; beat repairs any drift.
+COUNTER_RECONCILE_INTERVAL_SECONDS = float(
+    os.getenv("COUNTER_RECONCILE_INTERVAL_SECONDS", 60 * 60)
+)
+CELERY_BEAT_SCHEDULE = {
+    "reconcile-journey-follower-counts": {
+        "task": "journeys.tasks.reconcile_follower_counts",
+        "schedule": COUNTER_RECONCILE_INTERVAL_SECONDS,
+    },
+    "reconcile-challenge-participant-counts": {
+        "task": "challenges.tasks.reconcile_participant_counts",
+        "schedule": COUNTER_RECONCILE_INTERVAL_SECONDS,
+    },
+    "reconcile-unread-notification-counts": {
+        "task": "notifications.tasks.reconcile_unread_counts",
+        "schedule": COUNTER_RECONCILE_INTERVAL_SECONDS,
+    },
+    "reconcile-episode-counts": {
+        "task": "trade_up_league.tasks.reconcile_episode_counts",
+        "schedule": COUNTER_RECONCILE_INTERVAL_SECONDS,
+    },
+    "flush-episode-events": {
+        "task": "trade_up_league.tasks.flush_episode_events",
+        "schedule": EPISODE_EVENT_FLUSH_SECONDS,
+    },
+    "update-trending-ranks": {
+        "task": "trade_up_league.tasks.update_trending_ranks",
+        "schedule": TRENDING_INTERVAL_SECONDS,
+    },
+    "expire-upload-sessions": {
+        "task": "uploads.tasks.expire_upload_sessions",
+        "schedule": COUNTER_RECONCILE_INTERVAL_SECONDS,
+    },
+    "flush-activity-log": {
+        "task": "all_activities.tasks.flush_activity_log",
+        "schedule": ACTIVITY_FLUSH_SECONDS,
+    },
+    "prune-activity-log": {
+        "task": "all_activities.tasks.prune_activity_log",
+        "schedule": ACTIVITY_PRUNE_INTERVAL_SECONDS,
+    },
+}
+
 
 
 # Password validation
@@ -278,6 +420,28 @@ if USE_S3_MEDIA_STORAGE:
 
     MEDIA_ROOT = None
 
+# Media ingestion (see the uploads app). Multipart requests larger than
+# MEDIA_STREAM_MIN_BYTES are written to storage chunk by chunk while the body
+# is read (S3 multipart parts of MEDIA_STREAM_PART_BYTES); clients can instead
+# open presigned upload sessions and upload straight to storage.
+MEDIA_UPLOAD_MAX_BYTES = int(os.getenv("MEDIA_UPLOAD_MAX_BYTES", 200 * 1024 * 1024))
+MEDIA_STREAM_MIN_BYTES = int(os.getenv("MEDIA_STREAM_MIN_BYTES", 5 * 1024 * 1024))
+MEDIA_STREAM_PART_BYTES = int(os.getenv("MEDIA_STREAM_PART_BYTES", 8 * 1024 * 1024))
+MEDIA_STREAM_PREFIX = os.getenv("MEDIA_STREAM_PREFIX", "uploads/streamed")
+UPLOAD_SESSION_TTL_SECONDS = int(os.getenv("UPLOAD_SESSION_TTL_SECONDS", 60 * 60))
+
+# Garage inventory imports (garage.services) are created in one transaction;
+# this caps the items accepted per request.
+GARAGE_IMPORT_MAX_ITEMS = int(os.getenv("GARAGE_IMPORT_MAX_ITEMS", 100))
+
+# Garage item detail payloads (garage.loaders) are cached per item and page,
+# orphaned on writes to the item; author profile edits wait for the timeout.
+GARAGE_ITEM_DETAIL_CACHE_SECONDS = int(os.getenv("GARAGE_ITEM_DETAIL_CACHE_SECONDS", 300))
+
+# Image derivatives (uploads.derivatives): thumbnail/medium JPEG and WebP
+# copies rendered by Celery after upload, encoded at this quality.
+MEDIA_VARIANT_QUALITY = int(os.getenv("MEDIA_VARIANT_QUALITY", 82))
+
 
 
 HOST_SCHEME = "http://"
@@ -290,3 +454,23 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 FCM_SERVER_KEY = os.getenv("FCM_SERVER_KEY", "")
 
+# Notification fan-out (see notifications.fanout). Recipients are processed in
+# chunks; pushes go out in batches of up to 500 tokens on their own Celery
+# queue, run a worker with `-Q push` for them. "fcm" sends through Firebase
+# HTTP v1 with the service account in FCM_CREDENTIALS_FILE; without one,
+# "memory" delivers nothing (see notifications.push).
+FCM_CREDENTIALS_FILE = os.getenv("FCM_CREDENTIALS_FILE", "")
+FCM_PROJECT_ID = os.getenv("FCM_PROJECT_ID", "")
+NOTIFICATION_PUSH_TRANSPORT = os.getenv(
+    "NOTIFICATION_PUSH_TRANSPORT", "fcm" if FCM_CREDENTIALS_FILE else "memory"
+)
+NOTIFICATION_PUSH_QUEUE = os.getenv("NOTIFICATION_PUSH_QUEUE", "push")
+NOTIFICATION_PUSH_TIMEOUT = int(os.getenv("NOTIFICATION_PUSH_TIMEOUT", 10))
+NOTIFICATION_PUSH_MAX_RETRIES = int(os.getenv("NOTIFICATION_PUSH_MAX_RETRIES", 5))
+NOTIFICATION_PUSH_RETRY_BACKOFF_SECONDS = int(os.getenv("NOTIFICATION_PUSH_RETRY_BACKOFF_SECONDS", 5))
+NOTIFICATION_PUSH_RETRY_BACKOFF_MAX_SECONDS = int(os.getenv("NOTIFICATION_PUSH_RETRY_BACKOFF_MAX_SECONDS", 300))
+NOTIFICATION_FANOUT_CHUNK_SIZE = int(os.getenv("NOTIFICATION_FANOUT_CHUNK_SIZE", 1000))
+CELERY_TASK_ROUTES = {
+    "notifications.tasks.send_push_batch": {"queue": NOTIFICATION_PUSH_QUEUE},
+}
+
@@ -0,0 +1,92 @@
+from decimal import Decimal
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import AsyncRequestFactory
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from challenges.api.async_views import challenge_detail
+from challenges.models import Challenge, ChallengeMilestone, ChallengeParticipation, ChallengeStatus
+from journeys.api.async_views import list_journeys
+from journeys.models import Journey, JourneyFollower, JourneyVisibility
+from listings.api.async_views import browse_listings
+from listings.models import Listing, ListingCategory, ListingMedia
+
+User = get_user_model()
+
+
+class AsyncReadViewTests(APITestCase):
+    """The async variants must return exactly what the sync viewsets return."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(email="async@example.com", password="Password123")
+        self.other = User.objects.create_user(email="peer@example.com", password="Password123")
+        self.token = Token.objects.get(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.key}")
+        self.factory = AsyncRequestFactory()
+
+    def _async_get(self, view, path, data=None, token=True, **kwargs):
+        headers = {"authorization": f"Token {self.token.key}"} if token else {}
+        request = self.factory.get(path, data or {}, headers=headers)
+        response = async_to_sync(view)(request, **kwargs)
+        return response.status_code, response.data
+
+    def _assert_parity(self, view, path, data=None, **kwargs):
+        sync = self.client.get(path, data or {})
+        self.assertEqual(sync.status_code, status.HTTP_200_OK, sync.data)
+        # The sync response is cached by now; start cold so the async view does the work.
+        cache.clear()
+        status_code, data = self._async_get(view, path, data, **kwargs)
+        self.assertEqual(status_code, status.HTTP_200_OK, data)
+        self.assertEqual(data, sync.data)
+        return data
+
+    def test_listing_browse_matches_sync_view(self):
+        for idx in range(3):
+            listing = Listing.objects.create(
+                owner=self.other if idx else self.user,
+                title=f"Lamp {idx}",
+                category=ListingCategory.GOODS,
+                estimated_value=Decimal("10.00") * (idx + 1),
+            )
+            ListingMedia.objects.create(listing=listing, external_url=f"https://cdn.example.com/{idx}.jpg")
+
+        data = self._assert_parity(browse_listings, reverse("listings:listing-list"), {"page_size": 2})
+        self.assertEqual(len(data["results"]), 2)
+        self._assert_parity(browse_listings, reverse("listings:listing-list"), {"owner": "me"})
+
+    def test_journey_list_matches_sync_view(self):
+        followed = Journey.objects.create(owner=self.other, title="Followed", visibility=JourneyVisibility.PUBLIC)
+        Journey.objects.create(owner=self.other, title="Hidden", visibility=JourneyVisibility.FOLLOWERS)
+        JourneyFollower.objects.create(journey=followed, user=self.user)
+
+        data = self._assert_parity(list_journeys, reverse("journeys:journey-list"))
+        self.assertEqual([item["title"] for item in data["results"]], ["Followed"])
+
+    def test_challenge_detail_matches_sync_view(self):
+        challenge = Challenge.objects.create(title="Trade Up", status=ChallengeStatus.ACTIVE)
+        ChallengeMilestone.objects.create(challenge=challenge, label="First", target_value=Decimal("5.00"))
+        ChallengeParticipation.objects.create(challenge=challenge, user=self.user, total_trade_delta=Decimal("3.00"))
+        ChallengeParticipation.objects.create(challenge=challenge, user=self.other, total_trade_delta=Decimal("9.00"))
+
+        path = reverse("challenges:challenge-detail", args=[challenge.id])
+        data = self._assert_parity(challenge_detail, path, pk=str(challenge.id))
+        self.assertEqual(data["user_rank"]["rank"], 2)
+
+        missing = "00000000-0000-0000-0000-000000000000"
+        status_code, _ = self._async_get(
+            challenge_detail, reverse("challenges:challenge-detail", args=[missing]), pk=missing
+        )
+        self.assertEqual(status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_authentication_matches_token_authentication(self):
+        path = reverse("listings:listing-list")
+        status_code, _ = self._async_get(browse_listings, path, token=False)
+        self.assertEqual(status_code, status.HTTP_401_UNAUTHORIZED)
+
+        request = self.factory.get(path, headers={"authorization": "Token nope"})
+        self.assertEqual(async_to_sync(browse_listings)(request).status_code, status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,39 @@
+import pytest
+
+from mysite.backends import BackendRegistry
+
+
+class Memory:
+    def __init__(self):
+        self.items = ["kept"]
+
+    def clear(self):
+        self.items.clear()
+
+
+class Shared:
+    def clear(self):  # pragma: no cover - must never be called by reset()
+        raise AssertionError("reset() cleared a shared backend")
+
+
+def test_registry_defaults_to_redis_and_reuses_instances(settings):
+    registry = BackendRegistry("EXAMPLE_BACKEND", {"memory": Memory, "redis": Shared}, label="example backend")
+    assert isinstance(registry.get(), Shared)
+    assert registry.get() is registry.get()
+
+    settings.EXAMPLE_BACKEND = "disk"
+    with pytest.raises(ValueError, match="Unknown example backend: disk"):
+        registry.get()
+
+
+def test_reset_clears_only_in_process_state(settings):
+    registry = BackendRegistry("EXAMPLE_BACKEND", {"memory": Memory, "redis": Shared}, label="example backend")
+    shared = registry.get()
+    settings.EXAMPLE_BACKEND = "memory"
+    memory = registry.get()
+
+    registry.reset()
+    assert memory.items == []
+    assert registry.get() is not memory
+    settings.EXAMPLE_BACKEND = "redis"
+    assert registry.get() is not shared
@@ -0,0 +1,92 @@
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from benchmarks.dataset import BENCH_EMAIL_DOMAIN, DatasetScale, generate
+from benchmarks.load import compare
+from challenges.leaderboard import leaderboard_for
+from challenges.models import Challenge
+from journeys.models import Journey, JourneyFollower
+from listings.models import Listing
+from search.models import SearchDocument, SearchDocumentKind
+from search.services import matching_object_ids
+
+
+class BenchmarkDatasetTests(APITestCase):
+    def test_generate_builds_consistent_dataset(self):
+        manifest = generate(DatasetScale.small())
+
+        counts = manifest["counts"]
+        self.assertEqual(counts["users"], 20)
+        self.assertEqual(Listing.objects.filter(owner__email__endswith=BENCH_EMAIL_DOMAIN).count(), 60)
+        self.assertEqual(counts["steps"], 60)
+        self.assertEqual(counts["participations"], 10)
+
+        challenge = Challenge.objects.get(pk=manifest["challenge_id"])
+        self.assertEqual(challenge.participant_count, 10)
+        self.assertEqual(leaderboard_for(challenge).count(), 10)
+        journey = Journey.objects.filter(follower_links__isnull=False).first()
+        self.assertEqual(journey.followers_count, JourneyFollower.objects.filter(journey=journey).count())
+        self.assertEqual(SearchDocument.objects.filter(kind=SearchDocumentKind.LISTING).count(), 60)
+        self.assertEqual(Listing.objects.filter(pk__in=matching_object_ids("listing", "bundle")).count(), 60)
+
+        participant = manifest["participants"][0]
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {participant['token']}")
+        response = self.client.post(
+            reverse("challenges:challenge-progress", args=[challenge.pk]),
+            {"trade_delta_value": "5.00"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED, response.data)
+
+    def test_regenerating_replaces_previous_dataset(self):
+        generate(DatasetScale.small())
+        manifest = generate(DatasetScale.small())
+
+        self.assertEqual(Challenge.objects.filter(pk=manifest["challenge_id"]).count(), 1)
+        self.assertEqual(Challenge.objects.count(), 1)
+        self.assertEqual(Listing.objects.count(), 60)
+
+    def test_seed_staging_writes_manifest(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "bench.json"
+            call_command(
+                "seed_staging",
+                users=5,
+                listings=2,
+                participations=3,
+                manifest=str(path),
+                stdout=StringIO(),
+            )
+            manifest = json.loads(path.read_text())
+
+        self.assertEqual(manifest["counts"]["listings"], 10)
+        self.assertEqual(len(manifest["participants"]), 3)
+
+
+class LoadCompareTests(APITestCase):
+    def _report(self, label, rps, p95):
+        return {
+            "label": label,
+            "results": [
+                {"scenario": "listing_browse", "concurrency": 16, "rps": rps, "latency_ms": {"p95": p95}},
+            ],
+        }
+
+    def test_compare_flags_regressions_beyond_threshold(self):
+        baseline = self._report("main", 100.0, 50.0)
+
+        (steady,) = compare(baseline, self._report("branch", 95.0, 52.0))
+        (slower,) = compare(baseline, self._report("branch", 80.0, 50.0))
+        (laggier,) = compare(baseline, self._report("branch", 100.0, 70.0))
+
+        self.assertFalse(steady["regression"])
+        self.assertEqual(slower["speedup"], 0.8)
+        self.assertTrue(slower["regression"])
+        self.assertTrue(laggier["regression"])
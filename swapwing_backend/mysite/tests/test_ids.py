@@ -0,0 +1,53 @@
+from datetime import datetime, timezone
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from garage.models import Garage, GarageItem
+from mysite import ids
+
+User = get_user_model()
+
+
+class UlidTests(TestCase):
+    def test_ulids_are_time_ordered_and_monotonic(self):
+        generated = [ids.new_ulid() for _ in range(1000)]
+        self.assertEqual(generated, sorted(generated))
+        self.assertEqual(len(set(generated)), 1000)
+        self.assertTrue(all(ids.is_ulid(value) and len(value) == 26 for value in generated))
+
+        # Same millisecond: the random part is incremented rather than redrawn.
+        first, second = ids.new_ulid(now_ms=4_102_444_800_000), ids.new_ulid(now_ms=4_102_444_800_000)
+        self.assertEqual(first[:10], second[:10])
+        self.assertLess(first, second)
+        self.assertEqual(ids.ulid_datetime(first), datetime(2100, 1, 1, tzinfo=timezone.utc))
+
+    def test_models_get_ids_without_queries_including_bulk_create(self):
+        user = User.objects.create_user(email="ids@example.com", password="Password123")
+        self.assertTrue(ids.is_ulid(user.user_id))
+        garage = Garage.objects.create(user=user)
+
+        with CaptureQueriesContext(connection) as queries:
+            GarageItem.objects.create(garage=garage, item_owner=user, item_name="Lamp")
+        self.assertEqual(len(queries), 1)
+
+        items = GarageItem.objects.bulk_create(
+            [GarageItem(garage=garage, item_owner=user, item_name=f"Item {index}") for index in range(5)]
+        )
+        self.assertTrue(all(ids.is_ulid(item.item_id) for item in items))
+
+    def test_backfill_fills_only_missing_ids(self):
+        user = User.objects.create_user(email="legacy@example.com", password="Password123")
+        User.objects.filter(pk=user.pk).update(user_id="legacy-random-id")
+        garage = Garage.objects.create(user=user)
+        GarageItem.objects.bulk_create([GarageItem(garage=garage, item_owner=user, item_id=None) for _ in range(3)])
+
+        with mock.patch.object(ids, "new_ulid", wraps=ids.new_ulid) as generator:
+            self.assertEqual(ids.backfill_missing_ids(GarageItem, "item_id", batch_size=2), 3)
+            self.assertEqual(ids.backfill_missing_ids(User, "user_id"), 0)
+        self.assertEqual(generator.call_count, 3)
+        self.assertFalse(GarageItem.objects.filter(item_id__isnull=True).exists())
+        self.assertEqual(User.objects.get(pk=user.pk).user_id, "legacy-random-id")
@@ -0,0 +1,90 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from listings.models import Listing, ListingCategory, ListingMedia
+from mysite import instrumentation
+
+User = get_user_model()
+
+
+@override_settings(INSTRUMENTATION_SAMPLE_RATE=1.0, INSTRUMENTATION_FLUSH_SECONDS=0, METRICS_TOKEN="scrape-me")
+class InstrumentationMiddlewareTests(APITestCase):
+    def setUp(self):
+        instrumentation.reset_metrics()
+        self.user = User.objects.create_user(email="timing@example.com", password="Password123")
+        token = Token.objects.get(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+        for index in range(3):
+            listing = Listing.objects.create(
+                owner=self.user, title=f"Lamp {index}", category=ListingCategory.GOODS
+            )
+            ListingMedia.objects.create(listing=listing, external_url="https://cdn.example.com/a.jpg")
+        self.url = reverse("listings:listing-list")
+
+    def _timing(self, response):
+        entries = {}
+        for part in response["Server-Timing"].split(", "):
+            name, *params = part.split(";")
+            entries[name] = dict(param.split("=", 1) for param in params)
+        return entries
+
+    def test_sampled_request_reports_server_timing_and_logs(self):
+        with self.assertLogs("swapwing.requests", level="INFO") as logs:
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        timing = self._timing(response)
+        self.assertEqual(set(timing), {"db", "ser", "cache", "total"})
+        self.assertEqual(timing["cache"]["desc"], '"miss"')
+        self.assertEqual(timing["ser"]["desc"], '"0 queries"')
+
+        line = json.loads(logs.records[-1].getMessage())
+        self.assertEqual(line["view"], "listings_api:listing-list")
+        self.assertEqual(line["status"], 200)
+        self.assertEqual(timing["db"]["desc"], f'"{line["queries"]} queries"')
+        self.assertGreater(line["queries"], 0)
+        self.assertEqual(line["cache_misses"], 1)
+
+    def test_serializer_queries_expose_lazy_lookups(self):
+        from listings.api.serializers import ListingSerializer
+
+        metrics = instrumentation.RequestMetrics()
+        token = instrumentation._current.set(metrics)
+        try:
+            # No prefetch: every listing lazily loads its owner and media.
+            ListingSerializer(list(Listing.objects.all()), many=True).data
+        finally:
+            instrumentation._current.reset(token)
+
+        self.assertEqual(metrics.serializer_queries, 6)
+        self.assertEqual(metrics.queries, 7)
+        self.assertGreater(metrics.serializer_seconds, 0)
+
+    @override_settings(INSTRUMENTATION_SAMPLE_RATE=0)
+    def test_unsampled_requests_are_untouched(self):
+        response = self.client.get(self.url)
+
+        self.assertNotIn("Server-Timing", response)
+
+    def test_metrics_endpoint_renders_prometheus_counters(self):
+        self.client.get(self.url)
+        self.client.get(self.url)
+
+        metrics_url = reverse("prometheus-metrics")
+        self.assertEqual(self.client.get(metrics_url).status_code, status.HTTP_403_FORBIDDEN)
+
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer scrape-me")
+        response = self.client.get(metrics_url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        body = response.content.decode()
+        self.assertIn('swapwing_http_requests_total{view="listings_api:listing-list"} 2', body)
+        self.assertIn('swapwing_response_cache_hits_total{view="listings_api:listing-list"} 1', body)
+        self.assertIn('swapwing_http_request_duration_seconds_count{view="listings_api:listing-list"} 2', body)
+        self.assertIn('swapwing_response_cache_events_total{namespace="listings",event="miss"} 1', body)
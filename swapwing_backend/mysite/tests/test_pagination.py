@@ -0,0 +1,88 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from listings.models import Listing, ListingCategory
+
+User = get_user_model()
+
+
+class KeysetCursorPaginationTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="pager@example.com", password="Password123")
+        token = Token.objects.get(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+        self.list_url = reverse("listings:listing-list")
+
+        values = ["10.00", None, "30.00", "30.00", None]
+        self.listings = [
+            Listing.objects.create(
+                owner=self.user,
+                title=f"Listing {idx}",
+                category=ListingCategory.GOODS,
+                estimated_value=Decimal(value) if value else None,
+            )
+            for idx, value in enumerate(values)
+        ]
+        # Identical timestamps force the primary key tiebreak to keep pages stable.
+        Listing.objects.update(created_at=timezone.now())
+
+    def _walk(self, params):
+        titles, previous_links = [], []
+        response = self.client.get(self.list_url, params)
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+            titles.extend(item["title"] for item in response.data["results"])
+            previous_links.append(response.data["previous"])
+            if not response.data["next"]:
+                return titles, previous_links, response
+            response = self.client.get(response.data["next"])
+
+    def test_walks_pages_forward_and_back_without_gaps(self):
+        expected = [
+            listing.title
+            for listing in sorted(self.listings, key=lambda listing: str(listing.id), reverse=True)
+        ]
+        titles, previous_links, last_page = self._walk({"page_size": 2})
+        self.assertEqual(titles, expected)
+        self.assertIsNone(previous_links[0])
+
+        back = self.client.get(last_page.data["previous"])
+        self.assertEqual([item["title"] for item in back.data["results"]], expected[2:4])
+
+    def test_nullable_sort_key_keeps_nulls_grouped(self):
+        titles, _, _ = self._walk({"page_size": 2, "ordering": "estimated_value"})
+        if connection.features.nulls_order_largest:
+            self.assertEqual(titles[0], "Listing 0")
+            self.assertEqual(set(titles[1:3]), {"Listing 2", "Listing 3"})
+            self.assertEqual(set(titles[3:]), {"Listing 1", "Listing 4"})
+        else:
+            self.assertEqual(set(titles[:2]), {"Listing 1", "Listing 4"})
+            self.assertEqual(titles[2], "Listing 0")
+            self.assertEqual(set(titles[3:]), {"Listing 2", "Listing 3"})
+
+    @override_settings(API_MAX_PAGE_SIZE=3)
+    def test_page_size_is_capped(self):
+        response = self.client.get(self.list_url, {"page_size": 50})
+        self.assertEqual(len(response.data["results"]), 3)
+
+    def test_rejects_unindexed_ordering_and_bad_cursor(self):
+        response = self.client.get(self.list_url, {"ordering": "title"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("ordering", response.data)
+
+        response = self.client.get(self.list_url, {"cursor": "not-a-cursor"})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_schema_documents_cursor_parameters(self):
+        response = self.client.get(reverse("api-schema"), HTTP_ACCEPT="application/json")
+        operation = response.data["paths"]["/api/listings/"]["get"]
+        names = {parameter["name"] for parameter in operation["parameters"]}
+        self.assertTrue({"cursor", "page_size"} <= names)
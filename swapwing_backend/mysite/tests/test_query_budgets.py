@@ -0,0 +1,21 @@
+"""Query budgets for every GET API endpoint; see ``mysite.query_budget``."""
+
+from mysite.query_budget import SCALES, discover_endpoints, load_budgets
+
+
+def test_manifest_covers_every_get_endpoint():
+    discovered = {endpoint.name for endpoint in discover_endpoints()}
+    listed = set(load_budgets())
+
+    assert not discovered - listed, "add these endpoints to mysite/query_budgets.json"
+    assert not listed - discovered, "these manifest entries no longer match a GET endpoint"
+
+
+def test_endpoint_stays_within_query_budget(query_budget, query_budget_measurements):
+    sizes = query_budget_measurements[query_budget.name]
+    for label, measurement in sizes.items():
+        assert measurement.status < 400, f"{label} dataset answered {measurement.status}"
+
+    counts = {label: sizes[label].queries for label in SCALES}
+    assert len(set(counts.values())) == 1, f"query count grows with the data: {counts}"
+    assert counts["large"] <= query_budget.budget, f"{counts['large']} queries, budget {query_budget.budget}"
@@ -0,0 +1,101 @@
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.request import Request
+from rest_framework.test import APITestCase
+
+from challenges.models import Challenge, ChallengeStatus
+from listings.models import Listing, ListingCategory
+from mysite import response_cache
+from mysite.response_cache import cache_metrics, response_cache_key
+
+User = get_user_model()
+
+
+class ResponseCacheTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="cache@example.com", password="Password123")
+        self.other = User.objects.create_user(email="other@example.com", password="Password123")
+        self._login(self.user)
+        self.listings_url = reverse("listings:listing-list")
+        self.listing = Listing.objects.create(
+            owner=self.user, title="Desk Lamp", category=ListingCategory.GOODS
+        )
+
+    def _login(self, user):
+        token = Token.objects.get(user=user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+
+    def _titles(self, response):
+        return [item["title"] for item in response.data["results"]]
+
+    def test_second_request_is_served_from_cache(self):
+        first = self.client.get(self.listings_url)
+        self.assertEqual(first.status_code, status.HTTP_200_OK, first.data)
+        self.assertEqual(first["X-Cache"], "MISS")
+
+        with self.assertNumQueries(1):  # token authentication only
+            second = self.client.get(self.listings_url)
+        self.assertEqual(second["X-Cache"], "HIT")
+        self.assertEqual(second.data, first.data)
+
+        metrics = cache_metrics()[response_cache.LISTINGS]
+        self.assertEqual((metrics["hit"], metrics["miss"]), (1, 1))
+        self.assertEqual(metrics["hit_ratio"], 0.5)
+
+    def test_model_writes_orphan_cached_pages(self):
+        self.client.get(self.listings_url)
+        self.listing.title = "Floor Lamp"
+        self.listing.save()
+
+        response = self.client.get(self.listings_url)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(self._titles(response), ["Floor Lamp"])
+
+    def test_owner_me_pages_vary_per_user(self):
+        self.client.get(self.listings_url, {"owner": "me"})
+        self._login(self.other)
+        response = self.client.get(self.listings_url, {"owner": "me"})
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(self._titles(response), [])
+
+        shared = self.client.get(self.listings_url)
+        self.assertEqual(shared["X-Cache"], "MISS")
+        self._login(self.user)
+        self.assertEqual(self.client.get(self.listings_url)["X-Cache"], "HIT")
+
+    def test_challenge_detail_is_cached_per_user(self):
+        challenge = Challenge.objects.create(title="Trade Up", status=ChallengeStatus.ACTIVE)
+        url = reverse("challenges:challenge-detail", args=[challenge.id])
+        self.assertEqual(self.client.get(url)["X-Cache"], "MISS")
+        self.assertEqual(self.client.get(url)["X-Cache"], "HIT")
+        self._login(self.other)
+        self.assertEqual(self.client.get(url)["X-Cache"], "MISS")
+
+    @override_settings(RESPONSE_CACHE_TIMEOUT=-1)
+    def test_expired_entry_is_served_stale_while_refresh_is_locked(self):
+        first = self.client.get(self.listings_url)
+        key = response_cache_key(response_cache.LISTINGS, Request(first.wsgi_request), per_user=False)
+        response_cache._cache().add(f"{key}:lock", 1, 10)
+
+        response = self.client.get(self.listings_url)
+        self.assertEqual(response["X-Cache"], "STALE")
+        self.assertEqual(self._titles(response), ["Desk Lamp"])
+
+    @override_settings(RESPONSE_CACHE_ENABLED=False)
+    def test_disabled_cache_passes_through(self):
+        self.client.get(self.listings_url)
+        response = self.client.get(self.listings_url)
+        self.assertNotIn("X-Cache", response)
+
+    def test_stats_endpoint_requires_staff(self):
+        url = reverse("response-cache-stats")
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_403_FORBIDDEN)
+
+        admin = User.objects.create_superuser(email="ops@example.com", password="Password123")
+        self._login(admin)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn(response_cache.LISTINGS, response.data)
@@ -25,6 +25,8 @@ from drf_spectacular.views import (
     SpectacularSwaggerView,
 )
 
+from mysite.views import prometheus_metrics, response_cache_stats
+
 urlpatterns = [
     path("admin/", admin.site.urls),
 
@@ -51,7 +53,14 @@ urlpatterns = [
     path('api/listings/', include('listings.api.urls', 'listings_api')),
     path('api/journeys/', include('journeys.api.urls', 'journeys_api')),
     path('api/challenges/', include('challenges.api.urls', 'challenges_api')),
+    path('api/notifications/', include('notifications.api.urls', 'notifications_api')),
+    path('api/search/', include('search.api.urls', 'search_api')),
+    path('api/trade-up-league/', include('trade_up_league.api.urls', 'trade_up_league_api')),
+    path('api/uploads/', include('uploads.api.urls', 'uploads_api')),
     path('api/user-profile/', include('user_profile.api.urls', 'user_profile_api')),
+
+    path('api/cache-stats/', response_cache_stats, name='response-cache-stats'),
+    path('metrics', prometheus_metrics, name='prometheus-metrics'),
 ]
 if settings.DEBUG:
     urlpatterns = urlpatterns + static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
@@ -26,63 +26,6 @@ def generate_email_token():
     return code
 
 
-def unique_user_id_generator(instance):
-    """
-    This is for a django project with a user_id field
-    """
-    size = random.randint(30, 45)
-    user_id = random_string_generator(size=size)
-
-    Klass = instance.__class__
-    qs_exists = Klass.objects.filter(user_id=user_id).exists()
-    if qs_exists:
-        return
-    return user_id
-
-
-def unique_garage_id_generator(instance):
-
-
-    size = random.randint(20, 25)
-    garage_id = random_string_generator(size=size)
-
-    Klass = instance.__class__
-    qs_exists = Klass.objects.filter(garage_id=garage_id).exists()
-    if qs_exists:
-        return
-    return garage_id
-
-
-
-def unique_item_id_generator(instance):
-
-    size = random.randint(20, 25)
-    item_id = random_string_generator(size=12).upper()
-
-    Klass = instance.__class__
-    qs_exists = Klass.objects.filter(item_id=item_id).exists()
-    if qs_exists:
-        return
-    return item_id
-
-
-
-
-
-
-def unique_service_id_generator(instance):
-
-    size = random.randint(20, 25)
-    service_id = random_string_generator(size=12).upper()
-
-    Klass = instance.__class__
-    qs_exists = Klass.objects.filter(service_id=service_id).exists()
-    if qs_exists:
-        return
-    return service_id
-
-
-
 def unique_key_generator(instance):
     """
     This is for a Django project with an key field
@@ -0,0 +1,70 @@
+"""Project-level operational endpoints."""
+
+import hmac
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from drf_spectacular.utils import OpenApiTypes, extend_schema
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.decorators import api_view, authentication_classes, permission_classes
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+
+from mysite.instrumentation import prometheus_text
+from mysite.response_cache import cache_metrics
+from notifications.fanout import EVENTS, TIMERS, fanout_metrics
+
+
+@extend_schema(responses=OpenApiTypes.OBJECT, tags=["Operations"])
+@api_view(["GET"])
+@authentication_classes([TokenAuthentication])
+@permission_classes([IsAdminUser])
+def response_cache_stats(request):
+    """Hit, stale and miss counts per response cache namespace."""
+
+    return Response(cache_metrics())
+
+
+def prometheus_metrics(request):
+    """Request instrumentation and response cache counters for Prometheus.
+
+    Scrapers authenticate with ``Authorization: Bearer <METRICS_TOKEN>``;
+    without a configured token the endpoint is only served in DEBUG.
+    """
+
+    expected = getattr(settings, "METRICS_TOKEN", "")
+    if expected:
+        supplied = request.headers.get("Authorization", "").removeprefix("Bearer ").strip()
+        if not hmac.compare_digest(supplied.encode(), expected.encode()):
+            return HttpResponseForbidden()
+    elif not settings.DEBUG:
+        return HttpResponseForbidden()
+
+    events = {}
+    for namespace, counts in cache_metrics().items():
+        for event in ("hit", "stale", "miss"):
+            events[(("namespace", namespace), ("event", event))] = counts[event]
+    fanout = fanout_metrics()
+    body = prometheus_text(
+        [
+            (
+                "swapwing_response_cache_events_total",
+                "counter",
+                "Response cache lookups by namespace and outcome, across all requests.",
+                events,
+            ),
+            (
+                "swapwing_notification_events_total",
+                "counter",
+                "Notification rows created and push deliveries by outcome.",
+                {(("event", event),): fanout[event] for event in EVENTS},
+            ),
+            (
+                "swapwing_notification_seconds_total",
+                "counter",
+                "Time spent fanning out notifications and sending push batches.",
+                {(("stage", timer),): fanout[f"{timer}_seconds"] for timer in TIMERS},
+            ),
+        ]
+    )
+    return HttpResponse(body, content_type="text/plain; version=0.0.4; charset=utf-8")
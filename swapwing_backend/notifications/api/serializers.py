@@ -12,4 +12,13 @@ class NotificationSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Notification
-        fields = ['id', 'subject', 'body', 'created_at', 'read' ]
\ No newline at end of file
+        fields = ['id', 'subject', 'body', 'created_at', 'read' ]
+
+class NotificationMarkReadSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        required=False,
+        allow_empty=False,
+        max_length=500,
+        help_text="Notifications to mark read. Omit to mark the whole inbox read.",
+    )
@@ -1,9 +1,13 @@
 from django.urls import path
+from rest_framework.routers import DefaultRouter
 
-from notifications.api.views.views import get_user_notification_view
+from notifications.api.views.views import NotificationViewSet, get_user_notification_view
 
 app_name = 'notifications'
 
+router = DefaultRouter()
+router.register(r"inbox", NotificationViewSet, basename="notification")
+
 urlpatterns = [
     path('user-notifications', get_user_notification_view, name="get_user_notification"),
-]
+] + router.urls
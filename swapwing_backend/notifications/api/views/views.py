@@ -1,46 +1,103 @@
 from django.contrib.auth import get_user_model
-from rest_framework import status
-from rest_framework.decorators import permission_classes, api_view, authentication_classes
+from drf_spectacular.utils import (
+    OpenApiParameter,
+    OpenApiTypes,
+    extend_schema,
+    extend_schema_view,
+    inline_serializer,
+)
+from rest_framework import mixins, permissions, serializers, status, viewsets
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.decorators import permission_classes, api_view, authentication_classes, action
 from rest_framework.response import Response
 
-from notifications.api.serializers import NotificationSerializer
+from mysite.pagination import KeysetCursorPagination
+from notifications.api.serializers import NotificationMarkReadSerializer, NotificationSerializer
 from notifications.models import Notification
 
 User = get_user_model()
 
+INBOX_ORDERING_FIELDS = {"created_at": ("created_at", "id")}
+
+
 @api_view(['GET', ])
-@permission_classes([])
-@authentication_classes([])
+@permission_classes([permissions.IsAuthenticated, ])
+@authentication_classes([TokenAuthentication, ])
 def get_user_notification_view(request):
+    # Serves the caller's own inbox; the ``user_id`` older clients still send
+    # is ignored.
     payload = {}
-    data = {}
-    user_data = {}
-
-    errors = []
-
-    user_id = request.query_params.get('user_id', None)
-
-    if not user_id:
-        payload['message'] = "Error"
-        errors.append("User ID Required.")
-
-    user = User.objects.get(user_id=user_id)
+    user = request.user
 
+    paginator = KeysetCursorPagination()
+    notifications = paginator.paginate_queryset(Notification.objects.filter(user=user), request)
+    notifications = NotificationSerializer(notifications, many=True).data
 
-    notifications = Notification.objects.all().filter(user=user).order_by('-created_at')
+    payload['message'] = "Successful"
+    payload['data'] = notifications
+    payload['next'] = paginator.get_next_link()
+    payload['previous'] = paginator.get_previous_link()
+    payload['unread_count'] = user.unread_notification_count
 
-    notifications_serializer = NotificationSerializer(notifications, many=True)
-    if notifications_serializer:
-        notifications = notifications_serializer.data
+    return Response(payload, status=status.HTTP_200_OK)
 
-    print(notifications)
 
-    if errors:
-        payload['errors'] = errors
-        return Response(payload, status=status.HTTP_404_NOT_FOUND)
+@extend_schema_view(
+    list=extend_schema(
+        summary="Notification inbox",
+        description="The trader's notifications, newest first, with the unread total.",
+        parameters=[
+            OpenApiParameter(
+                name="unread",
+                type=OpenApiTypes.BOOL,
+                location=OpenApiParameter.QUERY,
+                description="When true, only include unread notifications.",
+            ),
+        ],
+        tags=["Notifications"],
+    ),
+)
+class NotificationViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
+    serializer_class = NotificationSerializer
+    authentication_classes = [TokenAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+    cursor_ordering_fields = INBOX_ORDERING_FIELDS
+    cursor_default_ordering = "-created_at"
 
-    payload['message'] = "Successful"
-    payload['data'] = notifications
+    def get_queryset(self):
+        queryset = Notification.objects.filter(user=self.request.user)
+        unread = self.request.query_params.get("unread")
+        if unread and str(unread).lower() in {"1", "true", "yes"}:
+            queryset = queryset.filter(read=False)
+        return queryset
 
-    return Response(payload, status=status.HTTP_200_OK)
+    def list(self, request, *args, **kwargs):
+        response = super().list(request, *args, **kwargs)
+        # Token authentication loaded the user row, so the total costs no query.
+        response.data["unread_count"] = request.user.unread_notification_count
+        return response
 
+    @extend_schema(
+        summary="Mark notifications read",
+        description="Mark the listed notifications, or the whole inbox, read in one update.",
+        request=NotificationMarkReadSerializer,
+        responses={
+            status.HTTP_200_OK: inline_serializer(
+                name="NotificationMarkReadResponse",
+                fields={
+                    "marked": serializers.IntegerField(),
+                    "unread_count": serializers.IntegerField(),
+                },
+            )
+        },
+        tags=["Notifications"],
+    )
+    @action(detail=False, methods=["post"], url_path="mark-read")
+    def mark_read(self, request):
+        serializer = NotificationMarkReadSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        marked = Notification.objects.mark_read(request.user, serializer.validated_data.get("ids"))
+        unread_count = User.objects.filter(pk=request.user.pk).values_list(
+            "unread_notification_count", flat=True
+        ).get()
+        return Response({"marked": marked, "unread_count": unread_count})
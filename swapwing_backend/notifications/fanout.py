@@ -0,0 +1,126 @@
+"""Fan-out of one notification to many recipients.
+
+``queue_fan_out`` enqueues ``notifications.tasks.fan_out_notification`` for a
+named audience (task arguments stay small however many people it covers).
+The task walks the audience in primary-key order, ``NOTIFICATION_FANOUT_CHUNK_SIZE``
+users at a time, and for every chunk
+
+* inserts the ``Notification`` rows with one ``bulk_create``,
+* raises each recipient's unread counter in one ``UPDATE``, and
+* enqueues ``send_push_batch`` tasks of at most ``FCM_MULTICAST_LIMIT``
+  device tokens, routed to the ``NOTIFICATION_PUSH_QUEUE`` Celery queue.
+
+Throughput counters (rows created, push outcomes, time spent) are kept in
+the shared cache and exported on ``/metrics``.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+
+from notifications.models import UNREAD_COUNTER, Notification
+from notifications.push import FCM_MULTICAST_LIMIT
+
+User = get_user_model()
+
+AUDIENCES: Dict[str, Callable] = {
+    "users": lambda key: User.objects.filter(pk__in=key),
+    "journey_followers": lambda key: User.objects.filter(journey_follow_links__journey_id=key),
+    "challenge_participants": lambda key: User.objects.filter(challenge_participations__challenge_id=key),
+}
+
+EVENTS = ("created", "push_sent", "push_failed", "push_retried", "push_unregistered", "push_batches")
+TIMERS = ("fanout", "push")
+
+
+# -- metrics ---------------------------------------------------------------------
+def _metric_key(name: str) -> str:
+    return f"notif:metric:{name}"
+
+
+def record(name: str, amount: int = 1) -> None:
+    if not amount:
+        return
+    key = _metric_key(name)
+    try:
+        cache.incr(key, amount)
+    except ValueError:
+        if not cache.add(key, amount, timeout=None):
+            cache.incr(key, amount)
+
+
+def record_seconds(timer: str, started: float) -> None:
+    record(f"{timer}_us", int((time.perf_counter() - started) * 1_000_000))
+
+
+def fanout_metrics() -> Dict[str, float]:
+    """Event counts and seconds spent per stage since the counters were reset."""
+
+    names = [*EVENTS, *(f"{timer}_us" for timer in TIMERS)]
+    values = cache.get_many([_metric_key(name) for name in names])
+    metrics = {event: int(values.get(_metric_key(event), 0)) for event in EVENTS}
+    for timer in TIMERS:
+        metrics[f"{timer}_seconds"] = values.get(_metric_key(f"{timer}_us"), 0) / 1_000_000
+    return metrics
+
+
+def reset_fanout_metrics() -> None:
+    cache.delete_many([_metric_key(name) for name in [*EVENTS, *(f"{timer}_us" for timer in TIMERS)]])
+
+
+# -- fan-out ---------------------------------------------------------------------
+def recipient_chunks(queryset, size: int) -> Iterator[List[Tuple[int, Optional[str]]]]:
+    """Yield ``(user_id, fcm_token)`` lists of up to ``size``, seeking by primary key."""
+
+    queryset = queryset.order_by("pk").values_list("pk", "fcm_token").distinct()
+    last = 0
+    while True:
+        rows = list(queryset.filter(pk__gt=last)[:size])
+        if not rows:
+            return
+        yield rows
+        last = rows[-1][0]
+
+
+def queue_fan_out(audience: str, key, subject: str, body: str, data: Optional[Dict[str, str]] = None) -> None:
+    """Notify ``audience`` (see ``AUDIENCES``) once the current transaction commits."""
+
+    from notifications.tasks import fan_out_notification
+
+    if audience not in AUDIENCES:
+        raise ValueError(f"Unknown notification audience: {audience}")
+    transaction.on_commit(lambda: fan_out_notification.delay(audience, key, subject, body, data))
+
+
+def fan_out(audience: str, key, subject: str, body: str, data: Optional[Dict[str, str]] = None, push: bool = True) -> int:
+    """Create the notification for every member of ``audience``; returns rows created."""
+
+    from notifications.tasks import send_push_batch
+
+    chunk_size = getattr(settings, "NOTIFICATION_FANOUT_CHUNK_SIZE", 1000)
+    started = time.perf_counter()
+    created = 0
+    for rows in recipient_chunks(AUDIENCES[audience](key), chunk_size):
+        user_ids = [user_id for user_id, _ in rows]
+        with transaction.atomic():
+            Notification.objects.bulk_create(
+                [Notification(user_id=user_id, subject=subject, body=body, active=True) for user_id in user_ids],
+                batch_size=chunk_size,
+            )
+            User.objects.filter(pk__in=user_ids).update(**{UNREAD_COUNTER: F(UNREAD_COUNTER) + 1})
+        created += len(user_ids)
+        record("created", len(user_ids))
+
+        tokens = [token for _, token in rows if token]
+        if push:
+            for start in range(0, len(tokens), FCM_MULTICAST_LIMIT):
+                send_push_batch.delay(tokens[start : start + FCM_MULTICAST_LIMIT], subject, body, data)
+    record_seconds("fanout", started)
+    return created
@@ -0,0 +1,35 @@
+# Generated by Django 4.2 on 2026-10-17 04:47
+
+from django.db import migrations, models
+
+from mysite.counters import reconcile_counter
+
+
+def backfill_unread_notification_count(apps, schema_editor):
+    reconcile_counter(
+        apps.get_model("accounts", "User"),
+        "unread_notification_count",
+        apps.get_model("notifications", "Notification"),
+        "user",
+        {"read": False},
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_user_unread_notification_count'),
+        ('notifications', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='notif_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['user', 'read', '-created_at'], name='notif_user_read_created_idx'),
+        ),
+        migrations.RunPython(backfill_unread_notification_count, migrations.RunPython.noop),
+    ]
@@ -1,12 +1,33 @@
 from django.contrib.auth import get_user_model
-from django.db import models
+from django.db import models, transaction
+from django.db.models.signals import post_delete, post_save
+from django.utils import timezone
 
+from mysite.counters import adjust_counter
 from user_profile.models import AdminInfo
 
 User = get_user_model()
 
-class NotificationManager():
-    pass
+UNREAD_COUNTER = "unread_notification_count"
+
+
+class NotificationManager(models.Manager):
+    def mark_read(self, user, ids=None) -> int:
+        """Mark ``user``'s unread notifications read in a single UPDATE.
+
+        Limited to ``ids`` when given. The unread counter is lowered by the
+        number of rows actually flipped, so repeated or racing calls never
+        double count. Returns that number.
+        """
+
+        queryset = self.filter(user=user, read=False)
+        if ids is not None:
+            queryset = queryset.filter(pk__in=ids)
+        with transaction.atomic():
+            marked = queryset.update(read=True, updated_at=timezone.now())
+            if marked:
+                adjust_counter(User, user.pk, UNREAD_COUNTER, -marked)
+        return marked
 
 
 class Notification(models.Model):
@@ -23,3 +44,41 @@ class Notification(models.Model):
 
     objects = NotificationManager()
 
+    class Meta:
+        indexes = [
+            # Inbox pages, newest first
+            models.Index(fields=["user", "-created_at", "-id"], name="notif_user_created_idx"),
+            # Unread filter and counter reconciliation
+            models.Index(fields=["user", "read", "-created_at"], name="notif_user_read_created_idx"),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_read = instance.__dict__.get("read")
+        return instance
+
+
+# Keep User.unread_notification_count in step with notification rows
+def _unread(read):
+    return 0 if read else 1
+
+
+def post_save_unread_count_receiver(sender, instance, created, *args, **kwargs):
+    if created:
+        delta = _unread(instance.read)
+    else:
+        loaded = getattr(instance, "_loaded_read", None)
+        delta = 0 if loaded is None else _unread(instance.read) - _unread(loaded)
+    instance._loaded_read = instance.read
+    if delta:
+        adjust_counter(User, instance.user_id, UNREAD_COUNTER, delta)
+
+
+def post_delete_unread_count_receiver(sender, instance, *args, **kwargs):
+    if not instance.read:
+        adjust_counter(User, instance.user_id, UNREAD_COUNTER, -1)
+
+
+post_save.connect(post_save_unread_count_receiver, sender=Notification)
+post_delete.connect(post_delete_unread_count_receiver, sender=Notification)
@@ -0,0 +1,136 @@
+"""Push delivery transports.
+
+A transport sends one batch of device tokens the same title, body and data
+and reports, per token, whether it was delivered, should be retried, or is
+no longer registered. ``NOTIFICATION_PUSH_TRANSPORT`` selects it:
+
+* ``memory`` (without FCM credentials) delivers nothing and keeps the last
+  batches for inspection; ``MemoryPushTransport.fail_next`` scripts failures.
+* ``fcm`` sends through Firebase Cloud Messaging's HTTP v1 API with
+  ``pyfcm``, authenticated by the service account in
+  ``FCM_CREDENTIALS_FILE``. HTTP v1 has no multicast call, so a batch is
+  sent as concurrent single-token requests.
+
+A failure that affects the whole batch (network, auth token refresh, FCM
+outage) raises ``TransientPushError`` so the Celery task can retry it.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List
+
+from django.conf import settings
+
+from mysite.backends import MEMORY, BackendRegistry
+
+# FCM's per-call multicast limit; also the batch size for HTTP v1 fan-out.
+FCM_MULTICAST_LIMIT = 500
+
+# HTTP v1 error statuses worth another attempt, and those meaning the token is dead.
+_RETRYABLE_STATUSES = {"UNAVAILABLE", "INTERNAL", "RESOURCE_EXHAUSTED", "QUOTA_EXCEEDED"}
+_UNREGISTERED_STATUSES = {"UNREGISTERED", "NOT_FOUND"}
+
+
+class TransientPushError(Exception):
+    """The whole batch failed in a way that may succeed later."""
+
+
+@dataclass
+class PushMessage:
+    title: str
+    body: str
+    data: Dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class PushResult:
+    sent: int = 0
+    failed: int = 0
+    retry_tokens: List[str] = field(default_factory=list)
+    unregistered_tokens: List[str] = field(default_factory=list)
+
+
+class MemoryPushTransport:
+    """Records batches instead of sending them."""
+
+    def __init__(self, history: int = 1000):
+        self.sent: Deque[tuple] = deque(maxlen=history)
+        self._failures: Deque = deque()
+
+    def fail_next(self, outcome) -> None:
+        """Make the next ``send`` raise ``outcome`` (an exception) or return it (a ``PushResult``)."""
+
+        self._failures.append(outcome)
+
+    def clear(self) -> None:
+        self.sent.clear()
+        self._failures.clear()
+
+    def send(self, tokens: List[str], message: PushMessage) -> PushResult:
+        if self._failures:
+            outcome = self._failures.popleft()
+            if isinstance(outcome, BaseException):
+                raise outcome
+            return outcome
+        self.sent.append((list(tokens), message))
+        return PushResult(sent=len(tokens))
+
+
+class FCMPushTransport:
+    """Firebase Cloud Messaging (HTTP v1) through ``pyfcm``."""
+
+    def __init__(self, client=None):
+        if client is None:
+            from pyfcm import FCMNotification
+
+            client = FCMNotification(
+                service_account_file=settings.FCM_CREDENTIALS_FILE,
+                project_id=settings.FCM_PROJECT_ID or None,
+            )
+        self.client = client
+
+    def send(self, tokens: List[str], message: PushMessage) -> PushResult:
+        params = [
+            {
+                "fcm_token": token,
+                "notification_title": message.title,
+                "notification_body": message.body,
+                "data_payload": message.data or None,
+            }
+            for token in tokens
+        ]
+        try:
+            responses = self.client.async_notify_multiple_devices(
+                params_list=params, timeout=getattr(settings, "NOTIFICATION_PUSH_TIMEOUT", 10)
+            )
+        except Exception as exc:  # aiohttp, asyncio and auth errors alike
+            raise TransientPushError(str(exc)) from exc
+
+        result = PushResult()
+        for token, response in zip(tokens, responses):
+            error = (response or {}).get("error")
+            if not error:
+                result.sent += 1
+                continue
+            statuses = {error.get("status")} | {
+                detail.get("errorCode") for detail in error.get("details", []) if isinstance(detail, dict)
+            }
+            if statuses & _UNREGISTERED_STATUSES:
+                result.unregistered_tokens.append(token)
+            elif statuses & _RETRYABLE_STATUSES or error.get("code", 0) >= 500:
+                result.retry_tokens.append(token)
+            else:
+                result.failed += 1
+        return result
+
+
+_transports = BackendRegistry(
+    "NOTIFICATION_PUSH_TRANSPORT",
+    {MEMORY: MemoryPushTransport, "fcm": FCMPushTransport},
+    label="notification push transport",
+    default=MEMORY,
+)
+get_push_transport = _transports.get
+reset_push_transport = _transports.reset
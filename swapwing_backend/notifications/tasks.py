@@ -0,0 +1,76 @@
+"""Celery tasks for notification bookkeeping and delivery."""
+
+import time
+
+from celery import shared_task
+from celery.utils.time import get_exponential_backoff_interval
+from django.conf import settings
+from django.contrib.auth import get_user_model
+
+from mysite.counters import reconcile_counter
+from notifications.fanout import fan_out, record, record_seconds
+from notifications.models import UNREAD_COUNTER, Notification
+from notifications.push import PushMessage, TransientPushError, get_push_transport
+
+PUSH_MAX_RETRIES = getattr(settings, "NOTIFICATION_PUSH_MAX_RETRIES", 5)
+PUSH_RETRY_BACKOFF = getattr(settings, "NOTIFICATION_PUSH_RETRY_BACKOFF_SECONDS", 5)
+PUSH_RETRY_BACKOFF_MAX = getattr(settings, "NOTIFICATION_PUSH_RETRY_BACKOFF_MAX_SECONDS", 300)
+
+
+@shared_task
+def reconcile_unread_counts():
+    """Repair ``User.unread_notification_count`` drift; returns rows corrected."""
+
+    return reconcile_counter(get_user_model(), UNREAD_COUNTER, Notification, "user", {"read": False})
+
+
+@shared_task
+def fan_out_notification(audience, key, subject, body, data=None):
+    """Create one notification per audience member and queue its pushes; returns rows created."""
+
+    return fan_out(audience, key, subject, body, data)
+
+
+@shared_task(
+    bind=True,
+    autoretry_for=(TransientPushError,),
+    max_retries=PUSH_MAX_RETRIES,
+    retry_backoff=PUSH_RETRY_BACKOFF,
+    retry_backoff_max=PUSH_RETRY_BACKOFF_MAX,
+    retry_jitter=True,
+)
+def send_push_batch(self, tokens, title, body, data=None):
+    """Push one message to up to ``FCM_MULTICAST_LIMIT`` device tokens; returns the number delivered.
+
+    A batch-wide ``TransientPushError`` retries the whole batch. Tokens that
+    individually failed with a retryable error are retried on their own,
+    with the same exponential backoff; tokens FCM reports as unregistered
+    are cleared from their users.
+    """
+
+    started = time.perf_counter()
+    try:
+        result = get_push_transport().send(tokens, PushMessage(title=title, body=body, data=data or {}))
+    except TransientPushError:
+        record("push_retried" if self.request.retries < self.max_retries else "push_failed", len(tokens))
+        raise
+    finally:
+        record_seconds("push", started)
+
+    record("push_batches")
+    record("push_sent", result.sent)
+    record("push_failed", result.failed)
+    record("push_unregistered", len(result.unregistered_tokens))
+    if result.unregistered_tokens:
+        get_user_model().objects.filter(fcm_token__in=result.unregistered_tokens).update(fcm_token=None)
+
+    if result.retry_tokens:
+        if self.request.retries >= self.max_retries:
+            record("push_failed", len(result.retry_tokens))
+        else:
+            record("push_retried", len(result.retry_tokens))
+            countdown = get_exponential_backoff_interval(
+                PUSH_RETRY_BACKOFF, self.request.retries, PUSH_RETRY_BACKOFF_MAX, full_jitter=True
+            )
+            raise self.retry(args=(result.retry_tokens, title, body, data), countdown=countdown)
+    return result.sent
@@ -1,3 +1,210 @@
-from django.test import TestCase
+from celery.exceptions import Retry
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
 
-# Create your tests here.
+from journeys.models import Journey, JourneyFollower, JourneyStatus
+from notifications.fanout import fan_out, fanout_metrics, reset_fanout_metrics
+from notifications.models import Notification
+from notifications.push import FCMPushTransport, PushMessage, PushResult, TransientPushError, get_push_transport
+from notifications.tasks import reconcile_unread_counts, send_push_batch
+from user_profile.models import PersonalInfo
+
+User = get_user_model()
+
+
+class NotificationInboxTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="inbox@example.com", password="Password123")
+        self.other = User.objects.create_user(email="other@example.com", password="Password123")
+        token = Token.objects.get(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+        self.inbox_url = reverse("notifications:notification-list")
+        self.mark_read_url = reverse("notifications:notification-mark-read")
+
+    def _notify(self, user, count, read=False):
+        return [
+            Notification.objects.create(user=user, subject=f"Offer {index}", body="New offer", read=read)
+            for index in range(count)
+        ]
+
+    def _unread_count(self, user):
+        user.refresh_from_db(fields=["unread_notification_count"])
+        return user.unread_notification_count
+
+    def test_unread_counter_follows_writes(self):
+        first, second, third = self._notify(self.user, 3)
+        self._notify(self.user, 1, read=True)
+        self.assertEqual(self._unread_count(self.user), 3)
+
+        first.read = True
+        first.save()
+        first.save()
+        self.assertEqual(self._unread_count(self.user), 2)
+
+        reloaded = Notification.objects.get(pk=first.pk)
+        reloaded.read = False
+        reloaded.save()
+        self.assertEqual(self._unread_count(self.user), 3)
+
+        second.delete()
+        Notification.objects.filter(read=True).delete()
+        self.assertEqual(self._unread_count(self.user), 2)
+
+    def test_inbox_pages_newest_first_with_unread_total(self):
+        self._notify(self.user, 5)
+        self._notify(self.other, 2)
+
+        response = self.client.get(self.inbox_url, {"page_size": 3})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["unread_count"], 5)
+        self.assertEqual([item["subject"] for item in response.data["results"]], ["Offer 4", "Offer 3", "Offer 2"])
+
+        following = self.client.get(response.data["next"])
+        self.assertEqual([item["subject"] for item in following.data["results"]], ["Offer 1", "Offer 0"])
+        self.assertIsNone(following.data["next"])
+
+        Notification.objects.mark_read(self.user, [Notification.objects.filter(user=self.user).first().pk])
+        unread = self.client.get(self.inbox_url, {"unread": "true"})
+        self.assertEqual(len(unread.data["results"]), 4)
+
+    def test_mark_read_is_one_update_plus_counter(self):
+        notifications = self._notify(self.user, 4)
+        others = self._notify(self.other, 2)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(
+                self.mark_read_url, {"ids": [notifications[0].pk, notifications[1].pk, others[0].pk]}, format="json"
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {"marked": 2, "unread_count": 2})
+        updates = [query for query in queries if query["sql"].startswith("UPDATE")]
+        self.assertEqual(len(updates), 2)
+
+        response = self.client.post(self.mark_read_url, {}, format="json")
+        self.assertEqual(response.data, {"marked": 2, "unread_count": 0})
+        self.assertEqual(self._unread_count(self.other), 2)
+
+    def test_legacy_inbox_is_paginated(self):
+        self._notify(self.user, 3)
+        url = reverse("notifications:get_user_notification")
+
+        response = self.client.get(url, {"user_id": self.user.user_id, "page_size": 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["data"]), 2)
+        self.assertEqual(response.data["unread_count"], 3)
+        self.assertIsNotNone(response.data["next"])
+
+        self._notify(self.other, 1)
+        other = self.client.get(url, {"user_id": self.other.user_id})
+        self.assertEqual((len(other.data["data"]), other.data["unread_count"]), (3, 3))
+
+        self.client.credentials()
+        anonymous = self.client.get(url, {"user_id": self.user.user_id})
+        self.assertEqual(anonymous.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_home_reads_counter_instead_of_notifications(self):
+        PersonalInfo.objects.get_or_create(user=self.user)
+        self._notify(self.user, 2)
+        url = reverse("home_page:user_home")
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, {"user_id": self.user.user_id})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data["data"]["has_notification"])
+        self.assertEqual(response.data["data"]["unread_notification_count"], 2)
+        self.assertFalse(any("notifications_notification" in query["sql"] for query in queries))
+
+    def test_reconcile_task_repairs_unread_count_drift(self):
+        Notification.objects.bulk_create([Notification(user=self.user, subject="Bulk") for _ in range(3)])
+        self.assertEqual(self._unread_count(self.user), 0)
+
+        self.assertEqual(reconcile_unread_counts.delay().get(), 1)
+        self.assertEqual(self._unread_count(self.user), 3)
+
+
+@override_settings(NOTIFICATION_FANOUT_CHUNK_SIZE=4)
+class NotificationFanOutTests(APITestCase):
+    def setUp(self):
+        reset_fanout_metrics()
+        self.owner = User.objects.create_user(email="owner@example.com", password="Password123")
+        self.journey = Journey.objects.create(owner=self.owner, title="Paperclip to house")
+        self.followers = []
+        for index in range(10):
+            follower = User.objects.create_user(email=f"fan{index}@example.com", password="Password123")
+            follower.fcm_token = f"token-{index}" if index % 5 else ""
+            follower.save(update_fields=["fcm_token"])
+            JourneyFollower.objects.create(journey=self.journey, user=follower)
+            self.followers.append(follower)
+        self.transport = get_push_transport()
+
+    def test_fan_out_writes_in_chunks_and_batches_pushes(self):
+        with CaptureQueriesContext(connection) as queries:
+            created = fan_out("journey_followers", self.journey.id, "New trade", "A step went live")
+
+        self.assertEqual(created, 10)
+        inserts = [query for query in queries if query["sql"].startswith("INSERT")]
+        self.assertEqual(len(inserts), 3)
+        for follower in self.followers:
+            follower.refresh_from_db(fields=["unread_notification_count"])
+            self.assertEqual(follower.unread_notification_count, 1)
+        self.assertFalse(Notification.objects.filter(user=self.owner).exists())
+
+        pushed = [token for tokens, _ in self.transport.sent for token in tokens]
+        self.assertEqual(sorted(pushed), sorted(f"token-{index}" for index in range(10) if index % 5))
+        metrics = fanout_metrics()
+        self.assertEqual(metrics["created"], 10)
+        self.assertEqual(metrics["push_sent"], 8)
+        self.assertEqual(metrics["push_batches"], 3)
+
+    def test_push_batch_retries_transient_failures(self):
+        tokens = ["token-1", "token-2", "token-3"]
+        self.transport.fail_next(TransientPushError("FCM unavailable"))
+        with self.assertRaises(Retry) as whole_batch:
+            send_push_batch.delay(tokens, "Hello", "World")
+        self.assertEqual(whole_batch.exception.sig.args[0], tokens)
+
+        self.transport.fail_next(PushResult(sent=1, retry_tokens=["token-2"], unregistered_tokens=["token-3"]))
+        with self.assertRaises(Retry) as partial:
+            send_push_batch.delay(tokens, "Hello", "World")
+        self.assertEqual(partial.exception.sig.args[0], ["token-2"])
+        self.assertEqual(User.objects.filter(fcm_token="token-3").count(), 0)
+
+        self.assertEqual(partial.exception.sig.apply().get(), 1)
+        self.assertEqual(self.transport.sent[-1][0], ["token-2"])
+        metrics = fanout_metrics()
+        self.assertEqual(metrics["push_sent"], 2)
+        self.assertEqual(metrics["push_retried"], 4)
+        self.assertEqual(metrics["push_unregistered"], 1)
+
+    def test_publishing_a_journey_notifies_followers(self):
+        self.journey.status = JourneyStatus.DRAFT
+        self.journey.save(update_fields=["status"])
+        token = Token.objects.get(user=self.owner)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse("journeys:journey-publish", args=[self.journey.id]))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(Notification.objects.filter(user__in=self.followers).count(), 10)
+
+    def test_fcm_transport_sorts_per_token_outcomes(self):
+        class FakeClient:
+            def async_notify_multiple_devices(self, params_list, timeout):
+                return [
+                    {"name": "projects/demo/messages/1"},
+                    {"error": {"code": 404, "status": "NOT_FOUND"}},
+                    {"error": {"code": 503, "status": "UNAVAILABLE"}},
+                    {"error": {"code": 400, "status": "INVALID_ARGUMENT"}},
+                ]
+
+        result = FCMPushTransport(client=FakeClient()).send(["a", "b", "c", "d"], PushMessage(title="Hi", body="There"))
+        self.assertEqual((result.sent, result.failed), (1, 1))
+        self.assertEqual(result.unregistered_tokens, ["b"])
+        self.assertEqual(result.retry_tokens, ["c"])
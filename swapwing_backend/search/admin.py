@@ -1,3 +1,6 @@
 from django.contrib import admin
 
-# Register your models here.
+from search.models import SearchDocument
+
+
+admin.site.register(SearchDocument)
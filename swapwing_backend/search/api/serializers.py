@@ -0,0 +1,15 @@
+from rest_framework import serializers
+
+from search.models import SearchDocumentKind
+
+
+class SearchHighlightSerializer(serializers.Serializer):
+    title = serializers.CharField(help_text="Title with matched terms wrapped in `<mark>` tags.")
+    body = serializers.CharField(help_text="Description excerpt around the best match.")
+
+
+class SearchHitSerializer(serializers.Serializer):
+    type = serializers.ChoiceField(source="kind", choices=SearchDocumentKind.choices)
+    id = serializers.UUIDField(source="object_id")
+    rank = serializers.FloatField()
+    highlights = SearchHighlightSerializer()
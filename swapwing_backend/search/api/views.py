@@ -0,0 +1,99 @@
+from drf_spectacular.utils import (
+    OpenApiParameter,
+    OpenApiTypes,
+    extend_schema,
+    inline_serializer,
+)
+from rest_framework import permissions, serializers, status
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from search.api.serializers import SearchHitSerializer
+from search.models import SearchDocumentKind
+from search.services import search
+
+DEFAULT_SEARCH_PAGE_SIZE = 20
+MAX_SEARCH_PAGE_SIZE = 50
+
+
+class SearchView(APIView):
+    authentication_classes = [TokenAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+
+    @extend_schema(
+        summary="Search listings and journeys",
+        description="Rank listings and journeys visible to the trader by relevance. Every "
+        "word is matched as a prefix; titles weigh more than tags, which weigh more than "
+        "descriptions and locations.",
+        parameters=[
+            OpenApiParameter(
+                name="q",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                required=True,
+                description="Search text.",
+            ),
+            OpenApiParameter(
+                name="type",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                many=True,
+                enum=SearchDocumentKind.values,
+                description="Restrict results to listings or journeys (defaults to both).",
+            ),
+            OpenApiParameter(
+                name="offset",
+                type=OpenApiTypes.INT,
+                location=OpenApiParameter.QUERY,
+                description="Zero-based result offset (defaults to 0).",
+            ),
+            OpenApiParameter(
+                name="limit",
+                type=OpenApiTypes.INT,
+                location=OpenApiParameter.QUERY,
+                description=f"Number of results to return (defaults to {DEFAULT_SEARCH_PAGE_SIZE}, "
+                f"max {MAX_SEARCH_PAGE_SIZE}).",
+            ),
+        ],
+        responses={
+            status.HTTP_200_OK: inline_serializer(
+                name="SearchResultsPage",
+                fields={
+                    "next_offset": serializers.IntegerField(allow_null=True),
+                    "results": SearchHitSerializer(many=True),
+                },
+            )
+        },
+        tags=["Search"],
+    )
+    def get(self, request, *args, **kwargs):
+        params = request.query_params
+
+        def _int_param(name: str, default: int, maximum: int) -> int:
+            try:
+                value = int(params.get(name, default))
+            except (TypeError, ValueError) as exc:
+                raise ValidationError({name: "Enter a valid integer."}) from exc
+            return min(max(value, 0), maximum)
+
+        text = (params.get("q") or "").strip()
+        if not text:
+            raise ValidationError({"q": "This parameter is required."})
+
+        kinds = params.getlist("type") or list(SearchDocumentKind.values)
+        unknown = set(kinds) - set(SearchDocumentKind.values)
+        if unknown:
+            raise ValidationError({"type": f"Unknown type(s): {', '.join(sorted(unknown))}."})
+
+        offset = _int_param("offset", 0, 10_000)
+        limit = max(_int_param("limit", DEFAULT_SEARCH_PAGE_SIZE, MAX_SEARCH_PAGE_SIZE), 1)
+        hits = search(text, request.user, kinds, limit=limit + 1, offset=offset)
+        has_more = len(hits) > limit
+        return Response(
+            {
+                "next_offset": offset + limit if has_more else None,
+                "results": SearchHitSerializer(hits[:limit], many=True).data,
+            }
+        )
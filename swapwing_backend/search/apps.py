@@ -1,6 +1,18 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
+
+
+def install_search_backend_receiver(sender, using="default", **kwargs):
+    from search.backends import install_search_backend
+
+    install_search_backend(using)
 
 
 class SearchConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "search"
+
+    def ready(self):
+        # Test databases are built with --nomigrations, so the full-text
+        # structures are (re)installed idempotently after every migrate run.
+        post_migrate.connect(install_search_backend_receiver, sender=self)
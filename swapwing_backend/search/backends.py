@@ -0,0 +1,296 @@
+"""Database-specific full-text engines behind ``SearchDocument``.
+
+``get_search_backend`` picks an engine for a connection:
+
+* ``postgres`` – a stored, weighted ``tsvector`` column generated from the
+  document columns, served by a GIN index and ranked with ``ts_rank_cd``.
+* ``sqlite`` – an external-content FTS5 table kept in sync by triggers and
+  ranked with column-weighted ``bm25``.
+* ``basic`` – ``icontains`` matching for databases without either feature.
+
+Every engine treats each query word as a prefix and requires all words to
+match, so "vin cam" finds "Vintage Camera".
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+from django.conf import settings
+from django.db import OperationalError, connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_END = "</mark>"
+MAX_QUERY_TERMS = 8
+SNIPPET_WORDS = 16
+
+_TERM_PATTERN = re.compile(r"[^\W_]+")
+
+
+def query_terms(text: str) -> List[str]:
+    """Split free text into lower-cased word terms safe for every engine."""
+
+    return _TERM_PATTERN.findall((text or "").lower())[:MAX_QUERY_TERMS]
+
+
+@dataclass
+class SearchHit:
+    kind: str
+    object_id: object
+    rank: float
+    highlights: Dict[str, str] = field(default_factory=dict)
+
+
+class BasicSearchBackend:
+    name = "basic"
+
+    def install(self, connection) -> None:
+        """Nothing to install; matching runs against the document columns."""
+
+    def uninstall(self, connection) -> None:
+        """Nothing to remove."""
+
+    def match_filter(self, text: str) -> Q:
+        terms = query_terms(text)
+        if not terms:
+            return Q(pk__in=[])
+        clause = Q()
+        for term in terms:
+            clause &= (
+                Q(title__icontains=term)
+                | Q(tags__icontains=term)
+                | Q(body__icontains=term)
+                | Q(location__icontains=term)
+            )
+        return clause
+
+    def _highlight(self, value: str, terms: Sequence[str]) -> str:
+        pattern = re.compile("|".join(re.escape(term) for term in terms), re.IGNORECASE)
+        return pattern.sub(lambda match: f"{HIGHLIGHT_START}{match.group(0)}{HIGHLIGHT_END}", value or "")
+
+    def search(self, text: str, documents, limit: int, offset: int = 0) -> List[SearchHit]:
+        terms = query_terms(text)
+        if not terms:
+            return []
+        rows = documents.filter(self.match_filter(text)).order_by("-updated_at", "id")
+        return [
+            SearchHit(
+                kind=document.kind,
+                object_id=document.object_id,
+                rank=0.0,
+                highlights={
+                    "title": self._highlight(document.title, terms),
+                    "body": self._highlight(" ".join(document.body.split()[: SNIPPET_WORDS * 2]), terms),
+                },
+            )
+            for document in rows[offset : offset + limit]
+        ]
+
+
+class _RawSQLSearchBackend(BasicSearchBackend):
+    """Shared plumbing for engines that rank with hand-written SQL."""
+
+    match_sql = ""
+    search_sql = ""
+
+    def match_expression(self, terms: Sequence[str]) -> str:
+        raise NotImplementedError
+
+    def match_params(self, terms: Sequence[str]) -> list:
+        return [self.match_expression(terms)]
+
+    def match_filter(self, text: str) -> Q:
+        terms = query_terms(text)
+        if not terms:
+            return Q(pk__in=[])
+        return Q(id__in=RawSQL(self.match_sql, self.match_params(terms)))
+
+    def search_params(self, terms: Sequence[str]) -> list:
+        return self.match_params(terms)
+
+    def search(self, text: str, documents, limit: int, offset: int = 0) -> List[SearchHit]:
+        terms = query_terms(text)
+        if not terms:
+            return []
+        scope_sql, scope_params = documents.values("id").query.sql_with_params()
+        object_id = documents.model._meta.get_field("object_id")
+        connection = connections[documents.db]
+        sql = self.search_sql.format(scope=scope_sql)
+        params = [*self.search_params(terms), *scope_params, limit, offset]
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+        return [
+            SearchHit(
+                kind=kind,
+                object_id=object_id.to_python(raw_id),
+                rank=float(rank),
+                highlights={"title": title, "body": body},
+            )
+            for kind, raw_id, rank, title, body in rows
+        ]
+
+
+class SQLiteSearchBackend(_RawSQLSearchBackend):
+    name = "sqlite"
+    fts_table = "search_searchdocument_fts"
+    # bm25 column weights for title, tags, body, location.
+    weights = (10.0, 5.0, 2.0, 1.0)
+
+    match_sql = (
+        "SELECT rowid FROM search_searchdocument_fts "
+        "WHERE search_searchdocument_fts MATCH %s"
+    )
+    search_sql = (
+        "SELECT d.kind, d.object_id, -bm25(search_searchdocument_fts, {weights}) AS rank, "
+        "highlight(search_searchdocument_fts, 0, '<mark>', '</mark>'), "
+        "snippet(search_searchdocument_fts, 2, '<mark>', '</mark>', '…', {snippet_words}) "
+        "FROM search_searchdocument_fts "
+        "JOIN search_searchdocument d ON d.id = search_searchdocument_fts.rowid "
+        "WHERE search_searchdocument_fts MATCH %s AND d.id IN ({{scope}}) "
+        "ORDER BY rank DESC, d.id LIMIT %s OFFSET %s"
+    ).format(weights=", ".join(str(weight) for weight in weights), snippet_words=SNIPPET_WORDS)
+
+    install_sql = (
+        "CREATE VIRTUAL TABLE IF NOT EXISTS search_searchdocument_fts USING fts5("
+        "title, tags, body, location, content='search_searchdocument', content_rowid='id', "
+        "prefix='2 3', tokenize='unicode61 remove_diacritics 2')",
+        "CREATE TRIGGER IF NOT EXISTS search_searchdocument_fts_ai "
+        "AFTER INSERT ON search_searchdocument BEGIN "
+        "INSERT INTO search_searchdocument_fts(rowid, title, tags, body, location) "
+        "VALUES (new.id, new.title, new.tags, new.body, new.location); END",
+        "CREATE TRIGGER IF NOT EXISTS search_searchdocument_fts_ad "
+        "AFTER DELETE ON search_searchdocument BEGIN "
+        "INSERT INTO search_searchdocument_fts(search_searchdocument_fts, rowid, title, tags, body, location) "
+        "VALUES ('delete', old.id, old.title, old.tags, old.body, old.location); END",
+        "CREATE TRIGGER IF NOT EXISTS search_searchdocument_fts_au "
+        "AFTER UPDATE ON search_searchdocument BEGIN "
+        "INSERT INTO search_searchdocument_fts(search_searchdocument_fts, rowid, title, tags, body, location) "
+        "VALUES ('delete', old.id, old.title, old.tags, old.body, old.location); "
+        "INSERT INTO search_searchdocument_fts(rowid, title, tags, body, location) "
+        "VALUES (new.id, new.title, new.tags, new.body, new.location); END",
+    )
+    rebuild_sql = "INSERT INTO search_searchdocument_fts(search_searchdocument_fts) VALUES ('rebuild')"
+    uninstall_sql = (
+        "DROP TRIGGER IF EXISTS search_searchdocument_fts_au",
+        "DROP TRIGGER IF EXISTS search_searchdocument_fts_ad",
+        "DROP TRIGGER IF EXISTS search_searchdocument_fts_ai",
+        "DROP TABLE IF EXISTS search_searchdocument_fts",
+    )
+
+    @classmethod
+    def is_supported(cls, connection) -> bool:
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA compile_options")
+            return any(row[0] == "ENABLE_FTS5" for row in cursor.fetchall())
+
+    def install(self, connection) -> None:
+        created = self.fts_table not in connection.introspection.table_names()
+        with connection.cursor() as cursor:
+            for statement in self.install_sql:
+                cursor.execute(statement)
+            if created:
+                # Index documents written before the FTS table existed.
+                cursor.execute(self.rebuild_sql)
+
+    def uninstall(self, connection) -> None:
+        with connection.cursor() as cursor:
+            for statement in self.uninstall_sql:
+                cursor.execute(statement)
+
+    def match_expression(self, terms: Sequence[str]) -> str:
+        return " ".join(f'"{term}"*' for term in terms)
+
+
+class PostgresSearchBackend(_RawSQLSearchBackend):
+    name = "postgres"
+
+    match_sql = (
+        "SELECT id FROM search_searchdocument "
+        "WHERE search_vector @@ to_tsquery(%s::regconfig, %s)"
+    )
+    search_sql = (
+        "SELECT d.kind, d.object_id, ts_rank_cd(d.search_vector, q.query) AS rank, "
+        "ts_headline(%s::regconfig, d.title, q.query, "
+        "'StartSel=<mark>, StopSel=</mark>, HighlightAll=true'), "
+        "ts_headline(%s::regconfig, d.body, q.query, "
+        "'StartSel=<mark>, StopSel=</mark>, MaxWords={snippet_words}, MinWords=5') "
+        "FROM search_searchdocument d, to_tsquery(%s::regconfig, %s) AS q(query) "
+        "WHERE d.search_vector @@ q.query AND d.id IN ({{scope}}) "
+        "ORDER BY rank DESC, d.id LIMIT %s OFFSET %s"
+    ).format(snippet_words=SNIPPET_WORDS)
+
+    install_sql = (
+        "ALTER TABLE search_searchdocument ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        "GENERATED ALWAYS AS ("
+        "setweight(to_tsvector('{config}'::regconfig, coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('{config}'::regconfig, coalesce(tags, '')), 'B') || "
+        "setweight(to_tsvector('{config}'::regconfig, coalesce(body, '')), 'C') || "
+        "setweight(to_tsvector('{config}'::regconfig, coalesce(location, '')), 'D')"
+        ") STORED",
+        "CREATE INDEX IF NOT EXISTS search_searchdocument_vector_gin "
+        "ON search_searchdocument USING gin (search_vector)",
+    )
+    uninstall_sql = (
+        "DROP INDEX IF EXISTS search_searchdocument_vector_gin",
+        "ALTER TABLE search_searchdocument DROP COLUMN IF EXISTS search_vector",
+    )
+
+    @property
+    def config(self) -> str:
+        return getattr(settings, "SEARCH_TEXT_CONFIG", "simple")
+
+    def install(self, connection) -> None:
+        if not re.fullmatch(r"[a-z_]+", self.config):
+            raise ValueError(f"Invalid SEARCH_TEXT_CONFIG: {self.config!r}")
+        with connection.cursor() as cursor:
+            for statement in self.install_sql:
+                cursor.execute(statement.format(config=self.config))
+
+    def uninstall(self, connection) -> None:
+        with connection.cursor() as cursor:
+            for statement in self.uninstall_sql:
+                cursor.execute(statement)
+
+    def match_expression(self, terms: Sequence[str]) -> str:
+        return " & ".join(f"{term}:*" for term in terms)
+
+    def match_params(self, terms: Sequence[str]) -> list:
+        return [self.config, self.match_expression(terms)]
+
+    def search_params(self, terms: Sequence[str]) -> list:
+        return [self.config, self.config, *self.match_params(terms)]
+
+
+_backends: Dict[str, BasicSearchBackend] = {}
+
+
+def get_search_backend(using: Optional[str] = None) -> BasicSearchBackend:
+    """Return the full-text engine for a database alias, detecting it once."""
+
+    alias = using or "default"
+    if alias not in _backends:
+        connection = connections[alias]
+        if connection.vendor == "postgresql":
+            backend = PostgresSearchBackend()
+        elif connection.vendor == "sqlite" and SQLiteSearchBackend.is_supported(connection):
+            backend = SQLiteSearchBackend()
+        else:
+            backend = BasicSearchBackend()
+        _backends[alias] = backend
+    return _backends[alias]
+
+
+def install_search_backend(using: Optional[str] = None) -> None:
+    connection = connections[using or "default"]
+    if "search_searchdocument" not in connection.introspection.table_names():
+        return
+    try:
+        get_search_backend(using).install(connection)
+    except OperationalError:
+        # FTS5 reported by compile options but unusable; fall back to LIKE matching.
+        _backends[using or "default"] = BasicSearchBackend()
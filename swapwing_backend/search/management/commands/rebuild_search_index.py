@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from search.backends import install_search_backend
+from search.models import SearchDocumentKind
+from search.services import rebuild_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild search documents for listings and journeys."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--kind",
+            action="append",
+            dest="kinds",
+            help="Only rebuild the given document kind (listing or journey; repeatable).",
+        )
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        kinds = options.get("kinds") or None
+        if kinds:
+            unknown = set(kinds) - set(SearchDocumentKind.values)
+            if unknown:
+                raise CommandError(f"Unknown document kind(s): {', '.join(sorted(unknown))}.")
+
+        install_search_backend()
+        written = rebuild_index(kinds, batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Search index rebuilt ({written} documents)."))
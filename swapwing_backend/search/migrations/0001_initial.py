@@ -0,0 +1,40 @@
+# Generated by Django 4.2 on 2026-10-17 04:02
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SearchDocument",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("kind", models.CharField(choices=[("listing", "Listing"), ("journey", "Journey")], max_length=16)),
+                ("object_id", models.UUIDField()),
+                ("visibility", models.CharField(choices=[("public", "Public"), ("followers", "Followers"), ("private", "Private")], default="public", max_length=16)),
+                ("title", models.CharField(max_length=255)),
+                ("tags", models.TextField(blank=True)),
+                ("body", models.TextField(blank=True)),
+                ("location", models.CharField(blank=True, max_length=255)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("owner", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="search_documents", to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="searchdocument",
+            index=models.Index(fields=["kind", "visibility"], name="search_doc_kind_vis_idx"),
+        ),
+        migrations.AlterUniqueTogether(
+            name="searchdocument",
+            unique_together={("kind", "object_id")},
+        ),
+    ]
@@ -0,0 +1,24 @@
+from django.db import migrations
+
+
+def install(apps, schema_editor):
+    from search.backends import install_search_backend
+
+    install_search_backend(schema_editor.connection.alias)
+
+
+def uninstall(apps, schema_editor):
+    from search.backends import get_search_backend
+
+    get_search_backend(schema_editor.connection.alias).uninstall(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("search", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(install, uninstall),
+    ]
@@ -0,0 +1,70 @@
+from django.db import migrations
+
+BATCH_SIZE = 500
+
+
+def _join_tags(tags):
+    if not isinstance(tags, list):
+        return ""
+    return " ".join(tag for tag in tags if isinstance(tag, str))
+
+
+def _listing_fields(listing):
+    return {
+        "owner_id": listing.owner_id,
+        "visibility": "private" if listing.status == "deleted" else "public",
+        "title": listing.title,
+        "tags": _join_tags(listing.tags),
+        "body": listing.description or "",
+        "location": listing.location or "",
+    }
+
+
+def _journey_fields(journey):
+    return {
+        "owner_id": journey.owner_id,
+        "visibility": journey.visibility,
+        "title": journey.title,
+        "tags": _join_tags(journey.tags),
+        "body": journey.description or "",
+        "location": "",
+    }
+
+
+def backfill(apps, schema_editor):
+    """Index the listings and journeys that existed before search documents.
+
+    Mirrors ``search.services.rebuild_index`` with historical models, so the
+    migration keeps working as those models change. The full-text structures
+    installed by 0002 (FTS5 triggers, the generated tsvector column) pick the
+    rows up.
+    """
+
+    SearchDocument = apps.get_model("search", "SearchDocument")
+    sources = {
+        "listing": (apps.get_model("listings", "Listing"), _listing_fields),
+        "journey": (apps.get_model("journeys", "Journey"), _journey_fields),
+    }
+    for kind, (model, fields_for) in sources.items():
+        SearchDocument.objects.filter(kind=kind).delete()
+        batch = []
+        for instance in model.objects.order_by("pk").iterator(chunk_size=BATCH_SIZE):
+            batch.append(SearchDocument(kind=kind, object_id=instance.pk, **fields_for(instance)))
+            if len(batch) >= BATCH_SIZE:
+                SearchDocument.objects.bulk_create(batch)
+                batch = []
+        if batch:
+            SearchDocument.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("search", "0002_fulltext_structures"),
+        ("listings", "0004_listingmedia_variants"),
+        ("journeys", "0006_journeystepmedia_variants"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -1,3 +1,73 @@
+"""Denormalized search documents for listings and journeys.
+
+Each searchable object is flattened into a single ``SearchDocument`` row whose
+columns map to ranking weights: ``title`` (A), ``tags`` (B), ``body`` (C) and
+``location`` (D). The full-text structures layered on top of this table are
+database specific and installed by ``search.backends`` (a generated
+``tsvector`` column with a GIN index on PostgreSQL, an external-content FTS5
+table on SQLite).
+"""
+
+from django.conf import settings
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+
+from journeys.models import Journey
+from listings.models import Listing
+
+
+class SearchDocumentKind(models.TextChoices):
+    LISTING = "listing", "Listing"
+    JOURNEY = "journey", "Journey"
+
+
+class SearchDocumentVisibility(models.TextChoices):
+    PUBLIC = "public", "Public"
+    FOLLOWERS = "followers", "Followers"
+    PRIVATE = "private", "Private"
+
+
+class SearchDocument(models.Model):
+    kind = models.CharField(max_length=16, choices=SearchDocumentKind.choices)
+    object_id = models.UUIDField()
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        related_name="search_documents",
+        on_delete=models.CASCADE,
+    )
+    visibility = models.CharField(
+        max_length=16,
+        choices=SearchDocumentVisibility.choices,
+        default=SearchDocumentVisibility.PUBLIC,
+    )
+    title = models.CharField(max_length=255)
+    tags = models.TextField(blank=True)
+    body = models.TextField(blank=True)
+    location = models.CharField(max_length=255, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("kind", "object_id")
+        indexes = [
+            models.Index(fields=["kind", "visibility"], name="search_doc_kind_vis_idx"),
+        ]
+
+    def __str__(self) -> str:  # pragma: no cover - debug helper
+        return f"{self.kind}:{self.object_id}"
+
+
+def index_search_document_receiver(sender, instance, **kwargs):
+    from search.services import index_instance
+
+    index_instance(instance)
+
+
+def remove_search_document_receiver(sender, instance, **kwargs):
+    from search.services import remove_instance
+
+    remove_instance(instance)
+
 
-# Create your models here.
+for _indexed_model in (Listing, Journey):
+    post_save.connect(index_search_document_receiver, sender=_indexed_model)
+    post_delete.connect(remove_search_document_receiver, sender=_indexed_model)
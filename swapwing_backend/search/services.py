@@ -0,0 +1,127 @@
+"""Keeping ``SearchDocument`` rows in step with listings and journeys, and
+querying them."""
+
+from __future__ import annotations
+
+from typing import Iterable, List, Optional
+
+from django.db.models import Q
+
+from journeys.models import Journey, JourneyFollower, JourneyVisibility
+from listings.models import Listing, ListingStatus
+from search.backends import SearchHit, get_search_backend
+from search.models import SearchDocument, SearchDocumentKind, SearchDocumentVisibility
+
+
+def _join_tags(tags) -> str:
+    if not isinstance(tags, list):
+        return ""
+    return " ".join(tag for tag in tags if isinstance(tag, str))
+
+
+def document_fields(instance) -> Optional[dict]:
+    """Flatten a listing or journey into ``SearchDocument`` column values."""
+
+    if isinstance(instance, Listing):
+        visibility = (
+            SearchDocumentVisibility.PRIVATE
+            if instance.status == ListingStatus.DELETED
+            else SearchDocumentVisibility.PUBLIC
+        )
+        return {
+            "kind": SearchDocumentKind.LISTING,
+            "owner_id": instance.owner_id,
+            "visibility": visibility,
+            "title": instance.title,
+            "tags": _join_tags(instance.tags),
+            "body": instance.description or "",
+            "location": instance.location or "",
+        }
+    if isinstance(instance, Journey):
+        return {
+            "kind": SearchDocumentKind.JOURNEY,
+            "owner_id": instance.owner_id,
+            "visibility": instance.visibility,
+            "title": instance.title,
+            "tags": _join_tags(instance.tags),
+            "body": instance.description or "",
+            "location": "",
+        }
+    return None
+
+
+def index_instance(instance) -> None:
+    fields = document_fields(instance)
+    if fields is None:
+        return
+    kind = fields.pop("kind")
+    SearchDocument.objects.update_or_create(kind=kind, object_id=instance.pk, defaults=fields)
+
+
+def remove_instance(instance) -> None:
+    fields = document_fields(instance)
+    if fields is None:
+        return
+    SearchDocument.objects.filter(kind=fields["kind"], object_id=instance.pk).delete()
+
+
+def rebuild_index(kinds: Optional[Iterable[str]] = None, batch_size: int = 500) -> int:
+    """Recreate documents for every listing and journey; returns rows written."""
+
+    sources = {
+        SearchDocumentKind.LISTING: Listing.objects.all(),
+        SearchDocumentKind.JOURNEY: Journey.objects.all(),
+    }
+    kinds = list(kinds or sources)
+    written = 0
+    for kind in kinds:
+        SearchDocument.objects.filter(kind=kind).delete()
+        batch: List[SearchDocument] = []
+        for instance in sources[kind].iterator(chunk_size=batch_size):
+            fields = document_fields(instance)
+            fields.pop("kind")
+            batch.append(SearchDocument(kind=kind, object_id=instance.pk, **fields))
+            if len(batch) >= batch_size:
+                SearchDocument.objects.bulk_create(batch)
+                written += len(batch)
+                batch = []
+        if batch:
+            SearchDocument.objects.bulk_create(batch)
+            written += len(batch)
+    return written
+
+
+def matching_object_ids(kind: str, text: str):
+    """Subquery of object ids whose documents match ``text``.
+
+    Intended for ``queryset.filter(id__in=...)`` so the caller's own
+    visibility rules, filters and pagination still apply.
+    """
+
+    backend = get_search_backend(SearchDocument.objects.db)
+    return (
+        SearchDocument.objects.filter(kind=kind)
+        .filter(backend.match_filter(text))
+        .values("object_id")
+    )
+
+
+def visible_documents(user, kinds: Iterable[str]):
+    """Documents the user may see, mirroring the listing and journey views."""
+
+    visibility = Q(visibility=SearchDocumentVisibility.PUBLIC)
+    if user is not None and user.is_authenticated:
+        visibility |= Q(kind=SearchDocumentKind.JOURNEY, owner=user)
+        visibility |= Q(
+            kind=SearchDocumentKind.JOURNEY,
+            visibility=JourneyVisibility.FOLLOWERS,
+            object_id__in=JourneyFollower.objects.filter(user=user).values("journey_id"),
+        )
+    return SearchDocument.objects.filter(kind__in=list(kinds)).filter(visibility)
+
+
+def search(text: str, user, kinds: Iterable[str], limit: int, offset: int = 0) -> List[SearchHit]:
+    """Rank documents visible to ``user`` for ``text``, best match first."""
+
+    documents = visible_documents(user, kinds)
+    return get_search_backend(documents.db).search(text, documents, limit=limit, offset=offset)
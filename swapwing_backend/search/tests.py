@@ -1,3 +1,106 @@
-from django.test import TestCase
+from io import StringIO
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from journeys.models import Journey, JourneyFollower, JourneyVisibility
+from listings.models import Listing, ListingCategory, ListingStatus
+from search.backends import get_search_backend
+from search.models import SearchDocument, SearchDocumentKind
+from search.services import matching_object_ids
+
+User = get_user_model()
+
+
+class SearchIndexTests(APITestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(email="seller@example.com", password="Password123")
+        self.viewer = User.objects.create_user(email="buyer@example.com", password="Password123")
+        token = Token.objects.get(user=self.viewer)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+        self.search_url = reverse("search:search")
+
+        self.camera = Listing.objects.create(
+            owner=self.owner,
+            title="Vintage Camera",
+            description="Classic film body with a fast lens.",
+            category=ListingCategory.ELECTRONICS,
+            tags=["photography"],
+            location="Accra",
+        )
+        self.bag = Listing.objects.create(
+            owner=self.owner,
+            title="Leather Bag",
+            description="Pairs well with a vintage camera strap.",
+            category=ListingCategory.FASHION,
+            location="Kumasi",
+        )
+        self.journey = Journey.objects.create(
+            owner=self.owner,
+            title="Paperclip to camera",
+            description="Trading up one swap at a time.",
+            tags=["vintage"],
+        )
+
+    def _matches(self, kind, text):
+        return {str(row["object_id"]) for row in matching_object_ids(kind, text)}
+
+    def test_documents_follow_saves_and_deletes(self):
+        self.assertEqual(SearchDocument.objects.filter(kind=SearchDocumentKind.LISTING).count(), 2)
+
+        self.camera.title = "Rangefinder Camera"
+        self.camera.save()
+        self.assertEqual(self._matches(SearchDocumentKind.LISTING, "rangefinder"), {str(self.camera.id)})
+        self.assertNotIn(str(self.camera.id), self._matches(SearchDocumentKind.LISTING, "vintage"))
+
+        self.bag.delete()
+        self.assertEqual(self._matches(SearchDocumentKind.LISTING, "leather"), set())
+
+    def test_prefix_terms_must_all_match(self):
+        self.assertEqual(
+            self._matches(SearchDocumentKind.LISTING, "vint cam"),
+            {str(self.camera.id), str(self.bag.id)},
+        )
+        self.assertEqual(self._matches(SearchDocumentKind.LISTING, "vint accra"), {str(self.camera.id)})
+        self.assertEqual(self._matches(SearchDocumentKind.LISTING, "?!"), set())
+
+    def test_search_endpoint_ranks_title_matches_first_and_highlights(self):
+        response = self.client.get(self.search_url, {"q": "vintage", "type": "listing"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        ids = [hit["id"] for hit in response.data["results"]]
+        self.assertEqual(ids, [str(self.camera.id), str(self.bag.id)])
+        self.assertIn("<mark>Vintage</mark>", response.data["results"][0]["highlights"]["title"])
+        if get_search_backend().name != "basic":
+            self.assertGreater(response.data["results"][0]["rank"], response.data["results"][1]["rank"])
+
+        page = self.client.get(self.search_url, {"q": "vintage", "limit": 1})
+        self.assertEqual(len(page.data["results"]), 1)
+        self.assertEqual(page.data["next_offset"], 1)
+
+    def test_search_endpoint_respects_visibility(self):
+        self.camera.status = ListingStatus.DELETED
+        self.camera.save()
+        self.journey.visibility = JourneyVisibility.FOLLOWERS
+        self.journey.save()
+
+        response = self.client.get(self.search_url, {"q": "camera"})
+        self.assertEqual([hit["id"] for hit in response.data["results"]], [str(self.bag.id)])
+
+        JourneyFollower.objects.create(journey=self.journey, user=self.viewer)
+        response = self.client.get(self.search_url, {"q": "camera", "type": "journey"})
+        self.assertEqual([hit["id"] for hit in response.data["results"]], [str(self.journey.id)])
+
+    def test_search_endpoint_validates_parameters(self):
+        self.assertEqual(self.client.get(self.search_url).status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(self.search_url, {"q": "camera", "type": "garage"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_rebuild_command_restores_missing_documents(self):
+        SearchDocument.objects.all().delete()
+        call_command("rebuild_search_index", stdout=StringIO())
+        self.assertEqual(SearchDocument.objects.count(), 3)
+        self.assertEqual(self._matches(SearchDocumentKind.JOURNEY, "paperclip"), {str(self.journey.id)})
@@ -8,3 +8,12 @@ class ListAllEpisodesSerializer(serializers.ModelSerializer):
         model = Episode
         fields = ['id', 'title', 'caption', 'video', 'date_published', 'tags', 'shared_episodes', 'user', 'likes', 'views','trending_no', 'active']
 
+
+class EpisodeSummarySerializer(serializers.ModelSerializer):
+    """Feed card: likes and shares as counts, tags as ids."""
+
+    tag_ids = serializers.PrimaryKeyRelatedField(source='tags', many=True, read_only=True)
+
+    class Meta:
+        model = Episode
+        fields = ['id', 'title', 'caption', 'video', 'date_published', 'user', 'views', 'trending_no', 'like_count', 'share_count', 'tag_ids']
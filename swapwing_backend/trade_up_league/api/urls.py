@@ -0,0 +1,11 @@
+from django.urls import path
+
+from trade_up_league.api.views.views import record_episode_view
+
+app_name = 'trade_up_league'
+
+urlpatterns = [
+    # CLIENT URLS
+    path('episodes/<int:pk>/view', record_episode_view, name="record_episode_view"),
+
+]
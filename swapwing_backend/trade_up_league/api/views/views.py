@@ -0,0 +1,17 @@
+from rest_framework import status
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.decorators import permission_classes, api_view, authentication_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from trade_up_league import trending
+
+
+
+@api_view(['POST', ])
+@permission_classes([IsAuthenticated, ])
+@authentication_classes([TokenAuthentication, ])
+def record_episode_view(request, pk):
+    # Counted in the event buffer; the flush job adds it to Episode.views.
+    trending.record_event(trending.VIEW, [pk])
+    return Response({'response': "Successful"}, status=status.HTTP_202_ACCEPTED)
@@ -0,0 +1,36 @@
+# Generated by Django 4.2 on 2026-10-17 06:12
+
+from django.db import migrations, models
+
+from mysite.counters import reconcile_counter
+
+
+def backfill_episode_counters(apps, schema_editor):
+    Episode = apps.get_model("trade_up_league", "Episode")
+    reconcile_counter(Episode, "like_count", Episode.likes.through, "episode")
+    reconcile_counter(Episode, "share_count", Episode.shared_episodes.through, "episode")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trade_up_league', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='episode',
+            name='like_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='episode',
+            name='share_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='episode',
+            index=models.Index(fields=['active', 'trending_no', 'id'], name='episode_active_trending_idx'),
+        ),
+        migrations.RunPython(backfill_episode_counters, migrations.RunPython.noop),
+    ]
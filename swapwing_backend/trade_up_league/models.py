@@ -3,8 +3,11 @@ import random
 from mysite import settings
 
 from django.db import models
+from django.db.models.signals import m2m_changed
 
+from mysite.response_cache import EPISODES, invalidate_on_change
 from tags.models import Tag
+from trade_up_league import trending
 
 User = settings.AUTH_USER_MODEL
 
@@ -33,8 +36,53 @@ class Episode(models.Model):
     likes = models.ManyToManyField(User, blank=True, related_name='episode_likes')
     views = models.IntegerField(default=0, null=True, blank=True)
     trending_no = models.IntegerField(default=0, null=True, blank=True)
+    like_count = models.PositiveIntegerField(default=0)
+    share_count = models.PositiveIntegerField(default=0)
 
 
     active = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["active", "trending_no", "id"], name="episode_active_trending_idx"),
+        ]
+
+
+# Like and share links feed the buffered engagement counters (see
+# trade_up_league.trending); flushing recounts like_count/share_count.
+EPISODE_COUNTERS = {
+    Episode.likes.through: "like_count",
+    Episode.shared_episodes.through: "share_count",
+}
+EPISODE_EVENTS = {
+    Episode.likes.through: trending.LIKE,
+    Episode.shared_episodes.through: trending.SHARE,
+}
+
+
+def m2m_changed_episode_counter_receiver(sender, instance, action, reverse, pk_set, *args, **kwargs):
+    if reverse and action == "pre_clear":
+        # The links are gone by post_clear; remember which episodes they touched.
+        instance._cleared_episode_ids = list(
+            sender.objects.filter(user=instance).values_list("episode_id", flat=True)
+        )
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        episode_ids = [instance.pk]
+    elif action == "post_clear":
+        episode_ids = getattr(instance, "_cleared_episode_ids", [])
+    else:
+        episode_ids = pk_set or []
+    if episode_ids:
+        trending.record_event(EPISODE_EVENTS[sender], episode_ids, 1 if action == "post_add" else -1)
+
+
+for through in EPISODE_COUNTERS:
+    m2m_changed.connect(m2m_changed_episode_counter_receiver, sender=through)
+
+
+# Orphan the cached trending block whenever an episode changes
+invalidate_on_change(EPISODES, Episode)
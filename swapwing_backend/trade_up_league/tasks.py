@@ -0,0 +1,31 @@
+"""Celery tasks for Trade-Up League episode bookkeeping."""
+
+from celery import shared_task
+
+from mysite.counters import reconcile_counter
+from trade_up_league import trending
+from trade_up_league.models import EPISODE_COUNTERS, Episode
+
+
+@shared_task
+def reconcile_episode_counts():
+    """Repair ``Episode.like_count``/``share_count`` drift; returns rows corrected."""
+
+    return sum(
+        reconcile_counter(Episode, field, through, "episode") for through, field in EPISODE_COUNTERS.items()
+    )
+
+
+@shared_task
+def flush_episode_events():
+    """Apply buffered view/like/share events; returns the episodes touched."""
+
+    return trending.flush_events()
+
+
+@shared_task
+def update_trending_ranks():
+    """Flush pending events, then re-rank every episode; returns rows re-ranked."""
+
+    trending.flush_events()
+    return trending.compute_trending_ranks()
@@ -1,3 +1,95 @@
-from django.test import TestCase
+from datetime import timedelta
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from trade_up_league import trending
+from trade_up_league.models import Episode
+from trade_up_league.tasks import flush_episode_events, update_trending_ranks
+
+User = get_user_model()
+
+
+class EpisodeTrendingTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="host@example.com", password="Password123")
+        token = Token.objects.get(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+        now = timezone.now()
+        self.fresh = Episode.objects.create(user=self.user, title="Fresh", active=True, date_published=now)
+        self.old = Episode.objects.create(
+            user=self.user, title="Old", active=True, views=400, date_published=now - timedelta(days=30)
+        )
+        self.steady = Episode.objects.create(
+            user=self.user, title="Steady", active=True, views=20, date_published=now - timedelta(hours=6)
+        )
+        self.draft = Episode.objects.create(user=self.user, title="Draft", trending_no=1)
+
+    def test_views_are_buffered_then_flushed_in_one_update(self):
+        url = reverse("trade_up_league:record_episode_view", args=[self.fresh.pk])
+        with CaptureQueriesContext(connection) as queries:
+            for _ in range(3):
+                response = self.client.post(url)
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertFalse(any("trade_up_league_episode" in query["sql"] for query in queries))
+        trending.record_event(trending.VIEW, [self.old.pk], 2)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(flush_episode_events.delay().get(), 2)
+        self.assertEqual(len([query for query in queries if query["sql"].startswith("UPDATE")]), 1)
+        self.fresh.refresh_from_db()
+        self.old.refresh_from_db()
+        self.assertEqual((self.fresh.views, self.old.views), (3, 402))
+        self.assertEqual(flush_episode_events.delay().get(), 0)
+
+    def test_ranks_decay_with_age_and_skip_inactive_episodes(self):
+        trending.record_event(trending.VIEW, [self.fresh.pk], 10)
+        self.fresh.likes.add(self.user)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(update_trending_ranks.delay().get(), 4)
+        self.assertEqual(len([query for query in queries if "SET \"trending_no\"" in query["sql"]]), 1)
+
+        ranked = list(Episode.objects.filter(active=True).order_by("trending_no").values_list("title", flat=True))
+        self.assertEqual(ranked, ["Fresh", "Steady", "Old"])
+        self.draft.refresh_from_db()
+        self.assertIsNone(self.draft.trending_no)
+        self.assertEqual(update_trending_ranks.delay().get(), 0)
+
+    def test_redis_buffer_drains_atomically(self):
+        class FakePipeline:
+            def __init__(self, store):
+                self.store, self.calls = store, []
+
+            def hincrby(self, key, field, amount):
+                self.calls.append(lambda: self.store.setdefault(key, {}).update(
+                    {field: str(int(self.store.get(key, {}).get(field, 0)) + amount)}
+                ))
+
+            def hgetall(self, key):
+                self.calls.append(lambda: dict(self.store.get(key, {})))
+
+            def delete(self, key):
+                self.calls.append(lambda: self.store.pop(key, None))
+
+            def execute(self):
+                return [call() for call in self.calls]
+
+        class FakeRedis:
+            def __init__(self):
+                self.store = {}
+
+            def pipeline(self, transaction=True):
+                return FakePipeline(self.store)
+
+        buffer = trending.RedisEventBuffer(client=FakeRedis())
+        buffer.incr(trending.VIEW, [1, 2, 1])
+        buffer.incr(trending.SHARE, [2], -1)
+        self.assertEqual(buffer.drain(), {trending.VIEW: {1: 2, 2: 1}, trending.SHARE: {2: -1}})
+        self.assertEqual(buffer.drain(), {})
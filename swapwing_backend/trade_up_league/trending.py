@@ -0,0 +1,188 @@
+"""Episode engagement counters and trending ranks.
+
+View, like and share events are counted in a buffer instead of touching the
+episode row on every request, and ``flush_events`` applies what has
+accumulated in batched statements. Two interchangeable buffers are provided:
+
+* ``redis`` (default) – one Redis hash per event kind, shared by web and
+  Celery workers.
+* ``memory`` – counters in the recording process, for the test suite (see
+  ``mysite.backends``); the Celery flusher never sees them.
+
+``compute_trending_ranks`` scores every active episode in one pass,
+weighting views, likes and shares and decaying the total with the age of the
+episode (``(age_hours + 2) ** TRENDING_GRAVITY``), and writes the resulting
+ranks to ``Episode.trending_no`` (1 = most trending, ``None`` = inactive)
+with one bulk update. The home feed reads episodes in that order.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import Counter
+from typing import Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.db.models import Case, F, IntegerField, Value, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from mysite.backends import MEMORY, REDIS, BackendRegistry
+
+VIEW = "view"
+LIKE = "like"
+SHARE = "share"
+KINDS = (VIEW, LIKE, SHARE)
+
+WEIGHTS = {VIEW: 1.0, LIKE: 4.0, SHARE: 8.0}
+
+# Episodes per flush statement.
+FLUSH_BATCH_SIZE = 500
+
+
+class MemoryEventBuffer:
+    """Per-kind counters held in process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending: Dict[str, Counter] = {kind: Counter() for kind in KINDS}
+
+    def incr(self, kind: str, episode_ids: Iterable[int], amount: int = 1) -> None:
+        with self._lock:
+            for episode_id in episode_ids:
+                self._pending[kind][int(episode_id)] += amount
+
+    def drain(self) -> Dict[str, Dict[int, int]]:
+        with self._lock:
+            drained = {kind: dict(counts) for kind, counts in self._pending.items() if counts}
+            for counts in self._pending.values():
+                counts.clear()
+        return drained
+
+    def clear(self) -> None:
+        self.drain()
+
+
+class RedisEventBuffer:
+    """Per-kind ``HINCRBY`` hashes; draining reads and deletes them in one transaction."""
+
+    def __init__(self, url: Optional[str] = None, client=None):
+        if client is None:
+            import redis
+
+            client = redis.Redis.from_url(url or settings.REDIS_URL, decode_responses=True)
+        self.client = client
+
+    @staticmethod
+    def _key(kind: str) -> str:
+        prefix = getattr(settings, "EPISODE_EVENT_KEY_PREFIX", "swapwing:episode-events")
+        return f"{prefix}:{kind}"
+
+    def incr(self, kind: str, episode_ids: Iterable[int], amount: int = 1) -> None:
+        pipe = self.client.pipeline(transaction=False)
+        for episode_id in episode_ids:
+            pipe.hincrby(self._key(kind), str(episode_id), amount)
+        pipe.execute()
+
+    def drain(self) -> Dict[str, Dict[int, int]]:
+        pipe = self.client.pipeline(transaction=True)
+        for kind in KINDS:
+            pipe.hgetall(self._key(kind))
+            pipe.delete(self._key(kind))
+        replies = pipe.execute()
+        drained = {}
+        for kind, counts in zip(KINDS, replies[::2]):
+            if counts:
+                drained[kind] = {int(episode_id): int(amount) for episode_id, amount in counts.items()}
+        return drained
+
+    def clear(self) -> None:
+        self.client.delete(*(self._key(kind) for kind in KINDS))
+
+
+_buffers = BackendRegistry(
+    "EPISODE_EVENT_BUFFER", {MEMORY: MemoryEventBuffer, REDIS: RedisEventBuffer}, label="episode event buffer"
+)
+get_event_buffer = _buffers.get
+reset_event_buffer = _buffers.reset
+
+
+def record_event(kind: str, episode_ids: Iterable[int], amount: int = 1) -> None:
+    """Count ``amount`` events of ``kind`` against each episode."""
+
+    if kind not in KINDS:
+        raise ValueError(f"Unknown episode event: {kind}")
+    get_event_buffer().incr(kind, episode_ids, amount)
+
+
+def _chunks(ids: List[int]) -> Iterable[List[int]]:
+    for start in range(0, len(ids), FLUSH_BATCH_SIZE):
+        yield ids[start : start + FLUSH_BATCH_SIZE]
+
+
+def flush_events() -> int:
+    """Apply buffered events to the episode rows; returns the episodes touched.
+
+    Views are added to ``views`` with one ``CASE`` update per batch. Like and
+    share events only mark their episodes: the counters are recounted from
+    the link tables, so a duplicate or missing event cannot skew them.
+    """
+
+    from mysite.counters import reconcile_counter
+    from mysite.response_cache import EPISODES, invalidate
+    from trade_up_league.models import EPISODE_COUNTERS, Episode
+
+    drained = get_event_buffer().drain()
+    views = {episode_id: amount for episode_id, amount in drained.get(VIEW, {}).items() if amount}
+    for batch in _chunks(sorted(views)):
+        Episode.objects.filter(pk__in=batch).update(
+            views=Coalesce(F("views"), 0)
+            + Case(
+                *[When(pk=episode_id, then=Value(views[episode_id])) for episode_id in batch],
+                default=Value(0),
+                output_field=IntegerField(),
+            )
+        )
+    for kind, through in ((LIKE, Episode.likes.through), (SHARE, Episode.shared_episodes.through)):
+        for batch in _chunks(sorted(drained.get(kind, {}))):
+            reconcile_counter(Episode, EPISODE_COUNTERS[through], through, "episode", pks=batch)
+
+    touched = set(views).union(*(drained.get(kind, {}) for kind in (LIKE, SHARE)))
+    if touched:
+        invalidate(EPISODES)
+    return len(touched)
+
+
+def trending_score(views: int, likes: int, shares: int, age_hours: float, gravity: float) -> float:
+    engagement = WEIGHTS[VIEW] * views + WEIGHTS[LIKE] * likes + WEIGHTS[SHARE] * shares
+    return engagement / (max(age_hours, 0.0) + 2) ** gravity
+
+
+def compute_trending_ranks() -> int:
+    """Rank every active episode by decayed engagement; returns rows re-ranked."""
+
+    from mysite.response_cache import EPISODES, invalidate
+    from trade_up_league.models import Episode
+
+    gravity = getattr(settings, "TRENDING_GRAVITY", 1.5)
+    now = timezone.now()
+    rows = list(
+        Episode.objects.values_list(
+            "pk", "active", "views", "like_count", "share_count", "date_published", "created_at", "trending_no"
+        )
+    )
+    scored = []
+    current = {}
+    for pk, active, views, likes, shares, published, created, trending_no in rows:
+        current[pk] = trending_no
+        if active:
+            age_hours = (now - (published or created)).total_seconds() / 3600
+            scored.append((-trending_score(views or 0, likes, shares, age_hours, gravity), pk))
+    ranks = {pk: None for pk in current}
+    ranks.update({pk: rank for rank, (_, pk) in enumerate(sorted(scored), start=1)})
+
+    changed = [Episode(pk=pk, trending_no=rank) for pk, rank in ranks.items() if current[pk] != rank]
+    if changed:
+        Episode.objects.bulk_update(changed, ["trending_no"])
+        invalidate(EPISODES)
+    return len(changed)
@@ -0,0 +1,5 @@
+from django.contrib import admin
+
+from uploads.models import UploadSession
+
+admin.site.register(UploadSession)
@@ -0,0 +1,30 @@
+from rest_framework import serializers
+
+from uploads.models import UploadSession, UploadTarget
+
+
+class UploadFileSerializer(serializers.Serializer):
+    filename = serializers.CharField(max_length=255)
+    content_type = serializers.CharField(max_length=100)
+
+
+class UploadSessionRequestSerializer(serializers.Serializer):
+    target = serializers.ChoiceField(choices=UploadTarget.choices)
+    target_id = serializers.UUIDField()
+    files = UploadFileSerializer(many=True, allow_empty=False, max_length=10)
+
+
+class UploadSessionSerializer(serializers.ModelSerializer):
+    upload = serializers.SerializerMethodField()
+
+    class Meta:
+        model = UploadSession
+        fields = ("id", "target", "target_id", "key", "filename", "content_type", "max_bytes", "expires_at", "upload")
+        read_only_fields = fields
+
+    def get_upload(self, obj: UploadSession) -> dict:
+        return self.context["instructions"][obj.pk]
+
+
+class UploadSessionCompleteSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.UUIDField(), allow_empty=False, max_length=10)
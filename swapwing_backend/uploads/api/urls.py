@@ -0,0 +1,10 @@
+from rest_framework.routers import DefaultRouter
+
+from uploads.api.views.views import UploadSessionViewSet
+
+app_name = 'uploads'
+
+router = DefaultRouter()
+router.register(r"sessions", UploadSessionViewSet, basename="upload-session")
+
+urlpatterns = router.urls
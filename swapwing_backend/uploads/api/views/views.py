@@ -0,0 +1,97 @@
+from django.core.files.storage import default_storage
+from django.urls import reverse
+from drf_spectacular.utils import extend_schema, inline_serializer
+from rest_framework import permissions, serializers, status, viewsets
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.response import Response
+
+from uploads import sessions
+from uploads.api.serializers import (
+    UploadSessionCompleteSerializer,
+    UploadSessionRequestSerializer,
+    UploadSessionSerializer,
+)
+from uploads.media import MEDIA_TARGETS
+from uploads.models import UploadSession, UploadSessionStatus
+from uploads.streaming import is_s3_storage
+
+
+class UploadSessionViewSet(viewsets.GenericViewSet):
+    serializer_class = UploadSessionSerializer
+    authentication_classes = [TokenAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        return UploadSession.objects.filter(owner=self.request.user)
+
+    @extend_schema(
+        summary="Open upload sessions",
+        description=(
+            "Reserve storage keys for up to 10 files and return how to upload each one: a presigned "
+            "S3 POST, or a PUT to the session's content endpoint on local storage."
+        ),
+        request=UploadSessionRequestSerializer,
+        responses={status.HTTP_201_CREATED: UploadSessionSerializer(many=True)},
+        tags=["Uploads"],
+    )
+    def create(self, request):
+        serializer = UploadSessionRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        parent = MEDIA_TARGETS[data["target"]].owned_parent(data["target_id"], request.user)
+        if parent is None:
+            raise NotFound("Upload target not found.")
+        created = sessions.open_sessions(request.user, parent, data["target"], data["files"])
+        instructions = {
+            session.pk: sessions.upload_instructions(
+                session, request.build_absolute_uri(reverse("uploads:upload-session-content", args=[session.pk]))
+            )
+            for session in created
+        }
+        payload = UploadSessionSerializer(created, many=True, context={"instructions": instructions}).data
+        return Response(payload, status=status.HTTP_201_CREATED)
+
+    @extend_schema(
+        summary="Upload session content",
+        description="Stream the file body into storage. Only offered when media is kept on local storage.",
+        request={"application/octet-stream": {"type": "string", "format": "binary"}},
+        responses={status.HTTP_204_NO_CONTENT: None},
+        tags=["Uploads"],
+    )
+    @action(detail=True, methods=["put"], url_path="content")
+    def content(self, request, pk=None):
+        if is_s3_storage(default_storage):
+            raise ValidationError("Upload directly to storage with the presigned POST.")
+        session = self.get_queryset().filter(pk=pk, status=UploadSessionStatus.PENDING).first()
+        if session is None:
+            raise NotFound("Upload session not found.")
+        length = int(request.META.get("CONTENT_LENGTH") or 0)
+        if length > session.max_bytes:
+            raise ValidationError({"content": "File exceeds the session's size limit."})
+        sessions.receive_content(session, request.stream)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    @extend_schema(
+        summary="Complete upload sessions",
+        description="Attach the uploaded files as media in one write and queue their processing.",
+        request=UploadSessionCompleteSerializer,
+        responses={
+            status.HTTP_200_OK: inline_serializer(
+                name="UploadSessionCompleteResponse",
+                fields={
+                    "completed": serializers.DictField(child=serializers.UUIDField()),
+                    "missing": serializers.ListField(child=serializers.UUIDField()),
+                    "rejected": serializers.ListField(child=serializers.UUIDField()),
+                },
+            )
+        },
+        tags=["Uploads"],
+    )
+    @action(detail=False, methods=["post"], url_path="complete")
+    def complete(self, request):
+        serializer = UploadSessionCompleteSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        result = sessions.complete_sessions(request.user, serializer.validated_data["ids"])
+        return Response({"completed": result.completed, "missing": result.missing, "rejected": result.rejected})
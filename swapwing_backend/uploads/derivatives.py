@@ -0,0 +1,102 @@
+"""Resized image variants for uploaded photos.
+
+Feeds render photos far smaller than they are uploaded, so every stored image
+gets derivatives next to it (``<original stem>__<variant>.<ext>``):
+
+* ``thumbnail`` – JPEG, longest side ``320`` px, for list cells and avatars;
+* ``medium`` – JPEG, longest side ``1080`` px, for detail screens;
+* ``webp`` – WebP at the ``medium`` size, for clients that can decode it.
+
+Images are never upscaled. The metadata returned by ``generate_variants`` is
+stored on the media row (``variants``, or ``photo_variants`` on profiles)
+and ``variant_urls`` turns it into the map the API exposes, so clients pick
+the smallest variant that fits instead of downloading the original.
+"""
+
+from __future__ import annotations
+
+import io
+import posixpath
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+
+@dataclass(frozen=True)
+class VariantSpec:
+    max_side: int
+    format: str
+    extension: str
+
+
+VARIANT_SPECS = {
+    "thumbnail": VariantSpec(max_side=320, format="JPEG", extension="jpg"),
+    "medium": VariantSpec(max_side=1080, format="JPEG", extension="jpg"),
+    "webp": VariantSpec(max_side=1080, format="WEBP", extension="webp"),
+}
+
+
+def variant_name(name: str, variant: str, spec: VariantSpec) -> str:
+    stem, _ = posixpath.splitext(name)
+    return f"{stem}__{variant}.{spec.extension}"
+
+
+def _render(image: Image.Image, spec: VariantSpec) -> Image.Image:
+    rendered = image.copy()
+    rendered.thumbnail((spec.max_side, spec.max_side), Image.LANCZOS)
+    if spec.format == "JPEG" and rendered.mode not in ("RGB", "L"):
+        rendered = rendered.convert("RGB")
+    return rendered
+
+
+def generate_variants(field_file) -> Dict[str, dict]:
+    """Write every ``VARIANT_SPECS`` derivative of ``field_file``; returns their metadata.
+
+    Returns an empty map when the file is not an image Pillow can read.
+    """
+
+    storage = field_file.storage
+    quality = getattr(settings, "MEDIA_VARIANT_QUALITY", 82)
+    try:
+        with field_file.open("rb") as source:
+            image = Image.open(source)
+            image.load()
+    except (UnidentifiedImageError, OSError, Image.DecompressionBombError):
+        return {}
+    image = ImageOps.exif_transpose(image)
+
+    variants = {}
+    for variant, spec in VARIANT_SPECS.items():
+        rendered = _render(image, spec)
+        buffer = io.BytesIO()
+        rendered.save(buffer, format=spec.format, quality=quality, optimize=spec.format == "JPEG")
+        name = variant_name(field_file.name, variant, spec)
+        if storage.exists(name):
+            storage.delete(name)
+        stored = storage.save(name, ContentFile(buffer.getvalue()))
+        variants[variant] = {
+            "name": stored,
+            "width": rendered.width,
+            "height": rendered.height,
+            "format": spec.format.lower(),
+            "bytes": buffer.tell(),
+        }
+    return variants
+
+
+def variant_urls(variants: Optional[dict], storage, request=None) -> Dict[str, dict]:
+    """The API ``variants`` map: a URL and dimensions per stored variant."""
+
+    urls = {}
+    for variant, meta in (variants or {}).items():
+        url = storage.url(meta["name"])
+        urls[variant] = {
+            "url": request.build_absolute_uri(url) if request else url,
+            "width": meta["width"],
+            "height": meta["height"],
+            "format": meta["format"],
+        }
+    return urls
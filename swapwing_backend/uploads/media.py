@@ -0,0 +1,150 @@
+"""Media rows for listings and journey steps.
+
+Both ``ListingMedia`` and ``JourneyStepMedia`` hang an ordered list of files
+or external URLs off a parent row. ``MEDIA_TARGETS`` describes each pairing
+so that request-time uploads (``bulk_create_media``) and completed upload
+sessions (``uploads.sessions``) build the rows the same way: validated in
+memory, inserted with one ``bulk_create``, and handed to
+``uploads.tasks.process_media`` once the transaction commits.
+"""
+
+from __future__ import annotations
+
+import mimetypes
+from dataclasses import dataclass
+from typing import Iterable, List
+
+from django.apps import apps
+from django.db import transaction
+
+from uploads.models import UploadTarget
+from uploads.streaming import StreamedUploadedFile
+
+
+@dataclass(frozen=True)
+class MediaTarget:
+    name: str
+    parent_label: str
+    media_label: str
+    parent_field: str
+    owner_lookup: str
+    cache_namespace: str
+
+    @property
+    def parent_model(self):
+        return apps.get_model(self.parent_label)
+
+    @property
+    def media_model(self):
+        return apps.get_model(self.media_label)
+
+    def owned_parent(self, pk, user):
+        """The parent row ``pk`` if ``user`` may attach media to it, else ``None``."""
+
+        queryset = self.parent_model.objects.filter(pk=pk, **{self.owner_lookup: user.pk})
+        if self.parent_field == "step":
+            queryset = queryset.select_related("journey")
+        return queryset.first()
+
+    def storage_key(self, parent, filename: str) -> str:
+        """The key the media field's ``upload_to`` would give ``filename``."""
+
+        media = self.media_model(**{self.parent_field: parent})
+        return self.media_model._meta.get_field("file").generate_filename(media, filename)
+
+
+MEDIA_TARGETS = {
+    UploadTarget.LISTING: MediaTarget(
+        name=UploadTarget.LISTING,
+        parent_label="listings.Listing",
+        media_label="listings.ListingMedia",
+        parent_field="listing",
+        owner_lookup="owner_id",
+        cache_namespace="listings",
+    ),
+    UploadTarget.JOURNEY_STEP: MediaTarget(
+        name=UploadTarget.JOURNEY_STEP,
+        parent_label="journeys.JourneyStep",
+        media_label="journeys.JourneyStepMedia",
+        parent_field="step",
+        owner_lookup="journey__owner_id",
+        cache_namespace="journeys",
+    ),
+}
+
+
+def target_for_media_model(model) -> MediaTarget:
+    return next(target for target in MEDIA_TARGETS.values() if target.media_label == model._meta.label)
+
+
+def guess_content_type(name: str, declared: str = "") -> str:
+    if declared and declared != "application/octet-stream":
+        return declared
+    return mimetypes.guess_type(name or "")[0] or declared or ""
+
+
+def build_file_media(model, parent_field: str, parent, file_obj, order: int, **extra):
+    """An unsaved media row for an uploaded or already stored file."""
+
+    pending = model.ProcessingStatus.PENDING
+    if isinstance(file_obj, StreamedUploadedFile):
+        return model(
+            **{parent_field: parent},
+            file=file_obj.stored_name,
+            content_type=guess_content_type(file_obj.name, file_obj.content_type or ""),
+            size_bytes=file_obj.size,
+            order=order,
+            processing_status=pending,
+            **extra,
+        )
+    if isinstance(file_obj, str):
+        return model(**{parent_field: parent}, file=file_obj, order=order, processing_status=pending, **extra)
+    return model(
+        **{parent_field: parent},
+        file=file_obj,
+        content_type=guess_content_type(file_obj.name, getattr(file_obj, "content_type", "") or ""),
+        size_bytes=file_obj.size,
+        order=order,
+        processing_status=pending,
+        **extra,
+    )
+
+
+def bulk_create_media(model, parent_field: str, parent, media_files=None, media_urls=None) -> List:
+    """Attach uploaded files and external URLs to ``parent`` after its existing media.
+
+    Rows are validated without the per-row uniqueness query (primary keys are
+    fresh UUIDs) and inserted together; uploaded files are written to storage
+    by the insert itself unless a streaming upload handler already put them
+    there.
+    """
+
+    media_files = list(media_files or [])
+    media_urls = list(media_urls or [])
+    if not media_files and not media_urls:
+        return []
+    order_start = parent.media.count()
+    items = [
+        build_file_media(model, parent_field, parent, file_obj, order_start + index)
+        for index, file_obj in enumerate(media_files, start=1)
+    ]
+    items.extend(
+        model(**{parent_field: parent}, external_url=url, order=order_start + len(media_files) + index)
+        for index, url in enumerate(media_urls, start=1)
+    )
+    for media in items:
+        media.full_clean(validate_unique=False)
+    created = model.objects.bulk_create(items)
+    schedule_processing(model, [media.pk for media in created if media.file])
+    return created
+
+
+def schedule_processing(model, media_ids: Iterable) -> None:
+    """Queue ``process_media`` for the rows once the current transaction commits."""
+
+    from uploads.tasks import process_media
+
+    media_ids = [str(pk) for pk in media_ids]
+    if media_ids:
+        label = model._meta.label
+        transaction.on_commit(lambda: process_media.delay(label, media_ids))
@@ -0,0 +1,57 @@
+"""Direct-to-storage upload sessions for listing and journey step media."""
+
+from __future__ import annotations
+
+import uuid
+
+from django.conf import settings
+from django.db import models
+
+
+class UploadTarget(models.TextChoices):
+    LISTING = "listing", "Listing"
+    JOURNEY_STEP = "journey_step", "Journey step"
+
+
+class UploadSessionStatus(models.TextChoices):
+    PENDING = "pending", "Pending"
+    COMPLETED = "completed", "Completed"
+    EXPIRED = "expired", "Expired"
+
+
+class UploadSession(models.Model):
+    """One file the client uploads straight to storage under ``key``.
+
+    The session reserves the storage key and the size limit; completing it
+    attaches the stored object to its listing or journey step as a media row.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="upload_sessions",
+    )
+    target = models.CharField(max_length=32, choices=UploadTarget.choices)
+    target_id = models.UUIDField()
+    key = models.CharField(max_length=500)
+    filename = models.CharField(max_length=255)
+    content_type = models.CharField(max_length=100)
+    max_bytes = models.PositiveBigIntegerField()
+    status = models.CharField(
+        max_length=16,
+        choices=UploadSessionStatus.choices,
+        default=UploadSessionStatus.PENDING,
+    )
+    media_id = models.UUIDField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["status", "expires_at"], name="upload_session_status_exp_idx"),
+        ]
+
+    def __str__(self) -> str:  # pragma: no cover - debug helper
+        return f"Upload {self.id} for {self.target} {self.target_id}"
@@ -0,0 +1,164 @@
+"""Presigned, direct-to-storage uploads.
+
+A client that wants to attach large files asks for one session per file
+(``open_sessions``). Each session reserves the object key the media row will
+use and carries upload instructions:
+
+* on S3 storage, a presigned ``POST`` policy limited to the declared content
+  type and ``MEDIA_UPLOAD_MAX_BYTES``, so the bytes never pass through Django;
+* on local file storage, a ``PUT`` to the session's ``content`` endpoint,
+  which streams the request body into storage (development and tests).
+
+Once the uploads finish, the client completes the sessions in one call
+(``complete_sessions``): stored objects are checked, the media rows are
+bulk-created after the parent's existing media, and post-processing is
+queued. Sessions left pending past ``UPLOAD_SESSION_TTL_SECONDS`` are expired
+by beat and their objects deleted.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+
+from mysite.response_cache import invalidate
+from uploads.media import MEDIA_TARGETS, build_file_media, schedule_processing
+from uploads.models import UploadSession, UploadSessionStatus
+from uploads.streaming import is_s3_storage, s3_object_key
+
+
+@dataclass
+class CompletionResult:
+    completed: Dict[str, str] = field(default_factory=dict)
+    missing: List[str] = field(default_factory=list)
+    rejected: List[str] = field(default_factory=list)
+
+
+def max_upload_bytes() -> int:
+    return getattr(settings, "MEDIA_UPLOAD_MAX_BYTES", 200 * 1024 * 1024)
+
+
+def open_sessions(user, parent, target: str, files: List[dict]) -> List[UploadSession]:
+    """Create one pending session per ``{"filename", "content_type"}`` in ``files``."""
+
+    media_target = MEDIA_TARGETS[target]
+    expires_at = timezone.now() + timedelta(seconds=getattr(settings, "UPLOAD_SESSION_TTL_SECONDS", 3600))
+    sessions = [
+        UploadSession(
+            owner=user,
+            target=target,
+            target_id=parent.pk,
+            key=media_target.storage_key(parent, item["filename"]),
+            filename=item["filename"],
+            content_type=item["content_type"],
+            max_bytes=max_upload_bytes(),
+            expires_at=expires_at,
+        )
+        for item in files
+    ]
+    return UploadSession.objects.bulk_create(sessions)
+
+
+def upload_instructions(session: UploadSession, content_url: str, storage=None) -> dict:
+    """How the client should send the bytes for ``session``."""
+
+    storage = storage or default_storage
+    if is_s3_storage(storage):
+        client = storage.connection.meta.client
+        post = client.generate_presigned_post(
+            Bucket=storage.bucket_name,
+            Key=s3_object_key(storage, session.key),
+            Fields={"Content-Type": session.content_type},
+            Conditions=[
+                {"Content-Type": session.content_type},
+                ["content-length-range", 1, session.max_bytes],
+            ],
+            ExpiresIn=max(int((session.expires_at - timezone.now()).total_seconds()), 1),
+        )
+        return {"method": "POST", "url": post["url"], "fields": post["fields"]}
+    return {"method": "PUT", "url": content_url, "headers": {"Content-Type": session.content_type}}
+
+
+def receive_content(session: UploadSession, stream) -> str:
+    """Stream a request body into storage for local-storage sessions."""
+
+    if default_storage.exists(session.key):
+        default_storage.delete(session.key)
+    return default_storage.save(session.key, File(stream, name=session.key))
+
+
+def complete_sessions(user, session_ids) -> CompletionResult:
+    """Attach the uploaded objects of ``user``'s pending sessions as media rows."""
+
+    result = CompletionResult()
+    with transaction.atomic():
+        # Locked so concurrent completions of the same sessions serialize;
+        # the loser re-reads them as no longer pending and creates nothing.
+        sessions = list(
+            UploadSession.objects.select_for_update()
+            .filter(owner=user, pk__in=session_ids, status=UploadSessionStatus.PENDING, expires_at__gt=timezone.now())
+            .order_by("created_at")
+        )
+        stored = defaultdict(list)
+        for session in sessions:
+            if not default_storage.exists(session.key):
+                result.missing.append(str(session.pk))
+                continue
+            size = default_storage.size(session.key)
+            if size > session.max_bytes:
+                default_storage.delete(session.key)
+                result.rejected.append(str(session.pk))
+                continue
+            stored[(session.target, session.target_id)].append((session, size))
+
+        completed: List[UploadSession] = []
+        for (target, target_id), uploads in stored.items():
+            media_target = MEDIA_TARGETS[target]
+            parent = media_target.owned_parent(target_id, user)
+            if parent is None:
+                result.rejected.extend(str(session.pk) for session, _ in uploads)
+                continue
+            model = media_target.media_model
+            order_start = parent.media.count()
+            items = [
+                build_file_media(
+                    model,
+                    media_target.parent_field,
+                    parent,
+                    session.key,
+                    order_start + index,
+                    content_type=session.content_type,
+                    size_bytes=size,
+                )
+                for index, (session, size) in enumerate(uploads, start=1)
+            ]
+            model.objects.bulk_create(items)
+            for (session, _), media in zip(uploads, items):
+                session.status = UploadSessionStatus.COMPLETED
+                session.media_id = media.pk
+                result.completed[str(session.pk)] = str(media.pk)
+                completed.append(session)
+            schedule_processing(model, [media.pk for media in items])
+            invalidate(media_target.cache_namespace)
+        if completed:
+            UploadSession.objects.bulk_update(completed, ["status", "media_id"])
+    return result
+
+
+def expire_sessions(now: Optional[timezone.datetime] = None) -> int:
+    """Expire stale pending sessions and delete anything uploaded for them."""
+
+    now = now or timezone.now()
+    stale = UploadSession.objects.filter(status=UploadSessionStatus.PENDING, expires_at__lte=now)
+    for key in stale.values_list("key", flat=True).iterator():
+        if default_storage.exists(key):
+            default_storage.delete(key)
+    return stale.update(status=UploadSessionStatus.EXPIRED)
@@ -0,0 +1,219 @@
+"""Upload handlers that stream multipart file bodies straight into storage.
+
+Django's default handlers hold small files in memory and spool large ones to
+a temporary file, and the storage write only happens when the model is
+saved, so a large video is written twice and the second write (to S3 when
+``USE_S3_MEDIA_STORAGE`` is on) happens inside the request.
+``StreamingStorageUploadHandler`` writes each chunk to its final storage
+object as it arrives instead: an S3 multipart upload on S3 storage, or the
+target file on local file storage. Other storages fall through to Django's
+default handlers.
+
+Only requests larger than ``MEDIA_STREAM_MIN_BYTES`` are streamed; smaller
+uploads keep the usual path and their ``upload_to`` keys. Streamed files
+land under ``MEDIA_STREAM_PREFIX`` because the parent row may not exist yet
+while the body is being read; when the view then fails (a validation error
+or a failed insert) ``StreamingUploadMixin`` deletes them again, since no
+row will ever point at them.
+"""
+
+from __future__ import annotations
+
+import os
+import posixpath
+import uuid
+from pathlib import Path
+from typing import Optional
+
+from django.conf import settings
+from django.core.exceptions import RequestDataTooBig
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.core.files.uploadedfile import UploadedFile
+from django.core.files.uploadhandler import FileUploadHandler, StopFutureHandlers
+from django.utils import timezone
+
+try:
+    from storages.backends.s3 import S3Storage
+except ImportError:  # pragma: no cover - django-storages is optional
+    S3Storage = None
+
+# S3 rejects multipart parts under 5 MiB (except the last one).
+S3_MIN_PART_BYTES = 5 * 1024 * 1024
+
+
+def is_s3_storage(storage) -> bool:
+    return S3Storage is not None and isinstance(storage, S3Storage)
+
+
+def s3_object_key(storage, name: str) -> str:
+    location = getattr(storage, "location", "") or ""
+    return posixpath.join(location, name) if location else name
+
+
+class StreamedUploadedFile(UploadedFile):
+    """An uploaded file whose bytes are already stored under ``stored_name``."""
+
+    def __init__(self, stored_name, name, content_type, size, charset=None, content_type_extra=None):
+        super().__init__(None, name, content_type, size, charset, content_type_extra)
+        self.stored_name = stored_name
+
+    def open(self, mode="rb"):
+        return default_storage.open(self.stored_name, mode)
+
+
+class FileSystemWriter:
+    def __init__(self, storage, name: str):
+        self.name = storage.get_available_name(name)
+        path = storage.path(self.name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._path = path
+        self._file = open(path, "wb")
+
+    def write(self, chunk: bytes) -> None:
+        self._file.write(chunk)
+
+    def close(self) -> str:
+        self._file.close()
+        return self.name
+
+    def abort(self) -> None:
+        self._file.close()
+        if os.path.exists(self._path):
+            os.remove(self._path)
+
+
+class S3MultipartWriter:
+    def __init__(self, storage, name: str, content_type: Optional[str] = None, client=None):
+        self.name = name
+        self.client = client or storage.connection.meta.client
+        self.bucket = storage.bucket_name
+        self.key = s3_object_key(storage, name)
+        self.part_bytes = max(getattr(settings, "MEDIA_STREAM_PART_BYTES", S3_MIN_PART_BYTES), S3_MIN_PART_BYTES)
+        extra = {"ContentType": content_type} if content_type else {}
+        self.upload_id = self.client.create_multipart_upload(Bucket=self.bucket, Key=self.key, **extra)["UploadId"]
+        self.parts = []
+        self._buffer = bytearray()
+
+    def _flush(self) -> None:
+        number = len(self.parts) + 1
+        response = self.client.upload_part(
+            Bucket=self.bucket, Key=self.key, UploadId=self.upload_id, PartNumber=number, Body=bytes(self._buffer)
+        )
+        self.parts.append({"ETag": response["ETag"], "PartNumber": number})
+        self._buffer.clear()
+
+    def write(self, chunk: bytes) -> None:
+        self._buffer.extend(chunk)
+        if len(self._buffer) >= self.part_bytes:
+            self._flush()
+
+    def close(self) -> str:
+        if self._buffer or not self.parts:
+            self._flush()
+        self.client.complete_multipart_upload(
+            Bucket=self.bucket, Key=self.key, UploadId=self.upload_id, MultipartUpload={"Parts": self.parts}
+        )
+        return self.name
+
+    def abort(self) -> None:
+        self.client.abort_multipart_upload(Bucket=self.bucket, Key=self.key, UploadId=self.upload_id)
+
+
+def open_writer(storage, name: str, content_type: Optional[str] = None):
+    """A chunk writer for ``storage``, or ``None`` when it cannot be streamed to."""
+
+    if is_s3_storage(storage):
+        return S3MultipartWriter(storage, name, content_type)
+    if isinstance(storage, FileSystemStorage):
+        return FileSystemWriter(storage, name)
+    return None
+
+
+def streamed_name(filename: str) -> str:
+    prefix = getattr(settings, "MEDIA_STREAM_PREFIX", "uploads/streamed")
+    ext = Path(filename or "").suffix or ".bin"
+    return f"{prefix}/{timezone.now():%Y/%m/%d}/{uuid.uuid4()}{ext}"
+
+
+class StreamingStorageUploadHandler(FileUploadHandler):
+    """Write file fields of large requests straight into default storage."""
+
+    def __init__(self, request=None):
+        super().__init__(request)
+        self.activated = False
+        self.writer = None
+        self.size = 0
+        self.stored_names = []
+
+    def handle_raw_input(self, input_data, META, content_length, boundary, encoding=None):
+        threshold = getattr(settings, "MEDIA_STREAM_MIN_BYTES", S3_MIN_PART_BYTES)
+        self.activated = content_length is not None and content_length > threshold
+
+    def new_file(self, field_name, file_name, content_type, content_length, charset=None, content_type_extra=None):
+        super().new_file(field_name, file_name, content_type, content_length, charset, content_type_extra)
+        self.writer = None
+        self.size = 0
+        if self.activated:
+            self.writer = open_writer(default_storage, streamed_name(file_name), content_type)
+        if self.writer is not None:
+            raise StopFutureHandlers()
+
+    def receive_data_chunk(self, raw_data, start):
+        if self.writer is None:
+            return raw_data
+        self.size += len(raw_data)
+        if self.size > getattr(settings, "MEDIA_UPLOAD_MAX_BYTES", self.size):
+            self.writer.abort()
+            self.writer = None
+            raise RequestDataTooBig("Uploaded file exceeds MEDIA_UPLOAD_MAX_BYTES.")
+        self.writer.write(raw_data)
+        return None
+
+    def file_complete(self, file_size):
+        if self.writer is None:
+            return None
+        stored_name = self.writer.close()
+        self.writer = None
+        self.stored_names.append(stored_name)
+        return StreamedUploadedFile(
+            stored_name,
+            self.file_name,
+            self.content_type,
+            self.size,
+            self.charset,
+            self.content_type_extra,
+        )
+
+    def upload_interrupted(self):
+        if self.writer is not None:
+            self.writer.abort()
+            self.writer = None
+
+
+class StreamingUploadMixin:
+    """Install ``StreamingStorageUploadHandler`` ahead of Django's handlers for a view.
+
+    Files streamed for a request that ends in an error are deleted.
+    """
+
+    def initialize_request(self, request, *args, **kwargs):
+        self.streaming_handler = StreamingStorageUploadHandler(request)
+        request.upload_handlers.insert(0, self.streaming_handler)
+        return super().initialize_request(request, *args, **kwargs)
+
+    def discard_streamed_files(self) -> None:
+        handler = getattr(self, "streaming_handler", None)
+        if handler is None:
+            return
+        for name in handler.stored_names:
+            default_storage.delete(name)
+        handler.stored_names = []
+
+    def handle_exception(self, exc):
+        self.discard_streamed_files()
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        if response.status_code >= 400:
+            self.discard_streamed_files()
+        return super().finalize_response(request, response, *args, **kwargs)
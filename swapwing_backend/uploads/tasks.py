@@ -0,0 +1,46 @@
+"""Celery tasks for uploaded media."""
+
+from celery import shared_task
+from django.apps import apps
+
+from mysite.response_cache import invalidate
+from uploads.derivatives import generate_variants
+from uploads.media import guess_content_type, target_for_media_model
+from uploads.sessions import expire_sessions
+
+
+@shared_task
+def process_media(label, media_ids):
+    """Inspect freshly stored media files; returns the rows marked ready.
+
+    Fills in the content type and size, derives ``media_type`` and writes the
+    resized image variants, so the request that attached the files does not
+    wait on storage round trips or image decoding.
+    """
+
+    model = apps.get_model(label)
+    items = list(model.objects.filter(pk__in=media_ids, processing_status=model.ProcessingStatus.PENDING))
+    ready = 0
+    for media in items:
+        try:
+            media.size_bytes = media.file.size
+        except OSError:
+            media.processing_status = model.ProcessingStatus.FAILED
+            continue
+        media.content_type = guess_content_type(media.file.name, media.content_type)
+        media.media_type = model.MediaType.VIDEO if media.content_type.startswith("video/") else model.MediaType.IMAGE
+        if media.media_type == model.MediaType.IMAGE:
+            media.variants = generate_variants(media.file)
+        media.processing_status = model.ProcessingStatus.READY
+        ready += 1
+    if items:
+        model.objects.bulk_update(items, ["size_bytes", "content_type", "media_type", "variants", "processing_status"])
+        invalidate(target_for_media_model(model).cache_namespace)
+    return ready
+
+
+@shared_task
+def expire_upload_sessions():
+    """Expire abandoned upload sessions; returns the sessions expired."""
+
+    return expire_sessions()
@@ -0,0 +1,190 @@
+import os
+import shutil
+import tempfile
+from io import BytesIO
+
+from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from PIL import Image
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from journeys.models import Journey, JourneyStep, JourneyStepMedia
+from listings.models import Listing, ListingCategory, ListingMedia
+from uploads.models import UploadSession, UploadSessionStatus
+from uploads.streaming import S3MultipartWriter
+from uploads.tasks import expire_upload_sessions
+
+User = get_user_model()
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp(prefix="uploads-tests-"))
+class MediaIngestionTests(APITestCase):
+    @classmethod
+    def tearDownClass(cls):  # pragma: no cover - cleanup helper
+        super().tearDownClass()
+        shutil.rmtree(cls._overridden_settings["MEDIA_ROOT"], ignore_errors=True)
+
+    def setUp(self):
+        self.user = User.objects.create_user(email="uploader@example.com", password="StrongPass123")
+        self.other = User.objects.create_user(email="other@example.com", password="StrongPass123")
+        token = Token.objects.get(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+        self.listing = Listing.objects.create(owner=self.user, title="Bike", category=ListingCategory.SPORTS)
+        self.sessions_url = reverse("uploads:upload-session-list")
+        self.complete_url = reverse("uploads:upload-session-complete")
+
+    @override_settings(MEDIA_STREAM_MIN_BYTES=0, MEDIA_STREAM_PREFIX="uploads/streamed")
+    def test_large_request_files_stream_into_storage_and_are_bulk_created(self):
+        files = [SimpleUploadedFile(f"clip{index}.mp4", b"\x00" * 2048, content_type="video/mp4") for index in range(3)]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.post(
+                    reverse("listings:listing-list"),
+                    {"title": "Camera", "category": ListingCategory.ELECTRONICS, "media_files": files},
+                    format="multipart",
+                )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+        media_inserts = [query for query in queries if query["sql"].startswith('INSERT INTO "listings_listingmedia"')]
+        self.assertEqual(len(media_inserts), 1)
+        media = list(ListingMedia.objects.filter(listing_id=response.data["id"]))
+        self.assertEqual(len(media), 3)
+        for item in media:
+            self.assertTrue(item.file.name.startswith("uploads/streamed/"))
+            self.assertTrue(default_storage.exists(item.file.name))
+            self.assertEqual(
+                (item.media_type, item.size_bytes, item.processing_status),
+                (ListingMedia.MediaType.VIDEO, 2048, ListingMedia.ProcessingStatus.READY),
+            )
+
+    @override_settings(MEDIA_STREAM_MIN_BYTES=0, MEDIA_STREAM_PREFIX="uploads/rejected")
+    def test_streamed_files_of_rejected_requests_are_deleted(self):
+        files = [SimpleUploadedFile(f"clip{index}.mp4", b"\x00" * 2048, content_type="video/mp4") for index in range(2)]
+        response = self.client.post(
+            reverse("listings:listing-list"), {"category": "not-a-category", "media_files": files}, format="multipart"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(ListingMedia.objects.exists())
+        stored = [name for _, _, names in os.walk(default_storage.path("uploads/rejected")) for name in names]
+        self.assertEqual(stored, [])
+
+    def test_small_uploads_keep_their_upload_path(self):
+        upload = SimpleUploadedFile("photo.png", b"png-bytes", content_type="image/png")
+        response = self.client.patch(
+            reverse("listings:listing-detail", args=[self.listing.pk]), {"media_files": [upload]}, format="multipart"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        media = self.listing.media.get()
+        self.assertTrue(media.file.name.startswith(f"listings/{self.listing.pk}/media/"))
+        self.assertEqual(media.processing_status, ListingMedia.ProcessingStatus.PENDING)
+
+    def test_processing_writes_image_variants(self):
+        buffer = BytesIO()
+        Image.new("RGBA", (2000, 1500), (10, 120, 200, 255)).save(buffer, format="PNG")
+        upload = SimpleUploadedFile("photo.png", buffer.getvalue(), content_type="image/png")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(
+                reverse("listings:listing-detail", args=[self.listing.pk]), {"media_files": [upload]}, format="multipart"
+            )
+
+        media = self.listing.media.get()
+        self.assertEqual(media.processing_status, ListingMedia.ProcessingStatus.READY)
+        self.assertEqual(set(media.variants), {"thumbnail", "medium", "webp"})
+        for name, meta in media.variants.items():
+            self.assertTrue(default_storage.exists(meta["name"]), name)
+        with default_storage.open(media.variants["thumbnail"]["name"]) as thumbnail:
+            self.assertEqual(Image.open(thumbnail).size, (320, 240))
+        self.assertEqual((media.variants["medium"]["width"], media.variants["webp"]["format"]), (1080, "webp"))
+
+        response = self.client.get(reverse("listings:listing-detail", args=[self.listing.pk]))
+        variant = response.data["media"][0]["variants"]["thumbnail"]
+        self.assertEqual((variant["width"], variant["height"]), (320, 240))
+        self.assertTrue(variant["url"].startswith("http://testserver/"))
+
+    def test_upload_session_round_trip(self):
+        journey = Journey.objects.create(owner=self.user, title="Paperclip")
+        step = JourneyStep.objects.create(journey=journey, sequence=1)
+        response = self.client.post(
+            self.sessions_url,
+            {
+                "target": "journey_step",
+                "target_id": str(step.pk),
+                "files": [
+                    {"filename": "trade.mp4", "content_type": "video/mp4"},
+                    {"filename": "receipt.jpg", "content_type": "image/jpeg"},
+                ],
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+        video, receipt = response.data
+        self.assertTrue(video["key"].startswith(f"journeys/{journey.pk}/steps/{step.pk}/"))
+        self.assertEqual(video["upload"]["method"], "PUT")
+
+        put = self.client.put(video["upload"]["url"], data=b"\x00" * 512, content_type="video/mp4")
+        self.assertEqual(put.status_code, status.HTTP_204_NO_CONTENT)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            completed = self.client.post(self.complete_url, {"ids": [video["id"], receipt["id"]]}, format="json")
+        self.assertEqual(completed.data["missing"], [str(receipt["id"])])
+        media = JourneyStepMedia.objects.get(pk=completed.data["completed"][str(video["id"])])
+        self.assertEqual((media.file.name, media.order, media.size_bytes), (video["key"], 1, 512))
+        self.assertEqual(media.media_type, JourneyStepMedia.MediaType.VIDEO)
+        self.assertEqual(UploadSession.objects.get(pk=video["id"]).status, UploadSessionStatus.COMPLETED)
+
+        again = self.client.post(self.complete_url, {"ids": [video["id"]]}, format="json")
+        self.assertEqual(again.data["completed"], {})
+
+    def test_sessions_require_an_owned_target_and_expire(self):
+        foreign = Listing.objects.create(owner=self.other, title="Not mine", category=ListingCategory.GOODS)
+        payload = {"target": "listing", "files": [{"filename": "a.png", "content_type": "image/png"}]}
+        response = self.client.post(self.sessions_url, {**payload, "target_id": str(foreign.pk)}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        response = self.client.post(self.sessions_url, {**payload, "target_id": str(self.listing.pk)}, format="json")
+        session = UploadSession.objects.get(pk=response.data[0]["id"])
+        default_storage.save(session.key, SimpleUploadedFile("a.png", b"partial"))
+        UploadSession.objects.filter(pk=session.pk).update(expires_at=session.created_at)
+
+        self.assertEqual(expire_upload_sessions.delay().get(), 1)
+        self.assertFalse(default_storage.exists(session.key))
+        completed = self.client.post(self.complete_url, {"ids": [str(session.pk)]}, format="json")
+        self.assertEqual(completed.data, {"completed": {}, "missing": [], "rejected": []})
+
+    def test_s3_writer_uploads_fixed_size_parts(self):
+        class FakeS3:
+            def __init__(self):
+                self.parts, self.completed = [], None
+
+            def create_multipart_upload(self, **kwargs):
+                return {"UploadId": "upload-1"}
+
+            def upload_part(self, PartNumber, Body, **kwargs):
+                self.parts.append(len(Body))
+                return {"ETag": f"etag-{PartNumber}"}
+
+            def complete_multipart_upload(self, MultipartUpload, **kwargs):
+                self.completed = MultipartUpload["Parts"]
+
+        class FakeStorage:
+            bucket_name = "media"
+            location = "root"
+
+        client = FakeS3()
+        writer = S3MultipartWriter(FakeStorage(), "uploads/clip.mp4", "video/mp4", client=client)
+        megabyte = b"\x00" * (1024 * 1024)
+        for _ in range(12):
+            writer.write(megabyte)
+        self.assertEqual(writer.close(), "uploads/clip.mp4")
+        self.assertEqual(writer.key, "root/uploads/clip.mp4")
+        self.assertEqual(client.parts, [8 * 1024 * 1024, 4 * 1024 * 1024])
+        self.assertEqual([part["PartNumber"] for part in client.completed], [1, 2])
@@ -1,8 +1,13 @@
 from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
 from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
 
+from uploads.derivatives import variant_urls
 from user_profile.models import PersonalInfo, SocialMedia, SOCIAL_MEDIA_CHOICES
+from user_profile.tasks import generate_profile_photo_variants, verify_profile_documents
+from user_profile.validators import file_digest, validate_avatar_file, validate_id_document
 
 User = get_user_model()
 
@@ -20,6 +25,7 @@ class PersonalInfoSerializer(serializers.ModelSerializer):
     first_name = serializers.CharField(source="user.first_name", read_only=True)
     last_name = serializers.CharField(source="user.last_name", read_only=True)
     photo_url = serializers.SerializerMethodField()
+    photo_variants = serializers.SerializerMethodField()
     id_card_document_url = serializers.SerializerMethodField()
     social_links = SocialLinkSerializer(source="user.user_social_medias", many=True, read_only=True)
 
@@ -39,6 +45,7 @@ class PersonalInfoSerializer(serializers.ModelSerializer):
             "profile_complete",
             "verified",
             "photo_url",
+            "photo_variants",
             "id_card_document_url",
             "social_links",
         )
@@ -56,6 +63,11 @@ class PersonalInfoSerializer(serializers.ModelSerializer):
             return None
         return self._build_absolute_uri(obj.photo.url)
 
+    def get_photo_variants(self, obj: PersonalInfo) -> dict:
+        if not obj.photo:
+            return {}
+        return variant_urls(obj.photo_variants, obj.photo.storage, self.context.get("request"))
+
     def get_id_card_document_url(self, obj: PersonalInfo):
         request = self.context.get("request")
         if not request or request.user != obj.user:
@@ -72,8 +84,14 @@ class SocialLinkInputSerializer(serializers.Serializer):
 
 
 class PersonalInfoUpdateSerializer(serializers.ModelSerializer):
+    # Plain file fields: DRF's ImageField decodes the whole image, while the
+    # validators below only read headers and skip content already stored.
+    photo = serializers.FileField(required=False, allow_null=True)
+    id_card_image = serializers.FileField(required=False, allow_null=True)
     social_links = serializers.JSONField(required=False)
 
+    DOCUMENT_VALIDATORS = {"photo": validate_avatar_file, "id_card_image": validate_id_document}
+
     class Meta:
         model = PersonalInfo
         fields = (
@@ -88,8 +106,6 @@ class PersonalInfoUpdateSerializer(serializers.ModelSerializer):
             "social_links",
         )
         extra_kwargs = {
-            "photo": {"required": False, "allow_null": True},
-            "id_card_image": {"required": False, "allow_null": True},
             "gender": {"required": False, "allow_null": True},
             "phone": {"required": False, "allow_null": True, "allow_blank": True},
             "about_me": {"required": False, "allow_null": True, "allow_blank": True},
@@ -98,7 +114,36 @@ class PersonalInfoUpdateSerializer(serializers.ModelSerializer):
             "id_number": {"required": False, "allow_null": True, "allow_blank": True},
         }
 
+    def _validate_document(self, field: str, value):
+        if value is None:
+            return None
+        digest = file_digest(value)
+        if self.instance is not None and digest == getattr(self.instance, f"{field}_sha256"):
+            self._unchanged_documents.add(field)
+            return value
+        try:
+            self.DOCUMENT_VALIDATORS[field](value)
+        except DjangoValidationError as exc:
+            raise serializers.ValidationError(exc.messages) from exc
+        self._document_digests[field] = digest
+        return value
+
+    def validate_photo(self, value):
+        return self._validate_document("photo", value)
+
+    def validate_id_card_image(self, value):
+        return self._validate_document("id_card_image", value)
+
+    def run_validation(self, data=serializers.empty):
+        self._document_digests = {}
+        self._unchanged_documents = set()
+        return super().run_validation(data)
+
     def validate(self, attrs):
+        # Re-uploading the stored bytes is a no-op: no rewrite, revalidation or reverification.
+        for field in self._unchanged_documents:
+            attrs.pop(field, None)
+
         id_document = attrs.get("id_card_image")
         id_type = attrs.get("id_type")
         id_number = attrs.get("id_number")
@@ -128,9 +173,24 @@ class PersonalInfoUpdateSerializer(serializers.ModelSerializer):
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
 
+        # Variants of the previous photo are stale; new ones are rendered off the request.
+        photo_changed = "photo" in validated_data
+        if photo_changed:
+            instance.photo_variants = {}
+        documents_changed = [field for field in self.DOCUMENT_VALIDATORS if field in validated_data]
+        for field in documents_changed:
+            setattr(instance, f"{field}_sha256", self._document_digests.get(field, ""))
+        if documents_changed:
+            instance.verified = False
+
         instance.profile_complete = self._is_profile_complete(instance)
         instance.save()
 
+        if photo_changed and instance.photo:
+            transaction.on_commit(lambda: generate_profile_photo_variants.delay(instance.pk))
+        if documents_changed:
+            transaction.on_commit(lambda: verify_profile_documents.delay(instance.pk))
+
         if social_links_data is not None:
             self._sync_social_links(instance.user, social_links_data)
 
@@ -0,0 +1,18 @@
+# Generated by Django 4.2 on 2026-10-17 05:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user_profile', '0003_alter_admininfo_photo_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='personalinfo',
+            name='photo_variants',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2 on 2026-10-17 05:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user_profile', '0004_personalinfo_photo_variants'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='personalinfo',
+            name='id_card_image_sha256',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='personalinfo',
+            name='photo_sha256',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+    ]
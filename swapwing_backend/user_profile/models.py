@@ -83,6 +83,11 @@ class PersonalInfo(models.Model):
         default=get_default_profile_image,
         validators=[validate_avatar_file],
     )
+    # Resized copies of ``photo`` written by user_profile.tasks.generate_profile_photo_variants.
+    photo_variants = models.JSONField(default=dict, blank=True)
+    # SHA-256 of the stored files, so re-uploading the same bytes is a no-op.
+    photo_sha256 = models.CharField(max_length=64, blank=True)
+    id_card_image_sha256 = models.CharField(max_length=64, blank=True)
 
     id_card_image = models.FileField(
         upload_to=id_document_upload_to,
@@ -105,6 +110,7 @@ class PersonalInfo(models.Model):
     trades_made = models.IntegerField(default=0, null=True, blank=True)
 
     profile_complete = models.BooleanField(default=False)
+    # Set by user_profile.tasks.verify_profile_documents once the stored documents fully decode.
     verified = models.BooleanField(default=False)
 
     location_name = models.CharField(max_length=200, null=True, blank=True)
@@ -0,0 +1,85 @@
+"""Celery tasks for user profiles."""
+
+from pathlib import Path
+
+from celery import shared_task
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+from uploads.derivatives import generate_variants
+from user_profile.models import PersonalInfo, get_default_profile_image
+from user_profile.validators import verify_image_content
+
+IMAGE_DOCUMENT_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp"}
+
+
+@shared_task
+def generate_profile_photo_variants(personal_info_id):
+    """Write the resized variants of a profile photo; returns whether they were stored.
+
+    The update is conditional on the photo name so a task for a photo that
+    has since been replaced does not overwrite the newer photo's variants.
+    """
+
+    info = PersonalInfo.objects.filter(pk=personal_info_id).only("photo").first()
+    if info is None or not info.photo or info.photo.name == get_default_profile_image():
+        return False
+    variants = generate_variants(info.photo)
+    return bool(PersonalInfo.objects.filter(pk=info.pk, photo=info.photo.name).update(photo_variants=variants))
+
+
+def _decodes(field_file, label) -> bool:
+    try:
+        with field_file.open("rb") as handle:
+            verify_image_content(handle, label)
+    except (ValidationError, OSError):
+        return False
+    return True
+
+
+@shared_task
+def verify_profile_documents(personal_info_id):
+    """Fully decode the stored avatar and ID document; returns the new ``verified`` state.
+
+    Uploads only get a header check in the request. A document that fails
+    to decode (corrupt, truncated or over ``PROFILE_IMAGE_MAX_PIXELS``) is
+    removed from the profile, and the profile is verified only when an ID
+    document with its type and number passes. Like the variants task, the
+    update is skipped if either document was replaced in the meantime.
+    """
+
+    info = (
+        PersonalInfo.objects.filter(pk=personal_info_id)
+        .only("photo", "id_card_image", "id_type", "id_number")
+        .first()
+    )
+    if info is None:
+        return False
+
+    changes = {}
+    photo, document = info.photo, info.id_card_image
+    if photo and photo.name != get_default_profile_image() and not _decodes(photo, "Avatar"):
+        changes.update(photo=get_default_profile_image(), photo_sha256="", photo_variants={})
+    if (
+        document
+        and Path(document.name).suffix.lower() in IMAGE_DOCUMENT_EXTENSIONS
+        and not _decodes(document, "Identification document")
+    ):
+        changes.update(id_card_image=None, id_card_image_sha256="")
+
+    verified = not changes and bool(document and info.id_type and info.id_number)
+    if changes:
+        changes["profile_complete"] = False
+    unchanged = PersonalInfo.objects.filter(pk=info.pk)
+    for field, field_file in (("photo", photo), ("id_card_image", document)):
+        if field_file.name:
+            unchanged = unchanged.filter(**{field: field_file.name})
+        else:
+            unchanged = unchanged.filter(Q(**{f"{field}__isnull": True}) | Q(**{field: ""}))
+    updated = unchanged.update(verified=verified, **changes)
+    if updated:
+        if "photo" in changes:
+            photo.storage.delete(photo.name)
+        if "id_card_image" in changes:
+            document.storage.delete(document.name)
+    return bool(updated) and verified
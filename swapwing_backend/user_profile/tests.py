@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import json
+import shutil
+import tempfile
 from io import BytesIO
 
 from django.contrib.auth import get_user_model
@@ -12,7 +14,13 @@ from rest_framework.authtoken.models import Token
 from rest_framework.test import APITestCase
 
 
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp(prefix="profile-tests-"))
 class ProfileDocumentTests(APITestCase):
+    @classmethod
+    def tearDownClass(cls):  # pragma: no cover - cleanup helper
+        super().tearDownClass()
+        shutil.rmtree(cls._overridden_settings["MEDIA_ROOT"], ignore_errors=True)
+
     def setUp(self):
         User = get_user_model()
         self.user = User.objects.create_user(
@@ -96,3 +104,79 @@ class ProfileDocumentTests(APITestCase):
 
         self.assertEqual(response.status_code, 400)
         self.assertIn("photo", response.data)
+
+    def test_photo_variants_are_rendered_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(
+                self.url, data={"photo": self._create_image(size=(1600, 800))}, format="multipart"
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["photo_variants"], {})
+
+        variants = self.client.get(self.url).data["photo_variants"]
+        self.assertEqual(set(variants), {"thumbnail", "medium", "webp"})
+        self.assertEqual((variants["thumbnail"]["width"], variants["thumbnail"]["height"]), (320, 160))
+        self.assertEqual(variants["webp"]["format"], "webp")
+        self.assertTrue(variants["medium"]["url"].startswith("http://testserver/"))
+
+    def _documents_payload(self, avatar, id_document):
+        return {"photo": avatar, "id_card_image": id_document, "id_type": "Passport", "id_number": "A1234567"}
+
+    def test_documents_are_verified_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(
+                self.url,
+                data=self._documents_payload(self._create_image(), self._create_image(name="id.png")),
+                format="multipart",
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.data["verified"])
+
+        info = self.user.user_personal_info
+        info.refresh_from_db()
+        self.assertTrue(info.verified)
+        self.assertEqual(len(info.photo_sha256), 64)
+
+    def test_truncated_document_passes_header_check_but_fails_verification(self):
+        valid = self._create_image(name="id.png", size=(720, 720), image_format="PNG").read()
+        truncated = SimpleUploadedFile("id.png", valid[: len(valid) // 2], content_type="image/png")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(
+                self.url, data=self._documents_payload(self._create_image(), truncated), format="multipart"
+            )
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertTrue(response.data["profile_complete"])
+
+        info = self.user.user_personal_info
+        info.refresh_from_db()
+        self.assertFalse(info.verified)
+        self.assertFalse(info.profile_complete)
+        self.assertFalse(info.id_card_image)
+        self.assertTrue(info.photo.name.startswith(f"users/{self.user.user_id}/avatars/"))
+
+    @override_settings(PROFILE_IMAGE_MAX_PIXELS=100_000)
+    def test_rejects_oversized_dimensions_from_the_header(self):
+        response = self.client.patch(
+            self.url, data={"photo": self._create_image(size=(400, 400))}, format="multipart"
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("photo", response.data)
+
+    def test_reuploading_the_same_photo_is_a_no_op(self):
+        content = self._create_image().read()
+        self.client.patch(
+            self.url, data={"photo": SimpleUploadedFile("a.png", content, "image/png")}, format="multipart"
+        )
+        info = self.user.user_personal_info
+        info.refresh_from_db()
+        stored = info.photo.name
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.client.patch(
+                self.url, data={"photo": SimpleUploadedFile("b.png", content, "image/png")}, format="multipart"
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(callbacks, [])
+        info.refresh_from_db()
+        self.assertEqual(info.photo.name, stored)
@@ -1,12 +1,21 @@
-"""Validation helpers for profile document uploads."""
+"""Validation helpers for profile document uploads.
+
+Request-time checks are cheap: size, extension and the format and dimensions
+parsed from a bounded header read. Decoding the pixel data (truncated files,
+decompression bombs) is left to ``user_profile.tasks.verify_profile_documents``.
+"""
 
 from __future__ import annotations
 
+import hashlib
+import warnings
+from io import BytesIO
 from pathlib import Path
 from typing import Iterable
 
 from django.conf import settings
 from django.core.exceptions import ValidationError
+from django.db.models.fields.files import FieldFile
 
 from PIL import Image, UnidentifiedImageError
 
@@ -14,6 +23,10 @@ from PIL import Image, UnidentifiedImageError
 DEFAULT_ALLOWED_AVATAR_FORMATS = {"JPEG", "PNG", "WEBP"}
 DEFAULT_ALLOWED_ID_IMAGE_FORMATS = {"JPEG", "PNG", "WEBP"}
 DEFAULT_ALLOWED_ID_DOCUMENT_EXTENSIONS = {"jpg", "jpeg", "png", "webp", "pdf"}
+# Enough for the format header plus a large EXIF block ahead of a JPEG's frame header.
+DEFAULT_IMAGE_HEADER_BYTES = 128 * 1024
+DEFAULT_MAX_IMAGE_PIXELS = 50_000_000
+PDF_MAGIC = b"%PDF-"
 
 
 def _get_setting(name: str, default):
@@ -29,39 +42,103 @@ def _validate_max_size(file_obj, max_size_mb: float, label: str) -> None:
         raise ValidationError(f"{label} must be smaller than {max_size_mb} MB.")
 
 
-def _validate_image_content(file_obj, label: str, allowed_formats: Iterable[str]) -> None:
-    allowed_formats = {fmt.upper() for fmt in allowed_formats}
+def _read_header(file_obj, limit: int) -> bytes:
     position = None
     if hasattr(file_obj, "tell"):
         try:
             position = file_obj.tell()
         except OSError:
             position = None
-
     try:
-        image = Image.open(file_obj)
-        image.verify()
-        fmt = (image.format or "").upper()
-    except UnidentifiedImageError as exc:
-        raise ValidationError(f"{label} must be a valid image file.") from exc
+        if hasattr(file_obj, "seek"):
+            file_obj.seek(0)
+        return file_obj.read(limit) or b""
     finally:
-        if hasattr(file_obj, "seek") and position is not None:
-            file_obj.seek(position)
-        elif hasattr(file_obj, "seek"):
+        if hasattr(file_obj, "seek"):
             try:
-                file_obj.seek(0)
+                file_obj.seek(position or 0)
             except OSError:
                 pass
 
+
+def sniff_image(file_obj):
+    """Return ``(format, (width, height))`` parsed from the first bytes of ``file_obj``.
+
+    Only ``PROFILE_IMAGE_HEADER_BYTES`` are read and no pixel data is decoded;
+    full decoding happens later in ``user_profile.tasks.verify_profile_documents``.
+    """
+
+    header = _read_header(file_obj, int(_get_setting("PROFILE_IMAGE_HEADER_BYTES", DEFAULT_IMAGE_HEADER_BYTES)))
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", Image.DecompressionBombWarning)
+        image = Image.open(BytesIO(header))
+    return (image.format or "").upper(), image.size
+
+
+def max_image_pixels() -> int:
+    return int(_get_setting("PROFILE_IMAGE_MAX_PIXELS", DEFAULT_MAX_IMAGE_PIXELS))
+
+
+def _validate_image_content(file_obj, label: str, allowed_formats: Iterable[str]) -> None:
+    allowed_formats = {fmt.upper() for fmt in allowed_formats}
+    try:
+        fmt, (width, height) = sniff_image(file_obj)
+    except (UnidentifiedImageError, OSError, SyntaxError, Image.DecompressionBombError) as exc:
+        raise ValidationError(f"{label} must be a valid image file.") from exc
+
     if fmt not in allowed_formats:
         allowed_display = ", ".join(sorted(allowed_formats))
         raise ValidationError(f"{label} must be one of the following formats: {allowed_display}.")
+    if width * height > max_image_pixels():
+        raise ValidationError(f"{label} dimensions are too large.")
+
+
+def verify_image_content(file_obj, label: str) -> None:
+    """Fully decode ``file_obj``, enforcing ``PROFILE_IMAGE_MAX_PIXELS``.
+
+    This is the expensive check the header sniff skips; it runs off the
+    request path.
+    """
+
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", Image.DecompressionBombWarning)
+            image = Image.open(file_obj)
+            width, height = image.size
+            if width * height > max_image_pixels():
+                raise ValidationError(f"{label} dimensions are too large.")
+            image.load()
+    except (UnidentifiedImageError, OSError, SyntaxError, Image.DecompressionBombError) as exc:
+        raise ValidationError(f"{label} must be a valid image file.") from exc
+
+
+def _validate_pdf_header(file_obj, label: str) -> None:
+    if not _read_header(file_obj, len(PDF_MAGIC)).startswith(PDF_MAGIC):
+        raise ValidationError(f"{label} must be a valid PDF file.")
+
+
+def _is_stored(file_obj) -> bool:
+    # A committed FieldFile is the already-validated stored file, e.g. when a
+    # form re-cleans an instance whose document did not change.
+    return isinstance(file_obj, FieldFile) and file_obj._committed
+
+
+def file_digest(file_obj) -> str:
+    """SHA-256 of ``file_obj``'s content, read in chunks."""
+
+    digest = hashlib.sha256()
+    chunks = file_obj.chunks() if hasattr(file_obj, "chunks") else iter(lambda: file_obj.read(64 * 1024), b"")
+    for chunk in chunks:
+        digest.update(chunk)
+    if hasattr(file_obj, "seek"):
+        file_obj.seek(0)
+    return digest.hexdigest()
 
 
 def validate_avatar_file(file_obj) -> None:
     """Validate trader avatar uploads."""
 
-    if not file_obj:
+    if not file_obj or _is_stored(file_obj):
         return
 
     max_size = float(_get_setting("PROFILE_AVATAR_MAX_SIZE_MB", 5))
@@ -76,7 +153,7 @@ def validate_avatar_file(file_obj) -> None:
 def validate_id_document(file_obj) -> None:
     """Validate uploaded government ID documents."""
 
-    if not file_obj:
+    if not file_obj or _is_stored(file_obj):
         return
 
     max_size = float(_get_setting("PROFILE_ID_DOCUMENT_MAX_SIZE_MB", 10))
@@ -104,3 +181,5 @@ def validate_id_document(file_obj) -> None:
 
     if extension in {"jpg", "jpeg", "png", "webp"}:
         _validate_image_content(file_obj, "Identification document", allowed_image_formats)
+    elif extension == "pdf":
+        _validate_pdf_header(file_obj, "Identification document")